@@ -4,8 +4,10 @@ from decimal import Decimal
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from backend.database import get_async_db
 from backend.models import Asset, get_db
 from backend.schemas.asset import (
     AssetCreate,
@@ -16,7 +18,9 @@ from backend.schemas.asset import (
     BulkAssetPriceUpdate,
 )
 from backend.schemas.base import BaseResponse, PaginatedResponse
+from backend.services.asset_search import get_asset_search_index
 from backend.services.base import BaseService
+from backend.services.pagination import COUNT_MODES, split_page
 
 router = APIRouter()
 asset_service = BaseService[Asset, AssetCreate, AssetUpdate](Asset)
@@ -33,11 +37,21 @@ async def get_assets(
     is_active: bool = Query(True, description="Filter by active status"),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
-    db: Session = Depends(get_db),
+    cursor: str | None = Query(
+        None, description="next_cursor of the previous page; replaces page"
+    ),
+    count: str = Query(
+        "exact",
+        pattern=f"^({'|'.join(COUNT_MODES)})$",
+        description="How to compute the total: exact, estimated or none",
+    ),
+    db: AsyncSession = Depends(get_async_db),
 ) -> PaginatedResponse[AssetResponse]:
     """Get assets with optional search and filtering."""
     try:
-        skip = (page - 1) * page_size
+        # A cursor replaces the offset; one extra asset tells whether another
+        # page follows
+        skip = 0 if cursor else (page - 1) * page_size
 
         # Build filters
         filters: dict[str, Any] = {"is_active": is_active}
@@ -52,103 +66,47 @@ async def get_assets(
         if currency:
             filters["currency"] = currency.upper()
 
-        # Get assets
-        if query:
-            # Use search functionality
-            assets = asset_service.search(
-                db,
+        # Search terms, filters, the page and its total in one statement
+        try:
+            rows, total = await db.run_sync(
+                asset_service.get_page,
+                skip=skip,
+                limit=page_size + 1,
+                filters=filters,
                 search_term=query,
                 search_fields=["ticker", "name"],
-                skip=skip,
-                limit=page_size,
+                cursor=cursor,
+                count=count,
             )
-            # Apply additional filters manually for search results
-            if filters:
-                assets = [
-                    a
-                    for a in assets
-                    if all(
-                        getattr(a, field) == value
-                        for field, value in filters.items()
-                        if hasattr(a, field)
-                    )
-                ]
-            total = len(assets)
-        else:
-            assets = asset_service.get_multi(
-                db, skip=skip, limit=page_size, filters=filters
-            )
-            total = asset_service.count(db, filters=filters)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
+        rows, next_cursor = split_page(rows, page_size, lambda row: (row.id,))
 
-        # Convert to response format
-        asset_responses = [
-            AssetResponse(
-                id=asset.id,
-                ticker=asset.ticker,
-                name=asset.name,
-                description=asset.description,
-                asset_type=asset.asset_type,
-                category=asset.category,
-                sector=asset.sector,
-                industry=asset.industry,
-                exchange=asset.exchange,
-                currency=asset.currency,
-                country=asset.country,
-                current_price=(
-                    Decimal(str(asset.current_price))
-                    if asset.current_price is not None
-                    else None
-                ),
-                previous_close=(
-                    Decimal(str(asset.previous_close))
-                    if asset.previous_close is not None
-                    else None
-                ),
-                day_change=(
-                    Decimal(str(asset.day_change))
-                    if asset.day_change is not None
-                    else None
-                ),
-                day_change_percent=(
-                    Decimal(str(asset.day_change_percent))
-                    if asset.day_change_percent is not None
-                    else None
-                ),
-                market_cap=(
-                    Decimal(str(asset.market_cap))
-                    if asset.market_cap is not None
-                    else None
-                ),
-                pe_ratio=(
-                    Decimal(str(asset.pe_ratio)) if asset.pe_ratio is not None else None
-                ),
-                dividend_yield=(
-                    Decimal(str(asset.dividend_yield))
-                    if asset.dividend_yield is not None
-                    else None
-                ),
-                is_active=asset.is_active,
-                data_source=asset.data_source,
-                created_at=asset.created_at,
-                updated_at=asset.updated_at,
-            )
-            for asset in assets
-        ]
+        # Rows are plain columns, validated straight into the response model
+        asset_responses = [AssetResponse.model_validate(row) for row in rows]
 
         return PaginatedResponse.create(
-            data=asset_responses, total=total, page=page, page_size=page_size
+            data=asset_responses,
+            total=total,
+            page=page,
+            page_size=page_size,
+            next_cursor=next_cursor,
+            cursor=cursor,
+            total_estimated=count == "estimated",
         )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) from e
 
 
 @router.get("/{asset_id}", response_model=BaseResponse[AssetResponse])
 async def get_asset(
-    asset_id: int, db: Session = Depends(get_db)
+    asset_id: int, db: AsyncSession = Depends(get_async_db)
 ) -> BaseResponse[AssetResponse]:
     """Get a specific asset by ID."""
     try:
-        asset = asset_service.get(db, asset_id)
+        asset = await db.run_sync(asset_service.get, asset_id)
         if not asset:
             raise HTTPException(status_code=404, detail="Asset not found")
 
@@ -210,11 +168,11 @@ async def get_asset(
 
 @router.get("/ticker/{ticker}", response_model=BaseResponse[AssetResponse])
 async def get_asset_by_ticker(
-    ticker: str, db: Session = Depends(get_db)
+    ticker: str, db: AsyncSession = Depends(get_async_db)
 ) -> BaseResponse[AssetResponse]:
     """Get a specific asset by ticker symbol."""
     try:
-        asset = asset_service.get_by_field(db, "ticker", ticker.upper())
+        asset = await db.run_sync(asset_service.get_by_field, "ticker", ticker.upper())
         if not asset:
             raise HTTPException(
                 status_code=404, detail=f"Asset with ticker '{ticker}' not found"
@@ -586,16 +544,33 @@ async def get_asset_price(
 
 
 @router.get("/search/tickers", response_model=BaseResponse[list[AssetSummary]])
-async def search_asset_tickers(
+def search_asset_tickers(
     query: str = Query(..., min_length=1, description="Search query"),
     limit: int = Query(10, ge=1, le=50, description="Maximum number of results"),
     db: Session = Depends(get_db),
 ) -> BaseResponse[list[AssetSummary]]:
-    """Search for assets by ticker or name (for autocomplete)."""
+    """Search for assets by ticker, name or ISIN (for autocomplete).
+
+    Matches are ranked: ticker prefixes first, then ISIN and name prefixes,
+    then fuzzy matches.
+    """
     try:
-        assets = asset_service.search(
-            db, search_term=query, search_fields=["ticker", "name"], skip=0, limit=limit
-        )
+        index = get_asset_search_index()
+        if index is not None and index.ensure_fresh(db):
+            asset_ids = index.search(query, limit)
+            found = {
+                asset.id: asset
+                for asset in asset_service.filter_by_ids(db, ids=asset_ids)
+            }
+            assets = [found[asset_id] for asset_id in asset_ids if asset_id in found]
+        else:
+            assets = asset_service.search(
+                db,
+                search_term=query,
+                search_fields=["ticker", "name"],
+                skip=0,
+                limit=limit,
+            )
 
         # Convert to summary format
         asset_summaries = [
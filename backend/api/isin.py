@@ -4,9 +4,10 @@ import logging
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import and_, desc, func
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from backend.database import get_db_session
+from backend.database import get_async_db, get_db_session
 from backend.models.isin import ISINTickerMapping
 from backend.schemas.isin import (
     ISINImportRequest,
@@ -26,7 +27,7 @@ from backend.schemas.isin import (
     ISINValidationResponse,
     TickerSuggestion,
 )
-from backend.services.isin_utils import ISINUtils, isin_service
+from backend.services.isin_utils import ISINUtils, isin_mapping_index, isin_service
 from backend.services.market_data import market_data_service
 
 logger = logging.getLogger(__name__)
@@ -62,7 +63,7 @@ async def validate_isin(
 
 @router.post("/resolve", response_model=ISINResolutionResponse)
 async def resolve_identifier(
-    request: ISINResolutionRequest, db: Session = Depends(get_db_session)
+    request: ISINResolutionRequest, db: AsyncSession = Depends(get_async_db)
 ) -> ISINResolutionResponse:
     """Resolve an identifier (ISIN or ticker) to get comprehensive asset information.
 
@@ -70,7 +71,7 @@ async def resolve_identifier(
     detecting the type and providing appropriate resolution.
     """
     try:
-        asset_info = isin_service.get_asset_info(db, request.identifier)
+        asset_info = await db.run_sync(isin_service.get_asset_info, request.identifier)
 
         response = ISINResolutionResponse(
             original_identifier=asset_info["original_identifier"],
@@ -101,7 +102,7 @@ async def resolve_identifier(
 
 @router.post("/lookup", response_model=ISINLookupResponse)
 async def lookup_isins(
-    request: ISINLookupRequest, db: Session = Depends(get_db_session)
+    request: ISINLookupRequest, db: AsyncSession = Depends(get_async_db)
 ) -> ISINLookupResponse:
     """Bulk lookup of ISIN codes to find their ticker mappings.
 
@@ -118,8 +119,10 @@ async def lookup_isins(
         for isin in request.isins:
             try:
                 # Get mappings for this ISIN
-                mappings = isin_service.mapping_service.get_mappings_from_db(
-                    db=db, isin=isin, active_only=not request.include_inactive
+                mappings = await db.run_sync(
+                    isin_service.mapping_service.get_mappings_from_db,
+                    isin=isin,
+                    active_only=not request.include_inactive,
                 )
 
                 if mappings:
@@ -252,10 +255,41 @@ async def suggest_ticker_formats(
         raise HTTPException(status_code=500, detail=f"Suggestion error: {e!s}")
 
 
+def _search_mappings(
+    db: Session, params: ISINMappingSearchParams, skip: int, limit: int
+) -> list[ISINTickerMapping]:
+    """Mappings matching the search filters, best confidence first."""
+    query = db.query(ISINTickerMapping)
+
+    # Apply filters
+    if params.isin:
+        query = query.filter(ISINTickerMapping.isin == params.isin.upper())
+    if params.ticker:
+        query = query.filter(ISINTickerMapping.ticker == params.ticker.upper())
+    if params.exchange_code:
+        query = query.filter(
+            ISINTickerMapping.exchange_code == params.exchange_code.upper()
+        )
+    if params.source:
+        query = query.filter(ISINTickerMapping.source == params.source)
+    if params.min_confidence is not None:
+        query = query.filter(ISINTickerMapping.confidence >= params.min_confidence)
+
+    query = query.filter(ISINTickerMapping.is_active == params.is_active)
+
+    # Order by confidence (highest first) and creation date (newest first)
+    query = query.order_by(
+        ISINTickerMapping.confidence.desc(), ISINTickerMapping.created_at.desc()
+    )
+
+    # Apply pagination
+    return query.offset(skip).limit(limit).all()
+
+
 @router.get("/mappings", response_model=list[ISINMappingResponse])
 async def get_mappings(
     params: ISINMappingSearchParams = Depends(),
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_async_db),
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(
         100, ge=1, le=1000, description="Maximum number of records to return"
@@ -267,31 +301,7 @@ async def get_mappings(
     and returns paginated results.
     """
     try:
-        query = db.query(ISINTickerMapping)
-
-        # Apply filters
-        if params.isin:
-            query = query.filter(ISINTickerMapping.isin == params.isin.upper())
-        if params.ticker:
-            query = query.filter(ISINTickerMapping.ticker == params.ticker.upper())
-        if params.exchange_code:
-            query = query.filter(
-                ISINTickerMapping.exchange_code == params.exchange_code.upper()
-            )
-        if params.source:
-            query = query.filter(ISINTickerMapping.source == params.source)
-        if params.min_confidence is not None:
-            query = query.filter(ISINTickerMapping.confidence >= params.min_confidence)
-
-        query = query.filter(ISINTickerMapping.is_active == params.is_active)
-
-        # Order by confidence (highest first) and creation date (newest first)
-        query = query.order_by(
-            ISINTickerMapping.confidence.desc(), ISINTickerMapping.created_at.desc()
-        )
-
-        # Apply pagination
-        mappings = query.offset(skip).limit(limit).all()
+        mappings = await db.run_sync(_search_mappings, params, skip, limit)
 
         return [
             ISINMappingResponse(
@@ -366,6 +376,7 @@ async def create_mapping(
         db.add(new_mapping)
         db.commit()
         db.refresh(new_mapping)
+        isin_mapping_index.invalidate([new_mapping.isin])
 
         logger.info(f"Created ISIN mapping: {mapping.isin} -> {mapping.ticker}")
 
@@ -433,6 +444,7 @@ async def update_mapping(
 
         db.commit()
         db.refresh(mapping)
+        isin_mapping_index.invalidate([mapping.isin])
 
         logger.info(
             f"Updated ISIN mapping {mapping_id}: {mapping.isin} -> {mapping.ticker}"
@@ -485,6 +497,7 @@ async def delete_mapping(
         # Soft delete by setting inactive
         mapping.is_active = False
         db.commit()
+        isin_mapping_index.invalidate([mapping.isin])
 
         logger.info(
             f"Deleted ISIN mapping {mapping_id}: {mapping.isin} -> {mapping.ticker}"
@@ -500,86 +513,89 @@ async def delete_mapping(
         raise HTTPException(status_code=500, detail=f"Deletion error: {e!s}")
 
 
+def _build_statistics(db: Session) -> ISINStatistics:
+    """Counts of ISIN mappings by country, exchange and source."""
+    # Basic counts
+    total_mappings = db.query(ISINTickerMapping).count()
+    active_mappings = (
+        db.query(ISINTickerMapping).filter(ISINTickerMapping.is_active).count()
+    )
+
+    unique_isins = db.query(func.count(func.distinct(ISINTickerMapping.isin))).scalar()
+    unique_tickers = db.query(
+        func.count(func.distinct(ISINTickerMapping.ticker))
+    ).scalar()
+
+    # Country statistics (from ISIN country codes)
+    country_stats = (
+        db.query(
+            func.substr(ISINTickerMapping.isin, 1, 2).label("country"),
+            func.count().label("count"),
+        )
+        .filter(ISINTickerMapping.is_active)
+        .group_by(func.substr(ISINTickerMapping.isin, 1, 2))
+        .order_by(desc("count"))
+        .limit(10)
+        .all()
+    )
+
+    # Exchange statistics
+    exchange_stats = (
+        db.query(ISINTickerMapping.exchange_code, func.count().label("count"))
+        .filter(
+            and_(
+                ISINTickerMapping.is_active,
+                ISINTickerMapping.exchange_code.isnot(None),
+            )
+        )
+        .group_by(ISINTickerMapping.exchange_code)
+        .order_by(desc("count"))
+        .limit(10)
+        .all()
+    )
+
+    # Data source statistics
+    source_stats = (
+        db.query(ISINTickerMapping.source, func.count().label("count"))
+        .filter(ISINTickerMapping.is_active)
+        .group_by(ISINTickerMapping.source)
+        .order_by(desc("count"))
+        .all()
+    )
+
+    # Get last update time
+    last_updated = db.query(func.max(ISINTickerMapping.last_updated)).scalar()
+
+    return ISINStatistics(
+        total_mappings=total_mappings,
+        active_mappings=active_mappings,
+        unique_isins=unique_isins,
+        unique_tickers=unique_tickers,
+        countries_covered=len(country_stats),
+        exchanges_covered=len(exchange_stats),
+        top_countries=[
+            {"country": stat.country, "count": stat.count} for stat in country_stats
+        ],
+        top_exchanges=[
+            {"exchange": stat.exchange_code, "count": stat.count}
+            for stat in exchange_stats
+        ],
+        data_sources=[
+            {"source": stat.source, "count": stat.count} for stat in source_stats
+        ],
+        last_updated=last_updated,
+    )
+
+
 @router.get("/statistics", response_model=ISINStatistics)
-async def get_statistics(db: Session = Depends(get_db_session)) -> ISINStatistics:
+async def get_statistics(db: AsyncSession = Depends(get_async_db)) -> ISINStatistics:
     """Get statistics about ISIN mappings in the system.
 
     This endpoint provides comprehensive statistics about the ISIN
     mappings database, including coverage and data source information.
     """
     try:
-        # Basic counts
-        total_mappings = db.query(ISINTickerMapping).count()
-        active_mappings = (
-            db.query(ISINTickerMapping).filter(ISINTickerMapping.is_active).count()
-        )
-
-        unique_isins = db.query(
-            func.count(func.distinct(ISINTickerMapping.isin))
-        ).scalar()
-        unique_tickers = db.query(
-            func.count(func.distinct(ISINTickerMapping.ticker))
-        ).scalar()
-
-        # Country statistics (from ISIN country codes)
-        country_stats = (
-            db.query(
-                func.substr(ISINTickerMapping.isin, 1, 2).label("country"),
-                func.count().label("count"),
-            )
-            .filter(ISINTickerMapping.is_active)
-            .group_by(func.substr(ISINTickerMapping.isin, 1, 2))
-            .order_by(desc("count"))
-            .limit(10)
-            .all()
-        )
-
-        # Exchange statistics
-        exchange_stats = (
-            db.query(ISINTickerMapping.exchange_code, func.count().label("count"))
-            .filter(
-                and_(
-                    ISINTickerMapping.is_active,
-                    ISINTickerMapping.exchange_code.isnot(None),
-                )
-            )
-            .group_by(ISINTickerMapping.exchange_code)
-            .order_by(desc("count"))
-            .limit(10)
-            .all()
-        )
-
-        # Data source statistics
-        source_stats = (
-            db.query(ISINTickerMapping.source, func.count().label("count"))
-            .filter(ISINTickerMapping.is_active)
-            .group_by(ISINTickerMapping.source)
-            .order_by(desc("count"))
-            .all()
-        )
-
-        # Get last update time
-        last_updated = db.query(func.max(ISINTickerMapping.last_updated)).scalar()
-
-        return ISINStatistics(
-            total_mappings=total_mappings,
-            active_mappings=active_mappings,
-            unique_isins=unique_isins,
-            unique_tickers=unique_tickers,
-            countries_covered=len(country_stats),
-            exchanges_covered=len(exchange_stats),
-            top_countries=[
-                {"country": stat.country, "count": stat.count} for stat in country_stats
-            ],
-            top_exchanges=[
-                {"exchange": stat.exchange_code, "count": stat.count}
-                for stat in exchange_stats
-            ],
-            data_sources=[
-                {"source": stat.source, "count": stat.count} for stat in source_stats
-            ],
-            last_updated=last_updated,
-        )
+        return await db.run_sync(_build_statistics)
 
     except Exception as e:
         logger.error(f"Error generating ISIN statistics: {e}")
@@ -604,11 +620,15 @@ async def import_mappings(
         total_skipped = 0
         total_errors = 0
 
-        for mapping_data in request.mappings:
+        # Validate every ISIN in the request in one vectorized pass
+        validation = ISINUtils.validate_isins(
+            [mapping_data.isin for mapping_data in request.mappings]
+        )
+
+        for index, mapping_data in enumerate(request.mappings):
             try:
-                # Validate ISIN
-                is_valid, error = ISINUtils.validate_isin(mapping_data.isin)
-                if not is_valid:
+                if not validation.is_valid[index]:
+                    error = validation.error(index)
                     results.append(
                         ISINImportResult(
                             isin=mapping_data.isin,
@@ -699,6 +719,9 @@ async def import_mappings(
 
         if not request.dry_run:
             db.commit()
+            isin_mapping_index.invalidate(
+                [r.isin for r in results if r.status in ("created", "updated")]
+            )
             logger.info(
                 f"Imported ISIN mappings: {total_created} created, {total_updated} updated"
             )
@@ -4,20 +4,37 @@ from datetime import date
 from typing import Annotated, Any
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from backend.auth.dependencies import get_current_active_user
-from backend.database import get_db
+from backend.database import get_async_db, get_db
 from backend.models.user import User
 from backend.schemas.base import BaseResponse
 from backend.schemas.portfolio import (
     AllocationBreakdown,
     DiversificationMetrics,
+    MonteCarloRiskAnalysis,
     PerformanceMetrics,
+    PortfolioRiskAnalysis,
     PortfolioSummary,
 )
+from backend.services.monte_carlo import (
+    DEFAULT_CONFIDENCE_LEVELS,
+    DEFAULT_HORIZONS,
+    DEFAULT_PATHS,
+    MAX_REQUEST_CONFIDENCE_LEVELS,
+    MAX_REQUEST_HORIZONS,
+    METHODS,
+    SimulationConfig,
+)
 from backend.services.performance_benchmark import get_performance_benchmark_service
 from backend.services.portfolio import PortfolioService
+from backend.services.risk import (
+    DEFAULT_LOOKBACK_DAYS,
+    default_simulation_config,
+    risk_service,
+)
 
 router = APIRouter()
 portfolio_service = PortfolioService()
@@ -27,7 +44,7 @@ portfolio_service = PortfolioService()
 async def get_portfolio_summary(
     user_id: int,
     current_user: Annotated[User, Depends(get_current_active_user)],
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> BaseResponse[PortfolioSummary]:
     """Get comprehensive portfolio summary for a user."""
     try:
@@ -37,7 +54,7 @@ async def get_portfolio_summary(
                 status_code=403, detail="Access denied to other user's data"
             )
 
-        summary = portfolio_service.get_portfolio_summary(db, user_id)
+        summary = await portfolio_service.get_portfolio_summary_async(db, user_id)
         return BaseResponse(
             success=True,
             message="Portfolio summary retrieved successfully",
@@ -81,11 +98,11 @@ async def test_auth(
 
 @router.get("/allocation/{user_id}", response_model=BaseResponse[AllocationBreakdown])
 async def get_allocation_breakdown(
-    user_id: int, db: Session = Depends(get_db)
+    user_id: int, db: AsyncSession = Depends(get_async_db)
 ) -> BaseResponse[AllocationBreakdown]:
     """Get asset allocation breakdown for a portfolio."""
     try:
-        allocation = portfolio_service.get_allocation_breakdown(db, user_id)
+        allocation = await portfolio_service.get_allocation_breakdown_async(db, user_id)
         return BaseResponse(
             success=True,
             message="Allocation breakdown retrieved successfully",
@@ -107,12 +124,15 @@ async def get_performance_metrics(
     end_date: date | None = Query(
         None, description="End date for performance calculation"
     ),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> BaseResponse[PerformanceMetrics]:
     """Calculate portfolio performance metrics."""
     try:
-        performance = portfolio_service.calculate_performance_metrics(
-            db, user_id, start_date, end_date
+        performance = await db.run_sync(
+            portfolio_service.calculate_performance_metrics,
+            user_id,
+            start_date,
+            end_date,
         )
         return BaseResponse(
             success=True,
@@ -129,11 +149,13 @@ async def get_performance_metrics(
     "/diversification/{user_id}", response_model=BaseResponse[DiversificationMetrics]
 )
 async def get_diversification_metrics(
-    user_id: int, db: Session = Depends(get_db)
+    user_id: int, db: AsyncSession = Depends(get_async_db)
 ) -> BaseResponse[DiversificationMetrics]:
     """Get portfolio diversification metrics."""
     try:
-        diversification = portfolio_service.get_diversification_metrics(db, user_id)
+        diversification = await portfolio_service.get_diversification_metrics_async(
+            db, user_id
+        )
         return BaseResponse(
             success=True,
             message="Diversification metrics calculated successfully",
@@ -145,6 +167,111 @@ async def get_diversification_metrics(
         raise HTTPException(status_code=500, detail=str(e)) from e
 
 
+@router.get("/risk/{user_id}", response_model=BaseResponse[PortfolioRiskAnalysis])
+def get_risk_analysis(
+    user_id: int,
+    current_user: Annotated[User, Depends(get_current_active_user)],
+    as_of: date | None = Query(None, description="Last price date to consider"),
+    lookback_days: int = Query(
+        DEFAULT_LOOKBACK_DAYS,
+        ge=30,
+        le=3650,
+        description="Calendar days of price history behind the covariance matrix",
+    ),
+    db: Session = Depends(get_db),
+) -> BaseResponse[PortfolioRiskAnalysis]:
+    """Get covariance-based risk metrics and the correlation matrix.
+
+    The covariance matrix is computed in Python, so like the Monte Carlo
+    endpoint this is a sync endpoint that FastAPI runs in its threadpool.
+    """
+    try:
+        if user_id != current_user.id:
+            raise HTTPException(
+                status_code=403, detail="Access denied to other user's data"
+            )
+
+        analysis = risk_service.get_risk_analysis(db, user_id, as_of, lookback_days)
+        return BaseResponse(
+            success=True,
+            message="Risk analysis calculated successfully",
+            data=analysis,
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+
+@router.get("/risk/{user_id}/var", response_model=BaseResponse[MonteCarloRiskAnalysis])
+def get_simulated_risk(
+    user_id: int,
+    current_user: Annotated[User, Depends(get_current_active_user)],
+    as_of: date | None = Query(None, description="Last price date to consider"),
+    lookback_days: int = Query(
+        DEFAULT_LOOKBACK_DAYS,
+        ge=30,
+        le=3650,
+        description="Calendar days of price history to simulate from",
+    ),
+    method: str = Query(
+        "historical",
+        pattern=f"^({'|'.join(METHODS)})$",
+        description="historical bootstrap or parametric normal simulation",
+    ),
+    horizons: list[int] = Query(
+        list(DEFAULT_HORIZONS),
+        max_length=MAX_REQUEST_HORIZONS,
+        description="Horizons in trading days",
+    ),
+    confidence_levels: list[float] = Query(
+        list(DEFAULT_CONFIDENCE_LEVELS),
+        max_length=MAX_REQUEST_CONFIDENCE_LEVELS,
+        description="Confidence levels, e.g. 0.95",
+    ),
+    paths: int | None = Query(
+        None, ge=100, le=DEFAULT_PATHS, description="Defaults to the configured count"
+    ),
+    seed: int | None = Query(None, ge=0, description="Defaults to the configured seed"),
+    db: Session = Depends(get_db),
+) -> BaseResponse[MonteCarloRiskAnalysis]:
+    """Get Monte Carlo value at risk and conditional value at risk.
+
+    Results of the nightly run are served from cache. Other parameters are
+    simulated on demand, so this is a sync endpoint that FastAPI runs in its
+    threadpool rather than on the event loop.
+    """
+    if user_id != current_user.id:
+        raise HTTPException(
+            status_code=403, detail="Access denied to other user's data"
+        )
+
+    defaults = default_simulation_config()
+    try:
+        config = SimulationConfig(
+            horizons=tuple(horizons),
+            confidence_levels=tuple(confidence_levels),
+            paths=paths or defaults.paths,
+            method=method,
+            seed=defaults.seed if seed is None else seed,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    try:
+        analysis = risk_service.get_simulated_risk(
+            db, user_id, as_of, lookback_days, config
+        )
+        return BaseResponse(
+            success=True,
+            message="Value at risk simulated successfully",
+            data=analysis,
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+
 @router.post("/snapshot/{user_id}")
 async def create_portfolio_snapshot(
     user_id: int, snapshot_date: date | None = None, db: Session = Depends(get_db)
@@ -195,11 +322,13 @@ async def get_performance_comparison(
 
 @router.get("/weights/{user_id}")
 async def get_position_weights(
-    user_id: int, db: Session = Depends(get_db)
+    user_id: int, db: AsyncSession = Depends(get_async_db)
 ) -> BaseResponse[Any]:
     """Get position weights in portfolio."""
     try:
-        weights = portfolio_service.calculate_position_weights(db, user_id)
+        weights = await db.run_sync(
+            portfolio_service.calculate_position_weights, user_id
+        )
         return BaseResponse(
             success=True,
             message="Position weights calculated successfully",
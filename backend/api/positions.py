@@ -3,9 +3,11 @@
 from typing import Annotated, Any
 
 from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from backend.auth.dependencies import get_current_active_user
+from backend.database import get_async_db
 from backend.exceptions import ResourceNotFoundError as NotFoundError
 from backend.exceptions import ValidationError
 from backend.models import get_db
@@ -19,6 +21,7 @@ from backend.schemas.position import (
     PositionSummary,
     PositionUpdate,
 )
+from backend.services.pagination import COUNT_MODES, split_page
 from backend.services.position import PositionService
 
 router = APIRouter()
@@ -34,7 +37,15 @@ async def get_positions(
     is_active: bool = Query(True, description="Filter by active status"),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
-    db: Session = Depends(get_db),
+    cursor: str | None = Query(
+        None, description="next_cursor of the previous page; replaces page"
+    ),
+    count: str = Query(
+        "exact",
+        pattern=f"^({'|'.join(COUNT_MODES)})$",
+        description="How to compute the total: exact, estimated or none",
+    ),
+    db: AsyncSession = Depends(get_async_db),
 ) -> PaginatedResponse[PositionResponse]:
     """Get positions for the authenticated user with optional filters and pagination."""
     # Create filters object
@@ -48,21 +59,42 @@ async def get_positions(
         max_value=None,
     )
 
-    # Calculate pagination
-    skip = (page - 1) * page_size
+    # Calculate pagination; a cursor replaces the offset
+    skip = 0 if cursor else (page - 1) * page_size
 
-    # Get positions
-    positions = position_service.get_user_positions(
-        db, current_user.id, filters, skip, page_size
+    # Get positions, plus one to tell whether another page follows
+    try:
+        positions = await db.run_sync(
+            position_service.get_user_positions,
+            current_user.id,
+            filters,
+            skip,
+            page_size + 1,
+            cursor,
+        )
+    except ValueError as e:
+        raise ValidationError(str(e), field="cursor") from e
+    positions, next_cursor = split_page(
+        positions, page_size, lambda position: (position.id,)
     )
 
     # Get total count for pagination
-    total = position_service.count(
-        db, filters={"user_id": current_user.id, "is_active": is_active}
-    )
+    total = None
+    if count != "none":
+        total = await db.run_sync(
+            position_service.count,
+            filters={"user_id": current_user.id, "is_active": is_active},
+            estimate=count == "estimated",
+        )
 
     return PaginatedResponse.create(
-        data=positions, total=total, page=page, page_size=page_size
+        data=positions,
+        total=total,
+        page=page,
+        page_size=page_size,
+        next_cursor=next_cursor,
+        cursor=cursor,
+        total_estimated=count == "estimated",
     )
 
 
@@ -289,11 +321,13 @@ async def close_position(
 async def get_position_summary(
     current_user: Annotated[User, Depends(get_current_active_user)],
     account_name: str | None = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> BaseResponse[PositionSummary]:
     """Get position summary for the authenticated user."""
-    summary = position_service.get_position_summary(
-        db, current_user.id, account_name=account_name
+    summary = await db.run_sync(
+        position_service.get_position_summary,
+        current_user.id,
+        account_name=account_name,
     )
 
     return BaseResponse(
@@ -13,11 +13,13 @@ from backend.schemas.transaction import (
     DividendTransactionRequest,
     SellTransactionRequest,
     TransactionFilters,
+    TransactionHistorySummary,
     TransactionPerformanceMetrics,
     TransactionResponse,
     TransactionUpdate,
 )
-from backend.services.transaction import TransactionService
+from backend.services.pagination import COUNT_MODES, split_page
+from backend.services.transaction import SUMMARY_PERIODS, TransactionService
 
 router = APIRouter()
 transaction_service = TransactionService()
@@ -36,6 +38,14 @@ async def get_transactions(
     end_date: date | None = Query(None, description="Filter to date"),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(50, ge=1, le=100, description="Items per page"),
+    cursor: str | None = Query(
+        None, description="next_cursor of the previous page; replaces page"
+    ),
+    count: str = Query(
+        "exact",
+        pattern=f"^({'|'.join(COUNT_MODES)})$",
+        description="How to compute the total: exact, estimated or none",
+    ),
     db: Session = Depends(get_db),
 ) -> PaginatedResponse[TransactionResponse]:
     """Get transactions for a user with optional filters and pagination."""
@@ -53,20 +63,36 @@ async def get_transactions(
             max_amount=None,
         )
 
-        # Calculate pagination
-        skip = (page - 1) * page_size
+        # Calculate pagination; a cursor replaces the offset
+        skip = 0 if cursor else (page - 1) * page_size
 
-        # Get transactions
-        transactions = transaction_service.get_user_transactions(
-            db, user_id, filters, skip, page_size
+        # Get transactions, plus one to tell whether another page follows
+        transactions, next_cursor = split_page(
+            transaction_service.get_user_transactions(
+                db, user_id, filters, skip, page_size + 1, cursor
+            ),
+            page_size,
+            lambda transaction: (transaction.transaction_date, transaction.id),
         )
 
         # Get total count for pagination
-        total = transaction_service.count(db, filters={"user_id": user_id})
+        total = None
+        if count != "none":
+            total = transaction_service.count(
+                db, filters={"user_id": user_id}, estimate=count == "estimated"
+            )
 
         return PaginatedResponse.create(
-            data=transactions, total=total, page=page, page_size=page_size
+            data=transactions,
+            total=total,
+            page=page,
+            page_size=page_size,
+            next_cursor=next_cursor,
+            cursor=cursor,
+            total_estimated=count == "estimated",
         )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
     except HTTPException:
         raise
     except Exception as e:
@@ -266,6 +292,39 @@ async def get_transaction_performance(
         raise HTTPException(status_code=500, detail=str(e)) from e
 
 
+@router.get(
+    "/summary/{user_id}", response_model=BaseResponse[TransactionHistorySummary]
+)
+async def get_transaction_summary(
+    user_id: int,
+    start_date: date = Query(..., description="First day of the range"),
+    end_date: date | None = Query(None, description="Last day, defaults to today"),
+    period: str = Query(
+        "month",
+        pattern=f"^({'|'.join(SUMMARY_PERIODS)})$",
+        description="Group by week or month",
+    ),
+    db: Session = Depends(get_db),
+) -> BaseResponse[TransactionHistorySummary]:
+    """Get per-period transaction counts, amounts and fees over a date range."""
+    try:
+        summary = transaction_service.get_transaction_summary(
+            db, user_id, start_date, end_date or date.today(), period
+        )
+
+        return BaseResponse(
+            success=True,
+            message="Transaction summary retrieved successfully",
+            data=summary,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+
 @router.get(
     "/summary/{user_id}/{year}/{month}", response_model=BaseResponse[dict[str, Any]]
 )
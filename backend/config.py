@@ -36,6 +36,14 @@ class Settings(BaseSettings):
         "postgresql://localhost:5432/financial_dashboard"  # Set DB credentials via DATABASE_URL env var
     )
     database_echo: bool = False
+    # Connection pool profile ("api", "worker" or "beat"), the connection budget
+    # shared by the process's sync and async engines; the DATABASE_POOL_*
+    # values below override individual fields of the profile when set
+    process_role: str = "api"
+    database_pool_size: int | None = None
+    database_max_overflow: int | None = None
+    database_pool_timeout: float | None = None
+    database_pool_recycle: int | None = None
 
     # Redis
     redis_url: str = "redis://localhost:6379/0"
@@ -103,10 +111,49 @@ class Settings(BaseSettings):
     deutsche_borse_rate_limit_delay: float = 2.0
     boerse_frankfurt_rate_limit_delay: float = 1.5
 
+    # Concurrent quote fetching (worker threads shared across providers)
+    market_data_max_workers: int = 8
+    # Bulk quote downloads (multi-symbol requests before per-ticker fallback)
+    market_data_bulk_enabled: bool = True
+    yfinance_bulk_chunk_size: int = 100
+
     # Cache TTL (Time To Live in seconds)
     market_data_cache_ttl: int = 300
     portfolio_cache_ttl: int = 600
     isin_mapping_cache_ttl: int = 86400
+    # In-process L1 size cap and shared Redis L2 for cached quotes
+    quote_cache_max_size: int = 10000
+    cache_redis_enabled: bool = True
+    # Preloaded ISIN mapping index (incremental refresh interval in seconds)
+    isin_mapping_index_enabled: bool = True
+    isin_mapping_refresh_interval: int = 60
+    # Per-user portfolio summary/allocation/diversification cache
+    portfolio_cache_enabled: bool = True
+    portfolio_cache_max_size: int = 1000
+    # Columnar price history files for analytics, refreshed after price updates
+    price_store_enabled: bool = True
+    price_store_path: str = "data/price_store"
+    # Benchmark metrics shared by every user's benchmark analysis
+    benchmark_cache_ttl: int = 3600
+    benchmark_cache_max_size: int = 500
+    # Covariance matrices shared by portfolios holding the same assets
+    risk_matrix_cache_ttl: int = 3600
+    risk_matrix_cache_max_size: int = 1000
+    # Monte Carlo VaR; 0 workers uses every CPU for the nightly run
+    monte_carlo_paths: int = 10000
+    monte_carlo_seed: int = 0
+    monte_carlo_workers: int = 0
+    # Two days, so the nightly run is still served if the next one is late
+    monte_carlo_cache_ttl: int = 172800
+    monte_carlo_cache_max_size: int = 10000
+    # Tax-lot ledgers, extended in place as new transactions arrive
+    tax_lot_cache_ttl: int = 3600
+    tax_lot_cache_max_size: int = 1000
+    # Asset autocomplete index, checked for other processes' writes every
+    # refresh interval and fully reloaded every reload interval
+    asset_search_index_enabled: bool = True
+    asset_search_refresh_interval: int = 60
+    asset_search_reload_interval: int = 3600
 
     # ISIN Service Configuration
     isin_batch_size: int = 50
@@ -24,6 +24,7 @@ MIN_API_LIMIT = 1
 CONCENTRATION_WARNING_THRESHOLD = settings.concentration_warning_threshold
 CONCENTRATION_CRITICAL_THRESHOLD = settings.concentration_critical_threshold
 MIN_DIVERSIFICATION_ASSETS = settings.min_diversification_assets
+TOP_POSITIONS_COUNT = 5  # Largest positions listed in portfolio summaries
 
 # Performance Calculation
 ANNUALIZATION_FACTOR = 252  # Trading days in a year
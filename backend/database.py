@@ -1,12 +1,15 @@
 """Database connection and session management."""
 
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 from contextlib import contextmanager
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import URL, Connection, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
 
 from backend.config import get_settings
+from backend.db_pool import get_pool_options, instrument_engine
 
 settings = get_settings()
 
@@ -20,11 +23,57 @@ engine = create_engine(
     echo=settings.database_echo,
     pool_pre_ping=True,
     connect_args=connect_args,
+    **get_pool_options(settings, settings.database_url),
 )
+instrument_engine("sync", engine)
+
+if engine.dialect.name == "sqlite":
+    # With isolation_level=None pysqlite never opens transactions itself, so
+    # emit BEGIN for each SQLAlchemy transaction to keep rollback working
+    @event.listens_for(engine, "begin")
+    def _begin_sqlite_transaction(conn: Connection) -> None:
+        conn.exec_driver_sql("BEGIN")
+
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async drivers for each supported database backend
+ASYNC_DRIVERS = {
+    "postgresql": "asyncpg",
+    "sqlite": "aiosqlite",
+}
+
+
+def get_async_database_url(database_url: str) -> URL:
+    """Rewrite a database URL to use the backend's async driver.
+
+    ``postgresql://`` and ``postgresql+psycopg2://`` become
+    ``postgresql+asyncpg://``; ``sqlite://`` becomes ``sqlite+aiosqlite://``.
+    """
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    driver = ASYNC_DRIVERS.get(backend)
+    if driver is None:
+        raise ValueError(f"No async driver configured for database '{backend}'")
+    return url.set(drivername=f"{backend}+{driver}")
+
+
+# Async engine on the same database, so I/O-bound endpoints do not block the
+# event loop while waiting on queries
+async_database_url = get_async_database_url(settings.database_url)
+async_engine = create_async_engine(
+    async_database_url,
+    echo=settings.database_echo,
+    pool_pre_ping=True,
+    **get_pool_options(settings, async_database_url, is_async=True),
+)
+instrument_engine("async", async_engine.sync_engine)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+
 
 def get_db() -> Generator[Session, None, None]:
     """Get database session for dependency injection."""
@@ -43,3 +92,9 @@ def get_db_session() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Get async database session for dependency injection."""
+    async with AsyncSessionLocal() as db:
+        yield db
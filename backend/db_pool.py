@@ -0,0 +1,254 @@
+"""Connection pool profiles and pool-level metrics.
+
+API workers, Celery workers and Celery beat have very different connection
+needs, so each process role gets its own pool profile. A profile is the
+budget for the whole process and is split between its sync and async
+engines, so a process never opens more than ``pool_size + max_overflow``
+connections. Individual values can be overridden through
+``DATABASE_POOL_*`` settings. Every engine created by
+``backend.database`` is instrumented, and ``get_pool_stats`` reports checked
+out connections, overflow and checkout wait times for the health endpoint.
+"""
+
+from dataclasses import dataclass, replace
+import threading
+import time
+from typing import Any
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+from backend.config import Settings
+
+
+@dataclass(frozen=True)
+class PoolProfile:
+    """Pool sizing for one process role.
+
+    ``async_share`` is the part of ``pool_size`` and ``max_overflow`` given
+    to the async engine; the sync engine gets the rest.
+    """
+
+    pool_size: int
+    max_overflow: int
+    pool_timeout: float
+    pool_recycle: int
+    async_share: float = 0.0
+
+
+POOL_PROFILES: dict[str, PoolProfile] = {
+    # Serves concurrent requests; keep a warm pool and allow bursts, split
+    # evenly between threadpool endpoints and async endpoints
+    "api": PoolProfile(
+        pool_size=10,
+        max_overflow=20,
+        pool_timeout=10,
+        pool_recycle=1800,
+        async_share=0.5,
+    ),
+    # Celery tasks run one at a time per process, plus ISIN sync batches
+    "worker": PoolProfile(
+        pool_size=5, max_overflow=5, pool_timeout=30, pool_recycle=1800
+    ),
+    # Beat only schedules tasks and rarely touches the database
+    "beat": PoolProfile(
+        pool_size=1, max_overflow=1, pool_timeout=30, pool_recycle=1800
+    ),
+}
+
+
+def get_pool_profile(settings: Settings) -> PoolProfile:
+    """Resolve the pool profile for this process, applying setting overrides."""
+    profile = POOL_PROFILES.get(settings.process_role)
+    if profile is None:
+        raise ValueError(
+            f"Unknown process role '{settings.process_role}', "
+            f"expected one of {sorted(POOL_PROFILES)}"
+        )
+    return PoolProfile(
+        pool_size=(
+            settings.database_pool_size
+            if settings.database_pool_size is not None
+            else profile.pool_size
+        ),
+        max_overflow=(
+            settings.database_max_overflow
+            if settings.database_max_overflow is not None
+            else profile.max_overflow
+        ),
+        pool_timeout=(
+            settings.database_pool_timeout
+            if settings.database_pool_timeout is not None
+            else profile.pool_timeout
+        ),
+        pool_recycle=(
+            settings.database_pool_recycle
+            if settings.database_pool_recycle is not None
+            else profile.pool_recycle
+        ),
+        async_share=profile.async_share,
+    )
+
+
+def get_engine_profile(profile: PoolProfile, is_async: bool) -> PoolProfile:
+    """The part of a process's pool budget that one of its engines gets.
+
+    An engine always keeps at least one pooled connection, since a
+    ``pool_size`` of 0 would lift the limit instead; processes that never
+    use their async engine open none.
+    """
+    async_size = round(profile.pool_size * profile.async_share)
+    async_overflow = round(profile.max_overflow * profile.async_share)
+    if is_async:
+        pool_size, max_overflow = async_size, async_overflow
+    else:
+        pool_size = profile.pool_size - async_size
+        max_overflow = profile.max_overflow - async_overflow
+    return replace(profile, pool_size=max(pool_size, 1), max_overflow=max_overflow)
+
+
+class PoolMetrics:
+    """Checkout counters and wait times for one engine's pool."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkins = 0
+        self.timeouts = 0
+        self.wait_count = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record_checkout(self) -> None:
+        """Count a connection handed out by the pool."""
+        with self._lock:
+            self.checkouts += 1
+
+    def record_checkin(self) -> None:
+        """Count a connection returned to the pool."""
+        with self._lock:
+            self.checkins += 1
+
+    def record_wait(self, seconds: float) -> None:
+        """Record how long a checkout waited for a connection."""
+        with self._lock:
+            self.wait_count += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    def record_timeout(self) -> None:
+        """Count a checkout that gave up after ``pool_timeout``."""
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self, pool: Pool) -> dict[str, Any]:
+        """Current pool state plus the counters collected so far."""
+        with self._lock:
+            stats: dict[str, Any] = {
+                "pool_class": type(pool).__name__,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "timeouts": self.timeouts,
+                "wait_ms": {
+                    "count": self.wait_count,
+                    "avg": (
+                        round(self.wait_total / self.wait_count * 1000, 3)
+                        if self.wait_count
+                        else 0.0
+                    ),
+                    "max": round(self.wait_max * 1000, 3),
+                },
+            }
+        if isinstance(pool, QueuePool):
+            stats.update(
+                size=pool.size(),
+                checked_out=pool.checkedout(),
+                checked_in=pool.checkedin(),
+                overflow=max(pool.overflow(), 0),
+                max_overflow=pool._max_overflow,
+            )
+        return stats
+
+
+class _TimedCheckoutMixin:
+    """Times how long each checkout waits for a connection."""
+
+    metrics: PoolMetrics | None = None
+
+    def _do_get(self) -> Any:
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()  # type: ignore[misc]
+        except exc.TimeoutError:
+            if self.metrics is not None:
+                self.metrics.record_timeout()
+            raise
+        if self.metrics is not None:
+            self.metrics.record_wait(time.perf_counter() - start)
+        return connection
+
+    def recreate(self) -> Any:
+        # engine.dispose() swaps in a fresh pool; keep reporting to the same
+        # metrics
+        pool = super().recreate()  # type: ignore[misc]
+        pool.metrics = self.metrics
+        return pool
+
+
+class TimedQueuePool(_TimedCheckoutMixin, QueuePool):
+    """QueuePool that records checkout wait times."""
+
+
+class TimedAsyncAdaptedQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records checkout wait times."""
+
+
+def get_pool_options(
+    settings: Settings, database_url: str | URL, is_async: bool = False
+) -> dict[str, Any]:
+    """Engine keyword arguments for an engine's share of the pool profile.
+
+    SQLite keeps SQLAlchemy's default pool, since in-memory databases must
+    not be spread across several connections.
+    """
+    if make_url(database_url).get_backend_name() == "sqlite":
+        return {}
+    profile = get_engine_profile(get_pool_profile(settings), is_async)
+    return {
+        "poolclass": TimedAsyncAdaptedQueuePool if is_async else TimedQueuePool,
+        "pool_size": profile.pool_size,
+        "max_overflow": profile.max_overflow,
+        "pool_timeout": profile.pool_timeout,
+        "pool_recycle": profile.pool_recycle,
+    }
+
+
+# Instrumented engines by name, e.g. "sync" and "async"
+_instrumented: dict[str, tuple[Engine, PoolMetrics]] = {}
+
+
+def instrument_engine(name: str, engine: Engine) -> PoolMetrics:
+    """Collect pool metrics for an engine and report them under ``name``."""
+    metrics = PoolMetrics()
+    if isinstance(engine.pool, _TimedCheckoutMixin):
+        engine.pool.metrics = metrics
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(*_args: Any) -> None:
+        metrics.record_checkout()
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(*_args: Any) -> None:
+        metrics.record_checkin()
+
+    _instrumented[name] = (engine, metrics)
+    return metrics
+
+
+def get_pool_stats() -> dict[str, dict[str, Any]]:
+    """Pool state and checkout metrics for every instrumented engine."""
+    return {
+        name: metrics.snapshot(engine.pool)
+        for name, (engine, metrics) in _instrumented.items()
+    }
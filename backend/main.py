@@ -2,6 +2,7 @@
 
 from contextlib import asynccontextmanager
 import logging
+from typing import Any
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
@@ -20,6 +21,7 @@ from backend.api import (
 )
 from backend.config import get_settings
 from backend.database import get_db_session
+from backend.db_pool import get_pool_stats
 from backend.exceptions import (
     FinancialDashboardException,
     financial_dashboard_exception_handler,
@@ -67,6 +69,41 @@ async def _check_services() -> dict[str, str]:
     return services
 
 
+def _cache_stats() -> dict[str, Any]:
+    """Hit/miss/eviction counters for this process's caches."""
+    from backend.services.isin_utils import isin_mapping_index
+    from backend.services.market_data import market_data_service
+    from backend.services.portfolio_cache import portfolio_cache
+
+    return {
+        "quotes": market_data_service.get_cache_stats(),
+        "isin_mappings": isin_mapping_index.get_stats(),
+        "portfolio": portfolio_cache.get_stats(),
+    }
+
+
+def _preload_isin_mappings() -> None:
+    """Load active ISIN mappings into memory so resolution skips the database."""
+    from backend.services.isin_utils import isin_mapping_index
+
+    try:
+        with get_db_session() as db:
+            isin_mapping_index.load(db)
+    except Exception as e:
+        logger.warning(f"ISIN mapping index not preloaded: {e}")
+
+
+def _preload_asset_search_index() -> None:
+    """Build the asset autocomplete index before the first search."""
+    from backend.services.asset_search import asset_search_index
+
+    try:
+        with get_db_session() as db:
+            asset_search_index.load(db)
+    except Exception as e:
+        logger.warning(f"Asset search index not preloaded: {e}")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager."""
@@ -74,6 +111,10 @@ async def lifespan(app: FastAPI):
     logger.info("Starting Financial Dashboard API...")
     logger.info(f"Environment: {settings.environment}")
     logger.info(f"Debug mode: {settings.debug}")
+    if settings.isin_mapping_index_enabled:
+        _preload_isin_mappings()
+    if settings.asset_search_index_enabled:
+        _preload_asset_search_index()
 
     yield
 
@@ -135,6 +176,10 @@ async def health_check():
             "version": settings.app_version,
             "environment": settings.environment,
             "config_errors": config_errors,
+            "database_pool": {
+                "process_role": settings.process_role,
+                "engines": get_pool_stats(),
+            },
         },
         status_code=status_code,
     )
@@ -149,6 +194,7 @@ async def api_status():
         "app_version": settings.app_version,
         "environment": settings.environment,
         "services": await _check_services(),
+        "caches": _cache_stats(),
     }
 
 
@@ -1,25 +1,13 @@
 """Base database model and database setup."""
 
-from collections.abc import Generator
 from datetime import datetime
 
-from sqlalchemy import DateTime, Integer, create_engine, func
-from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column, sessionmaker
+from sqlalchemy import DateTime, Integer, func
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
-from backend.config import get_settings
-
-settings = get_settings()
-
-# Create database engine
-engine = create_engine(
-    settings.database_url,
-    echo=settings.database_echo,
-    pool_pre_ping=True,
-    pool_recycle=300,
-)
-
-# Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Share the configured, instrumented pool rather than opening a second one, and
+# the session dependency, so auth and the endpoint use one session per request
+from backend.database import engine, get_db  # noqa: F401
 
 
 class Base(DeclarativeBase):
@@ -37,15 +25,6 @@ class Base(DeclarativeBase):
     )
 
 
-def get_db() -> Generator[Session, None, None]:  # Add return type
-    """Dependency to get database session."""
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 def init_db() -> None:
     """Initialize the database."""
     Base.metadata.create_all(bind=engine)  # type: ignore[attr-defined]
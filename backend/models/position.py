@@ -47,7 +47,7 @@ class Position(Base):
     # Tax information
     tax_lot_method: Mapped[str] = mapped_column(
         String(20), default="FIFO", nullable=False
-    )  # FIFO, LIFO, SpecificID
+    )  # FIFO, LIFO, AverageCost, SpecificID
 
     # Status
     is_active: Mapped[bool] = mapped_column(default=True, nullable=False)
@@ -7,7 +7,7 @@ from typing import TYPE_CHECKING, Any
 
 from sqlalchemy import Date
 from sqlalchemy import Enum as SQLEnum
-from sqlalchemy import ForeignKey, Numeric, String, Text
+from sqlalchemy import ForeignKey, Index, Numeric, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from backend.models.base import Base
@@ -112,6 +112,11 @@ class Transaction(Base):
         "Position", back_populates="transactions"
     )
 
+    # Keyset pagination walks a user's history by (transaction_date, id)
+    __table_args__ = (
+        Index("ix_transactions_user_date_id", "user_id", "transaction_date", "id"),
+    )
+
     def __repr__(self) -> str:
         return (
             f"<Transaction(id={self.id}, type={self.transaction_type}, "
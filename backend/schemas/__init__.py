@@ -28,6 +28,7 @@ from backend.schemas.base import (
 from backend.schemas.portfolio import (
     AllocationBreakdown,
     DiversificationMetrics,
+    MonteCarloRiskAnalysis,
     PerformanceMetrics,
     PortfolioAnalyticsResponse,
     PortfolioComparisonRequest,
@@ -39,6 +40,7 @@ from backend.schemas.portfolio import (
     PortfolioStressTestResults,
     PortfolioSummary,
     RebalancingRecommendation,
+    SimulatedLoss,
 )
 
 # Position schemas
@@ -64,9 +66,12 @@ from backend.schemas.transaction import (
     TransactionBase,
     TransactionCreate,
     TransactionFilters,
+    TransactionHistorySummary,
     TransactionPerformanceMetrics,
+    TransactionPeriodSummary,
     TransactionResponse,
     TransactionSummary,
+    TransactionTypeTotals,
     TransactionUpdate,
 )
 
@@ -92,6 +97,7 @@ __all__ = [
     "DividendTransactionRequest",
     "ErrorResponse",
     "HealthCheck",
+    "MonteCarloRiskAnalysis",
     "PaginatedResponse",
     "PaginationParams",
     "PerformanceMetrics",
@@ -117,14 +123,18 @@ __all__ = [
     "PositionUpdate",
     "RebalancingRecommendation",
     "SellTransactionRequest",
+    "SimulatedLoss",
     "StatusResponse",
     "TimestampMixin",
     # Transaction schemas
     "TransactionBase",
     "TransactionCreate",
     "TransactionFilters",
+    "TransactionHistorySummary",
     "TransactionPerformanceMetrics",
+    "TransactionPeriodSummary",
     "TransactionResponse",
     "TransactionSummary",
+    "TransactionTypeTotals",
     "TransactionUpdate",
 ]
@@ -57,23 +57,53 @@ class PaginationParams(BaseSchema):
 
 
 class PaginatedResponse(BaseSchema, Generic[DataT]):
-    """Paginated response model."""
+    """Paginated response model.
+
+    ``next_cursor`` fetches the following page in constant time, unlike
+    ``page``; ``total`` is None when the client asked not to count and may
+    be the database's estimate when ``total_estimated`` is set.
+    """
 
     success: bool = True
     data: list[DataT]
-    total: int
+    total: int | None
     page: int
     page_size: int
-    total_pages: int
+    total_pages: int | None
     has_next: bool
     has_previous: bool
+    next_cursor: str | None = None
+    total_estimated: bool = False
 
     @classmethod
     def create(
-        cls, data: list[DataT], total: int, page: int, page_size: int
+        cls,
+        data: list[DataT],
+        total: int | None,
+        page: int,
+        page_size: int,
+        next_cursor: str | None = None,
+        *,
+        cursor: str | None = None,
+        total_estimated: bool = False,
     ) -> "PaginatedResponse[DataT]":
-        """Create paginated response from data."""
-        total_pages = (total + page_size - 1) // page_size
+        """Create paginated response from data.
+
+        Args:
+            data: Items of the page
+            total: Number of items over all pages, if counted
+            page: Page number the items were fetched for
+            page_size: Items per page
+            next_cursor: Cursor of the following page, or None on the last
+                page; when given, decides ``has_next`` instead of ``total``
+            cursor: Cursor the page was fetched with, if any
+            total_estimated: Whether ``total`` is an estimate
+        """
+        total_pages = None if total is None else (total + page_size - 1) // page_size
+        if next_cursor is not None or cursor is not None or total_pages is None:
+            has_next = next_cursor is not None
+        else:
+            has_next = page < total_pages
 
         return cls(
             data=data,
@@ -81,8 +111,10 @@ class PaginatedResponse(BaseSchema, Generic[DataT]):
             page=page,
             page_size=page_size,
             total_pages=total_pages,
-            has_next=page < total_pages,
-            has_previous=page > 1,
+            has_next=has_next,
+            has_previous=page > 1 or cursor is not None,
+            next_cursor=next_cursor,
+            total_estimated=total_estimated,
         )
 
 
@@ -275,7 +275,13 @@ class PortfolioComparisonRequest(BaseSchema):
 
 
 class PortfolioRiskAnalysis(BaseSchema):
-    """Portfolio risk analysis."""
+    """Portfolio risk analysis.
+
+    Volatility and marginal contributions are annualized percentages, and
+    ``risk_contribution`` splits portfolio volatility between holdings in
+    percent. Value at risk and expected shortfall are one-day losses as a
+    percentage of portfolio value. Matrices are keyed by ticker.
+    """
 
     value_at_risk: dict[str, Decimal] = Field(
         ..., description="VaR at different confidence levels"
@@ -286,13 +292,63 @@ class PortfolioRiskAnalysis(BaseSchema):
     risk_contribution: dict[str, Decimal] = Field(
         ..., description="Risk contribution by position"
     )
+    marginal_risk_contribution: dict[str, Decimal] = Field(
+        default={}, description="Change in portfolio volatility per unit of weight"
+    )
     correlation_matrix: dict[str, dict[str, Decimal]] = Field(
         default={}, description="Asset correlation matrix"
     )
+    covariance_matrix: dict[str, dict[str, Decimal]] = Field(
+        default={}, description="Annualized asset covariance matrix"
+    )
 
     # Risk metrics
-    portfolio_volatility: Decimal = Field(..., description="Portfolio volatility")
+    portfolio_volatility: Decimal | None = Field(
+        None, description="Portfolio volatility"
+    )
     tracking_error: Decimal | None = Field(
         None, description="Tracking error vs benchmark"
     )
     information_ratio: Decimal | None = Field(None, description="Information ratio")
+
+    # Data coverage
+    as_of: date | None = Field(None, description="Last price date considered")
+    observations: int = Field(0, description="Aligned daily returns used")
+    excluded_tickers: list[str] = Field(
+        default=[], description="Holdings without enough shared price history"
+    )
+
+
+class SimulatedLoss(BaseSchema):
+    """Simulated portfolio loss over one horizon.
+
+    Losses are keyed by confidence level, as a percentage of portfolio value
+    and as an amount in the portfolio's currency.
+    """
+
+    horizon_days: int = Field(..., description="Horizon in trading days")
+    value_at_risk: dict[str, Decimal] = Field(..., description="VaR in percent")
+    conditional_value_at_risk: dict[str, Decimal] = Field(
+        ..., description="CVaR (expected shortfall) in percent"
+    )
+    value_at_risk_amount: dict[str, Decimal] = Field(..., description="VaR amount")
+    conditional_value_at_risk_amount: dict[str, Decimal] = Field(
+        ..., description="CVaR amount"
+    )
+
+
+class MonteCarloRiskAnalysis(BaseSchema):
+    """Monte Carlo value at risk of a portfolio's current holdings."""
+
+    method: str = Field(..., description="historical or parametric simulation")
+    paths: int = Field(..., description="Simulated paths")
+    seed: int = Field(..., description="Seed the paths were drawn with")
+    portfolio_value: Decimal = Field(
+        Decimal("0"), description="Market value of the simulated holdings"
+    )
+    horizons: list[SimulatedLoss] = Field(default=[], description="Loss by horizon")
+    as_of: date | None = Field(None, description="Last price date considered")
+    observations: int = Field(0, description="Aligned daily returns used")
+    excluded_tickers: list[str] = Field(
+        default=[], description="Holdings without enough shared price history"
+    )
@@ -29,7 +29,7 @@ class PositionBase(BaseSchema):
     @classmethod
     def validate_tax_lot_method(cls, v: str) -> str:
         """Validate tax lot method."""
-        allowed_methods = ["FIFO", "LIFO", "SpecificID"]
+        allowed_methods = ["FIFO", "LIFO", "AverageCost", "SpecificID"]
         if v not in allowed_methods:
             raise ValueError(f"Tax lot method must be one of: {allowed_methods}")
         return v
@@ -60,7 +60,7 @@ class PositionUpdate(BaseSchema):
     def validate_tax_lot_method(cls, v: str | None) -> str | None:
         """Validate tax lot method."""
         if v is not None:
-            allowed_methods = ["FIFO", "LIFO", "SpecificID"]
+            allowed_methods = ["FIFO", "LIFO", "AverageCost", "SpecificID"]
             if v not in allowed_methods:
                 raise ValueError(f"Tax lot method must be one of: {allowed_methods}")
         return v
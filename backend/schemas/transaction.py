@@ -182,6 +182,46 @@ class TransactionPerformanceMetrics(BaseSchema):
         ..., description="Net cash flow (negative = net investment)"
     )
     realized_gains: Decimal = Field(..., description="Total realized gains/losses")
+    open_cost_basis: Decimal = Field(
+        Decimal("0"), description="Cost basis of the lots still held"
+    )
+
+
+class TransactionTypeTotals(BaseSchema):
+    """Count and amounts of one transaction type."""
+
+    count: int = Field(0, ge=0, description="Number of transactions")
+    total_amount: Decimal = Field(Decimal("0"), description="Gross amount before fees")
+    fees: Decimal = Field(Decimal("0"), description="Commission and other fees")
+
+
+class TransactionPeriodSummary(BaseSchema):
+    """Transaction totals of one week or month."""
+
+    period_start: date = Field(..., description="First day of the period")
+    period_end: date = Field(..., description="Last day of the period")
+    total_transactions: int = Field(0, ge=0, description="Number of transactions")
+    total_fees: Decimal = Field(Decimal("0"), description="Total fees paid")
+    net_cash_flow: Decimal = Field(
+        Decimal("0"), description="Net cash flow (negative = net investment)"
+    )
+    by_type: dict[str, TransactionTypeTotals] = Field(
+        default={}, description="Totals by transaction type"
+    )
+
+
+class TransactionHistorySummary(BaseSchema):
+    """Transaction totals per week or month over a date range."""
+
+    start_date: date = Field(..., description="First day of the range")
+    end_date: date = Field(..., description="Last day of the range")
+    period: str = Field(..., description="Period length, week or month")
+    periods: list[TransactionPeriodSummary] = Field(
+        default=[], description="Every period in the range, oldest first"
+    )
+    totals: TransactionPeriodSummary | None = Field(
+        None, description="Totals over the whole range"
+    )
 
 
 class BulkTransactionImport(BaseSchema):
@@ -0,0 +1,337 @@
+"""Vectorized return and risk analytics over value series.
+
+Kernels work on NumPy float arrays of portfolio values or prices ordered by
+date. Returns are fractions per period, so a value of 0.01 means 1%.
+Annualized figures assume ``ANNUALIZATION_FACTOR`` periods per year.
+``analyze_performance`` runs every kernel needed for ``PerformanceMetrics``
+over one series.
+"""
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+import numpy as np
+
+from backend.constants import ANNUALIZATION_FACTOR, RISK_FREE_RATE
+
+# Trailing windows reported in PerformanceMetrics, in calendar days
+TRAILING_WINDOWS = {
+    "weekly_return": 7,
+    "monthly_return": 30,
+    "quarterly_return": 91,
+    "one_year_return": 365,
+}
+
+
+def period_returns(values: np.ndarray) -> np.ndarray:
+    """Return of each period, skipping periods that start at a value <= 0."""
+    values = np.asarray(values, dtype=float)
+    if values.size < 2:
+        return np.empty(0)
+    previous, current = values[:-1], values[1:]
+    valid = previous > 0
+    return current[valid] / previous[valid] - 1
+
+
+def volatility(
+    returns: np.ndarray, periods_per_year: int = ANNUALIZATION_FACTOR
+) -> float:
+    """Annualized sample standard deviation of period returns."""
+    returns = np.asarray(returns, dtype=float)
+    if returns.size < 2:
+        return 0.0
+    return float(np.std(returns, ddof=1) * np.sqrt(periods_per_year))
+
+
+def sharpe_ratio(
+    returns: np.ndarray,
+    risk_free_rate: float = RISK_FREE_RATE,
+    periods_per_year: int = ANNUALIZATION_FACTOR,
+    annual_volatility: float | None = None,
+) -> float:
+    """Annualized excess return over annualized volatility.
+
+    Args:
+        returns: Period returns
+        risk_free_rate: Annual risk-free rate as a fraction
+        periods_per_year: Periods used to annualize mean and volatility
+        annual_volatility: Volatility to divide by; computed from ``returns``
+            when omitted
+
+    Returns:
+        The ratio, or 0.0 when there are no returns or no volatility
+    """
+    returns = np.asarray(returns, dtype=float)
+    if annual_volatility is None:
+        annual_volatility = volatility(returns, periods_per_year)
+    if returns.size == 0 or annual_volatility <= 0:
+        return 0.0
+    annual_return = float(np.mean(returns)) * periods_per_year
+    return (annual_return - risk_free_rate) / annual_volatility
+
+
+def max_drawdown(values: np.ndarray) -> float:
+    """Largest peak-to-trough decline as a fraction of the peak."""
+    values = np.asarray(values, dtype=float)
+    if values.size < 2:
+        return 0.0
+    peaks = np.maximum.accumulate(values)
+    drawdowns = np.divide(
+        peaks - values, peaks, out=np.zeros_like(values), where=peaks > 0
+    )
+    return float(drawdowns.max())
+
+
+def beta_alpha(
+    returns: np.ndarray,
+    benchmark_returns: np.ndarray,
+    risk_free_rate: float = RISK_FREE_RATE,
+    periods_per_year: int = ANNUALIZATION_FACTOR,
+) -> tuple[float | None, float | None]:
+    """Beta to a benchmark and annualized Jensen's alpha.
+
+    Both series must hold returns for the same periods.
+
+    Returns:
+        ``(beta, alpha)``, or ``(None, None)`` without at least two periods
+        or when the benchmark does not move
+    """
+    returns = np.asarray(returns, dtype=float)
+    benchmark_returns = np.asarray(benchmark_returns, dtype=float)
+    if returns.size < 2 or returns.size != benchmark_returns.size:
+        return None, None
+    benchmark_variance = np.var(benchmark_returns, ddof=1)
+    if benchmark_variance == 0:
+        return None, None
+    covariance = np.cov(returns, benchmark_returns, ddof=1)[0, 1]
+    beta = float(covariance / benchmark_variance)
+    period_risk_free = risk_free_rate / periods_per_year
+    alpha = (
+        float(np.mean(returns))
+        - period_risk_free
+        - beta * (float(np.mean(benchmark_returns)) - period_risk_free)
+    ) * periods_per_year
+    return beta, alpha
+
+
+def trailing_returns(
+    dates: np.ndarray, values: np.ndarray, cutoffs: np.ndarray
+) -> np.ndarray:
+    """Return from the last value on or before each cutoff to the latest value.
+
+    Args:
+        dates: Sorted ``datetime64[D]`` dates of ``values``
+        values: Values in date order
+        cutoffs: ``datetime64[D]`` start dates, one per window
+
+    Returns:
+        One return per cutoff; NaN where no value precedes the cutoff or the
+        starting value is not positive
+    """
+    values = np.asarray(values, dtype=float)
+    result = np.full(len(cutoffs), np.nan)
+    if values.size == 0:
+        return result
+    indices = np.searchsorted(dates, cutoffs, side="right") - 1
+    found = indices >= 0
+    starts = np.full(len(cutoffs), np.nan)
+    starts[found] = values[indices[found]]
+    valid = found & (starts > 0)
+    result[valid] = values[-1] / starts[valid] - 1
+    return result
+
+
+def aligned_returns(
+    dates: np.ndarray,
+    values: np.ndarray,
+    other_dates: np.ndarray,
+    other_values: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Period returns of two series over the dates they have in common."""
+    _, indices, other_indices = np.intersect1d(
+        dates, other_dates, assume_unique=True, return_indices=True
+    )
+    first = np.asarray(values, dtype=float)[indices]
+    second = np.asarray(other_values, dtype=float)[other_indices]
+    valid = (first[:-1] > 0) & (second[:-1] > 0)
+    return (
+        (first[1:] / first[:-1] - 1)[valid],
+        (second[1:] / second[:-1] - 1)[valid],
+    )
+
+
+def return_matrix(
+    dates: list[np.ndarray], prices: list[np.ndarray]
+) -> tuple[np.ndarray, np.ndarray]:
+    """Period returns of several price series over the dates they all share.
+
+    Args:
+        dates: Sorted ``datetime64[D]`` dates of each series
+        prices: Prices of each series in date order; NaN and non-positive
+            prices are ignored
+
+    Returns:
+        ``(dates, returns)``: the shared dates and a matrix with one row per
+        period between them and one column per series
+    """
+    valid = [np.isfinite(p) & (np.asarray(p, dtype=float) > 0) for p in prices]
+    common = np.empty(0, dtype="datetime64[D]")
+    for i, (series_dates, mask) in enumerate(zip(dates, valid, strict=True)):
+        common = (
+            series_dates[mask]
+            if i == 0
+            else np.intersect1d(common, series_dates[mask], assume_unique=True)
+        )
+    if common.size < 2:
+        return common, np.empty((0, len(prices)))
+
+    aligned = np.column_stack(
+        [
+            np.asarray(p, dtype=float)[np.searchsorted(d, common)]
+            for d, p in zip(dates, prices, strict=True)
+        ]
+    )
+    return common, aligned[1:] / aligned[:-1] - 1
+
+
+def covariance_matrix(
+    returns: np.ndarray, periods_per_year: int = ANNUALIZATION_FACTOR
+) -> np.ndarray:
+    """Annualized sample covariance of a returns matrix with one column per asset."""
+    return np.atleast_2d(np.cov(returns, rowvar=False, ddof=1)) * periods_per_year
+
+
+def correlation_matrix(covariance: np.ndarray) -> np.ndarray:
+    """Correlation matrix of a covariance matrix.
+
+    Assets that never move have no defined correlation; it is reported as 0
+    against every other asset.
+    """
+    deviations = np.sqrt(np.diag(covariance))
+    scale = np.outer(deviations, deviations)
+    correlation = np.divide(
+        covariance, scale, out=np.zeros_like(covariance), where=scale > 0
+    )
+    np.fill_diagonal(correlation, 1.0)
+    return np.clip(correlation, -1.0, 1.0)
+
+
+def risk_contributions(
+    weights: np.ndarray, covariance: np.ndarray
+) -> tuple[float, np.ndarray]:
+    """Portfolio volatility and each asset's marginal contribution to it.
+
+    Both come from a single covariance-weights product: the portfolio variance
+    is ``w @ (C @ w)`` and the marginal contributions ``(C @ w) / volatility``.
+    ``weights * marginal`` then splits the volatility between the assets.
+    """
+    weights = np.asarray(weights, dtype=float)
+    weighted = covariance @ weights
+    variance = float(weights @ weighted)
+    if variance <= 0:
+        return 0.0, np.zeros_like(weights)
+    portfolio_volatility = float(np.sqrt(variance))
+    return portfolio_volatility, weighted / portfolio_volatility
+
+
+@dataclass
+class PerformanceAnalytics:
+    """Return and risk figures for one value series, as percentages.
+
+    ``sharpe_ratio`` and ``beta`` are plain ratios. Fields are None when the
+    series is too short to compute them.
+    """
+
+    annualized_return: float | None = None
+    daily_return: float | None = None
+    weekly_return: float | None = None
+    monthly_return: float | None = None
+    quarterly_return: float | None = None
+    ytd_return: float | None = None
+    one_year_return: float | None = None
+    volatility: float | None = None
+    sharpe_ratio: float | None = None
+    beta: float | None = None
+    alpha: float | None = None
+    max_drawdown: float | None = None
+
+
+def _percent(value: float | None) -> float | None:
+    if value is None or not np.isfinite(value):
+        return None
+    return float(value) * 100
+
+
+def analyze_performance(
+    dates: list[date],
+    values: list[float],
+    as_of: date,
+    period_days: int,
+    benchmark_dates: list[date] | np.ndarray | None = None,
+    benchmark_values: list[float] | np.ndarray | None = None,
+    risk_free_rate: float = RISK_FREE_RATE,
+) -> PerformanceAnalytics:
+    """Compute every return and risk figure of a value series.
+
+    Args:
+        dates: Dates of ``values`` in ascending order, without duplicates
+        values: Portfolio values
+        as_of: Date the trailing and year-to-date windows end on
+        period_days: Calendar days of the analysed period, for annualizing
+        benchmark_dates: Dates of ``benchmark_values``, ascending
+        benchmark_values: Benchmark prices for beta and alpha
+        risk_free_rate: Annual risk-free rate as a fraction
+    """
+    day_array = np.array(dates, dtype="datetime64[D]")
+    value_array = np.asarray(values, dtype=float)
+    analytics = PerformanceAnalytics()
+    if value_array.size == 0:
+        return analytics
+
+    start_value, end_value = value_array[0], value_array[-1]
+    if period_days > 0 and start_value > 0:
+        analytics.annualized_return = _percent(
+            (end_value / start_value) ** (365 / period_days) - 1
+        )
+
+    returns = period_returns(value_array)
+    if value_array.size >= 2 and value_array[-2] > 0:
+        analytics.daily_return = _percent(end_value / value_array[-2] - 1)
+
+    cutoffs = [as_of - timedelta(days=days) for days in TRAILING_WINDOWS.values()]
+    trailing = trailing_returns(
+        day_array, value_array, np.array(cutoffs, dtype="datetime64[D]")
+    )
+    for field_name, value in zip(TRAILING_WINDOWS, trailing, strict=True):
+        setattr(analytics, field_name, _percent(value))
+
+    # Year to date starts at the first value of the year, not the last before it
+    ytd_index = int(np.searchsorted(day_array, np.datetime64(date(as_of.year, 1, 1))))
+    if ytd_index < value_array.size and value_array[ytd_index] > 0:
+        analytics.ytd_return = _percent(end_value / value_array[ytd_index] - 1)
+
+    if returns.size:
+        annual_volatility = volatility(returns)
+        analytics.volatility = _percent(annual_volatility)
+        if annual_volatility > 0:
+            analytics.sharpe_ratio = sharpe_ratio(
+                returns, risk_free_rate, annual_volatility=annual_volatility
+            )
+        analytics.max_drawdown = _percent(max_drawdown(value_array))
+
+    if (
+        benchmark_dates is not None
+        and benchmark_values is not None
+        and len(benchmark_dates)
+    ):
+        portfolio_returns, benchmark_returns = aligned_returns(
+            day_array,
+            value_array,
+            np.array(benchmark_dates, dtype="datetime64[D]"),
+            np.asarray(benchmark_values, dtype=float),
+        )
+        beta, alpha = beta_alpha(portfolio_returns, benchmark_returns, risk_free_rate)
+        analytics.beta = beta
+        analytics.alpha = _percent(alpha)
+
+    return analytics
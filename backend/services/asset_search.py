@@ -0,0 +1,525 @@
+"""In-process ticker, name and ISIN index for asset autocomplete.
+
+``ilike('%term%')`` cannot use an index, so every keystroke of the asset
+autocomplete scanned the whole assets table. This index keeps every active
+asset's ticker, ISIN and name in memory:
+
+* sorted key lists answer prefix matches with two binary searches, and
+* a trigram inverted index over the distinct words answers fuzzy matches,
+  scoring each query word against a name's closest word like ``pg_trgm``
+  word similarity.
+
+Matches are ranked by tier: exact ticker, ticker prefix, ISIN prefix, name
+prefix, word-in-name prefix, then fuzzy similarity. Shorter keys rank first
+within a tier. Lookups return asset ids only; callers load the few matching
+rows by primary key.
+
+The index is rebuilt from one query over the assets table, in a background
+thread while searches keep using the previous snapshot. Session events
+request a rebuild when a commit adds or deletes an asset or changes a
+ticker, name, ISIN or active flag; price refreshes do not. Writes made by
+other processes are found every ``refresh_interval`` seconds by comparing
+the assets updated since the newest ``updated_at`` indexed against the
+index, and a full reload every ``reload_interval`` seconds catches the rest,
+such as rows deleted outside the application. Both run on the background
+thread too, so a search never waits on the database.
+"""
+
+from bisect import bisect_left
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from itertools import chain
+import logging
+import re
+import threading
+import time
+from typing import Any
+
+import numpy as np
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from backend.config import get_settings
+from backend.models import Asset
+from backend.services.commit_invalidation import ALL_USERS, CommitInvalidation
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Minimum similarity of a fuzzy match, as in pg_trgm's default threshold,
+# and the shortest query worth matching fuzzily
+FUZZY_THRESHOLD = 0.3
+FUZZY_MIN_LENGTH = 3
+
+# Asset fields the index is built from; writes to others leave it valid
+SEARCH_FIELDS = ("ticker", "name", "isin", "is_active")
+
+# Assets updated this long before the watermark are checked again, for
+# writers whose transactions committed after later-stamped ones
+ASSET_WATERMARK_OVERLAP = timedelta(seconds=5)
+
+_KEY_END = "\U0010ffff"
+_WORD_SEPARATORS = re.compile(r"[^0-9a-z]+")
+
+
+def normalize(text: str) -> str:
+    """Case-folded text with runs of punctuation and spaces made one space."""
+    return " ".join(_WORD_SEPARATORS.split(text.casefold())).strip()
+
+
+def fingerprint(ticker: str, name: str | None, isin: str | None) -> int:
+    """Hash of the searched fields of an asset, to tell whether they changed."""
+    return hash((ticker, name, isin))
+
+
+def trigrams(text: str) -> set[str]:
+    """Trigrams of each word padded like ``pg_trgm``: two spaces before, one after."""
+    grams: set[str] = set()
+    for word in text.split():
+        padded = f"  {word} "
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+@dataclass
+class _PrefixTier:
+    """Sorted keys of one kind, each pointing at an asset row."""
+
+    keys: list[str]
+    rows: np.ndarray
+    lengths: np.ndarray
+
+    @classmethod
+    def build(cls, entries: list[tuple[str, int]]) -> "_PrefixTier":
+        entries.sort()
+        return cls(
+            keys=[key for key, _ in entries],
+            rows=np.fromiter((row for _, row in entries), np.int32, len(entries)),
+            lengths=np.fromiter(
+                (len(key) for key, _ in entries), np.int32, len(entries)
+            ),
+        )
+
+    def matches(self, prefix: str, count: int) -> tuple[list[int], bool]:
+        """Rows of the ``count`` shortest keys starting with ``prefix``.
+
+        Returns:
+            ``(rows, more)``: rows shortest key first, then alphabetically,
+            and whether further keys match
+        """
+        start = bisect_left(self.keys, prefix)
+        end = bisect_left(self.keys, prefix + _KEY_END, start)
+        lengths = self.lengths[start:end]
+        if count < len(lengths):
+            # Short prefixes match large ranges; only the shortest are sorted
+            order = np.argpartition(lengths, count - 1)[:count]
+            order = order[np.lexsort((order, lengths[order]))]
+        else:
+            order = np.argsort(lengths, kind="stable")
+        return self.rows[start:end][order].tolist(), count < len(lengths)
+
+
+@dataclass
+class _Snapshot:
+    """Immutable index contents; replaced as a whole on every rebuild.
+
+    Fuzzy matching works on distinct words: ``postings`` maps trigrams to
+    word ids and ``word_rows[word_offsets[w]:word_offsets[w + 1]]`` lists
+    the rows containing word ``w``.
+    """
+
+    ids: np.ndarray
+    ticker_lengths: np.ndarray
+    sorted_ids: np.ndarray
+    sorted_fingerprints: np.ndarray
+    tiers: tuple[_PrefixTier, ...]
+    postings: dict[str, np.ndarray]
+    word_trigram_counts: np.ndarray
+    word_offsets: np.ndarray
+    word_rows: np.ndarray
+
+    @classmethod
+    def build(cls, rows: Iterable[tuple[int, str, str, str | None]]) -> "_Snapshot":
+        ids: list[int] = []
+        ticker_lengths: list[int] = []
+        fingerprints: list[int] = []
+        ticker_keys: list[tuple[str, int]] = []
+        isin_keys: list[tuple[str, int]] = []
+        name_keys: list[tuple[str, int]] = []
+        word_keys: list[tuple[str, int]] = []
+        rows_by_word: defaultdict[str, list[int]] = defaultdict(list)
+
+        for row, (asset_id, ticker, name, isin) in enumerate(rows):
+            ticker_key = ticker.casefold()
+            name_key = normalize(name or "")
+            name_words = set(name_key.split())
+            ids.append(asset_id)
+            ticker_lengths.append(len(ticker_key))
+            fingerprints.append(fingerprint(ticker, name, isin))
+            ticker_keys.append((ticker_key, row))
+            if isin:
+                isin_keys.append((isin.casefold(), row))
+            name_keys.append((name_key, row))
+            # The first word is already covered by the name prefix
+            word_keys.extend((word, row) for word in set(name_key.split()[1:]))
+            for word in name_words.union(normalize(ticker).split()):
+                rows_by_word[word].append(row)
+
+        word_ids_by_trigram: defaultdict[str, list[int]] = defaultdict(list)
+        word_trigram_counts: list[int] = []
+        for word_id, word in enumerate(rows_by_word):
+            grams = trigrams(word)
+            word_trigram_counts.append(len(grams))
+            for gram in grams:
+                word_ids_by_trigram[gram].append(word_id)
+
+        id_order = np.argsort(ids, kind="stable")
+        return cls(
+            ids=np.asarray(ids, dtype=np.int64),
+            ticker_lengths=np.asarray(ticker_lengths, dtype=np.int32),
+            sorted_ids=np.asarray(ids, dtype=np.int64)[id_order],
+            sorted_fingerprints=np.asarray(fingerprints, dtype=np.int64)[id_order],
+            tiers=tuple(
+                _PrefixTier.build(keys)
+                for keys in (ticker_keys, isin_keys, name_keys, word_keys)
+            ),
+            postings={
+                gram: np.asarray(word_ids, dtype=np.int32)
+                for gram, word_ids in word_ids_by_trigram.items()
+            },
+            word_trigram_counts=np.asarray(word_trigram_counts, dtype=np.int32),
+            word_offsets=np.cumsum(
+                [0, *map(len, rows_by_word.values())], dtype=np.int64
+            ),
+            word_rows=np.fromiter(chain.from_iterable(rows_by_word.values()), np.int32),
+        )
+
+    def fingerprint_of(self, asset_id: int) -> int | None:
+        """Fingerprint an asset was indexed with, or None if it is not indexed."""
+        position = int(np.searchsorted(self.sorted_ids, asset_id))
+        if position < len(self.sorted_ids) and self.sorted_ids[position] == asset_id:
+            return int(self.sorted_fingerprints[position])
+        return None
+
+    def search(self, query: str, limit: int) -> list[int]:
+        """Asset ids matching ``query``, best match first."""
+        text = normalize(query)
+        if not text:
+            return []
+        results: list[int] = []
+        seen: set[int] = set()
+
+        def take(rows: Iterable[int]) -> bool:
+            for row in rows:
+                if row not in seen:
+                    seen.add(row)
+                    results.append(row)
+                    if len(results) >= limit:
+                        return True
+            return False
+
+        # Tickers keep their punctuation ("BRK.B"); other keys are normalized
+        keys = (query.strip().casefold(), text, text, text)
+        for tier, key in zip(self.tiers, keys, strict=True):
+            # Rows already taken from earlier tiers may come back; ask for more
+            count = limit + len(seen)
+            while True:
+                rows, more = tier.matches(key, count)
+                if take(rows):
+                    return self.ids[results].tolist()
+                if not more:
+                    break
+                count *= 2
+        if len(text) >= FUZZY_MIN_LENGTH:
+            take(self._fuzzy(text, seen))
+        return self.ids[results].tolist()
+
+    def _fuzzy(self, text: str, seen: set[int]) -> list[int]:
+        """Rows whose words resemble the words of ``text``, most similar first.
+
+        Each query word scores its most similar word of a row by trigram
+        similarity; a row's score is the mean over the query words.
+        """
+        words = text.split()
+        scores = np.zeros(len(self.ids))
+        for word in words:
+            grams = trigrams(word)
+            lists = [self.postings[gram] for gram in grams if gram in self.postings]
+            if not lists:
+                continue
+            word_ids, shared = np.unique(np.concatenate(lists), return_counts=True)
+            similarity = shared / (
+                len(grams) + self.word_trigram_counts[word_ids] - shared
+            )
+            keep = similarity >= FUZZY_THRESHOLD
+            word_ids, similarity = word_ids[keep], similarity[keep]
+
+            # Rows of every similar word, gathered from their offset ranges
+            starts = self.word_offsets[word_ids]
+            counts = self.word_offsets[word_ids + 1] - starts
+            positions = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+            rows = self.word_rows[positions + np.arange(counts.sum())]
+            best = np.zeros(len(self.ids))
+            np.maximum.at(best, rows, np.repeat(similarity, counts))
+            scores += best
+
+        rows = np.flatnonzero(scores >= FUZZY_THRESHOLD * len(words))
+        order = np.lexsort((self.ticker_lengths[rows], -scores[rows]))
+        return [row for row in rows[order].tolist() if row not in seen]
+
+
+class AssetSearchIndex:
+    """Ranked prefix and fuzzy search over active assets."""
+
+    def __init__(self, refresh_interval: float, reload_interval: float):
+        self.refresh_interval = refresh_interval
+        self.reload_interval = reload_interval
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._snapshot: _Snapshot | None = None
+        self._watermark: datetime | None = None
+        self._loaded_at: float | None = None
+        self._checked_at = 0.0
+        self._reload_requested = False
+        self._refresh_thread: threading.Thread | None = None
+        self._stats = {
+            "searches": 0,
+            "full_loads": 0,
+            "load_errors": 0,
+            "change_checks": 0,
+            "check_errors": 0,
+        }
+
+    def load(self, db: Session) -> int:
+        """Rebuild the index from every active asset.
+
+        Returns:
+            Number of assets in the index
+        """
+        # Cleared first, so a commit landing while rows are read asks again
+        with self._lock:
+            self._reload_requested = False
+        # Read before the rows, so no update is newer than it without showing
+        watermark = db.execute(select(func.max(Asset.updated_at))).scalar()
+        rows = db.execute(
+            select(Asset.id, Asset.ticker, Asset.name, Asset.isin)
+            .where(Asset.is_active.is_(True))
+            .order_by(Asset.id)
+        )
+        count = self.load_rows(rows, watermark=watermark)
+        logger.info(f"Loaded {count} assets into the search index")
+        return count
+
+    def load_rows(
+        self,
+        rows: Iterable[tuple[int, str, str, str | None]],
+        watermark: datetime | None = None,
+    ) -> int:
+        """Rebuild the index from ``(id, ticker, name, isin)`` rows.
+
+        ``watermark`` is the newest ``updated_at`` of the assets when the
+        rows were read; later updates are compared against the index.
+        """
+        snapshot = _Snapshot.build(rows)
+        with self._lock:
+            self._snapshot = snapshot
+            self._watermark = watermark
+            self._loaded_at = self._checked_at = time.monotonic()
+            self._stats["full_loads"] += 1
+        return len(snapshot.ids)
+
+    def ensure_fresh(self, db: Session) -> bool:
+        """Keep the index current without making searches wait on the database.
+
+        Assets updated since the watermark are compared against the index at
+        most once per ``refresh_interval``. That check, and the rebuild that a
+        difference, a relevant commit in this process or a due reload
+        starts, run in the background; searches use the current snapshot
+        until it is replaced.
+
+        Returns:
+            True if the index can serve searches, False until the first
+            load has finished
+        """
+        check = self._check_due()
+        if check or self._due():
+            self._start_refresh(db.get_bind(), check=check)
+        return self._snapshot is not None
+
+    def _check_due(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            if (
+                self._snapshot is None
+                or self._reload_requested
+                or now - self._checked_at < self.refresh_interval
+            ):
+                return False
+            # Claimed up front, so concurrent searches do not check as well
+            self._checked_at = now
+            return True
+
+    def _check(self, db: Session) -> None:
+        """Request a rebuild if assets updated since the watermark differ."""
+        snapshot, watermark = self._snapshot, self._watermark
+        if snapshot is None:
+            return
+        query = select(
+            Asset.id,
+            Asset.ticker,
+            Asset.name,
+            Asset.isin,
+            Asset.is_active,
+            Asset.updated_at,
+        )
+        if watermark is not None:
+            query = query.where(Asset.updated_at >= watermark - ASSET_WATERMARK_OVERLAP)
+        self._stats["change_checks"] += 1
+
+        newest = watermark
+        for asset_id, ticker, name, isin, is_active, updated_at in db.execute(query):
+            indexed = snapshot.fingerprint_of(asset_id)
+            if (indexed is not None) != bool(is_active) or (
+                is_active and indexed != fingerprint(ticker, name, isin)
+            ):
+                self.invalidate()
+                return
+            if updated_at is not None and (newest is None or updated_at > newest):
+                newest = updated_at
+        with self._lock:
+            if self._snapshot is snapshot:
+                self._watermark = newest
+
+    def _due(self) -> bool:
+        with self._lock:
+            return (
+                self._loaded_at is None
+                or self._reload_requested
+                or time.monotonic() - self._loaded_at >= self.reload_interval
+            )
+
+    def _start_refresh(self, bind: Engine | Connection, check: bool) -> None:
+        """Check and rebuild in a background thread unless one is running."""
+        if not self._load_lock.acquire(blocking=False):
+            return
+        thread = threading.Thread(
+            target=self._refresh,
+            args=(bind, check),
+            name="asset-search-refresh",
+            daemon=True,
+        )
+        self._refresh_thread = thread
+        thread.start()
+
+    def _refresh(self, bind: Engine | Connection, check: bool) -> None:
+        try:
+            with Session(bind=bind) as db:
+                if check:
+                    try:
+                        self._check(db)
+                    except Exception as e:
+                        self._stats["check_errors"] += 1
+                        logger.warning(f"Failed to check assets for search index: {e}")
+                if self._due():
+                    self._rebuild(db)
+        finally:
+            self._load_lock.release()
+
+    def _rebuild(self, db: Session) -> None:
+        try:
+            self.load(db)
+        except Exception as e:
+            self._stats["load_errors"] += 1
+            logger.warning(f"Failed to load asset search index: {e}")
+            self.invalidate()
+
+    def join(self, timeout: float | None = None) -> None:
+        """Wait for a running background check or rebuild to finish."""
+        thread = self._refresh_thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def search(self, query: str, limit: int = 10) -> list[int]:
+        """Ids of up to ``limit`` active assets matching ``query``, best first."""
+        snapshot = self._snapshot
+        if snapshot is None or limit < 1:
+            return []
+        self._stats["searches"] += 1
+        return snapshot.search(query, limit)
+
+    def invalidate(self) -> None:
+        """Rebuild the index in the background on the next search."""
+        with self._lock:
+            self._reload_requested = True
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get index size and load statistics."""
+        snapshot = self._snapshot
+        return {
+            "loaded": snapshot is not None,
+            "assets": len(snapshot.ids) if snapshot else 0,
+            "words": len(snapshot.word_trigram_counts) if snapshot else 0,
+            "reload_requested": self._reload_requested,
+            "rebuilding": self._load_lock.locked(),
+            **self._stats,
+        }
+
+
+def _changes_search_fields(obj: Any) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[name].history.has_changes() for name in SEARCH_FIELDS)
+
+
+def _invalidate_committed(_pending: set[Any]) -> None:
+    """Rebuild the index on the next search after a relevant commit."""
+    asset_search_index.invalidate()
+
+
+# Assets are not per user; any relevant write is recorded as ALL_USERS
+_invalidation = CommitInvalidation("asset_search", _invalidate_committed)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed_changes(session: Session, _flush_context: Any) -> None:
+    """Note flushes that add or delete assets or change what is searched."""
+    if any(
+        isinstance(obj, Asset) for obj in chain(session.new, session.deleted)
+    ) or any(
+        isinstance(obj, Asset) and _changes_search_fields(obj) for obj in session.dirty
+    ):
+        _invalidation.pending(session).add(ALL_USERS)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_changes(orm_execute_state: ORMExecuteState) -> None:
+    """Bulk statements change the index unless they only set other fields."""
+    if not (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ) or not any(mapper.class_ is Asset for mapper in orm_execute_state.all_mappers):
+        return
+    parameters = orm_execute_state.parameters
+    if (
+        orm_execute_state.is_update
+        and isinstance(parameters, list)
+        and parameters
+        and not any(name in SEARCH_FIELDS for params in parameters for name in params)
+    ):
+        return
+    _invalidation.pending(orm_execute_state.session).add(ALL_USERS)
+
+
+# Global search index
+asset_search_index = AssetSearchIndex(
+    refresh_interval=settings.asset_search_refresh_interval,
+    reload_interval=settings.asset_search_reload_interval,
+)
+
+
+def get_asset_search_index() -> AssetSearchIndex | None:
+    """Get the global search index, or None when it is disabled."""
+    return asset_search_index if settings.asset_search_index_enabled else None
@@ -3,15 +3,20 @@
 from typing import Any, Generic, TypeVar, cast
 
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import Row, func, or_
+from sqlalchemy.orm import Query, Session
 
 from backend.models.base import Base
+from backend.services.pagination import count_rows, decode_cursor
 
 # Type variables
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
+# Label of the window column carrying the total in get_page rows
+_TOTAL_LABEL = "_page_total"
+
 
 class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     """Base service class with common CRUD operations."""
@@ -34,16 +39,19 @@ class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             .first()
         )
 
-    def get_multi(
+    def build_query(
         self,
         db: Session,
         *,
-        skip: int = 0,
-        limit: int = 100,
         filters: dict[str, Any] | None = None,
-        order_by: str | None = None,
-    ) -> list[ModelType]:
-        """Get multiple records with optional filtering and pagination."""
+        search_term: str | None = None,
+        search_fields: list[str] | None = None,
+    ) -> Query[ModelType]:
+        """Query for records matching every filter and, if given, the search term.
+
+        Filters compare fields for equality and skip None values; the search
+        term matches any of ``search_fields`` case-insensitively as a substring.
+        """
         query = db.query(self.model)
 
         # Apply filters
@@ -52,22 +60,116 @@ class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
                 if hasattr(self.model, field) and value is not None:
                     query = query.filter(getattr(self.model, field) == value)
 
+        # Build search conditions
+        if search_term:
+            search_conditions = [
+                getattr(self.model, field).ilike(f"%{search_term}%")
+                for field in search_fields or ()
+                if hasattr(self.model, field)
+            ]
+            if search_conditions:
+                query = query.filter(or_(*search_conditions))
+
+        return query
+
+    def get_page(
+        self,
+        db: Session,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        filters: dict[str, Any] | None = None,
+        search_term: str | None = None,
+        search_fields: list[str] | None = None,
+        cursor: str | None = None,
+        count: str = "exact",
+    ) -> tuple[list[Row[Any]], int | None]:
+        """One page of matching records in id order, with their total.
+
+        Records come back as plain column rows rather than ORM instances,
+        so large pages skip identity-map bookkeeping; every column of the
+        model is an attribute of the row. An exact total is read from a
+        ``COUNT(*) OVER ()`` window of the same statement, falling back to a
+        separate count for cursor pages and pages past the end.
+
+        Args:
+            db: Database session
+            skip: Records to skip; deep pages should use ``cursor``
+            limit: Maximum records to return
+            filters: Field values records must equal
+            search_term: Text to find in ``search_fields``
+            search_fields: Fields searched for ``search_term``
+            cursor: Id cursor of the last record of the previous page
+            count: ``exact``, ``estimated`` or ``none``, as in ``count_rows``
+
+        Returns:
+            ``(rows, total)``; ``total`` is None when ``count`` is ``none``
+        """
+        query = self.build_query(
+            db, filters=filters, search_term=search_term, search_fields=search_fields
+        )
+        windowed = count == "exact" and cursor is None
+        columns = [*self.model.__table__.columns]
+        if windowed:
+            columns.append(func.count().over().label(_TOTAL_LABEL))
+
+        page = (
+            self._after_cursor(query, cursor)
+            if cursor is not None
+            else query.order_by(self.model.id)
+        )
+        rows = page.with_entities(*columns).offset(skip).limit(limit).all()
+
+        if windowed and rows:
+            return rows, getattr(rows[0], _TOTAL_LABEL)
+        return rows, count_rows(db, query, count)
+
+    def get_multi(
+        self,
+        db: Session,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        filters: dict[str, Any] | None = None,
+        order_by: str | None = None,
+        cursor: str | None = None,
+    ) -> list[ModelType]:
+        """Get multiple records with optional filtering and pagination.
+
+        With a ``cursor``, records after it are returned in id order and
+        ``order_by`` is ignored.
+        """
+        query = self.build_query(db, filters=filters)
+
+        if cursor is not None:
+            return self._after_cursor(query, cursor).offset(skip).limit(limit).all()
+
         # Apply ordering
         if order_by and hasattr(self.model, order_by):
             query = query.order_by(getattr(self.model, order_by))
 
         return query.offset(skip).limit(limit).all()
 
-    def count(self, db: Session, *, filters: dict[str, Any] | None = None) -> int:
-        """Count records with optional filtering."""
-        query = db.query(self.model)
-
-        # Apply filters
-        if filters:
-            for field, value in filters.items():
-                if hasattr(self.model, field) and value is not None:
-                    query = query.filter(getattr(self.model, field) == value)
+    def count(
+        self,
+        db: Session,
+        *,
+        filters: dict[str, Any] | None = None,
+        estimate: bool = False,
+        search_term: str | None = None,
+        search_fields: list[str] | None = None,
+    ) -> int:
+        """Count records with optional filtering and search.
+
+        ``estimate`` returns the database's row estimate where it has one
+        instead of counting every matching record.
+        """
+        query = self.build_query(
+            db, filters=filters, search_term=search_term, search_fields=search_fields
+        )
 
+        if estimate:
+            return cast("int", count_rows(db, query, "estimated"))
         return query.count()
 
     def create(
@@ -188,24 +290,24 @@ class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         search_fields: list[str],
         skip: int = 0,
         limit: int = 100,
+        cursor: str | None = None,
     ) -> list[ModelType]:
-        """Search records by term in specified fields."""
-        query = db.query(self.model)
-
-        # Build search conditions
-        search_conditions = []
-        for field in search_fields:
-            if hasattr(self.model, field):
-                field_obj = getattr(self.model, field)
-                search_conditions.append(field_obj.ilike(f"%{search_term}%"))
-
-        if search_conditions:
-            from sqlalchemy import or_
-
-            query = query.filter(or_(*search_conditions))
+        """Search records by term in specified fields, in id order."""
+        query = self.build_query(
+            db, search_term=search_term, search_fields=search_fields
+        )
 
+        if cursor is not None:
+            query = self._after_cursor(query, cursor)
+        else:
+            query = query.order_by(self.model.id)
         return query.offset(skip).limit(limit).all()
 
+    def _after_cursor(self, query: Any, cursor: str) -> Any:
+        """Records of ``query`` after an id cursor, in id order."""
+        (last_id,) = decode_cursor(cursor, int)
+        return query.filter(self.model.id > last_id).order_by(self.model.id)
+
     def get_active(
         self, db: Session, *, skip: int = 0, limit: int = 100
     ) -> list[ModelType]:
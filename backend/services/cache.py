@@ -0,0 +1,309 @@
+"""Two-tier caching for values shared across API and Celery workers.
+
+The first tier is a bounded, thread-safe in-process LRU with per-entry TTL.
+The optional second tier is Redis, so every uvicorn and Celery worker sees
+values fetched by any other worker. Redis failures never surface to callers:
+the cache degrades to L1-only and retries Redis after a short cooldown.
+"""
+
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+import logging
+import threading
+import time
+from typing import Any, Generic, TypeVar
+
+from backend.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Seconds to skip Redis after a connection error before trying again
+REDIS_RETRY_COOLDOWN = 30.0
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss/eviction counters for a cache."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    l2_hits: int = 0
+    l2_misses: int = 0
+    l2_errors: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Share of lookups served from either tier."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize counters for status endpoints."""
+        return {**asdict(self), "hit_ratio": round(self.hit_ratio, 4)}
+
+
+class TTLCache(Generic[T]):
+    """Thread-safe in-process LRU cache with per-entry TTL and a size cap."""
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._entries: OrderedDict[str, tuple[float, float, T]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> T | None:
+        """Return a live entry and mark it most recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return None
+
+            expires_at, _stored_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return value
+
+    def set(self, key: str, value: T, ttl: float | None = None) -> None:
+        """Store a value, evicting least recently used entries over the cap."""
+        now = time.monotonic()
+        with self._lock:
+            expires_at = now + (self.ttl if ttl is None else ttl)
+            self._entries[key] = (expires_at, now, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def record(self, **counts: int) -> None:
+        """Add to stats counters under the lock that guards lookups."""
+        with self._lock:
+            for name, count in counts.items():
+                setattr(self.stats, name, getattr(self.stats, name) + count)
+
+    def delete(self, key: str) -> None:
+        """Drop a single entry if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self, older_than: float | None = None) -> int:
+        """Remove all entries, or only those stored more than ``older_than`` s ago."""
+        with self._lock:
+            if older_than is None:
+                removed = len(self._entries)
+                self._entries.clear()
+                return removed
+
+            cutoff = time.monotonic() - older_than
+            stale = [
+                key
+                for key, (_expires_at, stored_at, _value) in self._entries.items()
+                if stored_at < cutoff
+            ]
+            for key in stale:
+                del self._entries[key]
+            return len(stale)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class TwoTierCache(Generic[T]):
+    """In-process TTL/LRU cache backed by a shared Redis tier.
+
+    Values are written to both tiers. Lookups check L1 first, then Redis,
+    and promote Redis hits into L1. ``encode``/``decode`` convert values to
+    and from the string stored in Redis; when omitted the cache is L1-only.
+    ``local_ttl`` caps how long L1 keeps a value while Redis is in use, which
+    bounds how long a worker serves an entry another worker deleted.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        ttl: float,
+        max_size: int,
+        *,
+        encode: Callable[[T], str] | None = None,
+        decode: Callable[[str], T] | None = None,
+        redis_url: str | None = None,
+        local_ttl: float | None = None,
+    ):
+        settings = get_settings()
+        self.namespace = namespace
+        self.ttl = ttl
+        self.local_ttl = local_ttl
+        self.local: TTLCache[T] = TTLCache(max_size=max_size, ttl=ttl)
+        self.encode = encode
+        self.decode = decode
+        self.redis_url = redis_url or settings.redis_url
+        self.redis_enabled = (
+            settings.cache_redis_enabled and encode is not None and decode is not None
+        )
+        self._redis: Any = None
+        self._redis_retry_at = 0.0
+        self._redis_lock = threading.Lock()
+
+    @property
+    def stats(self) -> CacheStats:
+        """Counters shared by both tiers."""
+        return self.local.stats
+
+    def _key(self, key: str) -> str:
+        return f"fdmcp:{self.namespace}:{key}"
+
+    def _l1_ttl(self, ttl: float) -> float:
+        if self.local_ttl is not None and self.redis_enabled:
+            return min(ttl, self.local_ttl)
+        return ttl
+
+    def _client(self) -> Any:
+        """Return a Redis client, or None while Redis is disabled or cooling down."""
+        if not self.redis_enabled or time.monotonic() < self._redis_retry_at:
+            return None
+        if self._redis is None:
+            with self._redis_lock:
+                if self._redis is None:
+                    try:
+                        import redis
+
+                        self._redis = redis.Redis.from_url(
+                            self.redis_url,
+                            socket_connect_timeout=0.25,
+                            socket_timeout=0.25,
+                            decode_responses=True,
+                        )
+                    except Exception as e:
+                        logger.warning(
+                            f"Redis cache unavailable ({self.namespace}): {e}"
+                        )
+                        self.redis_enabled = False
+                        return None
+        return self._redis
+
+    def _redis_failed(self, error: Exception) -> None:
+        self.local.record(l2_errors=1)
+        self._redis_retry_at = time.monotonic() + REDIS_RETRY_COOLDOWN
+        logger.debug(f"Redis cache error ({self.namespace}), using L1 only: {error}")
+
+    def get(self, key: str) -> T | None:
+        """Look a value up in L1, then Redis."""
+        value = self.local.get(key)
+        if value is not None:
+            return value
+
+        client = self._client()
+        if client is None:
+            return None
+
+        try:
+            raw = client.get(self._key(key))
+        except Exception as e:
+            self._redis_failed(e)
+            return None
+
+        if raw is None:
+            self.local.record(l2_misses=1)
+            return None
+
+        try:
+            value = self.decode(raw)
+        except Exception as e:
+            logger.debug(f"Discarding undecodable cache entry {key}: {e}")
+            self.local.record(l2_misses=1)
+            return None
+
+        # A Redis hit turns the L1 miss recorded above into a hit overall
+        self.local.record(l2_hits=1, misses=-1, hits=1)
+        self.local.set(key, value, self._l1_ttl(self.ttl))
+        return value
+
+    def set(self, key: str, value: T, ttl: float | None = None) -> None:
+        """Store a value in both tiers."""
+        ttl = self.ttl if ttl is None else ttl
+        self.local.set(key, value, self._l1_ttl(ttl))
+
+        client = self._client()
+        if client is None:
+            return
+        try:
+            raw = self.encode(value)
+        except Exception as e:
+            # A value that cannot be encoded is a bug, not a Redis outage
+            logger.warning(f"Not caching unencodable value for {key} in Redis: {e}")
+            return
+        try:
+            client.set(self._key(key), raw, ex=max(1, int(ttl)))
+        except Exception as e:
+            self._redis_failed(e)
+
+    def delete(self, key: str) -> None:
+        """Invalidate a key in both tiers."""
+        self.local.delete(key)
+        client = self._client()
+        if client is None:
+            return
+        try:
+            client.delete(self._key(key))
+        except Exception as e:
+            self._redis_failed(e)
+
+    def incr(self, key: str) -> int:
+        """Increment an integer counter and return its new value.
+
+        Redis increments atomically, so every worker sees each increment; the
+        counter expires ``ttl`` seconds after the last one. Without Redis the
+        count is kept in L1 only.
+        """
+        value = None
+        client = self._client()
+        if client is not None:
+            try:
+                value = int(client.incr(self._key(key)))
+                client.expire(self._key(key), max(1, int(self.ttl)))
+            except Exception as e:
+                self._redis_failed(e)
+        if value is None:
+            value = int(self.local.get(key) or 0) + 1
+        self.local.set(key, value, self._l1_ttl(self.ttl))
+        return value
+
+    def clear(self, older_than: float | None = None) -> int:
+        """Clear L1, and the whole Redis namespace when ``older_than`` is None."""
+        removed = self.local.clear(older_than)
+        if older_than is not None:
+            return removed
+
+        client = self._client()
+        if client is None:
+            return removed
+        try:
+            keys = list(client.scan_iter(match=self._key("*"), count=500))
+            if keys:
+                client.delete(*keys)
+        except Exception as e:
+            self._redis_failed(e)
+        return removed
+
+    def get_stats(self) -> dict[str, Any]:
+        """Counters plus tier configuration for status endpoints."""
+        return {
+            "namespace": self.namespace,
+            "size": len(self.local),
+            "max_size": self.local.max_size,
+            "ttl_seconds": self.ttl,
+            "redis_enabled": self.redis_enabled,
+            **self.stats.to_dict(),
+        }
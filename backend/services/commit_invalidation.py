@@ -0,0 +1,50 @@
+"""Invalidate cached per-user data when the transaction that changed it commits.
+
+Caches record the owners of the rows a session writes, a user ID or
+``ALL_USERS``, from their flush and bulk statement hooks. The owners are
+handed to the cache once the session's transaction commits, and forgotten if
+it rolls back, so a rolled-back write never invalidates entries on a later
+commit of the same session.
+"""
+
+from collections.abc import Callable
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, SessionTransaction
+
+# Owner recorded by writes that can affect every user, e.g. bulk statements
+ALL_USERS = "*"
+
+
+class CommitInvalidation:
+    """Owners written by each session, applied when its transaction commits."""
+
+    def __init__(self, name: str, apply: Callable[[set[Any]], None]) -> None:
+        """Listen for commits and rollbacks of every session.
+
+        Args:
+            name: Prefix of the ``Session.info`` key holding pending owners
+            apply: Called with the owners written by each committed
+                transaction; contains ``ALL_USERS`` when everyone is affected
+        """
+        self.key = f"{name}_pending"
+        self.apply = apply
+        event.listen(Session, "after_commit", self._after_commit)
+        event.listen(Session, "after_soft_rollback", self._after_soft_rollback)
+
+    def pending(self, session: Session) -> set[Any]:
+        """Owners written so far in the session's current transaction."""
+        return session.info.setdefault(self.key, set())
+
+    def _after_commit(self, session: Session) -> None:
+        pending = session.info.pop(self.key, None)
+        if pending:
+            self.apply(pending)
+
+    def _after_soft_rollback(
+        self, session: Session, previous_transaction: SessionTransaction
+    ) -> None:
+        # Rolling back a savepoint leaves the outer transaction's writes pending
+        if previous_transaction.parent is None:
+            session.info.pop(self.key, None)
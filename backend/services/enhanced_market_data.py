@@ -6,9 +6,10 @@ infrastructure for European and international securities.
 
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
-from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
 from enum import Enum
+import json
 import logging
 import time
 from typing import Any
@@ -17,11 +18,13 @@ import numpy as np
 import pandas as pd
 import yfinance as yf
 
+from backend.config import get_settings
 from backend.database import get_db_session
-from backend.models.isin import ISINTickerMapping
+from backend.services.cache import TwoTierCache
 from backend.services.european_mappings import get_european_mapping_service
 from backend.services.german_data_providers import get_german_data_service
 from backend.services.isin_utils import get_isin_service
+from backend.services.single_flight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
@@ -97,12 +100,28 @@ class MarketQuote:
     is_tradeable: bool = True
     market_state: str | None = None  # REGULAR, CLOSED, PRE, POST
 
-    @property
     def is_fresh(self, max_age_minutes: int = 15) -> bool:
         """Check if quote is fresh."""
         age = datetime.now() - self.timestamp
         return age.total_seconds() < (max_age_minutes * 60)
 
+    def to_json(self) -> str:
+        """Serialize for the shared quote cache."""
+        data = asdict(self)
+        data["source"] = self.source.value
+        data["quote_type"] = self.quote_type.value
+        data["timestamp"] = self.timestamp.isoformat()
+        return json.dumps(data)
+
+    @classmethod
+    def from_json(cls, raw: str) -> "MarketQuote":
+        """Rebuild a quote stored by ``to_json``."""
+        data = json.loads(raw)
+        data["source"] = DataSource(data["source"])
+        data["quote_type"] = QuoteType(data["quote_type"])
+        data["timestamp"] = datetime.fromisoformat(data["timestamp"])
+        return cls(**data)
+
     @property
     def formatted_change(self) -> str:
         """Get formatted change string."""
@@ -176,9 +195,20 @@ class EnhancedMarketDataService:
         self.european_service = get_european_mapping_service()
         self.isin_service = get_isin_service()
 
-        # Caching
-        self.quote_cache: dict[str, MarketQuote] = {}
-        self.cache_ttl = 300  # 5 minutes
+        # Caching (in-process LRU shared with other workers through Redis)
+        settings = get_settings()
+        self.cache_ttl = settings.market_data_cache_ttl
+        self.quote_cache: TwoTierCache[MarketQuote] = TwoTierCache(
+            namespace="enhanced_quotes",
+            ttl=self.cache_ttl,
+            max_size=settings.quote_cache_max_size,
+            encode=MarketQuote.to_json,
+            decode=MarketQuote.from_json,
+        )
+        # Concurrent lookups for the same ISIN share one upstream fetch
+        self.in_flight: SingleFlight[MarketQuote | None] = SingleFlight(
+            "enhanced_quotes"
+        )
 
         # Rate limiting
         self.rate_limits = {
@@ -223,12 +253,22 @@ class EnhancedMarketDataService:
             MarketQuote if found, None otherwise
         """
         # Check cache first
-        if use_cache and isin in self.quote_cache:
-            cached_quote = self.quote_cache[isin]
-            if cached_quote.is_fresh():
+        if use_cache:
+            cached_quote = self.quote_cache.get(isin)
+            if cached_quote is not None:
                 logger.debug(f"Using cached quote for {isin}")
                 return cached_quote
 
+        source_key = prefer_source.value if prefer_source else "any"
+        return await self.in_flight.do_async(
+            f"{isin}:{source_key}",
+            lambda: self._fetch_quote_by_isin(isin, prefer_source),
+        )
+
+    async def _fetch_quote_by_isin(
+        self, isin: str, prefer_source: DataSource | None
+    ) -> MarketQuote | None:
+        """Resolve an ISIN and try each source until one returns a quote."""
         # Get ticker mapping for ISIN
         ticker = await self._resolve_isin_to_ticker(isin)
         if not ticker:
@@ -254,7 +294,7 @@ class EnhancedMarketDataService:
                 quote = await self._fetch_quote_from_source(ticker, source, isin)
                 if quote:
                     # Cache the result
-                    self.quote_cache[isin] = quote
+                    self.quote_cache.set(isin, quote)
                     logger.debug(f"Retrieved quote for {isin} from {source.value}")
                     return quote
             except Exception as e:
@@ -342,17 +382,12 @@ class EnhancedMarketDataService:
         try:
             # First check our ISIN mapping service
             with get_db_session() as db:
-                mapping = (
-                    db.query(ISINTickerMapping)
-                    .filter(
-                        ISINTickerMapping.isin == isin,
-                        ISINTickerMapping.is_active,
-                    )
-                    .order_by(ISINTickerMapping.confidence.desc())
-                    .first()
+                mappings = self.isin_service.mapping_service.get_mappings_from_db(
+                    db, isin
                 )
 
-                if mapping:
+                if mappings:
+                    mapping = mappings[0]
                     # Format ticker with exchange if needed
                     ticker = mapping.ticker
                     if mapping.exchange_code and not ticker.endswith(
@@ -532,16 +567,13 @@ class EnhancedMarketDataService:
 
     def get_cache_stats(self) -> dict[str, Any]:
         """Get cache statistics."""
-        total_entries = len(self.quote_cache)
-        fresh_entries = sum(
-            1 for quote in self.quote_cache.values() if quote.is_fresh()
-        )
+        cache_stats = self.quote_cache.get_stats()
 
         return {
-            "total_cached_quotes": total_entries,
-            "fresh_quotes": fresh_entries,
-            "stale_quotes": total_entries - fresh_entries,
-            "cache_hit_ratio": fresh_entries / max(total_entries, 1),
+            "total_cached_quotes": cache_stats["size"],
+            "cache_hit_ratio": cache_stats["hit_ratio"],
+            "cache": cache_stats,
+            "single_flight": self.in_flight.get_stats(),
             "supported_sources": [source.value for source in DataSource],
             "rate_limits": {
                 source.value: limit for source, limit in self.rate_limits.items()
@@ -554,17 +586,8 @@ class EnhancedMarketDataService:
             self.quote_cache.clear()
             logger.info("Cleared entire quote cache")
         else:
-            cutoff = datetime.now() - timedelta(minutes=older_than_minutes)
-            to_remove = [
-                isin
-                for isin, quote in self.quote_cache.items()
-                if quote.timestamp < cutoff
-            ]
-
-            for isin in to_remove:
-                del self.quote_cache[isin]
-
-            logger.info(f"Removed {len(to_remove)} stale quotes from cache")
+            removed = self.quote_cache.clear(older_than=older_than_minutes * 60)
+            logger.info(f"Removed {removed} stale quotes from cache")
 
     async def get_market_status(self, exchange: str = "XETR") -> dict[str, Any]:
         """Get market status for an exchange."""
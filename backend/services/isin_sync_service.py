@@ -23,6 +23,7 @@ from backend.services.european_mappings import (
     get_european_mappings_service,
 )
 from backend.services.german_data_providers import get_german_data_service
+from backend.services.isin_utils import isin_mapping_index
 
 logger = logging.getLogger(__name__)
 
@@ -417,6 +418,7 @@ class ISINSyncService:
                 mapping.last_updated = datetime.now()
 
                 db.commit()
+                isin_mapping_index.invalidate([conflict.isin])
 
             elif resolution == ConflictResolution.MERGE:
                 # Implement merge logic
@@ -448,6 +450,7 @@ class ISINSyncService:
         existing.last_updated = datetime.now()
 
         db.commit()
+        isin_mapping_index.invalidate([conflict.isin])
 
     async def _create_or_update_mapping(
         self, db: Session, isin: str, data: dict[str, Any]
@@ -489,6 +492,7 @@ class ISINSyncService:
                 db.add(new_mapping)
 
             db.commit()
+            isin_mapping_index.invalidate([isin])
 
         except Exception as e:
             logger.error(f"Error creating/updating mapping for {isin}: {e}")
@@ -5,18 +5,71 @@ caching, and database integration for the Financial Dashboard.
 """
 
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timedelta
+from functools import lru_cache
 import logging
 import re
+import threading
 import time
 from typing import Any
 
+import numpy as np
 from sqlalchemy import and_
 from sqlalchemy.orm import Session
 
+from backend.config import get_settings
 from backend.exceptions import ISINValidationError
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Entries kept in the in-memory ISIN validation cache
+VALIDATION_CACHE_SIZE = 65536
+
+# ISINs per IN query when loading mappings for a batch
+MAPPING_QUERY_CHUNK_SIZE = 500
+
+# Incremental index refreshes re-read rows this far behind the watermark:
+# ``now()`` is the transaction start time, so rows can commit "in the past",
+# and SQLite stores ``CURRENT_TIMESTAMP`` at whole-second resolution
+MAPPING_WATERMARK_OVERLAP = timedelta(seconds=5)
+
+
+def _build_luhn_tables() -> tuple[np.ndarray, np.ndarray]:
+    """Precompute per-character Luhn contributions for batch validation.
+
+    ISIN letters expand to two digits (A=10 ... Z=35), so whether a digit is
+    doubled depends on how many expanded digits sit to its right. For each
+    ASCII code the tables hold the expanded length and the contribution
+    when the character's last digit lands on a doubled (row 0) or undoubled
+    (row 1) position.
+    """
+
+    def luhn(digit: int, doubled: bool) -> int:
+        if not doubled:
+            return digit
+        digit *= 2
+        return digit - 9 if digit > 9 else digit
+
+    lengths = np.zeros(128, dtype=np.int64)
+    contributions = np.zeros((2, 128), dtype=np.int64)
+    for code in range(128):
+        char = chr(code)
+        if char.isdigit():
+            lengths[code] = 1
+            for parity in (0, 1):
+                contributions[parity, code] = luhn(int(char), parity == 0)
+        elif "A" <= char <= "Z":
+            lengths[code] = 2
+            tens, ones = divmod(code - ord("A") + 10, 10)
+            for parity in (0, 1):
+                contributions[parity, code] = luhn(ones, parity == 0) + luhn(
+                    tens, parity == 1
+                )
+    return lengths, contributions
+
+
+_LUHN_LENGTHS, _LUHN_CONTRIBUTIONS = _build_luhn_tables()
 
 
 @dataclass
@@ -32,6 +85,49 @@ class ISINInfo:
     validation_error: str | None = None
 
 
+@dataclass
+class ISINBatchValidation:
+    """Compact validation results for a batch of ISINs.
+
+    All arrays are aligned with the input order. ``expected_check_digit`` is
+    -1 where the format is invalid.
+    """
+
+    isins: list[str | None]
+    is_valid: np.ndarray
+    format_valid: np.ndarray
+    expected_check_digit: np.ndarray
+    empty: np.ndarray
+    not_string: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.isins)
+
+    @property
+    def valid_count(self) -> int:
+        """Number of valid ISINs in the batch."""
+        return int(self.is_valid.sum())
+
+    def error(self, index: int) -> str | None:
+        """Error message for one entry, matching ``ISINUtils.validate_isin``."""
+        if self.is_valid[index]:
+            return None
+        if self.empty[index]:
+            return "ISIN cannot be empty"
+        if self.not_string[index]:
+            return "ISIN must be a string"
+        if not self.format_valid[index]:
+            return "Invalid ISIN format"
+        return (
+            f"Invalid checksum (expected {self.expected_check_digit[index]}, "
+            f"got {self.isins[index][11]})"
+        )
+
+    def results(self) -> list[tuple[bool, str | None]]:
+        """Per-ISIN ``(is_valid, error)`` tuples like ``validate_isin``."""
+        return [(bool(valid), self.error(i)) for i, valid in enumerate(self.is_valid)]
+
+
 @dataclass
 class ISINMapping:
     """ISIN to ticker mapping result."""
@@ -229,11 +325,16 @@ class ISINUtils:
     def validate_isin(
         cls, isin: str, use_cache: bool = True
     ) -> tuple[bool, str | None]:
-        """Validate ISIN code completely with optional database caching.
+        """Validate ISIN code completely with optional in-memory caching.
+
+        Results are pure functions of the ISIN, so they are memoized in a
+        bounded process-local LRU rather than round-tripping to the
+        database. ``ISINValidationCache`` rows are written in batches by the
+        ``validate_isin_batch`` task.
 
         Args:
             isin: ISIN code to validate
-            use_cache: Whether to use database cache for validation
+            use_cache: Whether to use the in-memory validation cache
 
         Returns:
             Tuple of (is_valid, error_message)
@@ -247,68 +348,93 @@ class ISINUtils:
 
         isin = isin.upper().strip()
 
-        # Check cache first if enabled
         if use_cache:
-            try:
-                from backend.database import get_db_session
-                from backend.models.isin import ISINValidationCache
-
-                with get_db_session() as db:
-                    cached = (
-                        db.query(ISINValidationCache)
-                        .filter(ISINValidationCache.isin == isin)
-                        .first()
-                    )
+            return _cached_validation(isin)
 
-                    if cached and cached.is_fresh(24):
-                        logger.debug(f"Using cached ISIN validation for {isin}")
-                        return cached.is_valid, cached.validation_error
+        isin_info = cls.parse_isin(isin)
+        return isin_info.is_valid, isin_info.validation_error
 
-            except Exception as e:
-                logger.warning(f"Cache lookup failed for ISIN {isin}: {e}")
+    @classmethod
+    def validate_isins(cls, isins: list[str] | np.ndarray) -> ISINBatchValidation:
+        """Validate a batch of ISINs with vectorized format and Luhn checks.
 
-        # Perform validation
-        isin_info = cls.parse_isin(isin)
+        Characters are mapped through precomputed lookup tables, so the whole
+        batch is checked with a handful of NumPy operations instead of a
+        Python loop per character.
 
-        # Cache the result if caching is enabled
-        if use_cache:
-            try:
-                from backend.database import get_db_session
-                from backend.models.isin import ISINValidationCache
-
-                with get_db_session() as db:
-                    # Delete old cache entry if exists
-                    db.query(ISINValidationCache).filter(
-                        ISINValidationCache.isin == isin
-                    ).delete()
-
-                    # Create new cache entry
-                    cache_entry = ISINValidationCache.create_from_validation(
-                        isin=isin,
-                        is_valid=isin_info.is_valid,
-                        country_code=(
-                            isin_info.country_code if isin_info.is_valid else None
-                        ),
-                        country_name=(
-                            isin_info.country_name if isin_info.is_valid else None
-                        ),
-                        national_code=(
-                            isin_info.national_code if isin_info.is_valid else None
-                        ),
-                        check_digit=(
-                            isin_info.check_digit if isin_info.is_valid else None
-                        ),
-                        validation_error=isin_info.validation_error,
-                    )
+        Args:
+            isins: ISIN codes to validate (normalized like ``validate_isin``)
+
+        Returns:
+            ISINBatchValidation with arrays aligned to the input
+        """
+        raw = list(isins)
+        count = len(raw)
+        empty = np.fromiter((not value for value in raw), dtype=bool, count=count)
+        not_string = np.fromiter(
+            (bool(value) and not isinstance(value, str) for value in raw),
+            dtype=bool,
+            count=count,
+        )
+        normalized = [
+            value.upper().strip() if isinstance(value, str) else value for value in raw
+        ]
+        candidate = ~(empty | not_string) & np.fromiter(
+            (isinstance(value, str) and len(value) == 12 for value in normalized),
+            dtype=bool,
+            count=count,
+        )
 
-                    db.add(cache_entry)
-                    db.commit()
-                    logger.debug(f"Cached ISIN validation result for {isin}")
+        codes = np.zeros((count, 12), dtype=np.uint32)
+        if candidate.any():
+            codes[candidate] = (
+                np.array(
+                    [normalized[i] for i in np.flatnonzero(candidate)], dtype="<U12"
+                )
+                .view(np.uint32)
+                .reshape(-1, 12)
+            )
 
-            except Exception as e:
-                logger.warning(f"Failed to cache ISIN validation for {isin}: {e}")
+        is_upper = (codes >= ord("A")) & (codes <= ord("Z"))
+        is_digit = (codes >= ord("0")) & (codes <= ord("9"))
+        format_valid = (
+            candidate
+            & is_upper[:, :2].all(axis=1)
+            & (is_upper | is_digit)[:, 2:11].all(axis=1)
+            & is_digit[:, 11]
+        )
 
-        return isin_info.is_valid, isin_info.validation_error
+        # Luhn over the first 11 characters: the doubling parity of each
+        # character depends on the expanded length of everything to its right
+        body = np.where(codes[:, :11] < 128, codes[:, :11], 0).astype(np.intp)
+        lengths = _LUHN_LENGTHS[body]
+        digits_to_right = np.cumsum(lengths[:, ::-1], axis=1)[:, ::-1] - lengths
+        totals = _LUHN_CONTRIBUTIONS[digits_to_right % 2, body].sum(axis=1)
+        expected = (10 - totals % 10) % 10
+
+        actual = codes[:, 11].astype(np.int64) - ord("0")
+        is_valid = format_valid & (expected == actual)
+        expected_check_digit = np.where(format_valid, expected, -1).astype(np.int8)
+
+        return ISINBatchValidation(
+            isins=normalized,
+            is_valid=is_valid,
+            format_valid=format_valid,
+            expected_check_digit=expected_check_digit,
+            empty=empty,
+            not_string=not_string,
+        )
+
+    @classmethod
+    def validation_cache_info(cls) -> dict[str, int]:
+        """Hit/miss counters for the in-memory validation cache."""
+        info = _cached_validation.cache_info()
+        return {
+            "hits": info.hits,
+            "misses": info.misses,
+            "size": info.currsize,
+            "max_size": info.maxsize,
+        }
 
     @classmethod
     def get_preferred_exchanges(cls, country_code: str) -> list[str]:
@@ -425,12 +551,277 @@ class ISINUtils:
         return suggestions
 
 
+@lru_cache(maxsize=VALIDATION_CACHE_SIZE)
+def _cached_validation(isin: str) -> tuple[bool, str | None]:
+    """Memoized validation of an already-normalized ISIN."""
+    isin_info = ISINUtils.parse_isin(isin)
+    return isin_info.is_valid, isin_info.validation_error
+
+
+class _MappingMaps:
+    """Active mappings keyed by row ID, by ISIN and by ticker."""
+
+    def __init__(self) -> None:
+        self.rows: dict[int, tuple[tuple, ISINMapping]] = {}
+        self.ids_by_isin: dict[str, set[int]] = {}
+        self.ids_by_ticker: dict[str, set[int]] = {}
+        self.by_isin: dict[str, list[ISINMapping]] = {}
+        self.by_ticker: dict[str, list[ISINMapping]] = {}
+        self.watermark: datetime | None = None
+
+    def apply(self, rows: list[Any], removed: list[int] | None = None) -> None:
+        """Upsert active rows, drop inactive or removed ones, and re-sort."""
+        touched_isins: set[str] = set()
+        touched_tickers: set[str] = set()
+
+        def drop(row_id: int) -> None:
+            entry = self.rows.pop(row_id, None)
+            if entry is None:
+                return
+            mapping = entry[1]
+            ticker = mapping.ticker.upper()
+            self.ids_by_isin[mapping.isin].discard(row_id)
+            self.ids_by_ticker[ticker].discard(row_id)
+            touched_isins.add(mapping.isin)
+            touched_tickers.add(ticker)
+
+        for row_id in removed or ():
+            drop(row_id)
+
+        for row in rows:
+            drop(row.id)
+            if row.last_updated is not None and (
+                self.watermark is None or row.last_updated > self.watermark
+            ):
+                self.watermark = row.last_updated
+            if not row.is_active:
+                continue
+
+            mapping = ISINMappingService._to_mapping(row)
+            created = row.created_at.timestamp() if row.created_at else 0.0
+            # Same order as the database lookups: confidence, then newest first
+            sort_key = (-(mapping.confidence or 0.0), -created, -row.id)
+            self.rows[row.id] = (sort_key, mapping)
+
+            ticker = mapping.ticker.upper()
+            self.ids_by_isin.setdefault(mapping.isin, set()).add(row.id)
+            self.ids_by_ticker.setdefault(ticker, set()).add(row.id)
+            touched_isins.add(mapping.isin)
+            touched_tickers.add(ticker)
+
+        for keys, ids_by_key, index in (
+            (touched_isins, self.ids_by_isin, self.by_isin),
+            (touched_tickers, self.ids_by_ticker, self.by_ticker),
+        ):
+            for key in keys:
+                entries = sorted(self.rows[row_id] for row_id in ids_by_key[key])
+                if entries:
+                    index[key] = [mapping for _, mapping in entries]
+                else:
+                    index.pop(key, None)
+                    ids_by_key.pop(key, None)
+
+
+class ISINMappingIndex:
+    """In-process index of active ISIN mappings keyed by ISIN and by ticker.
+
+    The first lookup (or ``load`` at startup) reads every active mapping.
+    After that the index only pulls rows whose ``last_updated`` is at or past
+    the newest timestamp it has seen, at most once per ``refresh_interval``,
+    plus any ISINs writers flagged through ``invalidate``. Writers that set
+    ``last_updated`` from a skewed clock are covered by the invalidation; a
+    full reload every ``reload_interval`` seconds catches rows changed
+    outside the application.
+
+    Queries run outside the lock that guards the maps: a full reload builds
+    new maps and swaps them in, and an incremental refresh merges the rows
+    it read under the lock. One caller refreshes at a time; the others,
+    including coroutines sharing the event-loop thread with it through
+    ``AsyncSession.run_sync``, serve the current maps instead of waiting.
+    """
+
+    def __init__(self, refresh_interval: float, reload_interval: float):
+        self.refresh_interval = refresh_interval
+        self.reload_interval = reload_interval
+        # Guards the state below and is never held across a query
+        self._lock = threading.Lock()
+        # Held by the one caller currently querying the database
+        self._refresh_lock = threading.Lock()
+        self._maps = _MappingMaps()
+        self._loaded_at: float | None = None
+        self._refreshed_at = 0.0
+        self._dirty: set[str] = set()
+        self._reload_requested = False
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "full_loads": 0,
+            "incremental_refreshes": 0,
+            "refresh_errors": 0,
+        }
+
+    def load(self, db: Session) -> int:
+        """Load every active mapping, replacing the current contents.
+
+        Waits for a refresh already in progress, so only call this outside
+        the event loop, e.g. at startup.
+
+        Returns:
+            Number of mappings in the index
+        """
+        with self._refresh_lock:
+            return self._load(db)
+
+    def _load(self, db: Session) -> int:
+        from backend.models.isin import ISINTickerMapping
+
+        # Flags raised while the query runs stay set for the next refresh
+        with self._lock:
+            dirty = set(self._dirty)
+            reload_requested = self._reload_requested
+            self._reload_requested = False
+        try:
+            rows = db.query(ISINTickerMapping).filter(ISINTickerMapping.is_active).all()
+            maps = _MappingMaps()
+            maps.apply(rows)
+        except Exception:
+            with self._lock:
+                self._reload_requested = self._reload_requested or reload_requested
+            raise
+
+        with self._lock:
+            self._maps = maps
+            self._dirty -= dirty
+            self._loaded_at = self._refreshed_at = time.monotonic()
+            self._stats["full_loads"] += 1
+        logger.info(f"Loaded {len(maps.rows)} ISIN mappings into memory")
+        return len(maps.rows)
+
+    def ensure_fresh(self, db: Session) -> bool:
+        """Bring the index up to date if a refresh is due.
+
+        Returns immediately when another caller is already refreshing.
+
+        Returns:
+            True if the index can serve lookups, False if it was never loaded
+        """
+        if self._refresh_lock.acquire(blocking=False):
+            try:
+                self._refresh_if_due(db)
+            except Exception as e:
+                with self._lock:
+                    self._stats["refresh_errors"] += 1
+                logger.warning(f"Failed to refresh ISIN mapping index: {e}")
+            finally:
+                self._refresh_lock.release()
+        with self._lock:
+            return self._loaded_at is not None
+
+    def _refresh_if_due(self, db: Session) -> None:
+        now = time.monotonic()
+        with self._lock:
+            reload_due = (
+                self._loaded_at is None
+                or self._reload_requested
+                or now - self._loaded_at >= self.reload_interval
+                or len(self._dirty) > MAPPING_QUERY_CHUNK_SIZE
+            )
+            refresh_due = (
+                bool(self._dirty) or now - self._refreshed_at >= self.refresh_interval
+            )
+        if reload_due:
+            self._load(db)
+        elif refresh_due:
+            self._refresh(db)
+
+    def _refresh(self, db: Session) -> None:
+        """Merge rows changed since the watermark and rows of flagged ISINs."""
+        from sqlalchemy import or_
+
+        from backend.models.isin import ISINTickerMapping
+
+        with self._lock:
+            watermark = self._maps.watermark
+            dirty = set(self._dirty)
+
+        conditions = []
+        if watermark is not None:
+            conditions.append(
+                ISINTickerMapping.last_updated >= watermark - MAPPING_WATERMARK_OVERLAP
+            )
+        if dirty:
+            conditions.append(ISINTickerMapping.isin.in_(dirty))
+        if not conditions:
+            self._load(db)
+            return
+
+        rows = db.query(ISINTickerMapping).filter(or_(*conditions)).all()
+
+        # Only this caller changes the maps, so the row IDs it saw still apply
+        seen = {row.id for row in rows}
+        with self._lock:
+            # Rows of flagged ISINs that the query no longer returns were deleted
+            stale = [
+                row_id
+                for isin in dirty
+                for row_id in self._maps.ids_by_isin.get(isin, ())
+                if row_id not in seen
+            ]
+            self._maps.apply(rows, removed=stale)
+            self._dirty -= dirty
+            self._refreshed_at = time.monotonic()
+            self._stats["incremental_refreshes"] += 1
+
+    def lookup(self, isin: str) -> list[ISINMapping]:
+        """Active mappings for an ISIN, most confident first."""
+        with self._lock:
+            mappings = self._maps.by_isin.get(isin.upper().strip())
+            self._stats["hits" if mappings else "misses"] += 1
+            return list(mappings or ())
+
+    def lookup_ticker(self, ticker: str) -> list[ISINMapping]:
+        """Active mappings listing a ticker, most confident first."""
+        with self._lock:
+            mappings = self._maps.by_ticker.get(ticker.upper().strip())
+            self._stats["hits" if mappings else "misses"] += 1
+            return list(mappings or ())
+
+    def invalidate(self, isins: list[str] | None = None) -> None:
+        """Flag ISINs whose mappings changed, or everything when ``isins`` is None.
+
+        Flagged ISINs are re-read on the next lookup regardless of
+        ``refresh_interval``.
+        """
+        with self._lock:
+            if isins is None:
+                self._reload_requested = True
+            else:
+                self._dirty.update(isin.upper().strip() for isin in isins if isin)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get index size, freshness and hit statistics."""
+        with self._lock:
+            maps = self._maps
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                "loaded": self._loaded_at is not None,
+                "mappings": len(maps.rows),
+                "isins": len(maps.by_isin),
+                "tickers": len(maps.by_ticker),
+                "watermark": maps.watermark.isoformat() if maps.watermark else None,
+                "pending_invalidations": len(self._dirty),
+                "hit_ratio": self._stats["hits"] / lookups if lookups else 0.0,
+                **self._stats,
+            }
+
+
 class ISINMappingService:
     """Service for managing ISIN to ticker mappings with database persistence."""
 
-    def __init__(self):
+    def __init__(self, index: ISINMappingIndex | None = None):
         self.rate_limit_delay = 2.0  # Seconds between external API calls
         self.last_call_time = 0
+        self.index = index
 
     def _respect_rate_limit(self):
         """Ensure we don't exceed API rate limits."""
@@ -494,6 +885,12 @@ class ISINMappingService:
         Returns:
             List of ISINMapping objects
         """
+        if active_only and self.index is not None and self.index.ensure_fresh(db):
+            mappings = self.index.lookup(isin)
+            if exchange_code:
+                mappings = [m for m in mappings if m.exchange_code == exchange_code]
+            return mappings
+
         try:
             from backend.models.isin import ISINTickerMapping
 
@@ -512,28 +909,102 @@ class ISINMappingService:
                 ISINTickerMapping.confidence.desc(), ISINTickerMapping.created_at.desc()
             )
 
-            mappings = []
-            for mapping in query.all():
-                mappings.append(
-                    ISINMapping(
-                        isin=mapping.isin,
-                        ticker=mapping.ticker,
-                        exchange_code=mapping.exchange_code or "",
-                        exchange_name=mapping.exchange_name or "",
-                        security_name=mapping.security_name or "",
-                        currency=mapping.currency or "",
-                        source=mapping.source,
-                        confidence=mapping.confidence,
-                        is_active=mapping.is_active,
-                    )
+            return [self._to_mapping(mapping) for mapping in query.all()]
+
+        except Exception as e:
+            logger.error(f"Error getting ISIN mappings from database for {isin}: {e}")
+            return []
+
+    def get_mappings_for_isins(
+        self, db: Session, isins: list[str], active_only: bool = True
+    ) -> dict[str, list[ISINMapping]]:
+        """Get mappings for many ISINs with one ``IN`` query per chunk.
+
+        Args:
+            db: Database session
+            isins: ISIN codes
+            active_only: Whether to return only active mappings
+
+        Returns:
+            Dict of upper-cased ISIN to its mappings, ordered by confidence
+            (highest first) and creation date (newest first)
+        """
+        keys = list(dict.fromkeys(isin.upper() for isin in isins))
+        if active_only and self.index is not None and self.index.ensure_fresh(db):
+            return {isin: self.index.lookup(isin) for isin in keys}
+
+        grouped: dict[str, list[ISINMapping]] = {isin: [] for isin in keys}
+
+        try:
+            from backend.models.isin import ISINTickerMapping
+
+            for start in range(0, len(keys), MAPPING_QUERY_CHUNK_SIZE):
+                chunk = keys[start : start + MAPPING_QUERY_CHUNK_SIZE]
+                query = db.query(ISINTickerMapping).filter(
+                    ISINTickerMapping.isin.in_(chunk)
                 )
+                if active_only:
+                    query = query.filter(ISINTickerMapping.is_active)
+                query = query.order_by(
+                    ISINTickerMapping.confidence.desc(),
+                    ISINTickerMapping.created_at.desc(),
+                )
+                for mapping in query.all():
+                    grouped[mapping.isin].append(self._to_mapping(mapping))
 
-            return mappings
+        except Exception as e:
+            logger.error(f"Error getting ISIN mappings for {len(keys)} ISINs: {e}")
+
+        return grouped
+
+    def get_mappings_for_ticker(self, db: Session, ticker: str) -> list[ISINMapping]:
+        """Get active mappings listing a ticker, most confident first.
+
+        Args:
+            db: Database session
+            ticker: Ticker symbol
+
+        Returns:
+            List of ISINMapping objects
+        """
+        if self.index is not None and self.index.ensure_fresh(db):
+            return self.index.lookup_ticker(ticker)
+
+        try:
+            from backend.models.isin import ISINTickerMapping
+
+            query = (
+                db.query(ISINTickerMapping)
+                .filter(
+                    ISINTickerMapping.ticker == ticker.upper(),
+                    ISINTickerMapping.is_active,
+                )
+                .order_by(
+                    ISINTickerMapping.confidence.desc(),
+                    ISINTickerMapping.created_at.desc(),
+                )
+            )
+            return [self._to_mapping(mapping) for mapping in query.all()]
 
         except Exception as e:
-            logger.error(f"Error getting ISIN mappings from database for {isin}: {e}")
+            logger.error(f"Error getting ISIN mappings for ticker {ticker}: {e}")
             return []
 
+    @staticmethod
+    def _to_mapping(mapping: Any) -> ISINMapping:
+        """Convert an ``ISINTickerMapping`` row to an ISINMapping."""
+        return ISINMapping(
+            isin=mapping.isin,
+            ticker=mapping.ticker,
+            exchange_code=mapping.exchange_code or "",
+            exchange_name=mapping.exchange_name or "",
+            security_name=mapping.security_name or "",
+            currency=mapping.currency or "",
+            source=mapping.source,
+            confidence=mapping.confidence,
+            is_active=mapping.is_active,
+        )
+
     def save_mapping_to_db(
         self, db: Session, mapping: ISINMapping, update_existing: bool = True
     ) -> bool:
@@ -599,6 +1070,7 @@ class ISINMappingService:
                 )
 
             db.commit()
+            isin_mapping_index.invalidate([mapping.isin])
             return True
 
         except Exception as e:
@@ -662,28 +1134,80 @@ class ISINMappingService:
             logger.warning(f"Invalid ISIN provided: {isin} - {error}")
             return None
 
-        # Parse ISIN to get country information
-        isin_info = ISINUtils.parse_isin(isin)
-        country_code = preferred_country or isin_info.country_code
+        # Load every active mapping once and rank them in memory
+        isin = isin.upper().strip()
+        mappings = self.get_mappings_from_db(db, isin)
+        if not mappings:
+            logger.debug(f"No database mappings found for ISIN {isin}")
+            return None
+
+        country_code = preferred_country or isin[:2]
+        return self.select_best_mapping(
+            mappings, ISINUtils.get_preferred_exchanges(country_code)
+        ).ticker
 
-        # Get preferred exchanges for the country
-        preferred_exchanges = ISINUtils.get_preferred_exchanges(country_code)
+    def resolve_isins_to_tickers(
+        self, db: Session, isins: list[str], preferred_country: str | None = None
+    ) -> dict[str, str | None]:
+        """Resolve many ISINs to tickers in a single database round trip.
 
-        # Try each preferred exchange in order
-        for exchange in preferred_exchanges:
-            ticker = self.get_best_ticker_for_exchange(db, isin, exchange)
-            if ticker:
-                return ticker
+        Args:
+            db: Database session
+            isins: ISIN codes to resolve
+            preferred_country: Preferred country for exchange selection
 
-        # Fall back to any available mapping
-        return self.get_best_ticker_for_exchange(db, isin)
+        Returns:
+            Dict keyed by the given ISINs; invalid or unmapped ISINs map to None
+        """
+        validation = ISINUtils.validate_isins(isins)
+        valid = [
+            validation.isins[index] for index in np.flatnonzero(validation.is_valid)
+        ]
+        mappings = self.get_mappings_for_isins(db, valid)
+
+        resolved: dict[str, str | None] = {}
+        for index, isin in enumerate(isins):
+            if not validation.is_valid[index]:
+                logger.warning(
+                    f"Invalid ISIN provided: {isin} - {validation.error(index)}"
+                )
+                resolved[isin] = None
+                continue
+
+            normalized = validation.isins[index]
+            candidates = mappings.get(normalized)
+            if not candidates:
+                resolved[isin] = None
+                continue
+
+            preferred_exchanges = ISINUtils.get_preferred_exchanges(
+                preferred_country or normalized[:2]
+            )
+            resolved[isin] = self.select_best_mapping(
+                candidates, preferred_exchanges
+            ).ticker
+
+        return resolved
+
+    @staticmethod
+    def select_best_mapping(
+        mappings: list[ISINMapping], preferred_exchanges: list[str]
+    ) -> ISINMapping:
+        """Pick the mapping on the most preferred exchange.
+
+        Mappings on no preferred exchange rank last. Ties keep the input
+        order, so with confidence-ordered input the most confident mapping
+        wins within an exchange and in the fallback.
+        """
+        rank = {exchange: i for i, exchange in enumerate(preferred_exchanges)}
+        return min(mappings, key=lambda m: rank.get(m.exchange_code, len(rank)))
 
 
 class ISINService:
     """Main ISIN service combining validation, mapping, and resolution functionality."""
 
-    def __init__(self):
-        self.mapping_service = ISINMappingService()
+    def __init__(self, mapping_index: ISINMappingIndex | None = None):
+        self.mapping_service = ISINMappingService(mapping_index)
 
     def resolve_identifier(
         self, db: Session, identifier: str
@@ -863,8 +1387,14 @@ class ISINService:
             }
 
 
-# Global service instance
-isin_service = ISINService()
+# Global mapping index and service instance
+isin_mapping_index = ISINMappingIndex(
+    refresh_interval=settings.isin_mapping_refresh_interval,
+    reload_interval=settings.isin_mapping_cache_ttl,
+)
+isin_service = ISINService(
+    isin_mapping_index if settings.isin_mapping_index_enabled else None
+)
 
 
 def get_isin_service() -> ISINService:
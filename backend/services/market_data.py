@@ -1,25 +1,44 @@
 """Multi-provider market data service with fallback capabilities."""
 
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field, replace
 from datetime import date, datetime
 from decimal import Decimal
+import json
 import logging
+import threading
 import time
 from typing import Any
 
+import pandas as pd
 import requests
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 import yfinance as yf
 
 from backend.config import get_settings
 from backend.models.asset import Asset
 from backend.models.price_history import PriceHistory
+from backend.services.cache import TwoTierCache
 from backend.services.isin_utils import ISINUtils, isin_service
+from backend.services.price_store import sync_price_store
+from backend.services.single_flight import SingleFlight
 from backend.services.ticker_utils import TickerUtils
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Rows per statement for bulk price writes (keeps bind parameters under
+# SQLite's limit and statements a reasonable size on PostgreSQL)
+BULK_WRITE_CHUNK_SIZE = 500
+
+
+def _to_decimal(value: float | None) -> Decimal | None:
+    """Convert a float quote field to Decimal, preserving None."""
+    return Decimal(str(value)) if value is not None else None
+
 
 @dataclass
 class MarketDataResult:
@@ -39,17 +58,129 @@ class MarketDataResult:
     error: str | None = None
     suggestions: list[str] | None = None
 
+    def to_json(self) -> str:
+        """Serialize for the shared quote cache."""
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, raw: str) -> "MarketDataResult":
+        """Rebuild a result stored by ``to_json``."""
+        return cls(**json.loads(raw))
+
+
+@dataclass
+class BatchFetchStats:
+    """Throughput statistics for a multi-ticker fetch."""
+
+    total: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    elapsed_seconds: float = 0.0
+    workers: int = 0
+    bulk_fetched: int = 0
+    cache_hits: int = 0
+    provider_counts: dict[str, dict[str, int]] = field(default_factory=dict)
+
+    @property
+    def tickers_per_second(self) -> float:
+        """Completed tickers per wall-clock second."""
+        if self.elapsed_seconds <= 0:
+            return float(self.total)
+        return self.total / self.elapsed_seconds
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize stats for task results and logging."""
+        return {
+            "total": self.total,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "tickers_per_second": round(self.tickers_per_second, 2),
+            "workers": self.workers,
+            "bulk_fetched": self.bulk_fetched,
+            "cache_hits": self.cache_hits,
+            "providers": self.provider_counts,
+        }
+
+
+class TokenBucket:
+    """Thread-safe token bucket pacing calls to a single provider.
+
+    Tokens refill continuously at ``rate`` per second up to ``capacity``.
+    A caller reserves its token under the lock and sleeps outside it, so
+    concurrent workers queue for successive slots while the network time
+    of one request overlaps the wait of the next.
+    """
+
+    def __init__(self, rate: float | None, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self.last_refill
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.last_refill = now
+
+    def estimated_wait(self) -> float:
+        """Seconds until a token would be available, without reserving it."""
+        if not self.rate:
+            return 0.0
+        with self._lock:
+            self._refill(time.monotonic())
+            if self.tokens >= 1:
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    def reserve(self) -> float:
+        """Reserve one token and return the seconds to wait before using it."""
+        if not self.rate:
+            return 0.0
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def acquire(self) -> float:
+        """Block until a token is available and return the time waited."""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
 
 class MarketDataProvider:
     """Base class for market data providers."""
 
-    def __init__(self, name: str):
+    def __init__(self, name: str, rate_limit_delay: float = 0.0):
         self.name = name
+        self.rate_limit_delay = rate_limit_delay
+        self.rate_limiter = TokenBucket(
+            1 / rate_limit_delay if rate_limit_delay > 0 else None
+        )
+
+    def _respect_rate_limit(self):
+        """Ensure we don't exceed rate limits."""
+        waited = self.rate_limiter.acquire()
+        if waited > 0:
+            logger.debug(f"{self.name} rate limit: slept {waited:.1f}s")
 
     def fetch_quote(self, ticker: str) -> MarketDataResult:
         """Fetch current quote for a ticker."""
         raise NotImplementedError
 
+    def fetch_bulk_quotes(self, tickers: list[str]) -> dict[str, MarketDataResult]:
+        """Fetch quotes for many tickers in as few requests as possible.
+
+        Providers without a multi-symbol endpoint return an empty dict, and
+        callers fall back to ``fetch_quote`` for anything not returned.
+        """
+        return {}
+
     def fetch_multiple_quotes(self, tickers: list[str]) -> list[MarketDataResult]:
         """Fetch quotes for multiple tickers."""
         results = []
@@ -65,19 +196,7 @@ class YFinanceProvider(MarketDataProvider):
     """Yahoo Finance provider with international ticker support."""
 
     def __init__(self):
-        super().__init__("yfinance")
-        self.rate_limit_delay = 1.0  # 1 second between calls
-        self.last_call_time = 0
-
-    def _respect_rate_limit(self):
-        """Ensure we don't exceed rate limits."""
-        current_time = time.time()
-        time_since_last_call = current_time - self.last_call_time
-        if time_since_last_call < self.rate_limit_delay:
-            sleep_time = self.rate_limit_delay - time_since_last_call
-            logger.debug(f"YFinance rate limit: sleeping {sleep_time:.1f}s")
-            time.sleep(sleep_time)
-        self.last_call_time = time.time()
+        super().__init__("yfinance", rate_limit_delay=1.0)  # 1 second between calls
 
     def fetch_quote(self, ticker: str) -> MarketDataResult:
         """Fetch quote using yfinance."""
@@ -133,47 +252,7 @@ class YFinanceProvider(MarketDataProvider):
                     data_source=self.name,
                 )
 
-            # Get the most recent price
-            current_price = float(hist["Close"].iloc[-1])
-            open_price = float(hist["Open"].iloc[-1])
-            high_price = float(hist["High"].iloc[-1])
-            low_price = float(hist["Low"].iloc[-1])
-            volume = (
-                int(hist["Volume"].iloc[-1])
-                if "Volume" in hist.columns and hist["Volume"].iloc[-1] > 0
-                else None
-            )
-
-            # Calculate previous close and changes
-            previous_close = None
-            day_change = None
-            day_change_percent = None
-
-            if len(hist) > 1:
-                previous_close = float(hist["Close"].iloc[-2])
-                day_change = current_price - previous_close
-                day_change_percent = (
-                    (day_change / previous_close) * 100 if previous_close != 0 else 0
-                )
-
-            success_msg = f"Successfully fetched {ticker}"
-            if ticker_info.is_international:
-                success_msg += f" from {ticker_info.exchange_name} ({ticker_info.default_currency})"
-            logger.debug(success_msg)
-
-            return MarketDataResult(
-                ticker=ticker,
-                current_price=current_price,
-                open_price=open_price,
-                high_price=high_price,
-                low_price=low_price,
-                volume=volume,
-                previous_close=previous_close,
-                day_change=day_change,
-                day_change_percent=day_change_percent,
-                data_source=self.name,
-                success=True,
-            )
+            return self._result_from_history(ticker, hist)
 
         except Exception as e:
             error_msg = f"yFinance failed for {ticker}: {e}"
@@ -201,27 +280,139 @@ class YFinanceProvider(MarketDataProvider):
                 suggestions=suggestions,
             )
 
+    def _result_from_history(self, ticker: str, hist: pd.DataFrame) -> MarketDataResult:
+        """Build a quote from the last rows of a daily OHLCV frame."""
+        # Get the most recent price
+        current_price = float(hist["Close"].iloc[-1])
+        open_price = float(hist["Open"].iloc[-1])
+        high_price = float(hist["High"].iloc[-1])
+        low_price = float(hist["Low"].iloc[-1])
+        volume = (
+            int(hist["Volume"].iloc[-1])
+            if "Volume" in hist.columns and hist["Volume"].iloc[-1] > 0
+            else None
+        )
+
+        # Calculate previous close and changes
+        previous_close = None
+        day_change = None
+        day_change_percent = None
+
+        if len(hist) > 1:
+            previous_close = float(hist["Close"].iloc[-2])
+            day_change = current_price - previous_close
+            day_change_percent = (
+                (day_change / previous_close) * 100 if previous_close != 0 else 0
+            )
+
+        ticker_info = TickerUtils.parse_ticker(ticker)
+        success_msg = f"Successfully fetched {ticker}"
+        if ticker_info.is_international:
+            success_msg += (
+                f" from {ticker_info.exchange_name} ({ticker_info.default_currency})"
+            )
+        logger.debug(success_msg)
+
+        return MarketDataResult(
+            ticker=ticker,
+            current_price=current_price,
+            open_price=open_price,
+            high_price=high_price,
+            low_price=low_price,
+            volume=volume,
+            previous_close=previous_close,
+            day_change=day_change,
+            day_change_percent=day_change_percent,
+            data_source=self.name,
+            success=True,
+        )
+
+    def download_history(
+        self, tickers: list[str], period: str = "5d"
+    ) -> dict[str, pd.DataFrame]:
+        """Download daily history for many tickers with one call per chunk.
+
+        Each chunk of ``yfinance_bulk_chunk_size`` symbols is fetched with a
+        single ``yf.download`` call and costs one rate-limit token. Returns
+        frames keyed by the caller's ticker; tickers without rows are omitted.
+        """
+        symbols: dict[str, list[str]] = {}
+        for ticker in tickers:
+            symbols.setdefault(TickerUtils.format_for_yfinance(ticker), []).append(
+                ticker
+            )
+
+        symbol_list = list(symbols)
+        chunk_size = max(1, settings.yfinance_bulk_chunk_size)
+        frames: dict[str, pd.DataFrame] = {}
+
+        for start in range(0, len(symbol_list), chunk_size):
+            chunk = symbol_list[start : start + chunk_size]
+            self._respect_rate_limit()
+            try:
+                data = yf.download(
+                    chunk,
+                    period=period,
+                    interval="1d",
+                    group_by="ticker",
+                    auto_adjust=True,
+                    progress=False,
+                )
+            except Exception as e:
+                logger.warning(
+                    f"yFinance bulk download failed for {len(chunk)} symbols: {e}"
+                )
+                continue
+
+            if data is None or data.empty:
+                continue
+
+            for symbol in chunk:
+                frame = self._frame_for_symbol(data, symbol)
+                if frame is None:
+                    continue
+                for ticker in symbols[symbol]:
+                    frames[ticker] = frame
+
+        return frames
+
+    @staticmethod
+    def _frame_for_symbol(data: pd.DataFrame, symbol: str) -> pd.DataFrame | None:
+        """Extract one symbol's rows from a ``yf.download`` result."""
+        if isinstance(data.columns, pd.MultiIndex):
+            if symbol not in data.columns.get_level_values(0):
+                return None
+            frame = data[symbol]
+        else:
+            frame = data
+
+        if "Close" not in frame.columns:
+            return None
+        frame = frame.dropna(subset=["Close"])
+        return None if frame.empty else frame
+
+    def fetch_bulk_quotes(self, tickers: list[str]) -> dict[str, MarketDataResult]:
+        """Fetch quotes for many tickers via chunked multi-symbol downloads."""
+        results = {}
+        for ticker, frame in self.download_history(tickers).items():
+            try:
+                results[ticker] = self._result_from_history(ticker, frame)
+            except Exception as e:
+                logger.debug(f"Could not parse bulk data for {ticker}: {e}")
+        logger.info(f"yFinance bulk download returned {len(results)}/{len(tickers)}")
+        return results
+
 
 class AlphaVantageProvider(MarketDataProvider):
     """Alpha Vantage provider."""
 
     def __init__(self, api_key: str):
-        super().__init__("alpha_vantage")
         settings = get_settings()
+        super().__init__(
+            "alpha_vantage", rate_limit_delay=settings.alpha_vantage_rate_limit_delay
+        )
         self.api_key = api_key
         self.base_url = settings.alpha_vantage_base_url
-        self.rate_limit_delay = settings.alpha_vantage_rate_limit_delay
-        self.last_call_time = 0
-
-    def _respect_rate_limit(self):
-        """Ensure we don't exceed rate limits."""
-        current_time = time.time()
-        time_since_last_call = current_time - self.last_call_time
-        if time_since_last_call < self.rate_limit_delay:
-            sleep_time = self.rate_limit_delay - time_since_last_call
-            logger.info(f"Alpha Vantage rate limit: sleeping {sleep_time:.1f}s")
-            time.sleep(sleep_time)
-        self.last_call_time = time.time()
 
     def fetch_quote(self, ticker: str) -> MarketDataResult:
         """Fetch quote using Alpha Vantage."""
@@ -338,21 +529,10 @@ class FinnhubProvider(MarketDataProvider):
     """Finnhub provider."""
 
     def __init__(self, api_key: str):
-        super().__init__("finnhub")
         settings = get_settings()
+        super().__init__("finnhub", rate_limit_delay=settings.finnhub_rate_limit_delay)
         self.api_key = api_key
         self.base_url = settings.finnhub_base_url
-        self.rate_limit_delay = settings.finnhub_rate_limit_delay
-        self.last_call_time = 0
-
-    def _respect_rate_limit(self):
-        """Ensure we don't exceed rate limits."""
-        current_time = time.time()
-        time_since_last_call = current_time - self.last_call_time
-        if time_since_last_call < self.rate_limit_delay:
-            sleep_time = self.rate_limit_delay - time_since_last_call
-            time.sleep(sleep_time)
-        self.last_call_time = time.time()
 
     def fetch_quote(self, ticker: str) -> MarketDataResult:
         """Fetch quote using Finnhub."""
@@ -469,11 +649,22 @@ class MultiProviderMarketDataService:
             self.providers.append(FinnhubProvider(settings.finnhub_api_key))
             logger.info("Finnhub provider initialized")
 
+        self.last_batch_stats: BatchFetchStats | None = None
+        self.quote_cache: TwoTierCache[MarketDataResult] = TwoTierCache(
+            namespace="quotes",
+            ttl=settings.market_data_cache_ttl,
+            max_size=settings.quote_cache_max_size,
+            encode=MarketDataResult.to_json,
+            decode=MarketDataResult.from_json,
+        )
+        self.in_flight: SingleFlight[MarketDataResult] = SingleFlight("quotes")
+
         logger.info(f"Initialized {len(self.providers)} market data providers")
 
-    def fetch_quote(self, ticker: str, db: Session | None = None) -> MarketDataResult:
-        """Fetch quote with fallback across providers and ISIN support."""
-        # First, try to resolve ISIN to ticker if needed
+    def _resolve_identifier(
+        self, ticker: str, db: Session | None = None
+    ) -> tuple[str, str]:
+        """Resolve an ISIN to a ticker, returning (resolved_ticker, identifier_type)."""
         resolved_ticker = ticker
         identifier_type = "ticker"
 
@@ -489,24 +680,58 @@ class MultiProviderMarketDataService:
                 logger.warning(f"Failed to resolve ISIN {ticker}: {e}")
                 # Continue with original identifier
 
+        return resolved_ticker, identifier_type
+
+    def _resolve_identifiers(
+        self, tickers: list[str], db: Session | None = None
+    ) -> list[tuple[str, str]]:
+        """Resolve every ISIN in a batch with a single mapping query.
+
+        Mirrors ``_resolve_identifier``: invalid ISINs are treated as
+        tickers and valid ISINs without a mapping resolve to themselves.
+        Plain tickers are normalized to upper case, so ``aapl`` and ``AAPL``
+        share one cache entry and one upstream fetch.
+        """
+        isins = [ticker for ticker in tickers if ISINUtils.is_isin_format(ticker)]
+        if not db or not isins:
+            return [(ticker.upper().strip(), "ticker") for ticker in tickers]
+
+        try:
+            mapped = isin_service.mapping_service.resolve_isins_to_tickers(db, isins)
+        except Exception as e:
+            logger.warning(f"Failed to resolve {len(isins)} ISINs: {e}")
+            mapped = {}
+
+        resolved = []
+        for ticker in tickers:
+            if not (
+                ISINUtils.is_isin_format(ticker) and ISINUtils.validate_isin(ticker)[0]
+            ):
+                resolved.append((ticker.upper().strip(), "ticker"))
+                continue
+            resolved_ticker = mapped.get(ticker) or ticker.upper().strip()
+            if resolved_ticker != ticker:
+                logger.info(f"Resolved ISIN {ticker} to ticker {resolved_ticker}")
+            resolved.append((resolved_ticker, "isin"))
+        return resolved
+
+    def _fetch_with_fallback(
+        self, ticker: str, providers: list[MarketDataProvider]
+    ) -> MarketDataResult:
+        """Try each provider in order until one returns a quote."""
         last_error = None
 
-        for provider in self.providers:
-            logger.debug(f"Trying {provider.name} for {resolved_ticker}")
+        for provider in providers:
+            logger.debug(f"Trying {provider.name} for {ticker}")
 
-            result = provider.fetch_quote(resolved_ticker)
+            result = provider.fetch_quote(ticker)
 
             if result.success:
-                # Update result with original identifier if it was an ISIN
-                if identifier_type == "isin":
-                    result.ticker = ticker  # Keep original ISIN in result
                 logger.info(
                     f"Successfully fetched {ticker} from {provider.name}: ${result.current_price}"
                 )
                 return result
-            logger.warning(
-                f"{provider.name} failed for {resolved_ticker}: {result.error}"
-            )
+            logger.warning(f"{provider.name} failed for {ticker}: {result.error}")
             last_error = result.error
 
         # All providers failed
@@ -518,6 +743,76 @@ class MultiProviderMarketDataService:
             data_source="multi_provider",
         )
 
+    def _cached_quote(
+        self, ticker: str, resolved_ticker: str
+    ) -> MarketDataResult | None:
+        """Return a copy of a cached quote labelled with the requested identifier."""
+        cached = self.quote_cache.get(resolved_ticker)
+        if cached is None:
+            return None
+        return replace(cached, ticker=ticker)
+
+    def _store_quote(self, resolved_ticker: str, result: MarketDataResult) -> None:
+        """Cache successful quotes under the resolved ticker."""
+        if result.success:
+            self.quote_cache.set(
+                resolved_ticker, replace(result, ticker=resolved_ticker)
+            )
+
+    def _fetch_coalesced(
+        self, ticker: str, resolved_ticker: str, providers: list[MarketDataProvider]
+    ) -> MarketDataResult:
+        """Fetch through the provider chain, sharing in-flight fetches.
+
+        Concurrent callers for the same resolved ticker wait for a single
+        upstream fetch; each gets its own copy labelled with the identifier
+        it asked for.
+        """
+
+        def fetch() -> MarketDataResult:
+            result = self._fetch_with_fallback(resolved_ticker, providers)
+            self._store_quote(resolved_ticker, result)
+            return result
+
+        return replace(self.in_flight.do(resolved_ticker, fetch), ticker=ticker)
+
+    def get_cache_stats(self) -> dict[str, Any]:
+        """Hit/miss/eviction counters for the quote cache.
+
+        Includes how many duplicate in-flight fetches were collapsed.
+        """
+        return {
+            **self.quote_cache.get_stats(),
+            "single_flight": self.in_flight.get_stats(),
+        }
+
+    def _providers_by_availability(self) -> list[MarketDataProvider]:
+        """Order providers by how soon their rate limiter frees up.
+
+        Ties keep the configured preference order, so yFinance stays first
+        whenever every bucket has a token available.
+        """
+        return sorted(
+            self.providers, key=lambda provider: provider.rate_limiter.estimated_wait()
+        )
+
+    def fetch_quote(
+        self, ticker: str, db: Session | None = None, use_cache: bool = True
+    ) -> MarketDataResult:
+        """Fetch quote with fallback across providers and ISIN support.
+
+        Quotes younger than ``market_data_cache_ttl`` are served from the
+        shared cache; ``use_cache=False`` forces an upstream fetch but still
+        refreshes the cache.
+        """
+        resolved_ticker, _ = self._resolve_identifier(ticker, db)
+        if use_cache:
+            cached = self._cached_quote(ticker, resolved_ticker)
+            if cached is not None:
+                return cached
+
+        return self._fetch_coalesced(ticker, resolved_ticker, self.providers)
+
     def fetch_quote_by_isin(self, db: Session, isin: str) -> MarketDataResult:
         """Fetch quote specifically by ISIN with ticker resolution."""
         try:
@@ -562,129 +857,298 @@ class MultiProviderMarketDataService:
             )
 
     def fetch_multiple_quotes(
-        self, tickers: list[str], db: Session | None = None
+        self, tickers: list[str], db: Session | None = None, use_cache: bool = True
     ) -> list[MarketDataResult]:
-        """Fetch quotes for multiple tickers with intelligent provider selection and ISIN support."""
-        results = []
-        provider_stats = {
-            provider.name: {"success": 0, "total": 0} for provider in self.providers
-        }
+        """Fetch quotes for multiple tickers concurrently across providers.
+
+        ISINs are resolved up front on the calling thread, in one mapping
+        query, because the session is not thread-safe. When bulk mode is
+        enabled, providers with a multi-symbol endpoint are tried first for
+        the whole batch. Whatever is left is fanned out over a thread pool;
+        each worker starts with the provider whose token bucket frees up
+        first and falls back through the rest, so a refresh is bounded by the
+        providers' combined quotas instead of one provider's delay. Cached
+        quotes are served before any upstream call and every successful quote
+        is written back. Results keep the order of ``tickers``; throughput
+        for the batch is stored on ``last_batch_stats``.
+        """
+        if not tickers:
+            self.last_batch_stats = BatchFetchStats()
+            return []
+
+        started = time.monotonic()
+        resolved = self._resolve_identifiers(tickers, db)
+        results: list[MarketDataResult | None] = [None] * len(tickers)
+
+        cache_hits = 0
+        if use_cache:
+            for i, (resolved_ticker, _) in enumerate(resolved):
+                results[i] = self._cached_quote(tickers[i], resolved_ticker)
+                if results[i] is not None:
+                    cache_hits += 1
+
+        bulk_fetched = 0
+        if settings.market_data_bulk_enabled and results.count(None) > 1:
+            for provider in self.providers:
+                pending = [i for i, result in enumerate(results) if result is None]
+                if not pending:
+                    break
+                bulk = provider.fetch_bulk_quotes(
+                    list(dict.fromkeys(resolved[i][0] for i in pending))
+                )
+                for i in pending:
+                    resolved_ticker, _ = resolved[i]
+                    bulk_result = bulk.get(resolved_ticker)
+                    if bulk_result is None or not bulk_result.success:
+                        continue
+                    result = replace(bulk_result)
+                    self._store_quote(resolved_ticker, result)
+                    result.ticker = tickers[i]
+                    results[i] = result
+                    bulk_fetched += 1
+
+        def fetch(index: int) -> MarketDataResult:
+            return self._fetch_coalesced(
+                tickers[index], resolved[index][0], self._providers_by_availability()
+            )
 
-        for ticker in tickers:
-            result = self.fetch_quote(ticker, db)
-            results.append(result)
+        remaining = [i for i, result in enumerate(results) if result is None]
+        workers = max(1, min(settings.market_data_max_workers, len(remaining)))
+        if remaining:
+            with ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="quote-fetch"
+            ) as executor:
+                for index, result in zip(
+                    remaining, executor.map(fetch, remaining), strict=True
+                ):
+                    results[index] = result
+
+        stats = BatchFetchStats(
+            total=len(results),
+            elapsed_seconds=time.monotonic() - started,
+            workers=workers,
+            bulk_fetched=bulk_fetched,
+            cache_hits=cache_hits,
+            provider_counts={
+                provider.name: {"success": 0, "total": 0} for provider in self.providers
+            },
+        )
+        for result in results:
+            if result.success:
+                stats.succeeded += 1
+            else:
+                stats.failed += 1
 
             # Update provider statistics
-            if result.data_source and result.data_source in provider_stats:
-                provider_stats[result.data_source]["total"] += 1
+            if result.data_source and result.data_source in stats.provider_counts:
+                stats.provider_counts[result.data_source]["total"] += 1
                 if result.success:
-                    provider_stats[result.data_source]["success"] += 1
+                    stats.provider_counts[result.data_source]["success"] += 1
 
         # Log provider performance
-        for provider_name, stats in provider_stats.items():
-            if stats["total"] > 0:
-                success_rate = (stats["success"] / stats["total"]) * 100
+        for provider_name, counts in stats.provider_counts.items():
+            if counts["total"] > 0:
+                success_rate = (counts["success"] / counts["total"]) * 100
                 logger.info(
-                    f"{provider_name}: {stats['success']}/{stats['total']} ({success_rate:.1f}% success)"
+                    f"{provider_name}: {counts['success']}/{counts['total']} "
+                    f"({success_rate:.1f}% success)"
                 )
+        logger.info(
+            f"Fetched {stats.total} quotes in {stats.elapsed_seconds:.2f}s "
+            f"({stats.tickers_per_second:.1f} tickers/s, {cache_hits} cached, "
+            f"{bulk_fetched} via bulk, "
+            f"{workers} workers)"
+        )
 
+        self.last_batch_stats = stats
         return results
 
+    def _load_asset_ids(self, db: Session, tickers: list[str]) -> dict[str, int]:
+        """Map tickers to asset ids with one ``IN`` query per chunk."""
+        asset_ids: dict[str, int] = {}
+        for start in range(0, len(tickers), BULK_WRITE_CHUNK_SIZE):
+            chunk = tickers[start : start + BULK_WRITE_CHUNK_SIZE]
+            rows = db.execute(
+                select(Asset.ticker, Asset.id).where(Asset.ticker.in_(chunk))
+            ).all()
+            asset_ids.update((ticker, asset_id) for ticker, asset_id in rows)
+        return asset_ids
+
+    def _bulk_update_assets(
+        self,
+        db: Session,
+        asset_ids: dict[str, int],
+        quotes: dict[str, MarketDataResult],
+    ) -> None:
+        """Write current quote fields to assets as a single executemany."""
+        now = datetime.now()
+        db.execute(
+            update(Asset),
+            [
+                {
+                    "id": asset_ids[ticker],
+                    "current_price": _to_decimal(result.current_price),
+                    "previous_close": _to_decimal(result.previous_close),
+                    "day_change": _to_decimal(result.day_change),
+                    "day_change_percent": _to_decimal(result.day_change_percent),
+                    "data_source": result.data_source,
+                    "updated_at": now,
+                }
+                for ticker, result in quotes.items()
+            ],
+        )
+
+    def _bulk_upsert_price_history(
+        self,
+        db: Session,
+        asset_ids: dict[str, int],
+        quotes: dict[str, MarketDataResult],
+        price_date: date,
+    ) -> None:
+        """Insert or update one PriceHistory row per asset for ``price_date``.
+
+        PostgreSQL and SQLite use ``INSERT ... ON CONFLICT DO UPDATE`` on the
+        ``unique_asset_date`` constraint. Missing OHLC/volume values never
+        overwrite ones already stored for the day.
+        """
+        rows = [
+            {
+                "asset_id": asset_ids[ticker],
+                "price_date": price_date,
+                "open_price": _to_decimal(result.open_price or None),
+                "high_price": _to_decimal(result.high_price or None),
+                "low_price": _to_decimal(result.low_price or None),
+                "close_price": _to_decimal(result.current_price),
+                "volume": result.volume or None,
+                "data_source": result.data_source,
+            }
+            for ticker, result in quotes.items()
+        ]
+
+        dialect = db.get_bind().dialect.name
+        if dialect not in ("postgresql", "sqlite"):
+            self._upsert_price_history_generic(db, rows, price_date)
+            return
+
+        table = PriceHistory.__table__
+        insert_fn = postgresql_insert if dialect == "postgresql" else sqlite_insert
+        conflict_target = (
+            {"constraint": "unique_asset_date"}
+            if dialect == "postgresql"
+            else {"index_elements": ["asset_id", "price_date"]}
+        )
+
+        for start in range(0, len(rows), BULK_WRITE_CHUNK_SIZE):
+            stmt = insert_fn(table).values(rows[start : start + BULK_WRITE_CHUNK_SIZE])
+            excluded = stmt.excluded
+            db.execute(
+                stmt.on_conflict_do_update(
+                    **conflict_target,
+                    set_={
+                        "close_price": excluded.close_price,
+                        "open_price": func.coalesce(
+                            excluded.open_price, table.c.open_price
+                        ),
+                        "high_price": func.coalesce(
+                            excluded.high_price, table.c.high_price
+                        ),
+                        "low_price": func.coalesce(
+                            excluded.low_price, table.c.low_price
+                        ),
+                        "volume": func.coalesce(excluded.volume, table.c.volume),
+                        "updated_at": func.now(),
+                    },
+                )
+            )
+
+    def _upsert_price_history_generic(
+        self, db: Session, rows: list[dict[str, Any]], price_date: date
+    ) -> None:
+        """Upsert fallback for dialects without ``ON CONFLICT`` support."""
+        existing: dict[int, int] = {}
+        asset_id_list = [row["asset_id"] for row in rows]
+        for start in range(0, len(asset_id_list), BULK_WRITE_CHUNK_SIZE):
+            chunk = asset_id_list[start : start + BULK_WRITE_CHUNK_SIZE]
+            existing.update(
+                (asset_id, record_id)
+                for record_id, asset_id in db.execute(
+                    select(PriceHistory.id, PriceHistory.asset_id).where(
+                        PriceHistory.asset_id.in_(chunk),
+                        PriceHistory.price_date == price_date,
+                    )
+                ).all()
+            )
+
+        new_rows = [row for row in rows if row["asset_id"] not in existing]
+        if new_rows:
+            db.execute(insert(PriceHistory), new_rows)
+
+        updates = [
+            {
+                "id": existing[row["asset_id"]],
+                **{
+                    key: value
+                    for key, value in row.items()
+                    if value is not None and key not in ("asset_id", "price_date")
+                },
+            }
+            for row in rows
+            if row["asset_id"] in existing
+        ]
+        if updates:
+            db.execute(update(PriceHistory), updates)
+
     def update_asset_prices(self, db: Session, tickers: list[str]) -> dict[str, Any]:
-        """Update asset prices in the database with ISIN support."""
+        """Update asset prices in the database with ISIN support.
+
+        Persistence is set-based: assets are loaded with one ``IN`` query,
+        updated with a single executemany and today's price history rows are
+        upserted in bulk, so the statement count does not grow per ticker.
+        """
         logger.info(f"Updating prices for {len(tickers)} assets")
 
         # Fetch all quotes with ISIN support
         results = self.fetch_multiple_quotes(tickers, db)
 
-        updated_count = 0
-        failed_count = 0
         failed_tickers = []
-
+        quotes: dict[str, MarketDataResult] = {}
         for result in results:
-            try:
-                if not result.success or not result.current_price:
-                    failed_count += 1
-                    failed_tickers.append(result.ticker)
-                    continue
-
-                # Update asset in database
-                asset = db.query(Asset).filter(Asset.ticker == result.ticker).first()
-                if not asset:
-                    logger.warning(f"Asset not found for ticker {result.ticker}")
-                    continue
-
-                # Update asset fields
-                asset.current_price = result.current_price
-                asset.previous_close = result.previous_close
-                asset.day_change = result.day_change
-                asset.day_change_percent = result.day_change_percent
-                asset.data_source = result.data_source
-                asset.updated_at = datetime.now()
-
-                # Create or update price history record
-                today = date.today()
-                price_record = (
-                    db.query(PriceHistory)
-                    .filter(
-                        PriceHistory.asset_id == asset.id,
-                        PriceHistory.price_date == today,
-                    )
-                    .first()
-                )
-
-                if price_record:
-                    # Update existing record
-                    price_record.close_price = Decimal(str(result.current_price))
-                    if result.open_price:
-                        price_record.open_price = Decimal(str(result.open_price))
-                    if result.high_price:
-                        price_record.high_price = Decimal(str(result.high_price))
-                    if result.low_price:
-                        price_record.low_price = Decimal(str(result.low_price))
-                    if result.volume:
-                        price_record.volume = result.volume
-                    price_record.updated_at = datetime.now()
-                else:
-                    # Create new record
-                    price_record = PriceHistory()
-                    price_record.asset_id = asset.id
-                    price_record.price_date = today
-                    price_record.open_price = (
-                        Decimal(str(result.open_price)) if result.open_price else None
-                    )
-                    price_record.high_price = (
-                        Decimal(str(result.high_price)) if result.high_price else None
-                    )
-                    price_record.low_price = (
-                        Decimal(str(result.low_price)) if result.low_price else None
-                    )
-                    price_record.close_price = Decimal(str(result.current_price))
-                    price_record.volume = result.volume
-                    price_record.data_source = result.data_source
-                    db.add(price_record)
-
-                updated_count += 1
-                logger.debug(
-                    f"Updated {result.ticker}: ${result.current_price} from {result.data_source}"
-                )
-
-            except Exception as e:
-                logger.error(f"Error updating {result.ticker}: {e}")
-                failed_count += 1
+            if not result.success or not result.current_price:
                 failed_tickers.append(result.ticker)
+                continue
+            quotes[result.ticker] = result
 
-        # Commit all changes
         try:
+            asset_ids = self._load_asset_ids(db, list(quotes))
+            for ticker in quotes:
+                if ticker not in asset_ids:
+                    logger.warning(f"Asset not found for ticker {ticker}")
+
+            found = {
+                ticker: result
+                for ticker, result in quotes.items()
+                if ticker in asset_ids
+            }
+            if found:
+                self._bulk_update_assets(db, asset_ids, found)
+                self._bulk_upsert_price_history(db, asset_ids, found, date.today())
+
             db.commit()
-            logger.info(
-                f"Successfully committed price updates: {updated_count} updated, {failed_count} failed"
-            )
         except Exception as e:
             logger.error(f"Error committing price updates: {e}")
             db.rollback()
             raise
 
+        if found:
+            sync_price_store(db)
+
+        updated_count = len(found)
+        failed_count = len(failed_tickers)
+        logger.info(
+            f"Successfully committed price updates: {updated_count} updated, "
+            f"{failed_count} failed"
+        )
+
         return {
             "status": "completed",
             "updated_count": updated_count,
@@ -699,6 +1163,10 @@ class MultiProviderMarketDataService:
                 }
                 for provider in self.providers
             },
+            "batch_stats": (
+                self.last_batch_stats.to_dict() if self.last_batch_stats else None
+            ),
+            "cache_stats": self.get_cache_stats(),
         }
 
 
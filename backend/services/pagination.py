@@ -0,0 +1,109 @@
+"""Keyset pagination for list endpoints.
+
+A page is selected with ``WHERE key > last key ORDER BY key LIMIT n`` instead
+of ``OFFSET``, so every page costs the same index range scan however deep it
+is. The key of the last row of a page is handed to clients as an opaque,
+URL-safe cursor; keys end with the primary key so they are unique.
+
+List services take a ``cursor`` and endpoints ask them for one row more than
+the page size: ``split_page`` trims that row off and turns the last row that
+remains into the next cursor.
+"""
+
+import base64
+from collections.abc import Callable, Sequence
+from datetime import date
+import json
+from typing import Any, TypeVar
+
+from sqlalchemy import ColumnElement, func, select, tuple_
+from sqlalchemy.orm import Query, Session
+
+T = TypeVar("T")
+
+# How endpoints report totals: an exact COUNT, the planner's row estimate
+# (PostgreSQL only; other databases count exactly), or no total at all
+COUNT_MODES = ("exact", "estimated", "none")
+
+
+def encode_cursor(*values: date | int) -> str:
+    """Opaque cursor for a row key."""
+    payload = json.dumps(
+        [value.isoformat() if isinstance(value, date) else value for value in values],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *types: type) -> tuple[Any, ...]:
+    """Row key of a cursor, converted to ``types``.
+
+    Raises:
+        ValueError: If the cursor was not produced for a key of these types
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError
+        return tuple(
+            date.fromisoformat(value) if kind is date else kind(value)
+            for kind, value in zip(types, values, strict=True)
+        )
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid pagination cursor") from e
+
+
+def keyset_after(
+    columns: Sequence[ColumnElement[Any]],
+    values: Sequence[Any],
+    descending: bool = False,
+) -> ColumnElement[bool]:
+    """Condition selecting rows that come after ``values`` in key order.
+
+    A row-value comparison, which PostgreSQL and SQLite match against a
+    composite index on ``columns``.
+    """
+    key = tuple_(*columns)
+    last = tuple_(*values, types=[column.type for column in columns])
+    return key < last if descending else key > last
+
+
+def split_page(
+    rows: list[T], limit: int, key: Callable[[T], tuple[Any, ...]]
+) -> tuple[list[T], str | None]:
+    """Trim rows fetched with a ``limit + 1`` to one page.
+
+    Returns:
+        ``(page, next_cursor)``; the cursor is None on the last page
+    """
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    return page, encode_cursor(*key(page[-1]))
+
+
+def count_rows(db: Session, query: Query[Any], mode: str = "exact") -> int | None:
+    """Number of rows a query returns, as asked for by ``mode``.
+
+    ``estimated`` reads the PostgreSQL planner's row estimate for the query,
+    which needs no scan of the matching rows.
+    """
+    if mode == "none":
+        return None
+    query = query.order_by(None)
+    if mode == "estimated" and db.get_bind().dialect.name == "postgresql":
+        statement = query.statement.compile(
+            dialect=db.get_bind().dialect, compile_kwargs={"literal_binds": True}
+        )
+        plan = (
+            db.connection()
+            .exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}")
+            .scalar()
+        )
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+    return db.execute(
+        select(func.count()).select_from(query.statement.subquery())
+    ).scalar_one()
@@ -7,18 +7,34 @@ performance attribution analysis.
 
 from datetime import date, timedelta
 from decimal import Decimal
+import json
 import logging
 from typing import Any
 
+import numpy as np
 from sqlalchemy.orm import Session
 
+from backend.config import get_settings
+from backend.constants import RISK_FREE_RATE
 from backend.models.asset import Asset
-from backend.models.price_history import PriceHistory
 from backend.schemas.portfolio import PerformanceMetrics
+from backend.services import analytics
+from backend.services.cache import TwoTierCache
 from backend.services.market_data import market_data_service
 from backend.services.portfolio import PortfolioService
+from backend.services.price_store import price_store
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Portfolio and benchmark figures are Decimals; rounding the float
+# differences drops binary noise such as 1.2 - 1.0 = 0.19999999999999996
+DIFF_DECIMALS = 10
+
+
+def _metric_values(values: list[Decimal | None]) -> np.ndarray:
+    """Metric values as floats, with NaN for missing or zero values."""
+    return np.array([float(value) if value else np.nan for value in values])
 
 
 class BenchmarkMetrics:
@@ -42,6 +58,29 @@ class BenchmarkMetrics:
         self.sharpe_ratio = sharpe_ratio
         self.max_drawdown = max_drawdown
 
+    def to_json(self) -> str:
+        """Serialize for the shared benchmark metrics cache."""
+        return json.dumps(
+            {
+                key: str(value) if isinstance(value, Decimal) else value
+                for key, value in vars(self).items()
+            }
+        )
+
+    @classmethod
+    def from_json(cls, raw: str) -> "BenchmarkMetrics":
+        """Rebuild metrics stored by ``to_json``."""
+        data = json.loads(raw)
+        return cls(
+            name=data["name"],
+            ticker=data["ticker"],
+            **{
+                key: Decimal(value) if value is not None else None
+                for key, value in data.items()
+                if key not in ("name", "ticker")
+            },
+        )
+
 
 class PerformanceBenchmarkService:
     """Service for comprehensive portfolio performance benchmarking."""
@@ -65,6 +104,13 @@ class PerformanceBenchmarkService:
 
     def __init__(self):
         self.portfolio_service = PortfolioService()
+        self.metrics_cache: TwoTierCache[BenchmarkMetrics] = TwoTierCache(
+            namespace="benchmark_metrics",
+            ttl=settings.benchmark_cache_ttl,
+            max_size=settings.benchmark_cache_max_size,
+            encode=BenchmarkMetrics.to_json,
+            decode=BenchmarkMetrics.from_json,
+        )
 
     def get_comprehensive_benchmark_analysis(
         self,
@@ -88,25 +134,20 @@ class PerformanceBenchmarkService:
             db, user_id, start_date, end_date
         )
 
-        # Get benchmark performances
-        benchmark_comparisons = {}
-        for ticker in benchmark_tickers:
-            try:
-                benchmark_metrics = self._calculate_benchmark_metrics(
-                    db, ticker, start_date, end_date
-                )
-
-                comparison = self._compare_portfolio_to_benchmark(
-                    portfolio_metrics, benchmark_metrics
-                )
-
-                benchmark_comparisons[ticker] = {
-                    "benchmark": benchmark_metrics,
-                    "comparison": comparison,
-                }
-            except Exception as e:
-                logger.warning(f"Failed to calculate benchmark for {ticker}: {e}")
-                continue
+        # Benchmark metrics come from the shared cache where possible; the
+        # portfolio is then compared against all of them at once
+        benchmarks = self._get_benchmark_metrics(
+            db, benchmark_tickers, start_date, end_date
+        )
+        comparisons = self._compare_portfolio_to_benchmarks(
+            portfolio_metrics, list(benchmarks.values())
+        )
+        benchmark_comparisons = {
+            ticker: {"benchmark": metrics, "comparison": comparison}
+            for (ticker, metrics), comparison in zip(
+                benchmarks.items(), comparisons, strict=True
+            )
+        }
 
         # Performance ranking
         ranking = self._rank_performance(portfolio_metrics, benchmark_comparisons)
@@ -137,59 +178,99 @@ class PerformanceBenchmarkService:
             ),
         }
 
-    def _calculate_benchmark_metrics(
+    def _get_benchmark_metrics(
         self,
         db: Session,
-        ticker: str,
+        tickers: list[str],
         start_date: date,
         end_date: date,
-    ) -> BenchmarkMetrics:
-        """Calculate comprehensive metrics for a benchmark."""
-        # Get benchmark asset and price history
-        asset = db.query(Asset).filter(Asset.ticker == ticker).first()
-
-        if not asset:
-            # Try to create asset if it doesn't exist
-            asset = self._create_benchmark_asset(db, ticker)
-
-        # Get price history
-        prices = (
-            db.query(PriceHistory)
-            .filter(
-                PriceHistory.asset_id == asset.id,
-                PriceHistory.price_date >= start_date,
-                PriceHistory.price_date <= end_date,
+    ) -> dict[str, BenchmarkMetrics]:
+        """Metrics for each benchmark, cached per ticker, period and price data.
+
+        Cache keys include the price store version, so metrics are recomputed
+        once new prices are synced rather than on every request. Tickers whose
+        metrics cannot be calculated are left out.
+        """
+        as_of = price_store.version() or date.today().isoformat()
+        keys = {
+            ticker: f"{ticker}:{start_date}:{end_date}:{as_of}"
+            for ticker in dict.fromkeys(tickers)
+        }
+
+        metrics: dict[str, BenchmarkMetrics] = {}
+        for ticker, key in keys.items():
+            cached = self.metrics_cache.get(key)
+            if cached is not None:
+                metrics[ticker] = cached
+
+        missing = [ticker for ticker in keys if ticker not in metrics]
+        if missing:
+            calculated = self._calculate_benchmark_metrics(
+                db, missing, start_date, end_date
             )
-            .order_by(PriceHistory.price_date)
-            .all()
+            for ticker, benchmark in calculated.items():
+                self.metrics_cache.set(keys[ticker], benchmark)
+            metrics.update(calculated)
+
+        return {ticker: metrics[ticker] for ticker in keys if ticker in metrics}
+
+    def _calculate_benchmark_metrics(
+        self,
+        db: Session,
+        tickers: list[str],
+        start_date: date,
+        end_date: date,
+    ) -> dict[str, BenchmarkMetrics]:
+        """Calculate comprehensive metrics for several benchmarks."""
+        # Get benchmark assets with one IN query, creating any that are missing
+        asset_ids = dict(
+            db.query(Asset.ticker, Asset.id).filter(Asset.ticker.in_(tickers)).all()
         )
+        for ticker in tickers:
+            if ticker in asset_ids:
+                continue
+            try:
+                asset_ids[ticker] = self._create_benchmark_asset(db, ticker).id
+            except Exception as e:
+                logger.warning(f"Failed to create benchmark asset {ticker}: {e}")
 
-        if len(prices) < 2:
-            # Fallback to simple return calculation
-            return self._get_simple_benchmark_return(db, ticker, start_date, end_date)
-
-        # Calculate comprehensive metrics
-        returns = []
-        for i in range(1, len(prices)):
-            daily_return = (prices[i].close_price - prices[i - 1].close_price) / prices[
-                i - 1
-            ].close_price
-            returns.append(float(daily_return))
-
-        total_return = (
-            (prices[-1].close_price - prices[0].close_price)
-            / prices[0].close_price
-            * 100
+        # Get price histories as memory-mapped columns
+        prices = price_store.load_many(
+            db, list(asset_ids.values()), start_date, end_date
         )
 
+        metrics = {}
+        for ticker in tickers:
+            if ticker not in asset_ids:
+                continue
+            try:
+                closes = prices[asset_ids[ticker]].close
+                if len(closes) < 2 or closes[0] <= 0:
+                    # Fallback to simple return calculation
+                    metrics[ticker] = self._get_simple_benchmark_return(
+                        db, ticker, start_date, end_date
+                    )
+                else:
+                    metrics[ticker] = self._metrics_from_closes(ticker, closes)
+            except Exception as e:
+                logger.warning(f"Failed to calculate benchmark for {ticker}: {e}")
+
+        return metrics
+
+    def _metrics_from_closes(self, ticker: str, closes: np.ndarray) -> BenchmarkMetrics:
+        """Calculate benchmark metrics from closing prices, oldest first."""
+        returns = analytics.period_returns(closes)
+
+        total_return = float((closes[-1] - closes[0]) / closes[0] * 100)
+
         # Calculate additional metrics
-        avg_return = sum(returns) / len(returns) if returns else 0
-        volatility = self._calculate_volatility(returns) if len(returns) > 1 else None
-        annualized_return = self._annualize_return(avg_return, len(returns))
+        avg_return = float(returns.mean()) if returns.size else 0
+        volatility = self._calculate_volatility(returns) if returns.size > 1 else None
+        annualized_return = self._annualize_return(avg_return, returns.size)
         sharpe_ratio = (
             self._calculate_sharpe_ratio(returns, volatility) if volatility else None
         )
-        max_drawdown = self._calculate_max_drawdown([p.close_price for p in prices])
+        max_drawdown = analytics.max_drawdown(closes) * 100
 
         benchmark_info = self.BENCHMARKS.get(
             ticker, {"name": ticker, "description": ""}
@@ -213,42 +294,69 @@ class PerformanceBenchmarkService:
         benchmark: BenchmarkMetrics,
     ) -> dict[str, Any]:
         """Compare portfolio performance to a specific benchmark."""
-        portfolio_return = float(portfolio.total_return_percent or 0)
-        benchmark_return = float(benchmark.total_return)
+        return self._compare_portfolio_to_benchmarks(portfolio, [benchmark])[0]
 
-        excess_return = portfolio_return - benchmark_return
+    def _compare_portfolio_to_benchmarks(
+        self,
+        portfolio: PerformanceMetrics,
+        benchmarks: list[BenchmarkMetrics],
+    ) -> list[dict[str, Any]]:
+        """Compare portfolio performance to several benchmarks in one pass.
+
+        Risk-adjusted differences are only reported where both sides have a
+        non-zero value. The information ratio (excess return over tracking
+        error) is None where the tracking error is unknown or zero.
+        """
+        portfolio_return = float(portfolio.total_return_percent or 0)
+        benchmark_returns = np.array([float(b.total_return) for b in benchmarks])
 
         # Calculate relative performance metrics
-        comparison = {
-            "excess_return": excess_return,
-            "relative_return": (
-                (excess_return / benchmark_return * 100) if benchmark_return != 0 else 0
-            ),
-            "outperformed": excess_return > 0,
-        }
-
-        # Risk-adjusted comparisons
-        if portfolio.sharpe_ratio and benchmark.sharpe_ratio:
-            comparison["sharpe_ratio_diff"] = float(
-                portfolio.sharpe_ratio - benchmark.sharpe_ratio
-            )
-
-        if portfolio.volatility and benchmark.volatility:
-            comparison["volatility_diff"] = float(
-                portfolio.volatility - benchmark.volatility
+        excess_returns = portfolio_return - benchmark_returns
+        relative_returns = (
+            np.divide(
+                excess_returns,
+                benchmark_returns,
+                out=np.zeros_like(excess_returns),
+                where=benchmark_returns != 0,
             )
+            * 100
+        )
 
-        if portfolio.max_drawdown and benchmark.max_drawdown:
-            comparison["max_drawdown_diff"] = float(
-                portfolio.max_drawdown - benchmark.max_drawdown
+        # Risk-adjusted comparisons
+        diffs = {
+            f"{name}_diff": np.round(
+                _metric_values([getattr(portfolio, name)])
+                - _metric_values([getattr(b, name) for b in benchmarks]),
+                DIFF_DECIMALS,
             )
+            for name in ("sharpe_ratio", "volatility", "max_drawdown")
+        }
 
         # Performance consistency
-        comparison["risk_adjusted_excess"] = self._calculate_information_ratio(
-            excess_return, portfolio.volatility, benchmark.volatility
+        tracking_errors = np.abs(diffs["volatility_diff"])
+        has_tracking_error = np.isfinite(tracking_errors) & (tracking_errors != 0)
+        information_ratios = np.divide(
+            excess_returns,
+            tracking_errors,
+            out=np.zeros_like(excess_returns),
+            where=has_tracking_error,
         )
 
-        return comparison
+        comparisons = []
+        for i in range(len(benchmarks)):
+            comparison: dict[str, Any] = {
+                "excess_return": float(excess_returns[i]),
+                "relative_return": float(relative_returns[i]),
+                "outperformed": bool(excess_returns[i] > 0),
+            }
+            for key, values in diffs.items():
+                if np.isfinite(values[i]):
+                    comparison[key] = float(values[i])
+            comparison["risk_adjusted_excess"] = (
+                float(information_ratios[i]) if has_tracking_error[i] else None
+            )
+            comparisons.append(comparison)
+        return comparisons
 
     def _rank_performance(
         self,
@@ -457,13 +565,7 @@ class PerformanceBenchmarkService:
 
     def _calculate_volatility(self, returns: list[float]) -> float:
         """Calculate annualized volatility from daily returns."""
-        if len(returns) < 2:
-            return 0.0
-
-        mean_return = sum(returns) / len(returns)
-        variance = sum((r - mean_return) ** 2 for r in returns) / (len(returns) - 1)
-        daily_volatility = variance**0.5
-        return daily_volatility * (252**0.5) * 100  # Annualized percentage
+        return analytics.volatility(np.asarray(returns)) * 100  # Percentage
 
     def _annualize_return(self, daily_avg_return: float, days: int) -> float:
         """Annualize a daily average return."""
@@ -472,47 +574,14 @@ class PerformanceBenchmarkService:
         return ((1 + daily_avg_return) ** (252 / days) - 1) * 100
 
     def _calculate_sharpe_ratio(self, returns: list[float], volatility: float) -> float:
-        """Calculate Sharpe ratio (assuming 2% risk-free rate)."""
-        if not returns or volatility == 0:
-            return 0.0
-
-        avg_return = sum(returns) / len(returns) * 252 * 100  # Annualized
-        risk_free_rate = 2.0  # 2% risk-free rate assumption
-        excess_return = avg_return - risk_free_rate
-        return excess_return / volatility if volatility > 0 else 0.0
+        """Calculate Sharpe ratio from daily returns and volatility in percent."""
+        return analytics.sharpe_ratio(
+            np.asarray(returns), RISK_FREE_RATE, annual_volatility=volatility / 100
+        )
 
     def _calculate_max_drawdown(self, prices: list[Decimal]) -> float:
         """Calculate maximum drawdown from price series."""
-        if len(prices) < 2:
-            return 0.0
-
-        peak = prices[0]
-        max_drawdown = 0.0
-
-        for price in prices[1:]:
-            if price > peak:
-                peak = price
-            else:
-                drawdown = (peak - price) / peak
-                max_drawdown = max(max_drawdown, drawdown)
-
-        return float(max_drawdown) * 100  # Return as percentage
-
-    def _calculate_information_ratio(
-        self,
-        excess_return: float,
-        portfolio_vol: Decimal | None,
-        benchmark_vol: Decimal | None,
-    ) -> float | None:
-        """Calculate information ratio (excess return / tracking error)."""
-        if not portfolio_vol or not benchmark_vol:
-            return None
-
-        tracking_error = abs(float(portfolio_vol) - float(benchmark_vol))
-        if tracking_error == 0:
-            return None
-
-        return excess_return / tracking_error
+        return analytics.max_drawdown(np.array(prices, dtype=float)) * 100
 
     def _calculate_percentile_rank(
         self, value: float, benchmark_values: list[float]
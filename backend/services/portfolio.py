@@ -1,16 +1,20 @@
 """Portfolio service for portfolio operations and calculations."""
 
+from collections.abc import Callable
 from datetime import date, timedelta
 from decimal import Decimal
 import logging
+from typing import TypeVar
 
 from fastapi import HTTPException
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, joinedload
 
-from backend.constants import MIN_DIVERSIFICATION_ASSETS
+from backend.constants import MIN_DIVERSIFICATION_ASSETS, TOP_POSITIONS_COUNT
 from backend.models import (
+    Asset,
     AssetCategory,
-    AssetType,
     PortfolioSnapshot,
     Position,
     Transaction,
@@ -25,72 +29,84 @@ from backend.schemas.portfolio import (
     PortfolioSummary,
 )
 from backend.schemas.position import PositionSummary
+from backend.services.analytics import analyze_performance
 from backend.services.cash_account import CashAccountService
+from backend.services.portfolio_aggregation import PortfolioAggregator
+from backend.services.portfolio_cache import PortfolioCache, get_portfolio_cache
+from backend.services.price_store import PriceSeries, price_store
+
+M = TypeVar("M", bound=BaseModel)
+
+
+def _to_decimal(value: float | None) -> Decimal | None:
+    """Convert an analytics float to a Decimal with six decimal places."""
+    return None if value is None else Decimal(str(round(value, 6)))
 
 
 class PortfolioService:
     """Service for portfolio operations and calculations."""
 
-    def __init__(self) -> None:
-        """Initialize portfolio service."""
+    def __init__(self, cache: PortfolioCache | None = None) -> None:
+        """Initialize portfolio service.
+
+        Args:
+            cache: Cache for per-user portfolio views; defaults to the global
+                cache unless ``portfolio_cache_enabled`` is off
+        """
         self.cash_service = CashAccountService()
+        self.aggregator = PortfolioAggregator()
+        self.cache = cache if cache is not None else get_portfolio_cache()
 
-    def get_portfolio_summary(self, db: Session, user_id: int) -> PortfolioSummary:
-        """Get comprehensive portfolio summary for a user."""
-        # Check if user exists
+    def _get_user(self, db: Session, user_id: int) -> User:
+        """Load a user, raising 404 if they do not exist."""
         user = db.query(User).filter(User.id == user_id).first()
         if not user:
             raise HTTPException(
                 status_code=404, detail=f"User with ID {user_id} not found"
             )
+        return user
 
-        # Get all active positions with asset data
-        positions = (
-            db.query(Position)
-            .options(joinedload(Position.asset))
-            .filter(Position.user_id == user_id, Position.is_active.is_(True))
-            .all()
+    async def _get_cached_async(
+        self,
+        view: str,
+        db: AsyncSession,
+        user_id: int,
+        build: Callable[[Session, int], M],
+    ) -> M:
+        """Build a view on an async session, through the cache when enabled."""
+        if self.cache is None:
+            return await db.run_sync(build, user_id)
+        return await self.cache.get_or_compute_async(
+            view, user_id, lambda: db.run_sync(build, user_id)
         )
 
-        # Calculate portfolio totals
-        total_value = Decimal("0")
-        total_cost_basis = Decimal("0")
-        cash_balance = self.cash_service.get_cash_balance(db, user_id)
+    def get_portfolio_summary(self, db: Session, user_id: int) -> PortfolioSummary:
+        """Get comprehensive portfolio summary for a user."""
+        if self.cache is None:
+            return self._build_portfolio_summary(db, user_id)
+        return self.cache.get_or_compute(
+            "summary", user_id, lambda: self._build_portfolio_summary(db, user_id)
+        )
 
-        position_summaries = []
+    async def get_portfolio_summary_async(
+        self, db: AsyncSession, user_id: int
+    ) -> PortfolioSummary:
+        """:meth:`get_portfolio_summary` on an async session."""
+        return await self._get_cached_async(
+            "summary", db, user_id, self._build_portfolio_summary
+        )
 
-        for position in positions:
-            current_value = position.current_value or Decimal("0")
-            total_value += current_value
-            total_cost_basis += position.total_cost_basis
+    def _build_portfolio_summary(self, db: Session, user_id: int) -> PortfolioSummary:
+        """Compute the portfolio summary from the database."""
+        self._get_user(db, user_id)
 
-            # Create position summary
-            position_summary = PositionSummary(
-                id=position.id,
-                asset=AssetSummary(
-                    id=position.asset.id,
-                    ticker=position.asset.ticker,
-                    name=position.asset.name,
-                    asset_type=position.asset.asset_type,
-                    category=position.asset.category,
-                    current_price=(
-                        Decimal(str(position.asset.current_price))
-                        if position.asset.current_price
-                        else None
-                    ),
-                    currency=position.asset.currency,
-                    is_active=position.asset.is_active,
-                ),
-                quantity=position.quantity,
-                current_value=current_value,
-                unrealized_gain_loss=position.unrealized_gain_loss,
-                unrealized_gain_loss_percent=position.unrealized_gain_loss_percent,
-            )
-            position_summaries.append(position_summary)
+        aggregate = self.aggregator.aggregate(db, user_id, top_n=TOP_POSITIONS_COUNT)
+        cash_balance = self.cash_service.get_cash_balance(db, user_id)
 
         # Add cash to total value
-        total_value += cash_balance
-        invested_amount = total_value - cash_balance
+        invested_amount = aggregate.market_value
+        total_value = invested_amount + cash_balance
+        total_cost_basis = aggregate.cost_basis
 
         # Calculate performance metrics
         total_gain_loss = total_value - total_cost_basis - cash_balance
@@ -120,11 +136,30 @@ class PortfolioService:
                     daily_change / yesterday_snapshot.total_value * 100
                 )
 
-        # Sort positions by value for top positions
-        position_summaries.sort(
-            key=lambda x: x.current_value or Decimal("0"), reverse=True
-        )
-        top_positions = position_summaries[:5]
+        top_positions = [
+            PositionSummary(
+                id=position.id,
+                asset=AssetSummary(
+                    id=position.asset_id,
+                    ticker=position.ticker,
+                    name=position.name,
+                    asset_type=position.asset_type,
+                    category=position.category,
+                    current_price=(
+                        Decimal(str(position.current_price))
+                        if position.current_price
+                        else None
+                    ),
+                    currency=position.currency,
+                    is_active=position.asset_is_active,
+                ),
+                quantity=position.quantity,
+                current_value=position.current_value or Decimal("0"),
+                unrealized_gain_loss=position.unrealized_gain_loss,
+                unrealized_gain_loss_percent=position.unrealized_gain_loss_percent,
+            )
+            for position in aggregate.top_positions
+        ]
 
         return PortfolioSummary(
             user_id=user_id,
@@ -136,8 +171,8 @@ class PortfolioService:
             total_gain_loss_percent=total_gain_loss_percent,
             daily_change=daily_change,
             daily_change_percent=daily_change_percent,
-            total_positions=len(positions),
-            total_assets=len(set(p.asset_id for p in positions)),
+            total_positions=aggregate.position_count,
+            total_assets=aggregate.asset_count,
             top_positions=top_positions,
         )
 
@@ -145,26 +180,33 @@ class PortfolioService:
         self, db: Session, user_id: int
     ) -> AllocationBreakdown:
         """Calculate asset allocation breakdown for a portfolio."""
-        # Check if user exists
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
-            raise HTTPException(
-                status_code=404, detail=f"User with ID {user_id} not found"
-            )
+        if self.cache is None:
+            return self._build_allocation_breakdown(db, user_id)
+        return self.cache.get_or_compute(
+            "allocation",
+            user_id,
+            lambda: self._build_allocation_breakdown(db, user_id),
+        )
 
-        positions = (
-            db.query(Position)
-            .options(joinedload(Position.asset))
-            .filter(Position.user_id == user_id, Position.is_active.is_(True))
-            .all()
+    async def get_allocation_breakdown_async(
+        self, db: AsyncSession, user_id: int
+    ) -> AllocationBreakdown:
+        """:meth:`get_allocation_breakdown` on an async session."""
+        return await self._get_cached_async(
+            "allocation", db, user_id, self._build_allocation_breakdown
         )
 
+    def _build_allocation_breakdown(
+        self, db: Session, user_id: int
+    ) -> AllocationBreakdown:
+        """Compute the allocation breakdown from the database."""
+        self._get_user(db, user_id)
+
+        aggregate = self.aggregator.aggregate(db, user_id)
+
         # Calculate total portfolio value
         cash_balance = self.cash_service.get_cash_balance(db, user_id)
-        total_value = cash_balance
-        for position in positions:
-            if position.current_value:
-                total_value += position.current_value
+        total_value = cash_balance + aggregate.market_value
 
         if total_value == 0:
             return AllocationBreakdown(
@@ -176,64 +218,26 @@ class PortfolioService:
                 real_estate_percent=Decimal("0"),
             )
 
-        # Calculate allocation by category
-        category_values = {
-            AssetCategory.EQUITY: Decimal("0"),
-            AssetCategory.FIXED_INCOME: Decimal("0"),
-            AssetCategory.ALTERNATIVE: Decimal("0"),
-            AssetCategory.CASH_EQUIVALENT: Decimal("0"),
-            AssetCategory.COMMODITY: Decimal("0"),
-            AssetCategory.REAL_ESTATE: Decimal("0"),
+        allocation_by_category = aggregate.value_by("category")
+        allocation_by_sector = {
+            sector: value
+            for sector, value in aggregate.value_by("sector").items()
+            if sector
         }
+        allocation_by_asset_type = aggregate.value_by("asset_type")
 
-        allocation_by_category: dict[AssetCategory, Decimal] = {}
-        allocation_by_sector: dict[str, Decimal] = {}
-        allocation_by_asset_type: dict[AssetType, Decimal] = {}
-
-        for position in positions:
-            if position.current_value:
-                category = position.asset.category
-                if category in category_values:
-                    category_values[category] += position.current_value
-
-                # Track by category
-                allocation_by_category[category] = (
-                    allocation_by_category.get(category, Decimal("0"))
-                    + position.current_value
-                )
-
-                # Track by sector
-                if position.asset.sector:
-                    allocation_by_sector[position.asset.sector] = (
-                        allocation_by_sector.get(position.asset.sector, Decimal("0"))
-                        + position.current_value
-                    )
-
-                # Track by asset type
-                asset_type = position.asset.asset_type
-                allocation_by_asset_type[asset_type] = (
-                    allocation_by_asset_type.get(asset_type, Decimal("0"))
-                    + position.current_value
-                )
-
-        # Convert to percentages
-        cash_value = cash_balance
+        def percent_of(category: AssetCategory) -> Decimal:
+            return (
+                allocation_by_category.get(category, Decimal("0")) / total_value * 100
+            )
 
         return AllocationBreakdown(
-            equity_percent=(category_values[AssetCategory.EQUITY] / total_value * 100),
-            fixed_income_percent=(
-                category_values[AssetCategory.FIXED_INCOME] / total_value * 100
-            ),
-            alternative_percent=(
-                category_values[AssetCategory.ALTERNATIVE] / total_value * 100
-            ),
-            cash_percent=(cash_value / total_value * 100),
-            commodity_percent=(
-                category_values[AssetCategory.COMMODITY] / total_value * 100
-            ),
-            real_estate_percent=(
-                category_values[AssetCategory.REAL_ESTATE] / total_value * 100
-            ),
+            equity_percent=percent_of(AssetCategory.EQUITY),
+            fixed_income_percent=percent_of(AssetCategory.FIXED_INCOME),
+            alternative_percent=percent_of(AssetCategory.ALTERNATIVE),
+            cash_percent=(cash_balance / total_value * 100),
+            commodity_percent=percent_of(AssetCategory.COMMODITY),
+            real_estate_percent=percent_of(AssetCategory.REAL_ESTATE),
             allocation_by_category={
                 k: v / total_value * 100 for k, v in allocation_by_category.items()
             },
@@ -253,21 +257,16 @@ class PortfolioService:
         end_date: date | None = None,
     ) -> PerformanceMetrics:
         """Calculate portfolio performance metrics."""
-        # Check if user exists
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
-            raise HTTPException(
-                status_code=404, detail=f"User with ID {user_id} not found"
-            )
+        self._get_user(db, user_id)
 
         if not end_date:
             end_date = date.today()
         if not start_date:
             start_date = end_date - timedelta(days=365)  # Default to 1 year
 
-        # Get portfolio snapshots for the period
+        # Get portfolio values for the period
         snapshots = (
-            db.query(PortfolioSnapshot)
+            db.query(PortfolioSnapshot.snapshot_date, PortfolioSnapshot.total_value)
             .filter(
                 PortfolioSnapshot.user_id == user_id,
                 PortfolioSnapshot.snapshot_date >= start_date,
@@ -306,79 +305,16 @@ class PortfolioService:
             (total_return / start_value * 100) if start_value > 0 else Decimal("0")
         )
 
-        # Calculate time-based returns
-        daily_returns: list[Decimal] = []
-        for i in range(1, len(snapshots)):
-            prev_value = snapshots[i - 1].total_value
-            curr_value = snapshots[i].total_value
-            if prev_value > 0:
-                return_rate = (curr_value - prev_value) / prev_value * 100
-                daily_returns.append(return_rate)
-
-        # Calculate volatility (standard deviation of daily returns)
-        volatility = None
-        if daily_returns:
-            mean_return = sum(daily_returns) / len(daily_returns)
-            variance = sum(
-                (float(r) - float(mean_return)) ** 2 for r in daily_returns
-            ) / len(daily_returns)
-            volatility = Decimal(str(variance**0.5))
-
-        # Calculate annualized return
-        days_diff = (end_date - start_date).days
-        annualized_return = None
-        if days_diff > 0 and start_value > 0:
-            annualized_return = (
-                (end_value / start_value) ** (Decimal("365") / days_diff) - 1
-            ) * 100
-
-        # Get recent returns
-        today = date.today()
-
-        # Daily return
-        daily_return: Decimal | None = None
-        if len(snapshots) >= 2:
-            yesterday_value = snapshots[-2].total_value
-            today_value = snapshots[-1].total_value
-            if yesterday_value > 0:
-                daily_return = (today_value - yesterday_value) / yesterday_value * 100
-
-        # Weekly return
-        week_ago = today - timedelta(days=7)
-        weekly_snapshot = next(
-            (s for s in reversed(snapshots) if s.snapshot_date <= week_ago), None
+        # Time-based returns and risk metrics in vectorized passes
+        benchmark = self._get_benchmark_prices(db, start_date, end_date)
+        analytics = analyze_performance(
+            [s.snapshot_date for s in snapshots],
+            [float(s.total_value) for s in snapshots],
+            as_of=date.today(),
+            period_days=(end_date - start_date).days,
+            benchmark_dates=benchmark.dates,
+            benchmark_values=benchmark.close,
         )
-        weekly_return = None
-        if weekly_snapshot and weekly_snapshot.total_value > 0:
-            weekly_return = (
-                (end_value - weekly_snapshot.total_value)
-                / weekly_snapshot.total_value
-                * 100
-            )
-
-        # Monthly return
-        month_ago = today - timedelta(days=30)
-        monthly_snapshot = next(
-            (s for s in reversed(snapshots) if s.snapshot_date <= month_ago), None
-        )
-        monthly_return = None
-        if monthly_snapshot and monthly_snapshot.total_value > 0:
-            monthly_return = (
-                (end_value - monthly_snapshot.total_value)
-                / monthly_snapshot.total_value
-                * 100
-            )
-
-        # YTD return
-        year_start = date(today.year, 1, 1)
-        ytd_snapshot = next(
-            (s for s in snapshots if s.snapshot_date >= year_start), None
-        )
-        ytd_return = None
-        if ytd_snapshot and ytd_snapshot.total_value > 0:
-            ytd_return = (
-                (end_value - ytd_snapshot.total_value) / ytd_snapshot.total_value * 100
-            )
 
         # Calculate dividend yield and income
         dividend_transactions = (
@@ -405,32 +341,40 @@ class PortfolioService:
         return PerformanceMetrics(
             total_return=total_return,
             total_return_percent=total_return_percent,
-            annualized_return=annualized_return,
-            daily_return=daily_return,
-            weekly_return=weekly_return,
-            monthly_return=monthly_return,
-            quarterly_return=None,
-            ytd_return=ytd_return,
-            one_year_return=None,
-            volatility=volatility,
-            sharpe_ratio=None,
-            beta=None,
-            alpha=None,
-            max_drawdown=None,
+            annualized_return=_to_decimal(analytics.annualized_return),
+            daily_return=_to_decimal(analytics.daily_return),
+            weekly_return=_to_decimal(analytics.weekly_return),
+            monthly_return=_to_decimal(analytics.monthly_return),
+            quarterly_return=_to_decimal(analytics.quarterly_return),
+            ytd_return=_to_decimal(analytics.ytd_return),
+            one_year_return=_to_decimal(analytics.one_year_return),
+            volatility=_to_decimal(analytics.volatility),
+            sharpe_ratio=_to_decimal(analytics.sharpe_ratio),
+            beta=_to_decimal(analytics.beta),
+            alpha=_to_decimal(analytics.alpha),
+            max_drawdown=_to_decimal(analytics.max_drawdown),
             dividend_yield=dividend_yield,
             annual_dividend_income=annual_dividend_income,
         )
 
+    def _get_benchmark_prices(
+        self,
+        db: Session,
+        start_date: date,
+        end_date: date,
+        benchmark_ticker: str = "SPY",
+    ) -> PriceSeries:
+        """Load benchmark prices for a period from the price store."""
+        asset_id = db.query(Asset.id).filter(Asset.ticker == benchmark_ticker).scalar()
+        if asset_id is None:
+            return PriceSeries.empty()
+        return price_store.load(db, asset_id, start_date, end_date)
+
     def create_portfolio_snapshot(
         self, db: Session, user_id: int, snapshot_date: date | None = None
     ) -> PortfolioSnapshot:
         """Create a portfolio snapshot for a specific date."""
-        # Check if user exists
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
-            raise HTTPException(
-                status_code=404, detail=f"User with ID {user_id} not found"
-            )
+        self._get_user(db, user_id)
 
         if not snapshot_date:
             snapshot_date = date.today()
@@ -477,36 +421,32 @@ class PortfolioService:
         self, db: Session, user_id: int
     ) -> DiversificationMetrics:
         """Calculate portfolio diversification metrics."""
-        # Check if user exists
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
-            raise HTTPException(
-                status_code=404, detail=f"User with ID {user_id} not found"
-            )
+        if self.cache is None:
+            return self._build_diversification_metrics(db, user_id)
+        return self.cache.get_or_compute(
+            "diversification",
+            user_id,
+            lambda: self._build_diversification_metrics(db, user_id),
+        )
 
-        positions = (
-            db.query(Position)
-            .options(joinedload(Position.asset))
-            .filter(Position.user_id == user_id, Position.is_active.is_(True))
-            .all()
+    async def get_diversification_metrics_async(
+        self, db: AsyncSession, user_id: int
+    ) -> DiversificationMetrics:
+        """:meth:`get_diversification_metrics` on an async session."""
+        return await self._get_cached_async(
+            "diversification", db, user_id, self._build_diversification_metrics
         )
 
-        if not positions:
-            return DiversificationMetrics(
-                concentration_risk=Decimal("100"),
-                herfindahl_index=Decimal("1"),
-                effective_number_of_assets=Decimal("0"),
-                sector_concentration={},
-                geographic_concentration={},
-                overall_diversification_score=0,
-                sector_diversification_score=0,
-                asset_type_diversification_score=0,
-            )
+    def _build_diversification_metrics(
+        self, db: Session, user_id: int
+    ) -> DiversificationMetrics:
+        """Compute diversification metrics from the database."""
+        self._get_user(db, user_id)
 
-        # Calculate total portfolio value
-        total_value = sum(p.current_value or Decimal("0") for p in positions)
+        aggregate = self.aggregator.aggregate(db, user_id)
+        total_value = aggregate.market_value
 
-        if total_value == 0:
+        if aggregate.position_count == 0 or total_value == 0:
             return DiversificationMetrics(
                 concentration_risk=Decimal("100"),
                 herfindahl_index=Decimal("1"),
@@ -518,44 +458,38 @@ class PortfolioService:
                 asset_type_diversification_score=0,
             )
 
-        # Calculate position weights
-        weights = [(p.current_value or Decimal("0")) / total_value for p in positions]
-
-        # Calculate Herfindahl-Hirschman Index
-        hhi = sum(w**2 for w in weights) or Decimal("0")
+        # Herfindahl-Hirschman Index over position weights
+        hhi = aggregate.herfindahl_index
 
         # Effective number of assets
         effective_assets = Decimal("1") / hhi if hhi > 0 else Decimal("0")
 
         # Concentration risk (percentage of portfolio in top position)
-        max_weight = max(weights) if weights else Decimal("0")
-        concentration_risk = max_weight * 100
+        concentration_risk = aggregate.max_value / total_value * 100
 
         # Sector concentration
         sector_values: dict[str, Decimal] = {}
-        for position in positions:
-            sector = position.asset.sector or "Unknown"
-            sector_values[sector] = sector_values.get(sector, Decimal("0")) + (
-                position.current_value or Decimal("0")
-            )
+        for sector, value in aggregate.value_by("sector", include_empty=True).items():
+            sector = sector or "Unknown"
+            sector_values[sector] = sector_values.get(sector, Decimal("0")) + value
 
         sector_concentration = {
             sector: value / total_value * 100 for sector, value in sector_values.items()
         }
 
         # Calculate diversification scores (simplified scoring)
-        overall_score = (
-            min(100, int((effective_assets / len(positions)) * 100)) if positions else 0
+        overall_score = min(
+            100, int((effective_assets / aggregate.position_count) * 100)
         )
 
         # Sector diversification score based on number of sectors
-        unique_sectors = len(set(p.asset.sector for p in positions if p.asset.sector))
+        unique_sectors = len({g.sector for g in aggregate.groups if g.sector})
         sector_score = min(
             100, unique_sectors * (100 // MIN_DIVERSIFICATION_ASSETS)
         )  # Max score at MIN_DIVERSIFICATION_ASSETS+ sectors
 
         # Asset type diversification score
-        unique_asset_types = len(set(p.asset.asset_type for p in positions))
+        unique_asset_types = len({g.asset_type for g in aggregate.groups})
         asset_type_score = min(
             100, unique_asset_types * 25
         )  # Max score at 4+ asset types
@@ -575,27 +509,17 @@ class PortfolioService:
         self, db: Session, user_id: int
     ) -> dict[int, Decimal]:
         """Calculate position weights in portfolio."""
-        # Check if user exists
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
-            raise HTTPException(
-                status_code=404, detail=f"User with ID {user_id} not found"
-            )
-
-        positions = (
-            db.query(Position)
-            .filter(Position.user_id == user_id, Position.is_active.is_(True))
-            .all()
-        )
+        self._get_user(db, user_id)
 
-        total_value = sum(p.current_value or Decimal("0") for p in positions)
+        values = self.aggregator.position_values(db, user_id)
+        total_value = sum(values.values(), Decimal("0"))
 
         if total_value == 0:
             return {}
 
         return {
-            position.id: (position.current_value or Decimal("0")) / total_value * 100
-            for position in positions
+            position_id: value / total_value * 100
+            for position_id, value in values.items()
         }
 
     def get_performance_comparison(
@@ -607,12 +531,7 @@ class PortfolioService:
         end_date: date | None = None,
     ) -> dict[str, Decimal]:
         """Compare portfolio performance to a benchmark."""
-        # Check if user exists
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
-            raise HTTPException(
-                status_code=404, detail=f"User with ID {user_id} not found"
-            )
+        self._get_user(db, user_id)
 
         if not end_date:
             end_date = date.today()
@@ -645,43 +564,16 @@ class PortfolioService:
     ) -> Decimal:
         """Get benchmark return for a given period."""
         try:
-            from backend.models.asset import Asset
-            from backend.models.price_history import PriceHistory
             from backend.services.market_data import market_data_service
 
-            # Try to get benchmark asset from database
-            benchmark_asset = (
-                db.query(Asset).filter(Asset.ticker == benchmark_ticker).first()
-            )
-
-            if benchmark_asset:
-                # Get historical prices from database
-                start_price_record = (
-                    db.query(PriceHistory)
-                    .filter(
-                        PriceHistory.asset_id == benchmark_asset.id,
-                        PriceHistory.price_date >= start_date,
-                    )
-                    .order_by(PriceHistory.price_date.asc())
-                    .first()
-                )
-
-                end_price_record = (
-                    db.query(PriceHistory)
-                    .filter(
-                        PriceHistory.asset_id == benchmark_asset.id,
-                        PriceHistory.price_date <= end_date,
-                    )
-                    .order_by(PriceHistory.price_date.desc())
-                    .first()
-                )
-
-                if start_price_record and end_price_record:
-                    start_price = start_price_record.close_price
-                    end_price = end_price_record.close_price
-
-                    if start_price and end_price and start_price > 0:
-                        return ((end_price - start_price) / start_price) * 100
+            # Try the benchmark's stored price history first
+            closes = self._get_benchmark_prices(
+                db, start_date, end_date, benchmark_ticker
+            ).close
+            if len(closes) and closes[0] > 0:
+                start_price = Decimal(str(closes[0]))
+                end_price = Decimal(str(closes[-1]))
+                return ((end_price - start_price) / start_price) * 100
 
             # Fallback: fetch current vs historical data using market data service
             current_result = market_data_service.fetch_quote(benchmark_ticker, db)
@@ -0,0 +1,407 @@
+"""SQL aggregation of a user's active positions for portfolio views.
+
+Summary, allocation, diversification and position weights all derive from
+the same few numbers: market value and cost basis per asset category, sector
+and asset type, the sum of squared position values (for the HHI), the
+largest position and the top positions by value. These are computed in the
+database with one grouped query over ``positions JOIN assets`` instead of
+hydrating every ``Position`` and its ``Asset``. Daily snapshots for every
+user are built the same way, with a single ``INSERT ... SELECT``.
+"""
+
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal
+from typing import Any
+
+from sqlalchemy import Date, case, distinct, exists, func, insert, literal, select
+from sqlalchemy.orm import Session
+
+from backend.models import (
+    Asset,
+    AssetCategory,
+    AssetType,
+    CashAccount,
+    PortfolioSnapshot,
+    Position,
+    User,
+)
+
+ZERO = Decimal("0")
+HUNDRED = Decimal("100")
+
+# Snapshot columns holding the value of each asset category
+SNAPSHOT_CATEGORY_COLUMNS = {
+    AssetCategory.EQUITY: "equity_value",
+    AssetCategory.FIXED_INCOME: "fixed_income_value",
+    AssetCategory.ALTERNATIVE: "alternative_value",
+    AssetCategory.CASH_EQUIVALENT: "cash_equivalent_value",
+    AssetCategory.COMMODITY: "commodity_value",
+    AssetCategory.REAL_ESTATE: "real_estate_value",
+}
+
+
+def _position_value() -> Any:
+    """Market value of a position; NULL when its asset has no price."""
+    return Position.quantity * Asset.current_price
+
+
+def _decimal(value: Any) -> Decimal:
+    if value is None:
+        return ZERO
+    return value if isinstance(value, Decimal) else Decimal(str(value))
+
+
+@dataclass
+class AllocationGroup:
+    """Totals for positions sharing a category, sector and asset type."""
+
+    category: AssetCategory
+    sector: str | None
+    asset_type: AssetType
+    market_value: Decimal
+    cost_basis: Decimal
+    position_count: int
+    asset_count: int
+    sum_of_squares: Decimal
+    max_value: Decimal
+
+
+@dataclass
+class PositionValue:
+    """Narrow projection of a position and its asset."""
+
+    id: int
+    asset_id: int
+    quantity: Decimal
+    total_cost_basis: Decimal
+    ticker: str
+    name: str
+    asset_type: AssetType
+    category: AssetCategory
+    current_price: Decimal | None
+    currency: str
+    asset_is_active: bool
+
+    @property
+    def current_value(self) -> Decimal | None:
+        """Same rule as ``Position.current_value``."""
+        if self.current_price:
+            return Decimal(str(self.current_price)) * self.quantity
+        return None
+
+    @property
+    def unrealized_gain_loss(self) -> Decimal | None:
+        """Same rule as ``Position.unrealized_gain_loss``."""
+        current_value = self.current_value
+        if current_value is not None:
+            return current_value - self.total_cost_basis
+        return None
+
+    @property
+    def unrealized_gain_loss_percent(self) -> Decimal | None:
+        """Same rule as ``Position.unrealized_gain_loss_percent``."""
+        unrealized = self.unrealized_gain_loss
+        if unrealized is not None and self.total_cost_basis > 0:
+            return unrealized / self.total_cost_basis * 100
+        return None
+
+
+@dataclass
+class PortfolioAggregate:
+    """Grouped totals for one user's active positions."""
+
+    groups: list[AllocationGroup] = field(default_factory=list)
+    top_positions: list[PositionValue] = field(default_factory=list)
+
+    @property
+    def market_value(self) -> Decimal:
+        """Total value of priced positions, excluding cash."""
+        return sum((g.market_value for g in self.groups), ZERO)
+
+    @property
+    def cost_basis(self) -> Decimal:
+        """Total cost basis of all positions."""
+        return sum((g.cost_basis for g in self.groups), ZERO)
+
+    @property
+    def position_count(self) -> int:
+        """Number of active positions, priced or not."""
+        return sum(g.position_count for g in self.groups)
+
+    @property
+    def asset_count(self) -> int:
+        """Number of distinct assets held."""
+        # An asset has a single category, sector and type, so groups never
+        # share assets and per-group distinct counts add up
+        return sum(g.asset_count for g in self.groups)
+
+    @property
+    def max_value(self) -> Decimal:
+        """Value of the largest position."""
+        return max((g.max_value for g in self.groups), default=ZERO)
+
+    @property
+    def herfindahl_index(self) -> Decimal:
+        """Sum of squared position weights, computed as sum(v^2) / total^2."""
+        total = self.market_value
+        if total == 0:
+            return ZERO
+        return self.sum_of_squares / (total * total)
+
+    @property
+    def sum_of_squares(self) -> Decimal:
+        """Sum of squared position values."""
+        return sum((g.sum_of_squares for g in self.groups), ZERO)
+
+    def value_by(
+        self, attribute: str, include_empty: bool = False
+    ) -> dict[Any, Decimal]:
+        """Market value per category, sector or asset type.
+
+        Args:
+            attribute: ``"category"``, ``"sector"`` or ``"asset_type"``
+            include_empty: Keep keys whose positions have no market value
+        """
+        totals: dict[Any, Decimal] = {}
+        for group in self.groups:
+            if not group.market_value and not include_empty:
+                continue
+            key = getattr(group, attribute)
+            totals[key] = totals.get(key, ZERO) + group.market_value
+        return totals
+
+
+class PortfolioAggregator:
+    """Computes portfolio aggregates with grouped SQL queries."""
+
+    def aggregate(
+        self, db: Session, user_id: int, top_n: int = 0
+    ) -> PortfolioAggregate:
+        """Aggregate a user's active positions.
+
+        Args:
+            db: Database session
+            user_id: Portfolio owner
+            top_n: Number of largest positions to load alongside the totals
+
+        Returns:
+            PortfolioAggregate with one group per category/sector/asset type
+        """
+        value = _position_value()
+        rows = (
+            db.query(
+                Asset.category,
+                Asset.sector,
+                Asset.asset_type,
+                func.sum(value),
+                func.sum(Position.total_cost_basis),
+                func.count(Position.id),
+                func.count(distinct(Position.asset_id)),
+                func.sum(value * value),
+                func.max(value),
+            )
+            .join(Asset, Position.asset_id == Asset.id)
+            .filter(Position.user_id == user_id, Position.is_active.is_(True))
+            .group_by(Asset.category, Asset.sector, Asset.asset_type)
+            .all()
+        )
+        aggregate = PortfolioAggregate(
+            groups=[
+                AllocationGroup(
+                    category=category,
+                    sector=sector,
+                    asset_type=asset_type,
+                    market_value=_decimal(market_value),
+                    cost_basis=_decimal(cost_basis),
+                    position_count=position_count,
+                    asset_count=asset_count,
+                    sum_of_squares=_decimal(sum_of_squares),
+                    max_value=_decimal(max_value),
+                )
+                for (
+                    category,
+                    sector,
+                    asset_type,
+                    market_value,
+                    cost_basis,
+                    position_count,
+                    asset_count,
+                    sum_of_squares,
+                    max_value,
+                ) in rows
+            ]
+        )
+        if top_n and aggregate.groups:
+            aggregate.top_positions = self.top_positions(db, user_id, top_n)
+        return aggregate
+
+    def top_positions(
+        self, db: Session, user_id: int, limit: int
+    ) -> list[PositionValue]:
+        """Load the largest active positions by market value."""
+        rows = (
+            db.query(
+                Position.id,
+                Position.asset_id,
+                Position.quantity,
+                Position.total_cost_basis,
+                Asset.ticker,
+                Asset.name,
+                Asset.asset_type,
+                Asset.category,
+                Asset.current_price,
+                Asset.currency,
+                Asset.is_active,
+            )
+            .join(Asset, Position.asset_id == Asset.id)
+            .filter(Position.user_id == user_id, Position.is_active.is_(True))
+            .order_by(func.coalesce(_position_value(), 0).desc(), Position.id)
+            .limit(limit)
+            .all()
+        )
+        return [PositionValue(*row) for row in rows]
+
+    def position_values(self, db: Session, user_id: int) -> dict[int, Decimal]:
+        """Market value of each active position, zero when unpriced."""
+        rows = (
+            db.query(Position.id, _position_value())
+            .join(Asset, Position.asset_id == Asset.id)
+            .filter(Position.user_id == user_id, Position.is_active.is_(True))
+            .all()
+        )
+        return {position_id: _decimal(value) for position_id, value in rows}
+
+    def create_snapshots(
+        self,
+        db: Session,
+        snapshot_date: date,
+        user_id: int | None = None,
+        currency: str = "USD",
+    ) -> int:
+        """Insert a portfolio snapshot for every user holding priced positions.
+
+        Totals, category values and the change since each user's previous
+        snapshot are computed and inserted in one ``INSERT ... SELECT``.
+        Users that already have a snapshot for ``snapshot_date`` are skipped,
+        so the method can be re-run safely, as are users none of whose
+        active positions has a price yet. Values follow
+        ``PortfolioSnapshot.create_from_positions``. The caller commits.
+
+        Args:
+            db: Database session
+            snapshot_date: Date of the snapshots
+            user_id: Only snapshot this user; all active users when None
+            currency: Currency of the cash balance included in the totals
+
+        Returns:
+            Number of snapshots created
+        """
+        value = _position_value()
+        priced = Asset.current_price.isnot(None)
+        holdings_query = (
+            select(
+                Position.user_id.label("user_id"),
+                func.coalesce(func.sum(value), 0).label("invested"),
+                func.coalesce(
+                    func.sum(case((priced, Position.total_cost_basis))), 0
+                ).label("cost_basis"),
+                *(
+                    func.coalesce(
+                        func.sum(case((Asset.category == category, value))), 0
+                    ).label(column)
+                    for category, column in SNAPSHOT_CATEGORY_COLUMNS.items()
+                ),
+                func.count(Position.id).label("positions"),
+                func.count(distinct(Position.asset_id)).label("assets"),
+            )
+            .join(Asset, Position.asset_id == Asset.id)
+            .where(
+                Position.is_active.is_(True),
+                ~exists().where(
+                    PortfolioSnapshot.user_id == Position.user_id,
+                    PortfolioSnapshot.snapshot_date == snapshot_date,
+                ),
+            )
+            .group_by(Position.user_id)
+            .having(func.count(Asset.current_price) > 0)
+        )
+        if user_id is not None:
+            holdings_query = holdings_query.where(Position.user_id == user_id)
+        else:
+            holdings_query = holdings_query.join(
+                User, Position.user_id == User.id
+            ).where(User.is_active.is_(True))
+        holdings = holdings_query.subquery("holdings")
+
+        cash = (
+            select(
+                CashAccount.user_id.label("user_id"),
+                func.sum(CashAccount.balance).label("balance"),
+            )
+            .where(CashAccount.currency == currency)
+            .group_by(CashAccount.user_id)
+            .subquery("cash")
+        )
+        latest = (
+            select(
+                PortfolioSnapshot.user_id.label("user_id"),
+                func.max(PortfolioSnapshot.snapshot_date).label("snapshot_date"),
+            )
+            .where(PortfolioSnapshot.snapshot_date < snapshot_date)
+            .group_by(PortfolioSnapshot.user_id)
+            .subquery("latest")
+        )
+        previous = (
+            select(
+                PortfolioSnapshot.user_id.label("user_id"),
+                PortfolioSnapshot.total_value.label("total_value"),
+            )
+            .join(
+                latest,
+                (PortfolioSnapshot.user_id == latest.c.user_id)
+                & (PortfolioSnapshot.snapshot_date == latest.c.snapshot_date),
+            )
+            .subquery("previous")
+        )
+
+        cash_balance = func.coalesce(cash.c.balance, 0)
+        total_value = holdings.c.invested + cash_balance
+        gain_loss = holdings.c.invested - holdings.c.cost_basis
+        previous_value = previous.c.total_value
+        daily_change = total_value - previous_value
+        columns = {
+            "user_id": holdings.c.user_id,
+            "snapshot_date": literal(snapshot_date, Date),
+            "total_value": total_value,
+            "total_cost_basis": holdings.c.cost_basis,
+            "cash_balance": cash_balance,
+            "invested_amount": holdings.c.invested,
+            "total_gain_loss": gain_loss,
+            "total_gain_loss_percent": case(
+                (
+                    holdings.c.cost_basis > 0,
+                    gain_loss * HUNDRED / holdings.c.cost_basis,
+                ),
+                else_=0,
+            ),
+            "daily_change": daily_change,
+            "daily_change_percent": case(
+                (previous_value.is_(None), None),
+                (previous_value > 0, daily_change * HUNDRED / previous_value),
+                else_=0,
+            ),
+            **{
+                column: holdings.c[column]
+                for column in SNAPSHOT_CATEGORY_COLUMNS.values()
+            },
+            "number_of_positions": holdings.c.positions,
+            "number_of_assets": holdings.c.assets,
+        }
+        rows = (
+            select(*columns.values())
+            .outerjoin(cash, cash.c.user_id == holdings.c.user_id)
+            .outerjoin(previous, previous.c.user_id == holdings.c.user_id)
+        )
+        result = db.execute(insert(PortfolioSnapshot).from_select(list(columns), rows))
+        return result.rowcount
@@ -0,0 +1,229 @@
+"""Per-user cache of portfolio summary, allocation and diversification results.
+
+Entries are dropped from SQLAlchemy session events when a change commits:
+writes to a user's positions, transactions, cash accounts or snapshots
+invalidate that user, and any asset write (a price refresh, a new sector)
+invalidates every user, since positions are valued from asset data. This
+covers service methods, generic CRUD, bulk ORM updates and Celery tasks
+alike. ``settings.portfolio_cache_ttl`` bounds staleness for writes the
+events cannot see, such as raw SQL from outside the application.
+
+Cache keys carry a per-user and a global version counter, incremented in
+Redis on every invalidation. A view one worker computed from data that
+another worker's commit has since changed is stored under the old version,
+where no later lookup reads it.
+
+Views are copied into and out of the cache, so callers may modify what they
+get. Async endpoints use :meth:`PortfolioCache.get_or_compute_async`, which
+keeps the Redis round trips off the event loop.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from itertools import chain
+import logging
+import threading
+from typing import Any, TypeVar
+import weakref
+
+from pydantic import BaseModel
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from backend.config import get_settings
+from backend.models import Asset, CashAccount, PortfolioSnapshot, Position, Transaction
+from backend.schemas.portfolio import (
+    AllocationBreakdown,
+    DiversificationMetrics,
+    PortfolioSummary,
+)
+from backend.services.cache import TwoTierCache
+from backend.services.commit_invalidation import ALL_USERS, CommitInvalidation
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+M = TypeVar("M", bound=BaseModel)
+
+# Cached portfolio views and their response models
+PORTFOLIO_VIEWS: dict[str, type[BaseModel]] = {
+    "summary": PortfolioSummary,
+    "allocation": AllocationBreakdown,
+    "diversification": DiversificationMetrics,
+}
+
+# Seconds a worker keeps its own copy while Redis is shared, so invalidations
+# committed by other workers (e.g. Celery price refreshes) apply quickly
+LOCAL_CACHE_TTL = 5.0
+
+# Seconds a version counter outlives its last increment; far longer than
+# cached views live, so no counter restarts while views stored under it remain
+VERSION_TTL = 86400
+
+_USER_SCOPED_MODELS = (CashAccount, PortfolioSnapshot, Position, Transaction)
+_TRACKED_MODELS = (Asset, *_USER_SCOPED_MODELS)
+
+# Every live cache, so commits invalidate caches built outside the global one
+_caches: "weakref.WeakSet[PortfolioCache]" = weakref.WeakSet()
+
+
+class PortfolioCache:
+    """Cache of portfolio views keyed by user ID."""
+
+    def __init__(self, ttl: float, max_size: int):
+        self.caches: dict[str, TwoTierCache[BaseModel]] = {
+            view: TwoTierCache(
+                namespace=f"portfolio_{view}",
+                ttl=ttl,
+                max_size=max_size,
+                encode=lambda value: value.model_dump_json(),
+                decode=model.model_validate_json,
+                local_ttl=LOCAL_CACHE_TTL,
+            )
+            for view, model in PORTFOLIO_VIEWS.items()
+        }
+        self.versions: TwoTierCache[int] = TwoTierCache(
+            namespace="portfolio_version",
+            ttl=max(VERSION_TTL, 2 * ttl),
+            max_size=max_size,
+            encode=str,
+            decode=int,
+            local_ttl=LOCAL_CACHE_TTL,
+        )
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._user_generations: dict[int, int] = {}
+        self._invalidations = 0
+        _caches.add(self)
+
+    def _generation_for(self, user_id: int) -> tuple[int, int]:
+        with self._lock:
+            return self._generation, self._user_generations.get(user_id, 0)
+
+    def _key(self, user_id: int) -> str:
+        """Key of a user's views under the current shared versions."""
+        return (
+            f"{user_id}:{self.versions.get(ALL_USERS) or 0}"
+            f".{self.versions.get(str(user_id)) or 0}"
+        )
+
+    def _lookup(self, view: str, user_id: int) -> tuple[str, BaseModel | None]:
+        """Key of a user's view and a copy of the cached value, if any."""
+        key = self._key(user_id)
+        cached = self.caches[view].get(key)
+        return key, cached.model_copy(deep=True) if cached is not None else None
+
+    def _store(self, view: str, key: str, value: BaseModel) -> None:
+        self.caches[view].set(key, value.model_copy(deep=True))
+
+    def get_or_compute(self, view: str, user_id: int, compute: Callable[[], M]) -> M:
+        """Return the cached view for a user, computing and storing it on a miss.
+
+        A result is stored under the versions read before computing it, so
+        once any worker invalidates the user it is no longer served. Within
+        this process it is not stored at all if the user was invalidated
+        while it was being computed.
+        """
+        key, cached = self._lookup(view, user_id)
+        if cached is not None:
+            return cached  # type: ignore[return-value]
+
+        generation = self._generation_for(user_id)
+        value = compute()
+        if self._generation_for(user_id) == generation:
+            self._store(view, key, value)
+        return value
+
+    async def get_or_compute_async(
+        self, view: str, user_id: int, compute: Callable[[], Awaitable[M]]
+    ) -> M:
+        """:meth:`get_or_compute` for the event loop.
+
+        Lookups and stores may wait on Redis, so they run in a worker thread;
+        only ``compute`` is awaited on the loop.
+        """
+        key, cached = await asyncio.to_thread(self._lookup, view, user_id)
+        if cached is not None:
+            return cached  # type: ignore[return-value]
+
+        generation = self._generation_for(user_id)
+        value = await compute()
+        if self._generation_for(user_id) == generation:
+            await asyncio.to_thread(self._store, view, key, value)
+        return value
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Drop every cached view of one user's portfolio."""
+        key = self._key(user_id)
+        with self._lock:
+            self._user_generations[user_id] = self._user_generations.get(user_id, 0) + 1
+            self._invalidations += 1
+        self.versions.incr(str(user_id))
+        for cache in self.caches.values():
+            cache.delete(key)
+
+    def invalidate_all(self) -> None:
+        """Drop every cached view of every portfolio."""
+        with self._lock:
+            self._generation += 1
+            self._invalidations += 1
+        self.versions.incr(ALL_USERS)
+        for cache in self.caches.values():
+            cache.clear()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Per-view cache counters plus the number of invalidations."""
+        return {
+            "invalidations": self._invalidations,
+            **{view: cache.get_stats() for view, cache in self.caches.items()},
+        }
+
+
+def _invalidate_committed(pending: set[Any]) -> None:
+    """Invalidate the portfolios touched by a committed transaction."""
+    for cache in list(_caches):
+        if ALL_USERS in pending:
+            cache.invalidate_all()
+            continue
+        for user_id in pending:
+            cache.invalidate_user(user_id)
+
+
+_invalidation = CommitInvalidation("portfolio_cache", _invalidate_committed)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed_changes(session: Session, _flush_context: Any) -> None:
+    """Record which portfolios the flushed objects belong to."""
+    pending = _invalidation.pending(session)
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, Asset):
+            pending.add(ALL_USERS)
+        elif isinstance(obj, _USER_SCOPED_MODELS) and obj.user_id is not None:
+            pending.add(obj.user_id)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_changes(orm_execute_state: ORMExecuteState) -> None:
+    """Bulk ORM statements carry no per-row owner, so they affect everyone."""
+    if not (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        return
+    if any(
+        mapper.class_ in _TRACKED_MODELS for mapper in orm_execute_state.all_mappers
+    ):
+        _invalidation.pending(orm_execute_state.session).add(ALL_USERS)
+
+
+# Global cache instance
+portfolio_cache = PortfolioCache(
+    ttl=settings.portfolio_cache_ttl, max_size=settings.portfolio_cache_max_size
+)
+
+
+def get_portfolio_cache() -> PortfolioCache | None:
+    """Get the global portfolio cache, or None when caching is disabled."""
+    return portfolio_cache if settings.portfolio_cache_enabled else None
@@ -6,7 +6,7 @@ import logging
 from typing import Any, cast
 
 from fastapi import HTTPException
-from sqlalchemy import and_
+from sqlalchemy import Subquery, and_, case, func, select
 from sqlalchemy.orm import Session, joinedload
 
 from backend.models import Asset, Position, Transaction, User
@@ -20,6 +20,7 @@ from backend.schemas.position import (
     PositionUpdate,
 )
 from backend.services.base import BaseService
+from backend.services.pagination import decode_cursor
 
 logger = logging.getLogger(__name__)
 
@@ -38,8 +39,12 @@ class PositionService(BaseService[Position, PositionCreate, PositionUpdate]):
         filters: PositionFilters | None = None,
         skip: int = 0,
         limit: int = 100,
+        cursor: str | None = None,
     ) -> list[PositionResponse]:
-        """Get positions for a user with optional filters."""
+        """Get positions for a user with optional filters, in id order.
+
+        ``cursor`` continues after the position of an earlier page's cursor.
+        """
         # Check if user exists
         user = db.query(User).filter(User.id == user_id).first()
         if not user:
@@ -47,9 +52,11 @@ class PositionService(BaseService[Position, PositionCreate, PositionUpdate]):
                 status_code=404, detail=f"User with ID {user_id} not found"
             )
 
+        portfolio_values = self._portfolio_value_window(user_id)
         query = (
-            db.query(Position)
+            db.query(Position, portfolio_values.c.portfolio_value)
             .options(joinedload(Position.asset))
+            .join(portfolio_values, portfolio_values.c.position_id == Position.id)
             .filter(Position.user_id == user_id)
         )
 
@@ -74,11 +81,15 @@ class PositionService(BaseService[Position, PositionCreate, PositionUpdate]):
 
             query = query.filter(Position.is_active == filters.is_active)
 
-        positions = query.offset(skip).limit(limit).all()
+        if cursor is not None:
+            (last_id,) = decode_cursor(cursor, int)
+            query = query.filter(Position.id > last_id)
+
+        rows = query.order_by(Position.id).offset(skip).limit(limit).all()
 
         # Convert to response objects
         position_responses: list[PositionResponse] = []
-        for position in positions:
+        for position, portfolio_value in rows:
             asset_summary = AssetSummary(
                 id=position.asset.id,
                 ticker=position.asset.ticker,
@@ -112,26 +123,43 @@ class PositionService(BaseService[Position, PositionCreate, PositionUpdate]):
                 unrealized_gain_loss=position.unrealized_gain_loss,
                 unrealized_gain_loss_percent=position.unrealized_gain_loss_percent,
                 weight_in_portfolio=self._calculate_position_weight(
-                    position, positions
+                    position, portfolio_value
                 ),
             )
             position_responses.append(position_response)
 
         return position_responses
 
+    @staticmethod
+    def _portfolio_value_window(user_id: int) -> Subquery:
+        """Total active portfolio value alongside every position of a user.
+
+        The total is a window over all of the user's positions, computed in
+        the same query as the page, so weights are portfolio-wide regardless
+        of filters and pagination.
+        """
+        value = Position.quantity * Asset.current_price
+        return (
+            select(
+                Position.id.label("position_id"),
+                func.sum(case((Position.is_active.is_(True), value)))
+                .over(partition_by=Position.user_id)
+                .label("portfolio_value"),
+            )
+            .join(Asset, Position.asset_id == Asset.id)
+            .where(Position.user_id == user_id)
+            .subquery("portfolio_values")
+        )
+
     def _calculate_position_weight(
-        self, position: Position, all_positions: list[Position]
+        self, position: Position, portfolio_value: Decimal | float | None
     ) -> Decimal | None:
         """Calculate the weight of a position in the portfolio."""
         try:
             if not position.current_value:
                 return None
 
-            # Calculate total portfolio value
-            total_value = sum(
-                pos.current_value for pos in all_positions if pos.current_value
-            )
-
+            total_value = Decimal(str(portfolio_value or 0))
             if total_value == 0:
                 return Decimal("0")
 
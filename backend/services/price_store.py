@@ -0,0 +1,324 @@
+"""Columnar, memory-mapped store of daily price history for analytics.
+
+Each asset's history is kept as one ``.npy`` file per column (``dates``,
+``open``, ``high``, ``low``, ``close`` and ``volume``) under
+``<root>/<asset_id>/<generation>/``. Reads memory-map the current generation
+and slice it by date, so multi-year series reach the analytics kernels as
+zero-copy NumPy views instead of ``PriceHistory`` rows holding ``Decimal``
+prices.
+
+``sync`` merges the ``price_history`` rows changed since the previous sync
+and runs after every price refresh. Writers build a complete new generation
+and then switch the asset's ``CURRENT`` pointer with an atomic rename, so
+readers never see a half-written series.
+"""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, fields
+from datetime import date, datetime, timedelta
+import fcntl
+from itertools import groupby
+import json
+import logging
+from pathlib import Path
+import shutil
+import time
+from typing import Any
+
+import numpy as np
+from sqlalchemy import Float, cast, select
+from sqlalchemy.orm import Session
+
+from backend.config import get_settings
+from backend.models.price_history import PriceHistory
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Rows committed by transactions that started before the previous sync carry
+# an older updated_at; re-reading this margin picks them up. Merges are
+# idempotent, so the overlap only costs a few duplicate rows.
+SYNC_OVERLAP = timedelta(minutes=10)
+
+# Generations kept per asset; the previous one stays for readers that
+# resolved CURRENT just before it was switched
+KEEP_GENERATIONS = 2
+
+MANIFEST_FILE = "manifest.json"
+LOCK_FILE = ".lock"
+CURRENT_FILE = "CURRENT"
+
+# Price columns selected as floats so drivers skip building Decimals
+_PRICE_COLUMNS = (
+    cast(PriceHistory.open_price, Float),
+    cast(PriceHistory.high_price, Float),
+    cast(PriceHistory.low_price, Float),
+    cast(PriceHistory.close_price, Float),
+    cast(PriceHistory.volume, Float),
+)
+
+
+@dataclass(frozen=True)
+class PriceSeries:
+    """Daily OHLCV arrays for one asset, oldest first.
+
+    ``dates`` is ``datetime64[D]``; the other columns are float64 with NaN
+    where ``price_history`` has no value.
+    """
+
+    dates: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def columns(self) -> dict[str, np.ndarray]:
+        """Arrays by column name, in storage order."""
+        return {field.name: getattr(self, field.name) for field in fields(self)}
+
+    def between(self, start: date | None, end: date | None) -> "PriceSeries":
+        """Rows dated from ``start`` through ``end``, as views of this series."""
+        low = (
+            0
+            if start is None
+            else int(np.searchsorted(self.dates, np.datetime64(start, "D")))
+        )
+        high = (
+            len(self.dates)
+            if end is None
+            else int(np.searchsorted(self.dates, np.datetime64(end, "D"), side="right"))
+        )
+        return PriceSeries(
+            **{name: array[low:high] for name, array in self.columns().items()}
+        )
+
+    @classmethod
+    def empty(cls) -> "PriceSeries":
+        """Series without any rows."""
+        return cls.from_rows([])
+
+    @classmethod
+    def from_rows(cls, rows: list[Any]) -> "PriceSeries":
+        """Build a series from ``(price_date, open, high, low, close, volume)`` rows."""
+        return cls(
+            dates=np.array([row[0] for row in rows], dtype="datetime64[D]"),
+            **{
+                name: np.array([row[i] for row in rows], dtype=float)
+                for i, name in enumerate(("open", "high", "low", "close", "volume"), 1)
+            },
+        )
+
+
+class PriceStore:
+    """Per-asset columnar price files kept in step with ``price_history``."""
+
+    def __init__(self, root: str | Path, enabled: bool = True):
+        self.root = Path(root)
+        self.enabled = enabled
+
+    def is_synced(self) -> bool:
+        """Whether the store has been populated by at least one sync."""
+        return self.enabled and (self.root / MANIFEST_FILE).exists()
+
+    def read(
+        self, asset_id: int, start: date | None = None, end: date | None = None
+    ) -> PriceSeries:
+        """Memory-mapped prices of one asset between two dates, inclusive.
+
+        Returns an empty series for assets without stored prices.
+        """
+        asset_dir = self.root / str(asset_id)
+        try:
+            generation = (asset_dir / CURRENT_FILE).read_text().strip()
+        except FileNotFoundError:
+            return PriceSeries.empty()
+        directory = asset_dir / generation
+        series = PriceSeries(
+            **{
+                name: np.load(directory / f"{name}.npy", mmap_mode="r")
+                for name in PriceSeries.__dataclass_fields__
+            }
+        )
+        return series.between(start, end)
+
+    def load(
+        self,
+        db: Session,
+        asset_id: int,
+        start: date | None = None,
+        end: date | None = None,
+    ) -> PriceSeries:
+        """Prices of one asset from the store, or from SQL until the first sync."""
+        return self.load_many(db, [asset_id], start, end)[asset_id]
+
+    def load_many(
+        self,
+        db: Session,
+        asset_ids: list[int],
+        start: date | None = None,
+        end: date | None = None,
+    ) -> dict[int, PriceSeries]:
+        """Prices of several assets, read with one ``IN`` query before the first sync.
+
+        Every requested asset is in the result; assets without prices map to
+        an empty series.
+        """
+        if self.is_synced():
+            return {asset_id: self.read(asset_id, start, end) for asset_id in asset_ids}
+
+        query = select(PriceHistory.asset_id, PriceHistory.price_date, *_PRICE_COLUMNS)
+        query = query.where(PriceHistory.asset_id.in_(asset_ids))
+        if start is not None:
+            query = query.where(PriceHistory.price_date >= start)
+        if end is not None:
+            query = query.where(PriceHistory.price_date <= end)
+        rows = db.execute(
+            query.order_by(PriceHistory.asset_id, PriceHistory.price_date)
+        ).all()
+
+        series = dict.fromkeys(asset_ids, PriceSeries.empty())
+        for asset_id, asset_rows in groupby(rows, key=lambda row: row[0]):
+            series[asset_id] = PriceSeries.from_rows([row[1:] for row in asset_rows])
+        return series
+
+    def version(self) -> str | None:
+        """Watermark of the last sync, which changes whenever stored prices do."""
+        if not self.enabled:
+            return None
+        return self._read_manifest().get("synced_through")
+
+    def sync(self, db: Session, full: bool = False) -> int:
+        """Merge ``price_history`` rows changed since the previous sync.
+
+        Args:
+            db: Session to read ``price_history`` with
+            full: Rebuild every series from scratch, which also drops rows
+                and assets deleted from the table
+
+        Returns:
+            Number of rows read from the database
+        """
+        if not self.enabled:
+            return 0
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        with self._lock():
+            manifest = self._read_manifest()
+            synced_through = None if full else manifest.get("synced_through")
+
+            query = select(
+                PriceHistory.asset_id,
+                PriceHistory.price_date,
+                *_PRICE_COLUMNS,
+                PriceHistory.updated_at,
+            )
+            if synced_through is not None:
+                query = query.where(
+                    PriceHistory.updated_at
+                    >= datetime.fromisoformat(synced_through) - SYNC_OVERLAP
+                )
+            rows = db.execute(
+                query.order_by(PriceHistory.asset_id, PriceHistory.price_date)
+            ).all()
+
+            synced_assets = set()
+            for asset_id, asset_rows in groupby(rows, key=lambda row: row[0]):
+                changes = PriceSeries.from_rows([row[1:7] for row in asset_rows])
+                self._write(
+                    asset_id, changes if full else self._merge(asset_id, changes)
+                )
+                synced_assets.add(str(asset_id))
+
+            if full:
+                for path in self.root.iterdir():
+                    if path.is_dir() and path.name not in synced_assets:
+                        shutil.rmtree(path, ignore_errors=True)
+
+            updated = [row[-1] for row in rows if row[-1] is not None]
+            if updated:
+                synced_through = max(updated).isoformat()
+            self._write_manifest({"synced_through": synced_through})
+
+        logger.info(
+            f"Price store synced {len(rows)} rows for {len(synced_assets)} assets"
+        )
+        return len(rows)
+
+    def _merge(self, asset_id: int, changes: PriceSeries) -> PriceSeries:
+        """Stored series with ``changes`` applied; changed dates take new values."""
+        current = self.read(asset_id)
+        if not len(current):
+            return changes
+        combined = {
+            name: np.concatenate([array, getattr(changes, name)])
+            for name, array in current.columns().items()
+        }
+        # np.unique keeps the first occurrence, so search the reversed arrays
+        # to let the changed rows win over stored ones
+        _, last = np.unique(combined["dates"][::-1], return_index=True)
+        return PriceSeries(
+            **{name: array[::-1][last] for name, array in combined.items()}
+        )
+
+    def _write(self, asset_id: int, series: PriceSeries) -> None:
+        """Store ``series`` as a new generation and make it current."""
+        asset_dir = self.root / str(asset_id)
+        generation = f"g{time.time_ns()}"
+        directory = asset_dir / generation
+        directory.mkdir(parents=True)
+        for name, array in series.columns().items():
+            np.save(directory / f"{name}.npy", np.ascontiguousarray(array))
+
+        pointer = asset_dir / f"{CURRENT_FILE}.tmp"
+        pointer.write_text(generation)
+        pointer.replace(asset_dir / CURRENT_FILE)
+
+        generations = sorted(
+            path for path in asset_dir.iterdir() if path.name.startswith("g")
+        )
+        for stale in generations[:-KEEP_GENERATIONS]:
+            shutil.rmtree(stale, ignore_errors=True)
+
+    def _read_manifest(self) -> dict[str, Any]:
+        try:
+            return json.loads((self.root / MANIFEST_FILE).read_text())
+        except FileNotFoundError:
+            return {}
+
+    def _write_manifest(self, manifest: dict[str, Any]) -> None:
+        temporary = self.root / f"{MANIFEST_FILE}.tmp"
+        temporary.write_text(json.dumps(manifest))
+        temporary.replace(self.root / MANIFEST_FILE)
+
+    @contextmanager
+    def _lock(self) -> Iterator[None]:
+        """Serialize writers across processes sharing the store directory."""
+        with (self.root / LOCK_FILE).open("w") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def sync_price_store(db: Session) -> None:
+    """Bring the price store up to date after a refresh, logging failures.
+
+    The store is a derived copy of ``price_history``, so a failed sync must
+    not fail the refresh that triggered it; the next sync catches up.
+    """
+    try:
+        price_store.sync(db)
+    except Exception as e:
+        logger.warning(f"Price store sync failed: {e}")
+
+
+# Global store instance
+price_store = PriceStore(
+    settings.price_store_path, enabled=settings.price_store_enabled
+)
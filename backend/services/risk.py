@@ -0,0 +1,512 @@
+"""Covariance-based portfolio risk from aligned price history.
+
+Daily returns of a user's holdings are aligned on the dates every holding has
+a price for, and annualized covariance and correlation matrices are computed
+with NumPy. Matrices are cached per holdings set, lookback window and as-of
+date, so users holding the same assets share them and they are only rebuilt
+once new prices are synced. Portfolio volatility and marginal risk
+contributions then take one covariance-weights product per request.
+
+Monte Carlo value at risk simulates the same aligned returns with
+``backend.services.monte_carlo``. ``simulate_all`` runs it for every user on
+a process pool and caches the results for the API. Each user's newest run is
+also kept under a key without the as-of date, prices or market values, so
+requests for the current figures keep hitting the nightly run through the
+next day's price refreshes.
+"""
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+import hashlib
+from itertools import groupby
+
+from fastapi import HTTPException
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from backend.config import get_settings
+from backend.constants import ANNUALIZATION_FACTOR
+from backend.models import Asset, Position, User
+from backend.schemas.portfolio import (
+    MonteCarloRiskAnalysis,
+    PortfolioRiskAnalysis,
+    SimulatedLoss,
+)
+from backend.services import analytics, monte_carlo
+from backend.services.cache import TTLCache, TwoTierCache
+from backend.services.monte_carlo import SimulationConfig
+from backend.services.price_store import PriceSeries, price_store
+
+settings = get_settings()
+
+DEFAULT_LOOKBACK_DAYS = 365
+
+# Aligned daily returns needed before a covariance estimate is reported
+MIN_OBSERVATIONS = 20
+
+# One-sided standard normal quantiles, and the expected shortfall multiple
+# phi(z) / (1 - confidence), for parametric one-day VaR
+NORMAL_RISK_FACTORS = {
+    "95": (1.6449, 2.0627),
+    "99": (2.3263, 2.6652),
+}
+
+
+@dataclass(frozen=True)
+class CovarianceMatrix:
+    """Annualized covariance and correlation of a set of assets.
+
+    ``asset_ids`` orders the matrix rows and columns. Requested assets
+    without enough shared price history are listed in ``excluded`` instead.
+    """
+
+    asset_ids: tuple[int, ...]
+    covariance: np.ndarray
+    correlation: np.ndarray
+    observations: int
+    excluded: tuple[int, ...] = ()
+
+
+@dataclass
+class Holding:
+    """Market value of one asset across a user's active positions."""
+
+    asset_id: int
+    ticker: str
+    market_value: Decimal
+
+
+def _percent(value: float) -> Decimal:
+    return Decimal(str(round(value * 100, 6)))
+
+
+def _ratio(value: float) -> Decimal:
+    return Decimal(str(round(value, 6)))
+
+
+def _amount(value: float) -> Decimal:
+    return Decimal(str(round(value, 2)))
+
+
+def _level(confidence: float) -> str:
+    return f"{confidence * 100:g}"
+
+
+def default_simulation_config() -> SimulationConfig:
+    """Simulation parameters from settings, with the default horizons and levels."""
+    return SimulationConfig(
+        paths=settings.monte_carlo_paths, seed=settings.monte_carlo_seed
+    )
+
+
+class RiskService:
+    """Service for covariance-based portfolio risk."""
+
+    def __init__(
+        self,
+        cache: TTLCache[CovarianceMatrix] | None = None,
+        simulation_cache: TwoTierCache[MonteCarloRiskAnalysis] | None = None,
+    ) -> None:
+        self.cache: TTLCache[CovarianceMatrix] = (
+            cache
+            if cache is not None
+            else TTLCache(
+                max_size=settings.risk_matrix_cache_max_size,
+                ttl=settings.risk_matrix_cache_ttl,
+            )
+        )
+        self.simulation_cache: TwoTierCache[MonteCarloRiskAnalysis] = (
+            simulation_cache
+            if simulation_cache is not None
+            else TwoTierCache(
+                namespace="monte_carlo_risk",
+                ttl=settings.monte_carlo_cache_ttl,
+                max_size=settings.monte_carlo_cache_max_size,
+                encode=MonteCarloRiskAnalysis.model_dump_json,
+                decode=MonteCarloRiskAnalysis.model_validate_json,
+            )
+        )
+
+    def get_risk_analysis(
+        self,
+        db: Session,
+        user_id: int,
+        as_of: date | None = None,
+        lookback_days: int = DEFAULT_LOOKBACK_DAYS,
+    ) -> PortfolioRiskAnalysis:
+        """Volatility, risk contributions and correlations of a user's holdings.
+
+        Holdings without enough price history are left out and the remaining
+        ones are weighted by their share of the covered market value.
+        """
+        self._check_user(db, user_id)
+        as_of = as_of or date.today()
+
+        holdings = self._get_holdings(db, [user_id]).get(user_id, [])
+        matrix = self.get_covariance_matrix(
+            db, [h.asset_id for h in holdings], as_of, lookback_days
+        )
+        tickers = {h.asset_id: h.ticker for h in holdings}
+        excluded = [tickers[asset_id] for asset_id in matrix.excluded]
+        if not matrix.asset_ids:
+            return PortfolioRiskAnalysis(
+                value_at_risk={},
+                expected_shortfall={},
+                risk_contribution={},
+                as_of=as_of,
+                excluded_tickers=excluded,
+            )
+
+        values = {h.asset_id: float(h.market_value) for h in holdings}
+        weights = np.array([values[asset_id] for asset_id in matrix.asset_ids])
+        weights /= weights.sum()
+
+        volatility, marginal = analytics.risk_contributions(weights, matrix.covariance)
+        shares = (
+            weights * marginal / volatility if volatility else np.zeros_like(weights)
+        )
+        daily_volatility = volatility / np.sqrt(ANNUALIZATION_FACTOR)
+
+        labels = [tickers[asset_id] for asset_id in matrix.asset_ids]
+        return PortfolioRiskAnalysis(
+            value_at_risk={
+                level: _percent(z * daily_volatility)
+                for level, (z, _) in NORMAL_RISK_FACTORS.items()
+            },
+            expected_shortfall={
+                level: _percent(factor * daily_volatility)
+                for level, (_, factor) in NORMAL_RISK_FACTORS.items()
+            },
+            risk_contribution=dict(
+                zip(labels, map(_percent, shares.tolist()), strict=True)
+            ),
+            marginal_risk_contribution=dict(
+                zip(labels, map(_percent, marginal.tolist()), strict=True)
+            ),
+            correlation_matrix=self._by_ticker(labels, matrix.correlation),
+            covariance_matrix=self._by_ticker(labels, matrix.covariance),
+            portfolio_volatility=_percent(volatility),
+            as_of=as_of,
+            observations=matrix.observations,
+            excluded_tickers=excluded,
+        )
+
+    def get_simulated_risk(
+        self,
+        db: Session,
+        user_id: int,
+        as_of: date | None = None,
+        lookback_days: int = DEFAULT_LOOKBACK_DAYS,
+        config: SimulationConfig | None = None,
+    ) -> MonteCarloRiskAnalysis:
+        """Monte Carlo VaR and CVaR of a user's holdings at several horizons.
+
+        Without ``as_of`` the user's latest run for the same assets, window
+        and parameters is served, with the date it was run for; ``simulate_all``
+        refreshes it nightly. Other results are cached per holdings, window,
+        parameters and price store version.
+        """
+        self._check_user(db, user_id)
+        config = config or default_simulation_config()
+
+        holdings = self._get_holdings(db, [user_id]).get(user_id, [])
+        if as_of is None:
+            analysis = self.simulation_cache.get(
+                self._latest_key(user_id, holdings, lookback_days, config)
+            )
+            if analysis is not None:
+                return analysis
+            as_of = date.today()
+
+        analysis = self.simulation_cache.get(
+            self._simulation_key(holdings, as_of, lookback_days, config)
+        )
+        if analysis is None:
+            analysis = self._simulate(
+                db, {user_id: holdings}, as_of, lookback_days, config, workers=1
+            )[user_id]
+        return analysis
+
+    def simulate_all(
+        self,
+        db: Session,
+        as_of: date | None = None,
+        lookback_days: int = DEFAULT_LOOKBACK_DAYS,
+        config: SimulationConfig | None = None,
+        workers: int | None = None,
+    ) -> dict[int, MonteCarloRiskAnalysis]:
+        """Simulate every active user's holdings and cache the results.
+
+        Prices for all holdings are loaded once and the portfolios are spread
+        over ``workers`` processes (every CPU when omitted).
+        """
+        return self._simulate(
+            db,
+            self._get_holdings(db),
+            as_of or date.today(),
+            lookback_days,
+            config or default_simulation_config(),
+            workers,
+        )
+
+    def get_covariance_matrix(
+        self,
+        db: Session,
+        asset_ids: list[int],
+        as_of: date,
+        lookback_days: int = DEFAULT_LOOKBACK_DAYS,
+    ) -> CovarianceMatrix:
+        """Covariance of daily returns over ``lookback_days`` up to ``as_of``.
+
+        Results are cached per sorted asset set, window and price store
+        version, so the matrix is shared by every portfolio holding the same
+        assets until prices change.
+        """
+        asset_ids = sorted(set(asset_ids))
+        key = (
+            f"{','.join(map(str, asset_ids))}:{as_of}:{lookback_days}:"
+            f"{price_store.version()}"
+        )
+        matrix = self.cache.get(key)
+        if matrix is None:
+            matrix = self._calculate_covariance_matrix(
+                db, asset_ids, as_of, lookback_days
+            )
+            self.cache.set(key, matrix)
+        return matrix
+
+    def _calculate_covariance_matrix(
+        self, db: Session, asset_ids: list[int], as_of: date, lookback_days: int
+    ) -> CovarianceMatrix:
+        prices = price_store.load_many(
+            db, asset_ids, as_of - timedelta(days=lookback_days), as_of
+        )
+        usable, returns = self._aligned_returns(prices, asset_ids)
+        if not usable:
+            return CovarianceMatrix(
+                asset_ids=(),
+                covariance=np.empty((0, 0)),
+                correlation=np.empty((0, 0)),
+                observations=len(returns),
+                excluded=tuple(asset_ids),
+            )
+
+        covariance = analytics.covariance_matrix(returns)
+        return CovarianceMatrix(
+            asset_ids=tuple(usable),
+            covariance=covariance,
+            correlation=analytics.correlation_matrix(covariance),
+            observations=len(returns),
+            excluded=tuple(a for a in asset_ids if a not in usable),
+        )
+
+    def _simulate(
+        self,
+        db: Session,
+        holdings_by_user: dict[int, list[Holding]],
+        as_of: date,
+        lookback_days: int,
+        config: SimulationConfig,
+        workers: int | None,
+    ) -> dict[int, MonteCarloRiskAnalysis]:
+        """Simulate several users' holdings from one price load and cache them."""
+        asset_ids = sorted(
+            {h.asset_id for holdings in holdings_by_user.values() for h in holdings}
+        )
+        prices = price_store.load_many(
+            db, asset_ids, as_of - timedelta(days=lookback_days), as_of
+        )
+
+        coverage = {}
+        portfolios = {}
+        for user_id, holdings in holdings_by_user.items():
+            usable, returns = self._aligned_returns(
+                prices, [h.asset_id for h in holdings]
+            )
+            coverage[user_id] = (usable, len(returns))
+            if usable:
+                values = np.array(
+                    [float(h.market_value) for h in holdings if h.asset_id in usable]
+                )
+                portfolios[user_id] = (np.log1p(returns), values)
+
+        tails = dict(
+            zip(
+                portfolios,
+                monte_carlo.simulate_many(
+                    [
+                        (log_returns, values / values.sum())
+                        for log_returns, values in portfolios.values()
+                    ],
+                    list(portfolios),
+                    config,
+                    workers,
+                ),
+                strict=True,
+            )
+        )
+
+        results = {}
+        for user_id, holdings in holdings_by_user.items():
+            usable, observations = coverage[user_id]
+            analysis = MonteCarloRiskAnalysis(
+                method=config.method,
+                paths=config.paths,
+                seed=config.seed,
+                as_of=as_of,
+                observations=observations,
+                excluded_tickers=[
+                    h.ticker for h in holdings if h.asset_id not in usable
+                ],
+            )
+            if user_id in tails:
+                value = float(portfolios[user_id][1].sum())
+                analysis.portfolio_value = _amount(value)
+                analysis.horizons = self._simulated_losses(
+                    tails[user_id], value, config
+                )
+            self.simulation_cache.set(
+                self._simulation_key(holdings, as_of, lookback_days, config), analysis
+            )
+            latest_key = self._latest_key(user_id, holdings, lookback_days, config)
+            latest = self.simulation_cache.get(latest_key)
+            if latest is None or latest.as_of <= as_of:
+                self.simulation_cache.set(latest_key, analysis)
+            results[user_id] = analysis
+        return results
+
+    @staticmethod
+    def _simulated_losses(
+        tail: monte_carlo.TailRisk, value: float, config: SimulationConfig
+    ) -> list[SimulatedLoss]:
+        levels = [_level(level) for level in config.confidence_levels]
+        return [
+            SimulatedLoss(
+                horizon_days=horizon,
+                value_at_risk=dict(zip(levels, map(_percent, var), strict=True)),
+                conditional_value_at_risk=dict(
+                    zip(levels, map(_percent, cvar), strict=True)
+                ),
+                value_at_risk_amount={
+                    level: _amount(loss * value)
+                    for level, loss in zip(levels, var, strict=True)
+                },
+                conditional_value_at_risk_amount={
+                    level: _amount(loss * value)
+                    for level, loss in zip(levels, cvar, strict=True)
+                },
+            )
+            for horizon, var, cvar in zip(
+                config.horizons,
+                tail.value_at_risk.tolist(),
+                tail.conditional_value_at_risk.tolist(),
+                strict=True,
+            )
+        ]
+
+    @staticmethod
+    def _simulation_key(
+        holdings: list[Holding],
+        as_of: date,
+        lookback_days: int,
+        config: SimulationConfig,
+    ) -> str:
+        """Cache key that changes with the holdings, prices and parameters."""
+        positions = ",".join(f"{h.asset_id}={h.market_value}" for h in holdings)
+        digest = hashlib.sha256(positions.encode()).hexdigest()[:16]
+        return (
+            f"{digest}:{as_of}:{lookback_days}:{config.key()}:"
+            f"{price_store.version()}"
+        )
+
+    @staticmethod
+    def _latest_key(
+        user_id: int,
+        holdings: list[Holding],
+        lookback_days: int,
+        config: SimulationConfig,
+    ) -> str:
+        """Cache key of a user's newest run, unchanged by price updates."""
+        assets = ",".join(str(h.asset_id) for h in holdings)
+        digest = hashlib.sha256(assets.encode()).hexdigest()[:16]
+        return f"latest:{user_id}:{digest}:{lookback_days}:{config.key()}"
+
+    @staticmethod
+    def _aligned_returns(
+        prices: dict[int, PriceSeries], asset_ids: list[int]
+    ) -> tuple[list[int], np.ndarray]:
+        """Assets with enough shared history and their aligned daily returns.
+
+        Returns no assets when fewer than ``MIN_OBSERVATIONS`` returns remain.
+        """
+        # Assets that cannot reach the minimum alone would shrink the shared
+        # window for everyone else, so they are dropped before aligning
+        usable = [
+            asset_id
+            for asset_id in asset_ids
+            if np.count_nonzero(prices[asset_id].close > 0) > MIN_OBSERVATIONS
+        ]
+        _, returns = analytics.return_matrix(
+            [prices[asset_id].dates for asset_id in usable],
+            [prices[asset_id].close for asset_id in usable],
+        )
+        if len(returns) < MIN_OBSERVATIONS:
+            return [], returns
+        return usable, returns
+
+    @staticmethod
+    def _check_user(db: Session, user_id: int) -> None:
+        if not db.query(User.id).filter(User.id == user_id).first():
+            raise HTTPException(
+                status_code=404, detail=f"User with ID {user_id} not found"
+            )
+
+    def _get_holdings(
+        self, db: Session, user_ids: list[int] | None = None
+    ) -> dict[int, list[Holding]]:
+        """Priced holdings by user, one row per asset, ordered by asset id.
+
+        Covers every active user when ``user_ids`` is omitted.
+        """
+        query = (
+            select(
+                Position.user_id,
+                Asset.id,
+                Asset.ticker,
+                func.sum(Position.quantity * Asset.current_price),
+            )
+            .join(Asset, Position.asset_id == Asset.id)
+            .where(Position.is_active.is_(True), Asset.current_price > 0)
+            .group_by(Position.user_id, Asset.id, Asset.ticker)
+            .order_by(Position.user_id, Asset.id)
+        )
+        if user_ids is None:
+            query = query.join(User, Position.user_id == User.id).where(
+                User.is_active.is_(True)
+            )
+        else:
+            query = query.where(Position.user_id.in_(user_ids))
+
+        holdings: dict[int, list[Holding]] = {}
+        for user_id, rows in groupby(db.execute(query).all(), key=lambda row: row[0]):
+            holdings[user_id] = [
+                Holding(asset_id, ticker, Decimal(str(value)))
+                for _, asset_id, ticker, value in rows
+                if value and value > 0
+            ]
+        return holdings
+
+    @staticmethod
+    def _by_ticker(
+        labels: list[str], matrix: np.ndarray
+    ) -> dict[str, dict[str, Decimal]]:
+        return {
+            row_label: dict(zip(labels, map(_ratio, row), strict=True))
+            for row_label, row in zip(labels, matrix.tolist(), strict=True)
+        }
+
+
+# Global service instance
+risk_service = RiskService()
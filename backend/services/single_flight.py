@@ -0,0 +1,118 @@
+"""Request coalescing for identical in-flight lookups.
+
+When several callers ask for the same key at the same moment, only the first
+one (the leader) runs the fetch; the others wait for and share its result or
+exception. Sync callers on worker threads and async callers on an event loop
+are both supported.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+import logging
+import threading
+from typing import Any, Generic, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass
+class SingleFlightStats:
+    """Counters for coalesced calls."""
+
+    calls: int = 0
+    executions: int = 0
+    collapsed: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize counters for status endpoints."""
+        return asdict(self)
+
+
+class _Call(Generic[T]):
+    """An in-flight sync call that followers wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: T | None = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight(Generic[T]):
+    """Collapse concurrent calls for the same key into one execution."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.stats = SingleFlightStats()
+        self._lock = threading.Lock()
+        self._calls: dict[str, _Call[T]] = {}
+        self._tasks: dict[tuple[int, str], asyncio.Future[T]] = {}
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        """Run ``fn`` once for all threads that call with ``key`` concurrently."""
+        with self._lock:
+            self.stats.calls += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self.stats.executions += 1
+            else:
+                self.stats.collapsed += 1
+
+        if not leader:
+            logger.debug(f"Joining in-flight {self.name} call for {key}")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def do_async(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Await one shared ``fn()`` for all coroutines using ``key`` concurrently.
+
+        The shared task is shielded, so a cancelled caller does not cancel
+        the fetch for the others.
+        """
+        loop = asyncio.get_running_loop()
+        flight_key = (id(loop), key)
+        with self._lock:
+            self.stats.calls += 1
+            task = self._tasks.get(flight_key)
+            if task is None:
+                task = asyncio.ensure_future(fn())
+                self._tasks[flight_key] = task
+                self.stats.executions += 1
+                task.add_done_callback(lambda t: self._forget(flight_key, t))
+            else:
+                self.stats.collapsed += 1
+                logger.debug(f"Joining in-flight {self.name} task for {key}")
+
+        return await asyncio.shield(task)
+
+    def _forget(self, flight_key: tuple[int, str], task: asyncio.Future[T]) -> None:
+        with self._lock:
+            if self._tasks.get(flight_key) is task:
+                del self._tasks[flight_key]
+        # Mark the exception as retrieved in case every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Counters plus the number of calls currently in flight."""
+        with self._lock:
+            in_flight = len(self._calls) + len(self._tasks)
+        return {"name": self.name, "in_flight": in_flight, **self.stats.to_dict()}
@@ -0,0 +1,510 @@
+"""Tax-lot matching and transaction analytics in a single pass.
+
+A user's transactions are streamed once in date order as plain column rows,
+and every asset keeps its open lots in a compact queue. Sells are matched
+against the lots according to the position's ``tax_lot_method``:
+
+``FIFO``
+    Oldest lots first. ``SpecificID`` also matches this way, since sells
+    do not record which lots they close.
+``LIFO``
+    Newest lots first.
+``AverageCost``
+    All open shares are pooled into one lot at their average cost.
+
+Buy fees are part of a lot's cost and sell fees reduce the proceeds, so
+realized gains are net of fees. Ledgers are cached per user and brought up
+to date by applying only the transactions added since they were built;
+edits, deletes, back-dated transactions and method changes rebuild them.
+Committed edits and deletes of a user's transactions, and writes to their
+positions, drop that user's ledger through SQLAlchemy session events. New
+transactions are left to the count/last id stamp checked on every read,
+which also catches writes from other processes.
+
+Cached ledgers are only read and extended under their user's lock; callers
+get an immutable :class:`LedgerSummary` rather than the live ledger.
+"""
+
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal
+from itertools import chain
+import threading
+from typing import Any
+import weakref
+
+from sqlalchemy import event, func, or_, select
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from backend.config import get_settings
+from backend.models.position import Position
+from backend.models.transaction import Transaction, TransactionType
+from backend.services.cache import TTLCache
+from backend.services.commit_invalidation import ALL_USERS, CommitInvalidation
+
+settings = get_settings()
+
+TAX_LOT_METHODS = ("FIFO", "LIFO", "AverageCost", "SpecificID")
+DEFAULT_TAX_LOT_METHOD = "FIFO"
+
+# Rows fetched per round trip while streaming a user's history
+STREAM_BATCH_SIZE = 1000
+
+# Locks shared by hashing user IDs, so the table stays the same size however
+# many users are served
+USER_LOCK_STRIPES = 64
+
+ZERO = Decimal("0")
+
+_TRACKED_MODELS = (Position, Transaction)
+
+# Every live service, so commits invalidate ledgers cached outside the global one
+_services: "weakref.WeakSet[TaxLotService]" = weakref.WeakSet()
+
+_ROW_COLUMNS = (
+    Transaction.id,
+    Transaction.asset_id,
+    Transaction.transaction_type,
+    Transaction.transaction_date,
+    Transaction.quantity,
+    Transaction.total_amount,
+    Transaction.commission,
+    Transaction.regulatory_fees,
+    Transaction.other_fees,
+    Transaction.split_ratio,
+    Transaction.updated_at,
+)
+
+
+class LotQueue:
+    """Open lots of one asset, oldest first, as parallel lists.
+
+    Lots consumed from the front are skipped with an offset rather than
+    removed one by one; the lists are compacted once the consumed prefix
+    makes up half of them.
+    """
+
+    __slots__ = ("method", "quantities", "start", "unit_costs")
+
+    def __init__(self, method: str = DEFAULT_TAX_LOT_METHOD) -> None:
+        self.method = method
+        self.quantities: list[Decimal] = []
+        self.unit_costs: list[Decimal] = []
+        self.start = 0
+
+    def __len__(self) -> int:
+        return len(self.quantities) - self.start
+
+    @property
+    def quantity(self) -> Decimal:
+        """Shares held across the open lots."""
+        return sum(self.quantities[self.start :], ZERO)
+
+    @property
+    def cost_basis(self) -> Decimal:
+        """Total cost of the open lots."""
+        return sum(
+            (
+                quantity * unit_cost
+                for quantity, unit_cost in zip(
+                    self.quantities[self.start :],
+                    self.unit_costs[self.start :],
+                    strict=True,
+                )
+            ),
+            ZERO,
+        )
+
+    def add(self, quantity: Decimal, cost: Decimal) -> None:
+        """Open a lot of ``quantity`` shares bought for ``cost`` in total."""
+        if quantity <= 0:
+            return
+        if self.method == "AverageCost" and len(self):
+            held = self.quantities[-1]
+            self.unit_costs[-1] = (held * self.unit_costs[-1] + cost) / (
+                held + quantity
+            )
+            self.quantities[-1] = held + quantity
+            return
+        self.quantities.append(quantity)
+        self.unit_costs.append(cost / quantity)
+
+    def remove(self, quantity: Decimal) -> tuple[Decimal, Decimal]:
+        """Close up to ``quantity`` shares.
+
+        Returns:
+            ``(matched, cost)``: shares matched against open lots and their
+            cost; ``matched`` is short of ``quantity`` when too few are held
+        """
+        remaining = quantity
+        cost = ZERO
+        from_end = self.method == "LIFO"
+        while remaining > 0 and len(self):
+            index = len(self.quantities) - 1 if from_end else self.start
+            available = self.quantities[index]
+            taken = min(available, remaining)
+            cost += taken * self.unit_costs[index]
+            remaining -= taken
+            if taken < available:
+                self.quantities[index] = available - taken
+            elif from_end:
+                self.quantities.pop()
+                self.unit_costs.pop()
+            else:
+                self.start += 1
+        self._compact()
+        return quantity - remaining, cost
+
+    def split(self, ratio: Decimal) -> None:
+        """Apply a stock split of ``ratio`` new shares per old share."""
+        if ratio <= 0:
+            return
+        for index in range(self.start, len(self.quantities)):
+            self.quantities[index] *= ratio
+            self.unit_costs[index] /= ratio
+
+    def _compact(self) -> None:
+        if self.start and self.start * 2 >= len(self.quantities):
+            del self.quantities[: self.start]
+            del self.unit_costs[: self.start]
+            self.start = 0
+
+
+@dataclass
+class AssetLedger:
+    """Open lots and running totals of one asset."""
+
+    lots: LotQueue
+    transactions: int = 0
+    buys: int = 0
+    sells: int = 0
+    dividends: int = 0
+    invested: Decimal = ZERO
+    proceeds: Decimal = ZERO
+    dividends_received: Decimal = ZERO
+    fees_paid: Decimal = ZERO
+    realized_gains: Decimal = ZERO
+
+    @property
+    def net_cash_flow(self) -> Decimal:
+        """Cash received minus cash invested; negative means net investment."""
+        return self.proceeds + self.dividends_received - self.invested
+
+
+@dataclass(frozen=True)
+class LedgerSummary:
+    """Totals and open cost basis of one asset, or of every asset combined."""
+
+    transactions: int
+    buys: int
+    sells: int
+    dividends: int
+    invested: Decimal
+    proceeds: Decimal
+    dividends_received: Decimal
+    fees_paid: Decimal
+    realized_gains: Decimal
+    open_cost_basis: Decimal
+
+    @property
+    def net_cash_flow(self) -> Decimal:
+        """Cash received minus cash invested; negative means net investment."""
+        return self.proceeds + self.dividends_received - self.invested
+
+
+@dataclass
+class TaxLotLedger:
+    """Every asset ledger of one user, with the position of the last row applied.
+
+    ``count``, ``last_id`` and ``last_updated`` describe the transactions
+    already applied, so a later read can tell whether only new rows arrived.
+    """
+
+    methods: dict[int, str] = field(default_factory=dict)
+    assets: dict[int, AssetLedger] = field(default_factory=dict)
+    count: int = 0
+    last_id: int = 0
+    last_date: date | None = None
+    last_updated: datetime | None = None
+
+    def apply(self, row: Any) -> None:
+        """Apply one transaction row; rows must arrive in date, then id, order."""
+        (
+            transaction_id,
+            asset_id,
+            transaction_type,
+            transaction_date,
+            quantity,
+            total_amount,
+            commission,
+            regulatory_fees,
+            other_fees,
+            split_ratio,
+            updated_at,
+        ) = row
+        ledger = self.assets.get(asset_id)
+        if ledger is None:
+            ledger = AssetLedger(
+                LotQueue(self.methods.get(asset_id, DEFAULT_TAX_LOT_METHOD))
+            )
+            self.assets[asset_id] = ledger
+
+        fees = (commission or ZERO) + (regulatory_fees or ZERO) + (other_fees or ZERO)
+        quantity = abs(quantity or ZERO)
+        total_amount = total_amount or ZERO
+        ledger.transactions += 1
+        ledger.fees_paid += fees
+
+        if transaction_type == TransactionType.BUY:
+            ledger.buys += 1
+            ledger.invested += total_amount + fees
+            ledger.lots.add(quantity, total_amount + fees)
+        elif transaction_type == TransactionType.SELL:
+            ledger.sells += 1
+            net_proceeds = total_amount - fees
+            ledger.proceeds += net_proceeds
+            matched, cost = ledger.lots.remove(quantity)
+            if matched:
+                # Shares sold beyond the open lots have no known cost and
+                # are left out of the realized gain
+                ledger.realized_gains += net_proceeds * matched / quantity - cost
+        elif transaction_type == TransactionType.DIVIDEND:
+            ledger.dividends += 1
+            ledger.dividends_received += total_amount
+        elif transaction_type == TransactionType.TRANSFER_IN:
+            ledger.lots.add(quantity, total_amount + fees)
+        elif transaction_type == TransactionType.TRANSFER_OUT:
+            ledger.lots.remove(quantity)
+        elif transaction_type == TransactionType.SPLIT and split_ratio:
+            ledger.lots.split(split_ratio)
+
+        self.count += 1
+        self.last_id = max(self.last_id, transaction_id)
+        self.last_date = transaction_date
+        if updated_at is not None and (
+            self.last_updated is None or updated_at > self.last_updated
+        ):
+            self.last_updated = updated_at
+
+    def totals(self, asset_id: int | None = None) -> AssetLedger:
+        """Totals of one asset, or of every asset combined."""
+        if asset_id is not None:
+            return self.assets.get(asset_id) or AssetLedger(LotQueue())
+        combined = AssetLedger(LotQueue())
+        for ledger in self.assets.values():
+            combined.transactions += ledger.transactions
+            combined.buys += ledger.buys
+            combined.sells += ledger.sells
+            combined.dividends += ledger.dividends
+            combined.invested += ledger.invested
+            combined.proceeds += ledger.proceeds
+            combined.dividends_received += ledger.dividends_received
+            combined.fees_paid += ledger.fees_paid
+            combined.realized_gains += ledger.realized_gains
+        return combined
+
+    def cost_basis(self, asset_id: int | None = None) -> Decimal:
+        """Cost of the open lots of one asset, or of every asset."""
+        if asset_id is not None:
+            ledger = self.assets.get(asset_id)
+            return ledger.lots.cost_basis if ledger else ZERO
+        return sum((ledger.lots.cost_basis for ledger in self.assets.values()), ZERO)
+
+    def summary(self, asset_id: int | None = None) -> LedgerSummary:
+        """Snapshot of :meth:`totals` and :meth:`cost_basis`."""
+        totals = self.totals(asset_id)
+        return LedgerSummary(
+            transactions=totals.transactions,
+            buys=totals.buys,
+            sells=totals.sells,
+            dividends=totals.dividends,
+            invested=totals.invested,
+            proceeds=totals.proceeds,
+            dividends_received=totals.dividends_received,
+            fees_paid=totals.fees_paid,
+            realized_gains=totals.realized_gains,
+            open_cost_basis=self.cost_basis(asset_id),
+        )
+
+
+class TaxLotService:
+    """Builds and incrementally updates users' tax-lot ledgers."""
+
+    def __init__(self, cache: TTLCache[TaxLotLedger] | None = None) -> None:
+        self.cache: TTLCache[TaxLotLedger] = (
+            cache
+            if cache is not None
+            else TTLCache(
+                max_size=settings.tax_lot_cache_max_size,
+                ttl=settings.tax_lot_cache_ttl,
+            )
+        )
+        # Striped per-user locks, so a rebuild only blocks readers of the
+        # users sharing its stripe
+        self._user_locks = tuple(threading.Lock() for _ in range(USER_LOCK_STRIPES))
+        # Guards the generations separately, so commits never wait on a rebuild
+        self._generation_lock = threading.Lock()
+        self._generation = 0
+        self._user_generations: dict[int, int] = {}
+        _services.add(self)
+
+    def _generation_for(self, user_id: int) -> tuple[int, int]:
+        return self._generation, self._user_generations.get(user_id, 0)
+
+    def _lock_for(self, user_id: int) -> threading.Lock:
+        return self._user_locks[user_id % USER_LOCK_STRIPES]
+
+    def get_summary(
+        self, db: Session, user_id: int, asset_id: int | None = None
+    ) -> LedgerSummary:
+        """Totals of a user's transactions, for one asset or all of them.
+
+        The summary is taken under the user's lock, so it never observes a
+        ledger that another thread is extending.
+        """
+        with self._lock_for(user_id):
+            return self._get_ledger(db, user_id).summary(asset_id)
+
+    def _get_ledger(self, db: Session, user_id: int) -> TaxLotLedger:
+        """Up-to-date ledger of every transaction of a user.
+
+        Must be called with the user's lock held. A cached ledger is reused
+        while the user's transactions are unchanged, and extended in place
+        when only later-dated transactions were added. A ledger is not stored
+        if the user was invalidated while it was being built, since it may
+        reflect data from before that change.
+        """
+        with self._generation_lock:
+            generation = self._generation_for(user_id)
+        methods = self._get_methods(db, user_id)
+        count, last_id, last_updated = db.execute(
+            select(
+                func.count(Transaction.id),
+                func.max(Transaction.id),
+                func.max(Transaction.updated_at),
+            ).where(Transaction.user_id == user_id)
+        ).one()
+
+        key = str(user_id)
+        ledger = self.cache.get(key)
+        if ledger is not None and ledger.methods == methods:
+            if (ledger.count, ledger.last_id, ledger.last_updated) == (
+                count,
+                last_id or 0,
+                last_updated,
+            ):
+                return ledger
+            if self._extend(db, user_id, ledger, count):
+                return ledger
+
+        ledger = TaxLotLedger(methods=methods)
+        for row in self._stream(db, user_id):
+            ledger.apply(row)
+        with self._generation_lock:
+            if self._generation_for(user_id) == generation:
+                self.cache.set(key, ledger)
+        return ledger
+
+    def invalidate(self, user_id: int) -> None:
+        """Drop a user's cached ledger, e.g. after a transaction is deleted."""
+        with self._generation_lock:
+            self._user_generations[user_id] = self._user_generations.get(user_id, 0) + 1
+            self.cache.delete(str(user_id))
+
+    def invalidate_all(self) -> None:
+        """Drop every cached ledger."""
+        with self._generation_lock:
+            self._generation += 1
+            self.cache.clear()
+
+    def _extend(
+        self, db: Session, user_id: int, ledger: TaxLotLedger, count: int
+    ) -> bool:
+        """Apply transactions added since ``ledger`` was built.
+
+        Returns:
+            False, leaving the ledger untouched, when applied transactions
+            were changed or deleted or a new one is dated before the last
+            one applied; the ledger must then be rebuilt
+        """
+        query = select(*_ROW_COLUMNS).where(Transaction.user_id == user_id)
+        changed = Transaction.id > ledger.last_id
+        if ledger.last_updated is not None:
+            changed = or_(changed, Transaction.updated_at > ledger.last_updated)
+        rows = db.execute(
+            query.where(changed).order_by(Transaction.transaction_date, Transaction.id)
+        ).all()
+        if (
+            ledger.count + len(rows) != count
+            or any(row.id <= ledger.last_id for row in rows)
+            or (
+                rows
+                and ledger.last_date is not None
+                and rows[0].transaction_date < ledger.last_date
+            )
+        ):
+            return False
+        for row in rows:
+            ledger.apply(row)
+        return True
+
+    @staticmethod
+    def _stream(db: Session, user_id: int) -> Any:
+        """All of a user's transaction rows in date order, fetched in batches."""
+        return db.execute(
+            select(*_ROW_COLUMNS)
+            .where(Transaction.user_id == user_id)
+            .order_by(Transaction.transaction_date, Transaction.id)
+            .execution_options(yield_per=STREAM_BATCH_SIZE)
+        )
+
+    @staticmethod
+    def _get_methods(db: Session, user_id: int) -> dict[int, str]:
+        """Tax-lot method of each asset the user has a position in."""
+        rows = db.execute(
+            select(Position.asset_id, Position.tax_lot_method)
+            .where(Position.user_id == user_id)
+            .order_by(Position.id)
+        ).all()
+        methods: dict[int, str] = {}
+        for asset_id, method in rows:
+            methods.setdefault(asset_id, method or DEFAULT_TAX_LOT_METHOD)
+        return methods
+
+
+def _invalidate_committed(pending: set[Any]) -> None:
+    """Drop the ledgers of users whose rows a committed transaction wrote."""
+    for service in list(_services):
+        if ALL_USERS in pending:
+            service.invalidate_all()
+            continue
+        for user_id in pending:
+            service.invalidate(user_id)
+
+
+_invalidation = CommitInvalidation("tax_lot", _invalidate_committed)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed_changes(session: Session, _flush_context: Any) -> None:
+    """Record whose applied transactions or positions the flush changed."""
+    pending = _invalidation.pending(session)
+    new_positions = (obj for obj in session.new if isinstance(obj, Position))
+    for obj in chain(new_positions, session.dirty, session.deleted):
+        if isinstance(obj, _TRACKED_MODELS) and obj.user_id is not None:
+            pending.add(obj.user_id)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_changes(orm_execute_state: ORMExecuteState) -> None:
+    """Bulk updates and deletes carry no per-row owner, so they affect everyone."""
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    if any(
+        mapper.class_ in _TRACKED_MODELS for mapper in orm_execute_state.all_mappers
+    ):
+        _invalidation.pending(orm_execute_state.session).add(ALL_USERS)
+
+
+# Global service instance
+tax_lot_service = TaxLotService()
@@ -1,10 +1,10 @@
 """Transaction service for managing portfolio transactions."""
 
-from datetime import date
+from datetime import date, datetime, timedelta
 from decimal import Decimal
 from typing import Any
 
-from sqlalchemy import and_, desc
+from sqlalchemy import Date, and_, cast, desc, func, select
 from sqlalchemy.orm import Session, joinedload
 
 from backend.models.asset import Asset
@@ -16,11 +16,88 @@ from backend.schemas.transaction import (
     SellTransactionRequest,
     TransactionCreate,
     TransactionFilters,
+    TransactionHistorySummary,
     TransactionPerformanceMetrics,
+    TransactionPeriodSummary,
     TransactionResponse,
+    TransactionTypeTotals,
     TransactionUpdate,
 )
 from backend.services.base import BaseService
+from backend.services.pagination import decode_cursor, keyset_after
+from backend.services.tax_lots import tax_lot_service
+
+SUMMARY_PERIODS = ("week", "month")
+
+_FEES = Transaction.commission + Transaction.regulatory_fees + Transaction.other_fees
+
+
+def _period_start_column(db: Session, period: str) -> Any:
+    """SQL expression for the first day of each transaction's period."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return cast(func.date_trunc(period, Transaction.transaction_date), Date)
+    if dialect == "sqlite":
+        if period == "month":
+            return func.date(Transaction.transaction_date, "start of month")
+        # Step back six days, then forward to the next Monday
+        return func.date(Transaction.transaction_date, "-6 days", "weekday 1")
+    return Transaction.transaction_date
+
+
+def _as_date(value: Any) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def _period_floor(day: date, period: str) -> date:
+    if period == "month":
+        return day.replace(day=1)
+    return day - timedelta(days=day.weekday())
+
+
+def _next_period(start: date, period: str) -> date:
+    if period == "month":
+        return date(start.year + start.month // 12, start.month % 12 + 1, 1)
+    return start + timedelta(days=7)
+
+
+def _period_end(start: date, period: str) -> date:
+    return _next_period(start, period) - timedelta(days=1)
+
+
+def _period_starts(start_date: date, end_date: date, period: str) -> list[date]:
+    starts = []
+    start = _period_floor(start_date, period)
+    while start <= end_date:
+        starts.append(start)
+        start = _next_period(start, period)
+    return starts
+
+
+def _add_type_totals(
+    summary: TransactionPeriodSummary,
+    transaction_type: TransactionType,
+    count: int,
+    amount: Decimal,
+    fees: Decimal,
+) -> None:
+    """Add grouped totals of one type to a period summary."""
+    totals = summary.by_type.setdefault(transaction_type.value, TransactionTypeTotals())
+    totals.count += count
+    totals.total_amount += amount
+    totals.fees += fees
+    summary.total_transactions += count
+    summary.total_fees += fees
+    if transaction_type == TransactionType.BUY:
+        summary.net_cash_flow -= amount + fees
+    elif transaction_type == TransactionType.SELL:
+        summary.net_cash_flow += amount - fees
+    elif transaction_type == TransactionType.DIVIDEND:
+        summary.net_cash_flow += amount
 
 
 class TransactionService(
@@ -38,8 +115,13 @@ class TransactionService(
         filters: TransactionFilters | None = None,
         skip: int = 0,
         limit: int = 100,
+        cursor: str | None = None,
     ) -> list[TransactionResponse]:
-        """Get transactions for a user with optional filters."""
+        """Get transactions for a user with optional filters, newest first.
+
+        ``cursor`` continues after the ``(transaction_date, id)`` of an
+        earlier page's cursor.
+        """
         query = (
             db.query(Transaction)
             .options(joinedload(Transaction.asset))
@@ -69,6 +151,15 @@ class TransactionService(
             if filters.max_amount:
                 query = query.filter(Transaction.total_amount <= filters.max_amount)
 
+        if cursor is not None:
+            query = query.filter(
+                keyset_after(
+                    (Transaction.transaction_date, Transaction.id),
+                    decode_cursor(cursor, date, int),
+                    descending=True,
+                )
+            )
+
         # Order by date descending
         query = query.order_by(desc(Transaction.transaction_date), desc(Transaction.id))
 
@@ -245,72 +336,25 @@ class TransactionService(
     def get_transaction_performance(
         self, db: Session, user_id: int, asset_id: int | None = None
     ) -> TransactionPerformanceMetrics:
-        """Calculate performance metrics from transactions."""
-        query = db.query(Transaction).filter(Transaction.user_id == user_id)
-
-        if asset_id:
-            query = query.filter(Transaction.asset_id == asset_id)
-
-        transactions = query.all()
-
-        # Initialize metrics
-        total_transactions = len(transactions)
-        total_buys = 0
-        total_sells = 0
-        total_dividends = 0
-        total_invested = Decimal("0")
-        total_proceeds = Decimal("0")
-        total_dividends_received = Decimal("0")
-        total_fees_paid = Decimal("0")
-        realized_gains = Decimal("0")
-
-        for transaction in transactions:
-            total_fees = (
-                transaction.commission
-                + transaction.regulatory_fees
-                + transaction.other_fees
-            )
-            total_fees_paid += total_fees
-
-            if transaction.transaction_type == TransactionType.BUY:
-                total_buys += 1
-                total_invested += transaction.total_amount + total_fees
-
-            elif transaction.transaction_type == TransactionType.SELL:
-                total_sells += 1
-                total_proceeds += transaction.total_amount - total_fees
-                # Calculate realized gain/loss (simplified)
-                # This would need more sophisticated tracking for accurate calculation
-                if transaction.position_id:
-                    position = (
-                        db.query(Position)
-                        .filter(Position.id == transaction.position_id)
-                        .first()
-                    )
-                    if position:
-                        cost_basis = (
-                            position.average_cost_per_share * transaction.quantity
-                        )
-                        gain_loss = (transaction.total_amount - total_fees) - cost_basis
-                        realized_gains += gain_loss
+        """Calculate performance metrics from transactions.
 
-            elif transaction.transaction_type == TransactionType.DIVIDEND:
-                total_dividends += 1
-                total_dividends_received += transaction.total_amount
-
-        net_cash_flow = total_proceeds + total_dividends_received - total_invested
+        Realized gains match sells against tax lots using each position's
+        ``tax_lot_method``; see ``backend.services.tax_lots``.
+        """
+        totals = tax_lot_service.get_summary(db, user_id, asset_id)
 
         return TransactionPerformanceMetrics(
-            total_transactions=total_transactions,
-            total_buys=total_buys,
-            total_sells=total_sells,
-            total_dividends=total_dividends,
-            total_invested=total_invested,
-            total_proceeds=total_proceeds,
-            total_dividends_received=total_dividends_received,
-            total_fees_paid=total_fees_paid,
-            net_cash_flow=net_cash_flow,
-            realized_gains=realized_gains,
+            total_transactions=totals.transactions,
+            total_buys=totals.buys,
+            total_sells=totals.sells,
+            total_dividends=totals.dividends,
+            total_invested=totals.invested,
+            total_proceeds=totals.proceeds,
+            total_dividends_received=totals.dividends_received,
+            total_fees_paid=totals.fees_paid,
+            net_cash_flow=totals.net_cash_flow,
+            realized_gains=totals.realized_gains,
+            open_cost_basis=totals.open_cost_basis,
         )
 
     def get_transactions_by_date_range(
@@ -353,39 +397,88 @@ class TransactionService(
         _, last_day = monthrange(year, month)
         end_date = date(year, month, last_day)
 
-        transactions = self.get_transactions_by_date_range(
-            db, user_id, start_date, end_date
-        )
+        period = self.get_transaction_summary(
+            db, user_id, start_date, end_date, period="month"
+        ).periods[0]
+
+        def type_totals(transaction_type: TransactionType) -> dict[str, Any]:
+            totals = period.by_type.get(transaction_type.value)
+            return {
+                "count": totals.count if totals else 0,
+                "total_amount": totals.total_amount if totals else Decimal("0"),
+            }
 
-        # Summarize by type
-        summary = {
+        return {
             "month": f"{year}-{month:02d}",
-            "total_transactions": len(transactions),
-            "buys": {"count": 0, "total_amount": Decimal("0")},
-            "sells": {"count": 0, "total_amount": Decimal("0")},
-            "dividends": {"count": 0, "total_amount": Decimal("0")},
-            "fees": {"total": Decimal("0")},
+            "total_transactions": period.total_transactions,
+            "buys": type_totals(TransactionType.BUY),
+            "sells": type_totals(TransactionType.SELL),
+            "dividends": type_totals(TransactionType.DIVIDEND),
+            "fees": {"total": period.total_fees},
         }
 
-        for transaction in transactions:
-            fees = (
-                transaction.commission
-                + transaction.regulatory_fees
-                + transaction.other_fees
+    def get_transaction_summary(
+        self,
+        db: Session,
+        user_id: int,
+        start_date: date,
+        end_date: date,
+        period: str = "month",
+    ) -> TransactionHistorySummary:
+        """Get per-period, per-type transaction totals from one grouped query.
+
+        Weeks start on Monday. Every period overlapping the range is listed,
+        including periods without transactions.
+        """
+        if period not in SUMMARY_PERIODS:
+            raise ValueError(f"Period must be one of: {list(SUMMARY_PERIODS)}")
+        if end_date < start_date:
+            raise ValueError("End date must not be before start date")
+
+        period_start = _period_start_column(db, period).label("period_start")
+        rows = db.execute(
+            select(
+                period_start,
+                Transaction.transaction_type,
+                func.count(Transaction.id),
+                func.coalesce(func.sum(Transaction.total_amount), 0),
+                func.coalesce(func.sum(_FEES), 0),
+            )
+            .where(
+                Transaction.user_id == user_id,
+                Transaction.transaction_date >= start_date,
+                Transaction.transaction_date <= end_date,
+            )
+            .group_by("period_start", Transaction.transaction_type)
+        ).all()
+
+        periods = {
+            start: TransactionPeriodSummary(
+                period_start=start, period_end=_period_end(start, period)
             )
-            summary["fees"]["total"] += fees
-
-            if transaction.transaction_type == "buy":
-                summary["buys"]["count"] += 1
-                summary["buys"]["total_amount"] += transaction.total_amount
-            elif transaction.transaction_type == "sell":
-                summary["sells"]["count"] += 1
-                summary["sells"]["total_amount"] += transaction.total_amount
-            elif transaction.transaction_type == "dividend":
-                summary["dividends"]["count"] += 1
-                summary["dividends"]["total_amount"] += transaction.total_amount
-
-        return summary
+            for start in _period_starts(start_date, end_date, period)
+        }
+        totals = TransactionPeriodSummary(period_start=start_date, period_end=end_date)
+        for row_start, transaction_type, count, amount, fees in rows:
+            # Dialects without a truncation function group by day; the floor
+            # folds those days into their period
+            summary = periods[_period_floor(_as_date(row_start), period)]
+            for target in (summary, totals):
+                _add_type_totals(
+                    target,
+                    TransactionType(transaction_type),
+                    count,
+                    Decimal(str(amount)),
+                    Decimal(str(fees)),
+                )
+
+        return TransactionHistorySummary(
+            start_date=start_date,
+            end_date=end_date,
+            period=period,
+            periods=list(periods.values()),
+            totals=totals,
+        )
 
     def delete_transaction(self, db: Session, transaction_id: int) -> bool:
         """Delete a transaction and update related position."""
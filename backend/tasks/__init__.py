@@ -27,6 +27,9 @@ celery_app.conf.update(
     worker_prefetch_multiplier=1,
     task_acks_late=True,
     worker_max_tasks_per_child=1000,
+    # Monte Carlo VaR spreads portfolios over a process pool, which prefork
+    # children (daemonic) cannot start; a solo worker consumes this queue
+    task_routes={"calculate_portfolio_var": {"queue": "simulation"}},
 )
 
 # Auto-discover tasks
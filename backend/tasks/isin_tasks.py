@@ -17,10 +17,13 @@ from backend.models.isin import ISINTickerMapping, ISINValidationCache
 from backend.services.enhanced_market_data import get_enhanced_market_data_service
 from backend.services.european_mappings import get_european_mapping_service
 from backend.services.german_data_providers import get_german_data_service
-from backend.services.isin_utils import ISINUtils
+from backend.services.isin_utils import ISINUtils, isin_service
 
 logger = logging.getLogger(__name__)
 
+# ISINs per IN query when loading validation cache rows
+VALIDATION_QUERY_CHUNK_SIZE = 500
+
 
 @shared_task(bind=True, max_retries=3, default_retry_delay=60)
 def validate_isin_batch(self, isins: list[str]) -> dict[str, Any]:
@@ -46,14 +49,23 @@ def validate_isin_batch(self, isins: list[str]) -> dict[str, Any]:
         }
 
         with get_db_session() as db:
-            for isin in isins:
+            # Load existing cache rows up front instead of querying per ISIN
+            existing: dict[str, ISINValidationCache] = {}
+            unique_isins = list(dict.fromkeys(isins))
+            for start in range(0, len(unique_isins), VALIDATION_QUERY_CHUNK_SIZE):
+                chunk = unique_isins[start : start + VALIDATION_QUERY_CHUNK_SIZE]
+                for row in db.query(ISINValidationCache).filter(
+                    ISINValidationCache.isin.in_(chunk)
+                ):
+                    existing[row.isin] = row
+
+            # Validate the whole batch in one vectorized pass
+            validation = ISINUtils.validate_isins(isins)
+
+            for index, isin in enumerate(isins):
                 try:
                     # Check cache first
-                    cached = (
-                        db.query(ISINValidationCache)
-                        .filter(ISINValidationCache.isin == isin)
-                        .first()
-                    )
+                    cached = existing.get(isin)
 
                     if cached and cached.is_fresh(24):  # 24 hours cache
                         results["cached"] += 1
@@ -69,8 +81,8 @@ def validate_isin_batch(self, isins: list[str]) -> dict[str, Any]:
                             results["invalid"] += 1
                         continue
 
-                    # Validate ISIN
-                    is_valid, error = ISINUtils.validate_isin(isin)
+                    is_valid = bool(validation.is_valid[index])
+                    error = validation.error(index)
 
                     # Parse ISIN info
                     isin_info = ISINUtils.parse_isin(isin) if is_valid else None
@@ -86,27 +98,19 @@ def validate_isin_batch(self, isins: list[str]) -> dict[str, Any]:
                         validation_error=error if not is_valid else None,
                     )
 
-                    # Check if entry exists
-                    existing = (
-                        db.query(ISINValidationCache)
-                        .filter(ISINValidationCache.isin == isin)
-                        .first()
-                    )
-
-                    if existing:
+                    if cached:
                         # Update existing
-                        existing.is_valid = is_valid
-                        existing.country_code = cache_entry.country_code
-                        existing.country_name = cache_entry.country_name
-                        existing.national_code = cache_entry.national_code
-                        existing.check_digit = cache_entry.check_digit
-                        existing.validation_error = cache_entry.validation_error
-                        existing.cached_at = datetime.now()
+                        cached.is_valid = is_valid
+                        cached.country_code = cache_entry.country_code
+                        cached.country_name = cache_entry.country_name
+                        cached.national_code = cache_entry.national_code
+                        cached.check_digit = cache_entry.check_digit
+                        cached.validation_error = cache_entry.validation_error
+                        cached.cached_at = datetime.now()
                     else:
                         # Create new
                         db.add(cache_entry)
-
-                    db.commit()
+                        existing[isin] = cache_entry
 
                     # Update results
                     results["details"][isin] = {
@@ -130,6 +134,9 @@ def validate_isin_batch(self, isins: list[str]) -> dict[str, Any]:
                     results["errors"].append(error_msg)
                     results["details"][isin] = {"valid": False, "error": str(e)}
 
+            # Write all cache rows for the batch in one transaction
+            db.commit()
+
         logger.info(
             f"Completed ISIN batch validation: {results['valid']} valid, {results['invalid']} invalid"
         )
@@ -391,15 +398,12 @@ def enrich_asset_data(self, asset_ids: list[int]) -> dict[str, Any]:
                     if asset.isin:
                         try:
                             # Get mapping information
-                            mapping = (
-                                db.query(ISINTickerMapping)
-                                .filter(
-                                    ISINTickerMapping.isin == asset.isin,
-                                    ISINTickerMapping.is_active.is_(True),
+                            mappings = (
+                                isin_service.mapping_service.get_mappings_from_db(
+                                    db, asset.isin
                                 )
-                                .order_by(ISINTickerMapping.confidence.desc())
-                                .first()
                             )
+                            mapping = mappings[0] if mappings else None
 
                             if mapping:
                                 # Update asset with mapping data
@@ -440,15 +444,12 @@ def enrich_asset_data(self, asset_ids: list[int]) -> dict[str, Any]:
                     elif asset.ticker:
                         try:
                             # Search for ISIN by ticker
-                            mapping = (
-                                db.query(ISINTickerMapping)
-                                .filter(
-                                    ISINTickerMapping.ticker == asset.ticker,
-                                    ISINTickerMapping.is_active.is_(True),
+                            mappings = (
+                                isin_service.mapping_service.get_mappings_for_ticker(
+                                    db, asset.ticker
                                 )
-                                .order_by(ISINTickerMapping.confidence.desc())
-                                .first()
                             )
+                            mapping = mappings[0] if mappings else None
 
                             if mapping:
                                 asset.isin = mapping.isin
@@ -12,6 +12,8 @@ from backend.database import get_db_session
 from backend.models.asset import Asset
 from backend.models.position import Position
 from backend.models.price_history import PriceHistory
+from backend.services.market_data import YFinanceProvider
+from backend.services.price_store import sync_price_store
 from backend.tasks import celery_app
 
 logger = logging.getLogger(__name__)
@@ -133,12 +135,14 @@ def update_portfolio_prices(self, user_id: int | None = None) -> dict[str, Any]:
             updated_count = 0
             failed_count = 0
 
+            # One multi-symbol download per chunk instead of a request per ticker
+            histories = YFinanceProvider().download_history(tickers, period="5d")
+
             for i, ticker in enumerate(tickers):
                 try:
-                    yf_ticker = yf.Ticker(ticker)
-                    hist = yf_ticker.history(period="2d")  # Get last 2 days
+                    hist = histories.get(ticker)
 
-                    if hist.empty:
+                    if hist is None or hist.empty:
                         logger.warning(f"No recent data for {ticker}")
                         failed_count += 1
                         continue
@@ -199,6 +203,7 @@ def update_portfolio_prices(self, user_id: int | None = None) -> dict[str, Any]:
 
             # Commit all changes
             db.commit()
+            sync_price_store(db)
 
             logger.info(
                 f"Price update completed. Updated: {updated_count}, Failed: {failed_count}"
@@ -6,31 +6,23 @@ import logging
 from typing import Any
 
 from celery import current_task
+from sqlalchemy import func
 
+from backend.config import get_settings
 from backend.database import get_db_session
 from backend.models.asset import Asset
 from backend.models.portfolio_snapshot import PortfolioSnapshot
 from backend.models.position import Position
 from backend.models.user import User
-from backend.services.cash_account import CashAccountService
+from backend.services.monte_carlo import SimulationConfig
+from backend.services.portfolio_aggregation import PortfolioAggregator
+from backend.services.risk import default_simulation_config, risk_service
 from backend.tasks import celery_app
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
 
-# Initialize cash account service
-cash_account_service = CashAccountService()
-
-
-def _get_user_cash_balance(db, user_id: int) -> Decimal:
-    """Get total cash balance for a user across all currencies converted to USD."""
-    try:
-        # For now, get balance in USD (primary currency)
-        # In the future, this could convert all currencies to user's preferred currency
-        usd_balance = cash_account_service.get_cash_balance(db, user_id, "USD")
-        return usd_balance
-    except Exception as e:
-        logger.warning(f"Error getting cash balance for user {user_id}: {e}")
-        return Decimal("0")
+portfolio_aggregator = PortfolioAggregator()
 
 
 @celery_app.task(bind=True, name="calculate_portfolio_performance")  # type: ignore[misc]
@@ -206,6 +198,9 @@ def calculate_portfolio_performance(
 def create_portfolio_snapshot(self, user_id: int | None = None) -> dict[str, Any]:
     """Create daily portfolio snapshot(s) for tracking historical performance.
 
+    Snapshots for all users are built in one set-based insert; users that
+    already have today's snapshot or hold no active positions are skipped.
+
     Args:
         user_id: Specific user ID, or None for all users
 
@@ -217,12 +212,14 @@ def create_portfolio_snapshot(self, user_id: int | None = None) -> dict[str, Any
 
         with get_db_session() as db:
             # Get users to process
+            users_query = db.query(func.count(User.id))
             if user_id:
-                users = db.query(User).filter(User.id == user_id).all()
+                users_query = users_query.filter(User.id == user_id)
             else:
-                users = db.query(User).filter(User.is_active.is_(True)).all()
+                users_query = users_query.filter(User.is_active.is_(True))
+            total_users = users_query.scalar() or 0
 
-            if not users:
+            if not total_users:
                 return {
                     "status": "completed",
                     "message": "No users found",
@@ -233,108 +230,73 @@ def create_portfolio_snapshot(self, user_id: int | None = None) -> dict[str, Any
                 state="PROGRESS",
                 meta={
                     "current": 0,
-                    "total": len(users),
+                    "total": total_users,
                     "status": "Creating snapshots...",
                 },
             )
 
-            snapshots_created = 0
             today = datetime.now().date()
+            snapshots_created = portfolio_aggregator.create_snapshots(
+                db, today, user_id=user_id or None
+            )
+            db.commit()
 
-            for i, user in enumerate(users):
-                try:
-                    # Check if snapshot already exists for today
-                    existing_snapshot = (
-                        db.query(PortfolioSnapshot)
-                        .filter(
-                            PortfolioSnapshot.user_id == user.id,
-                            PortfolioSnapshot.snapshot_date == today,
-                        )
-                        .first()
-                    )
-
-                    if existing_snapshot:
-                        logger.info(
-                            f"Snapshot already exists for user {user.id} on {today}"
-                        )
-                        continue
-
-                    # Get user's active positions
-                    positions = (
-                        db.query(Position)
-                        .join(Asset)
-                        .filter(
-                            Position.user_id == user.id,
-                            Position.is_active.is_(True),
-                            Asset.current_price.isnot(None),
-                        )
-                        .all()
-                    )
+            logger.info(f"Created {snapshots_created} portfolio snapshots for {today}")
 
-                    if not positions:
-                        logger.info(f"No active positions for user {user.id}")
-                        continue
+            return {
+                "status": "completed",
+                "snapshots_created": snapshots_created,
+                "total_users_processed": total_users,
+                "snapshot_date": today.isoformat(),
+            }
 
-                    # Calculate portfolio totals
-                    total_value = Decimal("0")
-                    total_cost_basis = Decimal("0")
-                    total_positions = len(positions)
+    except Exception as e:
+        logger.error(f"Error creating portfolio snapshots: {e!s}")
+        current_task.update_state(state="FAILURE", meta={"error": str(e)})
+        raise
 
-                    for position in positions:
-                        total_value += position.current_value or Decimal("0")
-                        total_cost_basis += position.total_cost_basis
 
-                    total_gain_loss = total_value - total_cost_basis
-                    total_gain_loss_percent = float(
-                        (total_gain_loss / total_cost_basis * 100)
-                        if total_cost_basis > 0
-                        else 0
-                    )
+@celery_app.task(bind=True, name="calculate_portfolio_var")  # type: ignore[misc]
+def calculate_portfolio_var(
+    self, method: str = "historical", workers: int | None = None
+) -> dict[str, Any]:
+    """Simulate Monte Carlo VaR/CVaR for every active user's portfolio.
 
-                    # Create snapshot
-                    snapshot = PortfolioSnapshot(
-                        user_id=user.id,
-                        snapshot_date=today,
-                        total_value=total_value,
-                        total_cost_basis=total_cost_basis,
-                        total_gain_loss=total_gain_loss,
-                        total_gain_loss_percent=Decimal(str(total_gain_loss_percent)),
-                        total_positions=total_positions,
-                        cash_balance=_get_user_cash_balance(db, user.id),
-                    )  # type: ignore[call-arg]
-
-                    db.add(snapshot)
-                    snapshots_created += 1
-
-                    logger.info(
-                        f"Created snapshot for user {user.id}: ${total_value:.2f}"
-                    )
+    Results land in the shared risk cache that the VaR endpoint reads.
 
-                except Exception as e:
-                    logger.error(f"Error creating snapshot for user {user.id}: {e!s}")
-                    continue
+    Args:
+        method: Simulation method, ``historical`` or ``parametric``
+        workers: Worker processes; defaults to ``MONTE_CARLO_WORKERS``
 
-                current_task.update_state(
-                    state="PROGRESS",
-                    meta={
-                        "current": i + 1,
-                        "total": len(users),
-                        "status": f"Processed user {user.id}",
-                    },
-                )
+    Returns:
+        Dict with simulation status
+    """
+    try:
+        logger.info(f"Simulating {method} value at risk for all users")
+        defaults = default_simulation_config()
+        config = SimulationConfig(
+            paths=defaults.paths, method=method, seed=defaults.seed
+        )
 
-            # Commit all snapshots
-            db.commit()
+        with get_db_session() as db:
+            results = risk_service.simulate_all(
+                db,
+                config=config,
+                workers=workers or settings.monte_carlo_workers or None,
+            )
 
-            return {
-                "status": "completed",
-                "snapshots_created": snapshots_created,
-                "total_users_processed": len(users),
-                "snapshot_date": today.isoformat(),
-            }
+        simulated = sum(1 for analysis in results.values() if analysis.horizons)
+        logger.info(f"Simulated value at risk for {simulated} portfolios")
+        return {
+            "status": "completed",
+            "portfolios_simulated": simulated,
+            "total_users_processed": len(results),
+            "method": method,
+            "paths": config.paths,
+        }
 
     except Exception as e:
-        logger.error(f"Error creating portfolio snapshots: {e!s}")
+        logger.error(f"Error simulating portfolio value at risk: {e!s}")
         current_task.update_state(state="FAILURE", meta={"error": str(e)})
         raise
 
@@ -26,6 +26,11 @@ beat_schedule = {
         "schedule": crontab(minute="*/30", hour="6-20"),  # Every 30 min, 6 AM - 8 PM
         "args": [None],
     },
+    # Monte Carlo VaR for every portfolio once the evening price updates end
+    "simulate-portfolio-var-nightly": {
+        "task": "calculate_portfolio_var",
+        "schedule": crontab(minute=0, hour=21),  # 9 PM ET
+    },
     # Weekly portfolio performance reports on Sundays at 8 PM
     "weekly-cleanup": {
         "task": "create_portfolio_snapshot",
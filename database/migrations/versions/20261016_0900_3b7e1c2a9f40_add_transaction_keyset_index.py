@@ -0,0 +1,30 @@
+"""Add transaction keyset pagination index
+
+Revision ID: 3b7e1c2a9f40
+Revises: fd5642662c22
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3b7e1c2a9f40"
+down_revision: Union[str, None] = "fd5642662c22"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_transactions_user_date_id",
+        "transactions",
+        ["user_id", "transaction_date", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_transactions_user_date_id", table_name="transactions")
@@ -231,8 +231,6 @@ class MarketDataTools:
     ) -> list[TextContent]:
         """Analyze portfolio risk metrics."""
         try:
-            # This is a placeholder implementation - in a real system, this would
-            # calculate actual risk metrics like Sharpe ratio, beta, VaR, etc.
             period = arguments.get("period", "1Y")
 
             # Get current positions for diversification analysis
@@ -293,7 +291,7 @@ class MarketDataTools:
   • Largest Position: {concentration_pct:.1f}% of portfolio
   • Concentration Risk: {concentration_risk}
 
-**Risk Assessment:**
+{await self._format_volatility_metrics(user_id, headers)}**Risk Assessment:**
   • **Overall Risk Level:** {"HIGH" if concentration_pct > 40 or num_positions < 3 else "MODERATE" if concentration_pct > 25 or num_positions < 6 else "LOW"}
 
 **Recommendations:**
@@ -317,6 +315,43 @@ class MarketDataTools:
                 TextContent(type="text", text=f"Error analyzing portfolio risk: {e!s}")
             ]
 
+    async def _format_volatility_metrics(
+        self, user_id: int, headers: dict[str, str]
+    ) -> str:
+        """Covariance-based volatility section, or nothing if unavailable."""
+        try:
+            response = await self.http_client.get(
+                f"{self.backend_url}/api/v1/portfolio/risk/{user_id}", headers=headers
+            )
+        except httpx.HTTPError as e:
+            logger.warning(f"Volatility metrics unavailable for user {user_id}: {e}")
+            return ""
+        if response.status_code != 200:
+            return ""
+        risk = response.json().get("data") or {}
+        if risk.get("portfolio_volatility") is None:
+            return ""
+
+        value_at_risk = risk.get("value_at_risk", {})
+        contributors = sorted(
+            risk.get("risk_contribution", {}).items(),
+            key=lambda item: float(item[1]),
+            reverse=True,
+        )[:3]
+        top_contributors = ", ".join(
+            f"{ticker} {float(share):.1f}%" for ticker, share in contributors
+        )
+        text = f"""**Volatility Metrics ({risk.get("observations", 0)} daily returns):**
+  • Annualized Volatility: {float(risk["portfolio_volatility"]):.2f}%
+  • 1-Day VaR (95%): {float(value_at_risk.get("95", 0)):.2f}%
+  • 1-Day VaR (99%): {float(value_at_risk.get("99", 0)):.2f}%
+  • Top Risk Contributors: {top_contributors}
+"""
+        if risk.get("excluded_tickers"):
+            excluded = ", ".join(risk["excluded_tickers"])
+            text += f"  • Not enough price history: {excluded}\n"
+        return text + "\n"
+
     async def _get_market_trends(self, arguments: dict[str, Any]) -> list[TextContent]:
         """Get market trends information."""
         try:
@@ -47,6 +47,12 @@ echo "🔧 Starting Celery worker..."
 celery -A backend.tasks worker --loglevel=info --logfile=logs/celery_worker.log &
 WORKER_PID=$!
 
+# Start the Monte Carlo VaR worker; a solo pool lets it start its own processes
+echo "🎲 Starting Celery simulation worker..."
+celery -A backend.tasks worker --loglevel=info --queues=simulation --pool=solo \
+    --hostname=simulation@%h --logfile=logs/celery_simulation_worker.log &
+SIMULATION_WORKER_PID=$!
+
 # Start Celery beat scheduler
 echo "⏰ Starting Celery beat scheduler..."
 celery -A backend.tasks beat --loglevel=info --logfile=logs/celery_beat.log &
@@ -69,6 +75,7 @@ echo "   - Flower (if available): http://localhost:5555"
 echo ""
 echo "📝 Log files:"
 echo "   - Worker logs: logs/celery_worker.log"
+echo "   - Simulation worker logs: logs/celery_simulation_worker.log"
 echo "   - Beat logs: logs/celery_beat.log"
 echo "   - Flower logs: logs/flower.log"
 echo ""
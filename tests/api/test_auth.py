@@ -1,5 +1,6 @@
 """Tests for authentication API endpoints."""
 
+from types import SimpleNamespace
 from unittest.mock import patch
 
 import pytest
@@ -512,3 +513,21 @@ class TestProtectedEndpoints:
         # that user A cannot access user B's data
         # For now, verify the concept
         assert True  # Placeholder for user isolation test
+
+    @pytest.mark.parametrize(
+        "endpoint", ["/api/v1/portfolio/risk/2", "/api/v1/portfolio/risk/2/var"]
+    )
+    def test_other_users_risk_is_forbidden(self, client, endpoint):
+        """Test risk endpoints refuse another user's portfolio."""
+        from backend.auth.dependencies import get_current_active_user
+        from backend.main import app
+
+        app.dependency_overrides[get_current_active_user] = lambda: SimpleNamespace(
+            id=1
+        )
+        try:
+            response = client.get(endpoint)
+        finally:
+            app.dependency_overrides.pop(get_current_active_user)
+
+        assert response.status_code == 403
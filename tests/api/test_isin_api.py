@@ -23,6 +23,16 @@ def test_client():
     return TestClient(app)
 
 
+class FakeAsyncSession:
+    """Runs sync session work on a mock session, as AsyncSession.run_sync does."""
+
+    def __init__(self, session):
+        self.session = session
+
+    async def run_sync(self, fn, *args, **kwargs):
+        return fn(self.session, *args, **kwargs)
+
+
 @pytest.fixture
 def mock_db_session():
     """Mock database session for ISIN API tests."""
@@ -357,13 +367,13 @@ class TestISINMappingAPI:
 
     def test_get_mappings(self, test_client, mock_db_session):
         """Test getting ISIN mappings."""
-        from backend.database import get_db_session
+        from backend.database import get_async_db
 
         # Override the dependency in the test client's app
-        def override_get_db():
-            yield mock_db_session
+        async def override_get_async_db():
+            yield FakeAsyncSession(mock_db_session)
 
-        test_client.app.dependency_overrides[get_db_session] = override_get_db
+        test_client.app.dependency_overrides[get_async_db] = override_get_async_db
 
         try:
             response = test_client.get(
@@ -25,6 +25,11 @@ os.environ["SESSION_TIMEOUT"] = "3600"
 os.environ["MARKET_DATA_CACHE_TTL"] = "300"
 os.environ["PORTFOLIO_CACHE_TTL"] = "600"
 os.environ["ISIN_MAPPING_CACHE_TTL"] = "86400"
+os.environ["CACHE_REDIS_ENABLED"] = "false"
+os.environ["ISIN_MAPPING_INDEX_ENABLED"] = "false"
+os.environ["PORTFOLIO_CACHE_ENABLED"] = "false"
+os.environ["PRICE_STORE_ENABLED"] = "false"
+os.environ["ASSET_SEARCH_INDEX_ENABLED"] = "false"
 os.environ["CONCENTRATION_WARNING_THRESHOLD"] = "0.20"
 os.environ["CONCENTRATION_CRITICAL_THRESHOLD"] = "0.25"
 os.environ["RISK_FREE_RATE"] = "0.02"
@@ -40,8 +45,9 @@ from typing import Any
 from unittest.mock import AsyncMock, MagicMock
 
 from faker import Faker
+import numpy as np
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 
 # Import all models to ensure they're registered with Base metadata
@@ -110,6 +116,22 @@ def setup_test_environment():
     os.environ["DEBUG"] = "true"
 
 
+@pytest.fixture(autouse=True)
+def reset_asset_search_index(monkeypatch):
+    """Give each test an empty asset search index.
+
+    Commits in any test mark the global index for a rebuild, so it is
+    replaced rather than shared across tests.
+    """
+    from backend.services import asset_search
+
+    monkeypatch.setattr(
+        asset_search,
+        "asset_search_index",
+        asset_search.AssetSearchIndex(refresh_interval=60, reload_interval=3600),
+    )
+
+
 @pytest.fixture
 def test_db():
     """Create a test database for each test."""
@@ -157,26 +179,83 @@ def test_db():
         pass  # Ignore cleanup errors in tests
 
 
+@pytest.fixture
+def db_session(test_db):
+    """Session on the per-test database, closed after the test."""
+    override_get_db, _engine = test_db
+    session = next(override_get_db())
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def count_queries():
+    """Record the statements a session's engine runs from the call onwards."""
+    listeners = []
+
+    def count(session):
+        statements = []
+
+        def record(_conn, _cursor, statement, *_args):
+            statements.append(statement)
+
+        bind = session.get_bind()
+        event.listen(bind, "before_cursor_execute", record)
+        listeners.append((bind, record))
+        return statements
+
+    yield count
+    for bind, record in listeners:
+        event.remove(bind, "before_cursor_execute", record)
+
+
+@pytest.fixture
+def days():
+    """Build datetime64[D] arrays from ISO date strings."""
+
+    def build(*dates):
+        return np.array(dates, dtype="datetime64[D]")
+
+    return build
+
+
 @pytest.fixture
 def client(test_db):
     """Create a test client with a test database."""
+    import asyncio
+
     from fastapi.testclient import TestClient
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
-    from backend.database import get_db
+    from backend.database import get_async_database_url, get_async_db, get_db
     from backend.main import app
 
     override_get_db, engine = test_db
 
-    # Apply the dependency override
+    # Async endpoints read the same database file through aiosqlite
+    async_engine = create_async_engine(
+        get_async_database_url(engine.url.render_as_string(hide_password=False))
+    )
+    TestAsyncSessionLocal = async_sessionmaker(
+        bind=async_engine, autoflush=False, expire_on_commit=False
+    )
+
+    async def override_get_async_db():
+        async with TestAsyncSessionLocal() as db:
+            yield db
+
+    # Apply the dependency overrides
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
 
     try:
         with TestClient(app) as test_client:
             yield test_client
     finally:
-        # Remove dependency override
-        if get_db in app.dependency_overrides:
-            del app.dependency_overrides[get_db]
+        # Remove dependency overrides
+        app.dependency_overrides.pop(get_db, None)
+        app.dependency_overrides.pop(get_async_db, None)
+        asyncio.run(async_engine.dispose())
 
 
 # Legacy fixtures - commented out to prevent conflicts with new isolated database approach
@@ -242,6 +321,40 @@ def mock_redis():
     return mock_redis
 
 
+class FakeRedis:
+    """In-memory stand-in for the redis client calls the caches make."""
+
+    def __init__(self):
+        self.store: dict[str, str] = {}
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def set(self, key, value, ex=None):
+        self.store[key] = value
+
+    def delete(self, *keys):
+        for key in keys:
+            self.store.pop(key, None)
+
+    def scan_iter(self, match=None, count=None):
+        prefix = match.rstrip("*")
+        return [key for key in list(self.store) if key.startswith(prefix)]
+
+    def incr(self, key):
+        self.store[key] = str(int(self.store.get(key, 0)) + 1)
+        return int(self.store[key])
+
+    def expire(self, key, seconds):
+        pass
+
+
+@pytest.fixture
+def fake_redis() -> FakeRedis:
+    """Shared Redis tier for caches standing in for separate workers."""
+    return FakeRedis()
+
+
 @pytest.fixture
 def mock_celery_task():
     """Mock Celery task for testing."""
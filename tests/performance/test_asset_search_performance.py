@@ -0,0 +1,47 @@
+"""Performance benchmarks for asset autocomplete."""
+
+import random
+import string
+
+import pytest
+
+from backend.services.asset_search import AssetSearchIndex
+
+ASSETS = 100_000
+
+
+@pytest.fixture(scope="module")
+def index():
+    """Index over random tickers and names from a shared vocabulary."""
+    rng = random.Random(0)
+    words = [
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9)))
+        for _ in range(5000)
+    ]
+    search_index = AssetSearchIndex(refresh_interval=60, reload_interval=3600)
+    search_index.load_rows(
+        (
+            asset_id,
+            "".join(rng.choices(string.ascii_uppercase, k=rng.randint(1, 5))),
+            " ".join(rng.choices(words, k=rng.randint(1, 4))) + " Inc",
+            None,
+        )
+        for asset_id in range(1, ASSETS + 1)
+    )
+    return search_index
+
+
+@pytest.mark.benchmark
+@pytest.mark.performance
+class TestAssetSearchPerformance:
+    """Benchmark keystroke-sized queries against a large index."""
+
+    @pytest.mark.parametrize("query", ["a", "ab", "inc", "qzxjv", "abc defg"])
+    def test_search_under_ten_milliseconds(self, benchmark, index, query):
+        """Benchmark prefix and fuzzy queries over 100k assets."""
+        results = benchmark(index.search, query, 10)
+
+        assert len(results) <= 10
+        # Timings are only collected when benchmarking is enabled (not under xdist)
+        if not benchmark.disabled:
+            assert benchmark.stats.stats.mean < 0.01
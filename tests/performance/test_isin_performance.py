@@ -80,6 +80,39 @@ class TestISINValidationPerformance:
         assert avg_time_per_isin < 0.01, "Average validation time should be under 10ms"
         assert throughput > 100, "Throughput should be over 100 ISINs/second"
 
+    @pytest.mark.slow
+    def test_vectorized_batch_validation_speedup(self):
+        """Compare validate_isins against per-ISIN validation at 100k ISINs."""
+        bases = [ISINFactory.create_valid_isin()[:11] for _ in range(1000)]
+        check_digits = [ISINUtils.validate_isin_checksum(f"{b}0")[1] for b in bases]
+        # Alternate correct and off-by-one check digits
+        isins = [
+            f"{base}{(check + i % 2) % 10}"
+            for i, (base, check) in enumerate(
+                zip(bases * 100, check_digits * 100, strict=True)
+            )
+        ]
+
+        start_time = time.perf_counter()
+        scalar_results = [
+            ISINUtils.validate_isin(isin, use_cache=False) for isin in isins
+        ]
+        scalar_elapsed = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        batch = ISINUtils.validate_isins(isins)
+        vectorized_elapsed = time.perf_counter() - start_time
+
+        speedup = scalar_elapsed / vectorized_elapsed
+
+        assert batch.valid_count == len(isins) // 2
+        assert batch.is_valid.tolist() == [valid for valid, _ in scalar_results]
+        assert speedup > 3, (
+            f"Vectorized validation should be several times faster: "
+            f"{vectorized_elapsed:.3f}s vs {scalar_elapsed:.3f}s per-ISIN "
+            f"({speedup:.1f}x)"
+        )
+
     def test_validation_memory_usage(self, performance_test_data):
         """Test memory usage during validation."""
         medium_batch = performance_test_data["medium_batch"]
@@ -0,0 +1,33 @@
+"""Performance benchmarks for Monte Carlo value at risk."""
+
+import numpy as np
+import pytest
+
+from backend.services.monte_carlo import METHODS, SimulationConfig, simulate_tail_risk
+
+PATHS = 10_000
+POSITIONS = 500
+DAYS = 250
+
+
+@pytest.mark.benchmark
+@pytest.mark.performance
+class TestMonteCarloPerformance:
+    """Benchmark a large portfolio at the default path count."""
+
+    @pytest.mark.parametrize("method", METHODS)
+    def test_large_portfolio_under_one_second(self, benchmark, method):
+        """Benchmark 10k paths over 500 positions and two horizons."""
+        rng = np.random.default_rng(0)
+        log_returns = rng.normal(0, 0.01, (DAYS, 1)) + rng.normal(
+            0, 0.01, (DAYS, POSITIONS)
+        )
+        weights = np.full(POSITIONS, 1 / POSITIONS)
+        config = SimulationConfig(paths=PATHS, method=method)
+
+        result = benchmark(simulate_tail_risk, log_returns, weights, config)
+
+        assert result.value_at_risk.shape == (2, 2)
+        # Timings are only collected when benchmarking is enabled (not under xdist)
+        if not benchmark.disabled:
+            assert benchmark.stats.stats.mean < 1.0
@@ -0,0 +1,147 @@
+"""Tests for vectorized return and risk analytics."""
+
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from backend.services.analytics import (
+    aligned_returns,
+    analyze_performance,
+    beta_alpha,
+    max_drawdown,
+    period_returns,
+    sharpe_ratio,
+    trailing_returns,
+    volatility,
+)
+
+
+class TestKernels:
+    """Test individual kernels against hand-computed values."""
+
+    def test_period_returns_skip_non_positive_starts(self):
+        """Test periods starting at zero are left out."""
+        returns = period_returns(np.array([100.0, 110.0, 0.0, 50.0, 55.0]))
+
+        np.testing.assert_allclose(returns, [0.1, -1.0, 0.1])
+
+    def test_volatility_is_annualized_sample_std(self):
+        """Test volatility matches the textbook formula."""
+        returns = np.array([0.01, -0.005, 0.02, -0.015, 0.008])
+        mean = returns.mean()
+        expected = (((returns - mean) ** 2).sum() / 4) ** 0.5 * 252**0.5
+
+        assert volatility(returns) == pytest.approx(expected)
+        assert volatility(np.array([0.01])) == 0.0
+
+    def test_sharpe_ratio(self):
+        """Test annualized excess return over volatility."""
+        returns = np.array([0.002, -0.001, 0.003, 0.0])
+
+        expected = (returns.mean() * 252 - 0.02) / volatility(returns)
+        assert sharpe_ratio(returns, 0.02) == pytest.approx(expected)
+        assert sharpe_ratio(np.full(5, 0.001), 0.02) == 0.0
+
+    def test_max_drawdown(self):
+        """Test the deepest fall from a running peak."""
+        values = np.array([100.0, 120.0, 90.0, 130.0, 104.0, 125.0])
+
+        assert max_drawdown(values) == pytest.approx(0.25)
+        assert max_drawdown(np.array([100.0])) == 0.0
+
+    def test_beta_alpha_of_levered_series(self):
+        """Test a series moving twice the benchmark has beta two."""
+        benchmark = np.array([0.01, -0.02, 0.015, 0.005, -0.01])
+        returns = 2 * benchmark + 0.001
+
+        beta, alpha = beta_alpha(returns, benchmark, risk_free_rate=0.0)
+
+        assert beta == pytest.approx(2.0)
+        assert alpha == pytest.approx(0.001 * 252)
+        assert beta_alpha(returns, np.zeros(5)) == (None, None)
+
+    def test_trailing_returns(self, days):
+        """Test each window starts at the last value on or before its cutoff."""
+        dates = days("2024-01-01", "2024-01-05", "2024-01-10")
+        values = np.array([100.0, 125.0, 150.0])
+
+        result = trailing_returns(
+            dates, values, days("2024-01-06", "2024-01-01", "2023-12-31")
+        )
+
+        np.testing.assert_allclose(result, [0.2, 0.5, np.nan])
+
+    def test_aligned_returns_use_common_dates(self, days):
+        """Test only dates present in both series form periods."""
+        first, second = aligned_returns(
+            days("2024-01-01", "2024-01-02", "2024-01-03"),
+            np.array([100.0, 110.0, 121.0]),
+            days("2024-01-01", "2024-01-03"),
+            np.array([50.0, 60.0]),
+        )
+
+        np.testing.assert_allclose(first, [0.21])
+        np.testing.assert_allclose(second, [0.2])
+
+
+class TestAnalyzePerformance:
+    """Test the full set of PerformanceMetrics figures."""
+
+    @pytest.fixture
+    def series(self):
+        """Daily values over 400 days ending on the analysis date."""
+        as_of = date(2024, 6, 30)
+        dates = [as_of - timedelta(days=n) for n in range(399, -1, -1)]
+        values = list(100 * np.exp(np.linspace(0, 0.2, 400)))
+        return as_of, dates, values
+
+    def test_windows_and_risk(self, series):
+        """Test trailing windows and risk figures are all populated."""
+        as_of, dates, values = series
+
+        result = analyze_performance(dates, values, as_of, period_days=399)
+
+        by_date = dict(zip(dates, values, strict=True))
+        week_start = by_date[as_of - timedelta(days=7)]
+        assert result.weekly_return == pytest.approx(
+            (values[-1] / week_start - 1) * 100
+        )
+        assert result.ytd_return == pytest.approx(
+            (values[-1] / by_date[date(2024, 1, 1)] - 1) * 100
+        )
+        assert result.one_year_return == pytest.approx(
+            (values[-1] / by_date[as_of - timedelta(days=365)] - 1) * 100
+        )
+        assert result.quarterly_return is not None
+        assert result.max_drawdown == 0.0
+        assert result.volatility is not None
+        assert result.beta is None
+
+    def test_short_series(self):
+        """Test a single value yields no returns or risk figures."""
+        result = analyze_performance([date(2024, 1, 1)], [100.0], date(2024, 1, 1), 0)
+
+        assert result.daily_return is None
+        assert result.volatility is None
+        assert result.sharpe_ratio is None
+        assert result.weekly_return is None
+        assert result.ytd_return == 0.0
+
+    def test_benchmark_beta(self, series):
+        """Test beta against a benchmark on the same dates."""
+        as_of, dates, _ = series
+        log_prices = np.cumsum(np.random.default_rng(7).normal(0, 0.01, len(dates)))
+        benchmark = list(100 * np.exp(log_prices))
+        values = list(100 * np.exp(2 * log_prices))
+
+        result = analyze_performance(
+            dates,
+            values,
+            as_of,
+            period_days=399,
+            benchmark_dates=dates,
+            benchmark_values=benchmark,
+        )
+
+        assert result.beta == pytest.approx(2.0, rel=1e-2)
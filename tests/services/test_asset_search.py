@@ -0,0 +1,184 @@
+"""Tests for the in-process asset autocomplete index."""
+
+from datetime import UTC, datetime
+from decimal import Decimal
+import threading
+
+import pytest
+from sqlalchemy import event, text, update
+
+from backend.models import Asset, AssetCategory, AssetType
+from backend.services.asset_search import AssetSearchIndex
+
+ASSETS = [
+    (1, "AAPL", "Apple Inc.", "US0378331005"),
+    (2, "AAP", "Advance Auto Parts Inc.", None),
+    (3, "APLE", "Apple Hospitality REIT", None),
+    (4, "MSFT", "Microsoft Corporation", "US5949181045"),
+    (5, "BRK.B", "Berkshire Hathaway Inc. Class B", None),
+    (6, "PINE", "Alpine Income Property Trust", None),
+]
+
+
+@pytest.fixture
+def index():
+    """Index over a handful of assets."""
+    search_index = AssetSearchIndex(refresh_interval=60, reload_interval=3600)
+    search_index.load_rows(ASSETS)
+    return search_index
+
+
+@pytest.fixture
+def db(db_session):
+    """SQLite session with an active and an inactive asset."""
+    db_session.add_all(
+        [
+            Asset(
+                ticker=ticker,
+                name=ticker.title(),
+                asset_type=AssetType.STOCK,
+                category=AssetCategory.EQUITY,
+                is_active=ticker != "GONE",
+            )
+            for ticker in ("KEEP", "GONE")
+        ]
+    )
+    db_session.commit()
+    return db_session
+
+
+class TestRanking:
+    """Test match tiers and their order."""
+
+    def test_ticker_prefix_shortest_first(self, index):
+        """Test an exact ticker beats longer tickers with the same prefix."""
+        assert index.search("aap") == [2, 1]
+
+    def test_tiers_in_order(self, index):
+        """Test ticker, then name, then word-in-name prefixes."""
+        assert index.search("ap") == [3, 1]
+        assert index.search("a") == [2, 1, 3, 6]
+        assert index.search("apple") == [1, 3]
+        assert index.search("hath") == [5]
+
+    def test_isin_prefix(self, index):
+        """Test ISINs match by prefix."""
+        assert index.search("us5949") == [4]
+
+    def test_punctuation(self, index):
+        """Test tickers keep punctuation and names ignore it."""
+        assert index.search("BRK.B") == [5]
+        assert index.search("berkshire hathaway inc class") == [5]
+
+    def test_fuzzy_after_prefix_matches(self, index):
+        """Test misspelled words still find the closest names."""
+        assert index.search("microsfot")[0] == 4
+        assert index.search("hathway berkshire") == [5]
+
+    def test_limit_and_empty(self, index):
+        """Test results are capped and blank queries match nothing."""
+        assert index.search("a", limit=2) == [2, 1]
+        assert index.search("  ") == []
+        assert (
+            AssetSearchIndex(refresh_interval=60, reload_interval=3600).search("aapl")
+            == []
+        )
+
+
+class TestFreshness:
+    """Test loading from the database and rebuilds after asset writes."""
+
+    def test_loads_active_assets_in_background(self, db):
+        """Test the first search starts a load and only active assets are indexed."""
+        index = AssetSearchIndex(refresh_interval=60, reload_interval=3600)
+
+        index.ensure_fresh(db)
+        index.join()
+
+        assert index.ensure_fresh(db)
+        assert index.get_stats()["assets"] == 1
+        assert index.search("gone") == []
+
+    def test_rename_requests_rebuild(self, db, monkeypatch):
+        """Test committing a changed ticker rebuilds the index."""
+        index = AssetSearchIndex(refresh_interval=60, reload_interval=3600)
+        monkeypatch.setattr("backend.services.asset_search.asset_search_index", index)
+        index.load(db)
+
+        asset = db.query(Asset).filter(Asset.ticker == "KEEP").one()
+        asset.ticker = "KEPT"
+        db.commit()
+        # The previous snapshot keeps serving while the rebuild runs
+        assert index.ensure_fresh(db)
+        index.join()
+
+        assert index.get_stats()["full_loads"] == 2
+        assert index.search("kept") == [asset.id]
+
+    def test_rolled_back_rename_keeps_index(self, db, monkeypatch):
+        """Test a rename that was rolled back requests no rebuild on commit."""
+        index = AssetSearchIndex(refresh_interval=60, reload_interval=3600)
+        monkeypatch.setattr("backend.services.asset_search.asset_search_index", index)
+        index.load(db)
+
+        asset = db.query(Asset).filter(Asset.ticker == "KEEP").one()
+        asset.ticker = "KEPT"
+        db.flush()
+        db.rollback()
+        db.commit()
+
+        assert index.get_stats()["reload_requested"] is False
+
+    def test_price_updates_keep_index(self, db, monkeypatch):
+        """Test price refreshes, single or bulk, do not rebuild the index."""
+        index = AssetSearchIndex(refresh_interval=0, reload_interval=3600)
+        monkeypatch.setattr("backend.services.asset_search.asset_search_index", index)
+        index.load(db)
+        asset = db.query(Asset).filter(Asset.ticker == "KEEP").one()
+
+        asset.current_price = Decimal("10")
+        db.commit()
+        db.execute(update(Asset), [{"id": asset.id, "current_price": Decimal("11")}])
+        db.commit()
+        index.ensure_fresh(db)
+        index.join()
+
+        assert index.get_stats()["change_checks"] == 1
+        assert index.get_stats()["full_loads"] == 1
+
+    def test_check_runs_in_background(self, db):
+        """Test searches leave the change check to the background thread."""
+        index = AssetSearchIndex(refresh_interval=0, reload_interval=3600)
+        index.load(db)
+        threads = []
+
+        def record(*args):
+            threads.append(threading.current_thread())
+
+        event.listen(db.get_bind(), "before_cursor_execute", record)
+        try:
+            index.ensure_fresh(db)
+            index.join()
+        finally:
+            event.remove(db.get_bind(), "before_cursor_execute", record)
+
+        assert threads
+        assert threading.current_thread() not in threads
+        assert index.get_stats()["change_checks"] == 1
+
+    def test_check_finds_writes_from_other_processes(self, db):
+        """Test renames that no session event reported are found and indexed."""
+        index = AssetSearchIndex(refresh_interval=0, reload_interval=3600)
+        index.load(db)
+        asset_id = db.query(Asset.id).filter(Asset.ticker == "GONE").scalar()
+
+        db.execute(
+            text("UPDATE assets SET is_active = 1, updated_at = :now WHERE id = :id"),
+            {"now": datetime.now(UTC).replace(tzinfo=None), "id": asset_id},
+        )
+        db.commit()
+        index.ensure_fresh(db)
+        index.join()
+
+        assert index.get_stats()["full_loads"] == 2
+        assert index.search("gone") == [asset_id]
@@ -0,0 +1,204 @@
+"""Tests for the two-tier TTL/LRU cache."""
+
+import threading
+from unittest.mock import patch
+
+from backend.services.cache import CacheStats, TTLCache, TwoTierCache
+
+
+class BrokenRedis:
+    """Redis client whose every call fails."""
+
+    def get(self, key):
+        raise ConnectionError("redis down")
+
+    def set(self, key, value, ex=None):
+        raise ConnectionError("redis down")
+
+
+class TestTTLCache:
+    """Test suite for the in-process L1 cache."""
+
+    def test_get_set_and_counters(self):
+        """Test hits and misses are counted."""
+        cache = TTLCache(max_size=10, ttl=60)
+
+        assert cache.get("AAPL") is None
+        cache.set("AAPL", 150.0)
+        assert cache.get("AAPL") == 150.0
+
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 1
+        assert cache.stats.hit_ratio == 0.5
+
+    def test_entries_expire(self):
+        """Test entries are dropped once their TTL passes."""
+        cache = TTLCache(max_size=10, ttl=60)
+
+        with patch("backend.services.cache.time.monotonic", return_value=1000.0):
+            cache.set("AAPL", 150.0)
+        with patch("backend.services.cache.time.monotonic", return_value=1061.0):
+            assert cache.get("AAPL") is None
+
+        assert cache.stats.expirations == 1
+        assert len(cache) == 0
+
+    def test_zero_ttl_is_not_the_default(self):
+        """Test an explicit ttl=0 stores an already expired entry."""
+        cache = TTLCache(max_size=10, ttl=60)
+
+        cache.set("AAPL", 150.0, ttl=0)
+
+        assert cache.get("AAPL") is None
+        assert cache.stats.expirations == 1
+
+    def test_size_cap_evicts_least_recently_used(self):
+        """Test the LRU entry is evicted when the cap is exceeded."""
+        cache = TTLCache(max_size=2, ttl=60)
+        cache.set("AAPL", 1)
+        cache.set("MSFT", 2)
+        cache.get("AAPL")  # MSFT is now least recently used
+        cache.set("GOOGL", 3)
+
+        assert cache.get("MSFT") is None
+        assert cache.get("AAPL") == 1
+        assert cache.get("GOOGL") == 3
+        assert cache.stats.evictions == 1
+
+    def test_clear_older_than(self):
+        """Test clearing only entries stored before a cutoff."""
+        cache = TTLCache(max_size=10, ttl=3600)
+        with patch("backend.services.cache.time.monotonic", return_value=1000.0):
+            cache.set("OLD", 1)
+        with patch("backend.services.cache.time.monotonic", return_value=1500.0):
+            cache.set("NEW", 2)
+            assert cache.clear(older_than=300) == 1
+            assert cache.get("NEW") == 2
+            assert cache.get("OLD") is None
+
+    def test_stats_to_dict(self):
+        """Test stats serialization."""
+        stats = CacheStats(hits=3, misses=1).to_dict()
+
+        assert stats["hits"] == 3
+        assert stats["hit_ratio"] == 0.75
+
+
+class TestTwoTierCache:
+    """Test suite for the Redis-backed two-tier cache."""
+
+    def make_cache(self, client, local_ttl=None):
+        """Build a cache whose L2 is the given client."""
+        cache = TwoTierCache(
+            namespace="test",
+            ttl=60,
+            max_size=10,
+            encode=str,
+            decode=float,
+            local_ttl=local_ttl,
+        )
+        cache.redis_enabled = True
+        cache._redis = client
+        return cache
+
+    def test_values_shared_between_workers(self, fake_redis):
+        """Test a value set by one worker is served to another from Redis."""
+        api_worker = self.make_cache(fake_redis)
+        celery_worker = self.make_cache(fake_redis)
+
+        api_worker.set("AAPL", 150.0)
+
+        assert celery_worker.get("AAPL") == 150.0
+        assert celery_worker.stats.l2_hits == 1
+        assert celery_worker.stats.hits == 1
+        assert celery_worker.stats.misses == 0
+        # Promoted into L1, so the next lookup does not touch Redis
+        fake_redis.store.clear()
+        assert celery_worker.get("AAPL") == 150.0
+
+    def test_delete_and_clear_remove_namespace(self, fake_redis):
+        """Test invalidation reaches Redis."""
+        cache = self.make_cache(fake_redis)
+        cache.set("AAPL", 1.0)
+        cache.set("MSFT", 2.0)
+        fake_redis.store["fdmcp:other:AAPL"] = "3.0"
+
+        cache.delete("AAPL")
+        assert "fdmcp:test:AAPL" not in fake_redis.store
+
+        cache.clear()
+        assert fake_redis.store == {"fdmcp:other:AAPL": "3.0"}
+
+    def test_local_ttl_bounds_stale_l1_copies(self, fake_redis):
+        """Test a delete by one worker reaches others once their L1 copy expires."""
+        api_worker = self.make_cache(fake_redis, local_ttl=5)
+        celery_worker = self.make_cache(fake_redis, local_ttl=5)
+        with patch("backend.services.cache.time.monotonic", return_value=1000.0):
+            api_worker.set("AAPL", 150.0)
+            assert celery_worker.get("AAPL") == 150.0
+
+            api_worker.delete("AAPL")
+            assert celery_worker.get("AAPL") == 150.0  # Still in its L1
+
+        with patch("backend.services.cache.time.monotonic", return_value=1006.0):
+            assert celery_worker.get("AAPL") is None
+
+    def test_counters_shared_between_workers(self, fake_redis):
+        """Test increments by every worker add up in Redis."""
+        api_worker = self.make_cache(fake_redis)
+        celery_worker = self.make_cache(fake_redis)
+
+        assert api_worker.incr("version") == 1
+        assert celery_worker.incr("version") == 2
+        assert fake_redis.store["fdmcp:test:version"] == "2"
+
+    def test_concurrent_lookups_keep_every_count(self, fake_redis):
+        """Test counters updated by many threads add up to the lookups made."""
+        cache = self.make_cache(fake_redis)
+        cache.local.max_size = 1
+        for i in range(10):
+            fake_redis.store[f"fdmcp:test:{i}"] = str(float(i))
+
+        def lookups():
+            for i in range(1000):
+                cache.get(str(i % 10))
+
+        threads = [threading.Thread(target=lookups) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert cache.stats.hits == 8000
+        assert cache.stats.misses == 0
+        assert cache.stats.l2_hits <= 8000
+
+    def test_redis_errors_fall_back_to_l1(self):
+        """Test Redis failures are counted and never raised."""
+        cache = self.make_cache(BrokenRedis())
+
+        cache.set("AAPL", 150.0)
+        assert cache.get("AAPL") == 150.0
+        assert cache.get("MSFT") is None
+        assert cache.stats.l2_errors == 1  # Cooldown skips Redis afterwards
+
+    def test_encode_errors_keep_redis_enabled(self, fake_redis):
+        """Test an unencodable value skips Redis without a cooldown."""
+        cache = self.make_cache(fake_redis)
+        cache.encode = lambda value: f"{float(value)}"
+
+        cache.set("BAD", "not a number")
+        cache.set("AAPL", 150.0)
+
+        assert cache.get("BAD") == "not a number"  # Still cached in L1
+        assert "fdmcp:test:BAD" not in fake_redis.store
+        assert fake_redis.store["fdmcp:test:AAPL"] == "150.0"
+        assert cache.stats.l2_errors == 0
+
+    def test_l1_only_without_codec(self):
+        """Test caches without encode/decode never use Redis."""
+        cache = TwoTierCache(namespace="test", ttl=60, max_size=10)
+
+        cache.set("AAPL", object())
+        assert cache.redis_enabled is False
+        assert cache.get_stats()["size"] == 1
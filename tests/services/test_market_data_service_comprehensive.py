@@ -1,13 +1,18 @@
 """Comprehensive tests for MarketDataService and providers."""
 
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
 from decimal import Decimal
+import threading
 import time
 from unittest.mock import Mock, patch
 
+import pandas as pd
 import pytest
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 
-from backend.models.asset import Asset
+from backend.models.asset import Asset, AssetCategory, AssetType
 from backend.models.price_history import PriceHistory
 from backend.services.market_data import (
     AlphaVantageProvider,
@@ -15,6 +20,7 @@ from backend.services.market_data import (
     MarketDataProvider,
     MarketDataResult,
     MultiProviderMarketDataService,
+    TokenBucket,
     YFinanceProvider,
     market_data_service,
 )
@@ -62,6 +68,39 @@ class TestMarketDataResult:
         assert result.success is True
 
 
+class TestTokenBucket:
+    """Test suite for the per-provider token bucket."""
+
+    def test_unlimited_bucket_never_waits(self):
+        """Test that a bucket without a rate never blocks."""
+        bucket = TokenBucket(None)
+
+        assert bucket.reserve() == 0.0
+        assert bucket.reserve() == 0.0
+        assert bucket.estimated_wait() == 0.0
+
+    def test_burst_capacity_then_pacing(self):
+        """Test that tokens up to capacity are free and later ones are spaced."""
+        bucket = TokenBucket(rate=2.0, capacity=2)
+
+        assert bucket.reserve() == 0.0
+        assert bucket.reserve() == 0.0
+        first_wait = bucket.reserve()
+        second_wait = bucket.reserve()
+
+        assert first_wait == pytest.approx(0.5, abs=0.05)
+        assert second_wait == pytest.approx(1.0, abs=0.05)
+
+    def test_estimated_wait_does_not_reserve(self):
+        """Test that estimated_wait leaves the bucket untouched."""
+        bucket = TokenBucket(rate=1.0)
+
+        assert bucket.estimated_wait() == 0.0
+        assert bucket.estimated_wait() == 0.0
+        assert bucket.reserve() == 0.0
+        assert bucket.estimated_wait() > 0
+
+
 class TestMarketDataProvider:
     """Test suite for base MarketDataProvider class."""
 
@@ -106,26 +145,22 @@ class TestYFinanceProvider:
         """Test YFinanceProvider initialization."""
         assert yfinance_provider.name == "yfinance"
         assert yfinance_provider.rate_limit_delay == 1.0
-        assert yfinance_provider.last_call_time == 0
+        assert yfinance_provider.rate_limiter.rate == 1.0
+        assert yfinance_provider.rate_limiter.tokens == 1.0
 
     def test_respect_rate_limit_no_delay_needed(self, yfinance_provider):
         """Test rate limiting when no delay is needed."""
-        yfinance_provider.last_call_time = time.time() - 2.0  # 2 seconds ago
-
         with patch("time.sleep") as mock_sleep:
             yfinance_provider._respect_rate_limit()
             mock_sleep.assert_not_called()
 
     def test_respect_rate_limit_delay_needed(self, yfinance_provider):
         """Test rate limiting when delay is needed."""
-        yfinance_provider.last_call_time = time.time() - 0.5  # 0.5 seconds ago
-
-        with (
-            patch("time.sleep") as mock_sleep,
-            patch("time.time", return_value=time.time()),
-        ):
+        with patch("time.sleep") as mock_sleep:
+            yfinance_provider._respect_rate_limit()
             yfinance_provider._respect_rate_limit()
             mock_sleep.assert_called_once()
+            assert 0 < mock_sleep.call_args[0][0] <= 1.0
 
     @patch("backend.services.market_data.yf.Ticker")
     @patch("backend.services.ticker_utils.TickerUtils.format_for_yfinance")
@@ -275,6 +310,70 @@ class TestYFinanceProvider:
             assert "Network error" in result.error
             assert result.data_source == "yfinance"
 
+    @staticmethod
+    def _download_frame(prices: dict[str, list[float]]) -> pd.DataFrame:
+        """Build a frame shaped like ``yf.download(..., group_by="ticker")``."""
+        index = pd.date_range("2024-01-02", periods=2, freq="D")
+        columns = pd.MultiIndex.from_product(
+            [list(prices), ["Open", "High", "Low", "Close", "Volume"]]
+        )
+        frame = pd.DataFrame(index=index, columns=columns, dtype=float)
+        for symbol, closes in prices.items():
+            frame[(symbol, "Open")] = closes
+            frame[(symbol, "High")] = [c + 1 for c in closes]
+            frame[(symbol, "Low")] = [c - 1 for c in closes]
+            frame[(symbol, "Close")] = closes
+            frame[(symbol, "Volume")] = [1000, 2000]
+        return frame
+
+    @patch("backend.services.market_data.yf.download")
+    def test_fetch_bulk_quotes_splits_frame(self, mock_download, yfinance_provider):
+        """Test that one multi-symbol download is split into per-ticker results."""
+        mock_download.return_value = self._download_frame(
+            {"AAPL": [100.0, 110.0], "MSFT": [200.0, 190.0]}
+        )
+
+        with patch.object(yfinance_provider, "_respect_rate_limit"):
+            results = yfinance_provider.fetch_bulk_quotes(["AAPL", "MSFT", "NOPE"])
+
+        mock_download.assert_called_once()
+        assert set(results) == {"AAPL", "MSFT"}
+        assert results["AAPL"].current_price == 110.0
+        assert results["AAPL"].previous_close == 100.0
+        assert results["AAPL"].day_change_percent == pytest.approx(10.0)
+        assert results["MSFT"].day_change == pytest.approx(-10.0)
+        assert results["MSFT"].volume == 2000
+        assert all(r.data_source == "yfinance" for r in results.values())
+
+    @patch("backend.services.market_data.yf.download")
+    def test_download_history_chunks_requests(self, mock_download, yfinance_provider):
+        """Test that large batches are split into chunk-sized downloads."""
+        mock_download.side_effect = lambda symbols, **_kwargs: self._download_frame(
+            {symbol: [1.0, 2.0] for symbol in symbols}
+        )
+        tickers = [f"T{i}" for i in range(5)]
+
+        with (
+            patch("backend.services.market_data.settings") as mock_settings,
+            patch.object(yfinance_provider, "_respect_rate_limit") as mock_limit,
+        ):
+            mock_settings.yfinance_bulk_chunk_size = 2
+            frames = yfinance_provider.download_history(tickers)
+
+        assert mock_download.call_count == 3
+        assert mock_limit.call_count == 3
+        assert set(frames) == set(tickers)
+
+    @patch("backend.services.market_data.yf.download")
+    def test_download_history_failed_chunk_is_skipped(
+        self, mock_download, yfinance_provider
+    ):
+        """Test that a failing download leaves tickers for the per-ticker path."""
+        mock_download.side_effect = Exception("Network error")
+
+        with patch.object(yfinance_provider, "_respect_rate_limit"):
+            assert yfinance_provider.fetch_bulk_quotes(["AAPL", "MSFT"]) == {}
+
 
 class TestAlphaVantageProvider:
     """Test suite for AlphaVantageProvider."""
@@ -467,7 +566,12 @@ class TestMultiProviderMarketDataService:
         with patch("backend.services.market_data.settings") as mock_settings:
             mock_settings.alpha_vantage_api_key = None
             mock_settings.finnhub_api_key = None
-            return MultiProviderMarketDataService()
+            mock_settings.market_data_cache_ttl = 300
+            mock_settings.quote_cache_max_size = 100
+            service = MultiProviderMarketDataService()
+        # Keep batch tests offline; bulk behaviour is tested explicitly
+        service.providers[0].fetch_bulk_quotes = Mock(return_value={})
+        return service
 
     def test_service_initialization_no_api_keys(self, market_service):
         """Test service initialization with no API keys."""
@@ -616,7 +720,10 @@ class TestMultiProviderMarketDataService:
             ),
         ]
 
-        market_service.fetch_quote = Mock(side_effect=mock_results)
+        results_by_ticker = {result.ticker: result for result in mock_results}
+        market_service.providers[0].fetch_quote = Mock(
+            side_effect=lambda ticker: results_by_ticker[ticker]
+        )
 
         results = market_service.fetch_multiple_quotes(["AAPL", "GOOGL"])
 
@@ -625,7 +732,257 @@ class TestMultiProviderMarketDataService:
         assert results[0].ticker == "AAPL"
         assert results[1].ticker == "GOOGL"
 
-    def test_update_asset_prices_success(self, market_service, mock_db):
+        stats = market_service.last_batch_stats
+        assert stats.total == 2
+        assert stats.succeeded == 2
+        assert stats.provider_counts["yfinance"] == {"success": 2, "total": 2}
+
+    def test_fetch_multiple_quotes_runs_concurrently(self, market_service):
+        """Test that slow provider calls overlap instead of running serially."""
+        market_service.providers[0].rate_limiter = TokenBucket(None)
+
+        def slow_fetch(ticker):
+            time.sleep(0.2)
+            return MarketDataResult(
+                ticker=ticker, current_price=1.0, success=True, data_source="yfinance"
+            )
+
+        market_service.providers[0].fetch_quote = Mock(side_effect=slow_fetch)
+        tickers = [f"T{i}" for i in range(8)]
+
+        started = time.monotonic()
+        results = market_service.fetch_multiple_quotes(tickers)
+        elapsed = time.monotonic() - started
+
+        assert [result.ticker for result in results] == tickers
+        assert elapsed < 0.2 * len(tickers) / 2
+        assert market_service.last_batch_stats.tickers_per_second > 0
+
+    def test_fetch_multiple_quotes_spreads_across_providers(self, market_service):
+        """Test that tickers start on whichever provider has tokens available."""
+        second = MarketDataProvider("second", rate_limit_delay=60.0)
+        second.fetch_quote = Mock(
+            side_effect=lambda ticker: MarketDataResult(
+                ticker=ticker, current_price=1.0, success=True, data_source="second"
+            )
+        )
+        first = market_service.providers[0]
+        first.rate_limiter = TokenBucket(rate=1 / 60.0)
+        first.fetch_quote = Mock(
+            side_effect=lambda ticker: MarketDataResult(
+                ticker=ticker, current_price=1.0, success=True, data_source="yfinance"
+            )
+        )
+        # Drain the first provider so the second one is the sooner choice
+        first.rate_limiter.reserve()
+        market_service.providers.append(second)
+
+        with patch("backend.services.market_data.settings") as mock_settings:
+            mock_settings.market_data_max_workers = 1
+            results = market_service.fetch_multiple_quotes(["AAPL"])
+
+        assert results[0].data_source == "second"
+        first.fetch_quote.assert_not_called()
+
+    def test_fetch_multiple_quotes_uses_bulk_first(self, market_service):
+        """Test that bulk results are used and only misses go per-ticker."""
+        provider = market_service.providers[0]
+        provider.fetch_bulk_quotes = Mock(
+            return_value={
+                "AAPL": MarketDataResult(
+                    ticker="AAPL",
+                    current_price=150.0,
+                    success=True,
+                    data_source="yfinance",
+                )
+            }
+        )
+        provider.fetch_quote = Mock(
+            side_effect=lambda ticker: MarketDataResult(
+                ticker=ticker, current_price=1.0, success=True, data_source="yfinance"
+            )
+        )
+
+        results = market_service.fetch_multiple_quotes(["AAPL", "GOOGL"])
+
+        provider.fetch_bulk_quotes.assert_called_once_with(["AAPL", "GOOGL"])
+        provider.fetch_quote.assert_called_once_with("GOOGL")
+        assert [r.current_price for r in results] == [150.0, 1.0]
+        assert market_service.last_batch_stats.bulk_fetched == 1
+
+    def test_fetch_multiple_quotes_bulk_disabled(self, market_service):
+        """Test that bulk mode can be switched off."""
+        provider = market_service.providers[0]
+        provider.fetch_quote = Mock(
+            side_effect=lambda ticker: MarketDataResult(
+                ticker=ticker, current_price=1.0, success=True, data_source="yfinance"
+            )
+        )
+
+        with patch("backend.services.market_data.settings") as mock_settings:
+            mock_settings.market_data_bulk_enabled = False
+            mock_settings.market_data_max_workers = 2
+            market_service.fetch_multiple_quotes(["AAPL", "GOOGL"])
+
+        provider.fetch_bulk_quotes.assert_not_called()
+        assert provider.fetch_quote.call_count == 2
+
+    def test_fetch_quote_served_from_cache(self, market_service):
+        """Test repeated quotes are served from the cache within the TTL."""
+        provider = market_service.providers[0]
+        provider.fetch_quote = Mock(
+            return_value=MarketDataResult(
+                ticker="AAPL", current_price=150.0, success=True, data_source="yfinance"
+            )
+        )
+
+        first = market_service.fetch_quote("AAPL")
+        second = market_service.fetch_quote("AAPL")
+
+        assert provider.fetch_quote.call_count == 1
+        assert second.current_price == 150.0
+        assert second is not first
+        assert market_service.get_cache_stats()["hits"] == 1
+
+        market_service.fetch_quote("AAPL", use_cache=False)
+        assert provider.fetch_quote.call_count == 2
+
+    def test_concurrent_fetch_quote_coalesced(self, market_service):
+        """Test concurrent requests for one ticker share an upstream fetch."""
+        release = threading.Event()
+
+        def slow_quote(ticker):
+            release.wait(1)
+            return MarketDataResult(
+                ticker=ticker, current_price=150.0, success=True, data_source="yfinance"
+            )
+
+        provider = market_service.providers[0]
+        provider.fetch_quote = Mock(side_effect=slow_quote)
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [
+                executor.submit(market_service.fetch_quote, "AAPL", None, False)
+                for _ in range(3)
+            ]
+            while market_service.in_flight.stats.calls < 3:
+                time.sleep(0.001)
+            release.set()
+            results = [future.result() for future in futures]
+
+        assert provider.fetch_quote.call_count == 1
+        assert all(result.current_price == 150.0 for result in results)
+        assert len({id(result) for result in results}) == 3
+        assert market_service.get_cache_stats()["single_flight"]["collapsed"] == 2
+
+    def test_failed_quotes_not_cached(self, market_service):
+        """Test failures are retried upstream on the next request."""
+        provider = market_service.providers[0]
+        provider.fetch_quote = Mock(
+            return_value=MarketDataResult(ticker="AAPL", success=False, error="down")
+        )
+
+        market_service.fetch_quote("AAPL")
+        market_service.fetch_quote("AAPL")
+
+        assert provider.fetch_quote.call_count == 2
+
+    def test_fetch_multiple_quotes_uses_cache(self, market_service):
+        """Test cached tickers skip both the bulk and per-ticker phases."""
+        provider = market_service.providers[0]
+        provider.fetch_quote = Mock(
+            side_effect=lambda ticker: MarketDataResult(
+                ticker=ticker, current_price=10.0, success=True, data_source="yfinance"
+            )
+        )
+        market_service.fetch_quote("AAPL")
+        provider.fetch_quote.reset_mock()
+
+        results = market_service.fetch_multiple_quotes(["AAPL", "MSFT"])
+
+        assert [r.ticker for r in results] == ["AAPL", "MSFT"]
+        provider.fetch_quote.assert_called_once_with("MSFT")
+        provider.fetch_bulk_quotes.assert_not_called()
+        assert market_service.last_batch_stats.cache_hits == 1
+
+    def test_fetch_multiple_quotes_uppercases_tickers(self, market_service):
+        """Test plain tickers are fetched and cached in upper case."""
+        provider = market_service.providers[0]
+        provider.fetch_quote = Mock(
+            side_effect=lambda ticker: MarketDataResult(
+                ticker=ticker, current_price=10.0, success=True, data_source="yfinance"
+            )
+        )
+        market_service.fetch_quote("AAPL")
+        provider.fetch_quote.reset_mock()
+
+        results = market_service.fetch_multiple_quotes(["aapl", " msft "])
+
+        assert [r.ticker for r in results] == ["aapl", " msft "]
+        provider.fetch_quote.assert_called_once_with("MSFT")
+        assert market_service.last_batch_stats.cache_hits == 1
+
+    @patch("backend.services.market_data.isin_service")
+    def test_fetch_multiple_quotes_resolves_isins_in_batch(
+        self, mock_isin_service, market_service, mock_db
+    ):
+        """Test ISINs in a batch are resolved with one mapping lookup."""
+        mock_isin_service.mapping_service.resolve_isins_to_tickers.return_value = {
+            "US0378331005": "AAPL",
+            "DE0007164600": None,
+            "US0378331006": None,
+        }
+        provider = market_service.providers[0]
+        provider.fetch_quote = Mock(
+            side_effect=lambda ticker: MarketDataResult(
+                ticker=ticker, current_price=1.0, success=True, data_source="yfinance"
+            )
+        )
+
+        results = market_service.fetch_multiple_quotes(
+            ["US0378331005", "MSFT", "DE0007164600", "US0378331006"], mock_db
+        )
+
+        mock_isin_service.mapping_service.resolve_isins_to_tickers.assert_called_once_with(
+            mock_db, ["US0378331005", "DE0007164600", "US0378331006"]
+        )
+        mock_isin_service.resolve_identifier.assert_not_called()
+        assert [r.ticker for r in results] == [
+            "US0378331005",
+            "MSFT",
+            "DE0007164600",
+            "US0378331006",
+        ]
+        assert sorted(call.args[0] for call in provider.fetch_quote.call_args_list) == [
+            "AAPL",
+            "DE0007164600",
+            "MSFT",
+            "US0378331006",
+        ]
+
+    def test_fetch_multiple_quotes_empty(self, market_service):
+        """Test fetching an empty ticker list."""
+        assert market_service.fetch_multiple_quotes([]) == []
+        assert market_service.last_batch_stats.total == 0
+
+    @pytest.fixture
+    def db_session(self, db_session):
+        """Shared SQLite session seeded with a couple of assets."""
+        db_session.add_all(
+            [
+                Asset(
+                    ticker=ticker,
+                    name=f"{ticker} Inc.",
+                    asset_type=AssetType.STOCK,
+                    category=AssetCategory.EQUITY,
+                )
+                for ticker in ("AAPL", "MSFT")
+            ]
+        )
+        db_session.commit()
+        return db_session
+
+    def test_update_asset_prices_success(self, market_service, db_session):
         """Test successful asset price updates."""
         # Mock successful quote fetch
         mock_result = MarketDataResult(
@@ -643,42 +1000,41 @@ class TestMultiProviderMarketDataService:
         )
         market_service.fetch_multiple_quotes = Mock(return_value=[mock_result])
 
-        # Mock asset in database
-        mock_asset = Mock(spec=Asset)
-        mock_asset.id = 1
-
-        # Mock query chain for asset lookup and price history lookup
-        mock_db.query.return_value.filter.return_value.first.side_effect = [
-            mock_asset,  # Asset found
-            None,  # No existing price history
-        ]
-
-        result = market_service.update_asset_prices(mock_db, ["AAPL"])
+        result = market_service.update_asset_prices(db_session, ["AAPL"])
 
         assert result["status"] == "completed"
         assert result["updated_count"] == 1
         assert result["failed_count"] == 0
         assert result["total_tickers"] == 1
-        mock_db.commit.assert_called_once()
 
-    def test_update_asset_prices_asset_not_found(self, market_service, mock_db):
+        asset = db_session.query(Asset).filter(Asset.ticker == "AAPL").one()
+        assert asset.current_price == Decimal("150.0")
+        assert asset.previous_close == Decimal("149.0")
+        assert asset.data_source == "yfinance"
+
+        record = db_session.query(PriceHistory).filter_by(asset_id=asset.id).one()
+        assert record.price_date == date.today()
+        assert record.close_price == Decimal("150.0")
+        assert record.open_price == Decimal("148.0")
+        assert record.volume == 1000000
+        assert record.data_source == "yfinance"
+
+    def test_update_asset_prices_asset_not_found(self, market_service, db_session):
         """Test asset price update when asset not found in database."""
         # Mock successful quote fetch
         mock_result = MarketDataResult(
-            ticker="AAPL", current_price=150.0, success=True, data_source="yfinance"
+            ticker="UNKNOWN", current_price=150.0, success=True, data_source="yfinance"
         )
         market_service.fetch_multiple_quotes = Mock(return_value=[mock_result])
 
-        # Mock asset not found
-        mock_db.query.return_value.filter.return_value.first.return_value = None
-
-        result = market_service.update_asset_prices(mock_db, ["AAPL"])
+        result = market_service.update_asset_prices(db_session, ["UNKNOWN"])
 
         assert result["status"] == "completed"
         assert result["updated_count"] == 0
         # When asset is not found, it doesn't increment failed_count, just continues
         assert result["failed_count"] == 0
         assert result["failed_tickers"] == []
+        assert db_session.query(PriceHistory).count() == 0
 
     def test_update_asset_prices_quote_failed(self, market_service, mock_db):
         """Test asset price update when quote fetch fails."""
@@ -694,9 +1050,26 @@ class TestMultiProviderMarketDataService:
         assert result["updated_count"] == 0
         assert result["failed_count"] == 1
         assert "AAPL" in result["failed_tickers"]
+        mock_db.execute.assert_not_called()
 
-    def test_update_asset_prices_existing_price_history(self, market_service, mock_db):
+    def test_update_asset_prices_existing_price_history(
+        self, market_service, db_session
+    ):
         """Test asset price update with existing price history."""
+        asset = db_session.query(Asset).filter(Asset.ticker == "AAPL").one()
+        db_session.add(
+            PriceHistory(
+                asset_id=asset.id,
+                price_date=date.today(),
+                open_price=Decimal("140.0"),
+                high_price=Decimal("145.0"),
+                close_price=Decimal("141.0"),
+                volume=500,
+                data_source="yfinance",
+            )
+        )
+        db_session.commit()
+
         # Mock successful quote fetch
         mock_result = MarketDataResult(
             ticker="AAPL",
@@ -707,28 +1080,68 @@ class TestMultiProviderMarketDataService:
         )
         market_service.fetch_multiple_quotes = Mock(return_value=[mock_result])
 
-        # Mock asset in database
-        mock_asset = Mock(spec=Asset)
-        mock_asset.id = 1
-
-        # Mock existing price history
-        mock_price_record = Mock(spec=PriceHistory)
-
-        # Setup query mocks for asset and price history
-        mock_db.query.return_value.filter.return_value.first.side_effect = [
-            mock_asset,  # Asset query
-            mock_price_record,  # Price history query
-        ]
-
-        result = market_service.update_asset_prices(mock_db, ["AAPL"])
+        result = market_service.update_asset_prices(db_session, ["AAPL"])
 
         assert result["status"] == "completed"
         assert result["updated_count"] == 1
         assert result["failed_count"] == 0
-        # Verify existing price record was updated
-        assert mock_price_record.close_price == Decimal("150.0")
 
-    def test_update_asset_prices_commit_error(self, market_service, mock_db):
+        # Verify existing price record was updated in place
+        db_session.expire_all()
+        record = db_session.query(PriceHistory).filter_by(asset_id=asset.id).one()
+        assert record.close_price == Decimal("150.0")
+        assert record.open_price == Decimal("148.0")
+        # Fields missing from the new quote keep their stored values
+        assert record.high_price == Decimal("145.0")
+        assert record.volume == 500
+
+    def test_update_asset_prices_batch_uses_constant_statements(
+        self, market_service, db_session, test_db
+    ):
+        """Test that the write path does not issue per-ticker queries."""
+        _override_get_db, engine = test_db
+        tickers = [f"BULK{i}" for i in range(50)]
+        db_session.add_all(
+            [
+                Asset(
+                    ticker=ticker,
+                    name=ticker,
+                    asset_type=AssetType.STOCK,
+                    category=AssetCategory.EQUITY,
+                )
+                for ticker in tickers
+            ]
+        )
+        db_session.commit()
+        market_service.fetch_multiple_quotes = Mock(
+            return_value=[
+                MarketDataResult(
+                    ticker=ticker,
+                    current_price=10.0 + i,
+                    success=True,
+                    data_source="yfinance",
+                )
+                for i, ticker in enumerate(tickers)
+            ]
+        )
+
+        statements = []
+
+        def count_statement(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", count_statement)
+        try:
+            result = market_service.update_asset_prices(db_session, tickers)
+        finally:
+            event.remove(engine, "before_cursor_execute", count_statement)
+
+        assert result["updated_count"] == 50
+        # asset lookup, asset executemany, price upsert
+        assert len(statements) <= 3
+        assert db_session.query(PriceHistory).count() == 50
+
+    def test_update_asset_prices_commit_error(self, market_service, db_session):
         """Test asset price update when database commit fails."""
         # Mock successful quote fetch
         mock_result = MarketDataResult(
@@ -736,18 +1149,15 @@ class TestMultiProviderMarketDataService:
         )
         market_service.fetch_multiple_quotes = Mock(return_value=[mock_result])
 
-        # Mock asset in database
-        mock_asset = Mock(spec=Asset)
-        mock_asset.id = 1
-        mock_db.query.return_value.filter.return_value.first.return_value = mock_asset
-
         # Mock commit error
-        mock_db.commit.side_effect = Exception("Database error")
-
-        with pytest.raises(Exception, match="Database error"):
-            market_service.update_asset_prices(mock_db, ["AAPL"])
+        with (
+            patch.object(db_session, "commit", side_effect=Exception("Database error")),
+            patch.object(db_session, "rollback") as mock_rollback,
+            pytest.raises(Exception, match="Database error"),
+        ):
+            market_service.update_asset_prices(db_session, ["AAPL"])
 
-        mock_db.rollback.assert_called_once()
+        mock_rollback.assert_called_once()
 
 
 class TestGlobalMarketDataService:
@@ -0,0 +1,131 @@
+"""Tests for Monte Carlo value at risk simulation."""
+
+import numpy as np
+import pytest
+
+from backend.services.monte_carlo import (
+    SimulationConfig,
+    simulate_many,
+    simulate_returns,
+    simulate_tail_risk,
+    tail_risk,
+)
+
+
+@pytest.fixture
+def log_returns():
+    """Two years of daily log returns for three correlated assets."""
+    rng = np.random.default_rng(3)
+    market = rng.normal(0.0003, 0.01, (500, 1))
+    return market + rng.normal(0, 0.005, (500, 3))
+
+
+class TestTailRisk:
+    """Test VaR and CVaR of a known loss distribution."""
+
+    def test_quantile_and_tail_mean(self):
+        """Test VaR is the loss quantile and CVaR the mean loss beyond it."""
+        returns = -np.arange(1, 101) / 100
+
+        var, cvar = tail_risk(returns, [0.95, 0.99])
+
+        np.testing.assert_allclose(var, [[0.9505, 0.9901]])
+        np.testing.assert_allclose(cvar, [[0.98, 1.0]])
+
+
+class TestSimulation:
+    """Test the simulation methods against closed-form results."""
+
+    def test_historical_one_day_draws_observed_days(self, log_returns):
+        """Test one-day paths only take returns that happened."""
+        weights = np.array([0.5, 0.3, 0.2])
+        observed = np.exp(log_returns) @ weights - 1
+
+        returns = simulate_returns(
+            log_returns, weights, [1], 1000, "historical", np.random.default_rng(1)
+        )
+
+        assert np.isin(returns[0], observed).all()
+
+    def test_historical_horizons_extend_each_other(self, log_returns):
+        """Test a longer horizon compounds the draws of the shorter one."""
+        weights = np.array([1.0, 0.0, 0.0])
+
+        short, long = simulate_returns(
+            log_returns, weights, [1, 250], 5000, "historical", np.random.default_rng(1)
+        )
+
+        assert long.std() > 10 * short.std()
+
+    def test_parametric_matches_normal_var(self):
+        """Test one-asset parametric VaR against the normal quantile."""
+        log_returns = np.random.default_rng(5).normal(0, 0.01, (1000, 1))
+        sigma = log_returns.std(ddof=1)
+
+        result = simulate_tail_risk(
+            log_returns,
+            np.ones(1),
+            SimulationConfig(horizons=(1, 4), paths=200_000, method="parametric"),
+        )
+
+        np.testing.assert_allclose(
+            result.value_at_risk[:, 0], [1.6449 * sigma, 2 * 1.6449 * sigma], rtol=0.03
+        )
+
+    def test_singular_covariance(self):
+        """Test more assets than days still simulates."""
+        log_returns = np.random.default_rng(2).normal(0, 0.01, (30, 100))
+
+        result = simulate_tail_risk(
+            log_returns,
+            np.full(100, 0.01),
+            SimulationConfig(paths=1000, method="parametric"),
+        )
+
+        assert np.all(result.value_at_risk > 0)
+
+
+class TestReproducibility:
+    """Test seeding and process-pool execution."""
+
+    def test_same_seed_same_result(self, log_returns):
+        """Test a seed and stream fix the result."""
+        weights = np.full(3, 1 / 3)
+        config = SimulationConfig(paths=2000, seed=42)
+
+        first = simulate_tail_risk(log_returns, weights, config, stream=7)
+        second = simulate_tail_risk(log_returns, weights, config, stream=7)
+        other = simulate_tail_risk(log_returns, weights, config, stream=8)
+
+        np.testing.assert_array_equal(first.value_at_risk, second.value_at_risk)
+        assert not np.array_equal(first.value_at_risk, other.value_at_risk)
+
+    def test_process_pool_matches_in_process(self, log_returns):
+        """Test results do not depend on the number of workers."""
+        weights = np.full(3, 1 / 3)
+        portfolios = [(log_returns, weights), (log_returns[:, :2], weights[:2] * 1.5)]
+        config = SimulationConfig(paths=1000)
+
+        pooled = simulate_many(portfolios, [1, 2], config, workers=2)
+        local = simulate_many(portfolios, [1, 2], config, workers=1)
+
+        for pooled_risk, local_risk in zip(pooled, local, strict=True):
+            np.testing.assert_array_equal(
+                pooled_risk.conditional_value_at_risk,
+                local_risk.conditional_value_at_risk,
+            )
+
+    @pytest.mark.parametrize(
+        "options",
+        [
+            {"method": "garch"},
+            {"paths": 0},
+            {"horizons": (0,)},
+            {"horizons": (300,)},
+            {"confidence_levels": (95,)},
+        ],
+    )
+    def test_invalid_config(self, options):
+        """Test unusable parameters are rejected."""
+        with pytest.raises(ValueError):
+            SimulationConfig(**options)
@@ -0,0 +1,250 @@
+"""Tests for keyset pagination of list services."""
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import event
+
+from backend.models import Asset, AssetCategory, AssetType, Position, User
+from backend.models.transaction import Transaction, TransactionType
+from backend.schemas.base import PaginatedResponse
+from backend.schemas.position import PositionFilters
+from backend.schemas.transaction import TransactionFilters
+from backend.services.base import BaseService
+from backend.services.pagination import (
+    count_rows,
+    decode_cursor,
+    encode_cursor,
+    split_page,
+)
+from backend.services.position import PositionService
+from backend.services.transaction import TransactionService
+
+START = date(2024, 1, 1)
+
+
+@pytest.fixture
+def db(db_session):
+    """SQLite session with five assets, positions and same-day transactions."""
+    user = User(email="pages@example.com", username="pages", hashed_password="x")
+    assets = [
+        Asset(
+            ticker=f"T{index}",
+            name=f"Ticker {index}",
+            asset_type=AssetType.STOCK,
+            category=AssetCategory.EQUITY,
+            current_price=Decimal("10"),
+        )
+        for index in range(5)
+    ]
+    db_session.add(user)
+    db_session.add_all(assets)
+    db_session.commit()
+    db_session.add_all(
+        [
+            Position(
+                user_id=user.id,
+                asset_id=asset.id,
+                quantity=Decimal("1"),
+                average_cost_per_share=Decimal("10"),
+                total_cost_basis=Decimal("10"),
+            )
+            for asset in assets
+        ]
+    )
+    # Two transactions per day, so pages split rows sharing a date
+    db_session.add_all(
+        [
+            Transaction(
+                user_id=user.id,
+                asset_id=assets[0].id,
+                transaction_type=TransactionType.BUY,
+                transaction_date=START + timedelta(days=index // 2),
+                quantity=Decimal("1"),
+                price_per_share=Decimal("10"),
+                total_amount=Decimal("10"),
+            )
+            for index in range(7)
+        ]
+    )
+    db_session.commit()
+    return db_session
+
+
+def user_id(db):
+    """Id of the seeded user."""
+    return db.query(User.id).scalar()
+
+
+def walk(fetch, key, page_size):
+    """Every page of a listing, following next cursors."""
+    pages, cursor = [], None
+    while True:
+        page, cursor = split_page(fetch(cursor, page_size + 1), page_size, key)
+        pages.append(page)
+        if cursor is None:
+            return pages
+
+
+class TestCursors:
+    """Test cursor encoding and page splitting."""
+
+    def test_round_trip(self):
+        """Test a key survives encoding as an opaque URL-safe string."""
+        cursor = encode_cursor(date(2024, 2, 29), 42)
+
+        assert cursor.isascii() and "=" not in cursor
+        assert decode_cursor(cursor, date, int) == (date(2024, 2, 29), 42)
+
+    @pytest.mark.parametrize("cursor", ["garbage", encode_cursor(1, 2), "W10"])
+    def test_invalid_cursor(self, cursor):
+        """Test malformed cursors and cursors for another key are rejected."""
+        with pytest.raises(ValueError, match="Invalid pagination cursor"):
+            decode_cursor(cursor, date, int)
+
+    def test_split_page(self):
+        """Test the extra row is dropped and the last kept row is the cursor."""
+        assert split_page([1, 2], 2, lambda row: (row,)) == ([1, 2], None)
+        page, cursor = split_page([1, 2, 3], 2, lambda row: (row,))
+        assert page == [1, 2]
+        assert decode_cursor(cursor, int) == (2,)
+
+    def test_response_follows_cursor(self):
+        """Test has_next follows the cursor, not the page number."""
+        response = PaginatedResponse.create(
+            data=[1], total=None, page=1, page_size=1, cursor="abc"
+        )
+
+        assert response.has_previous
+        assert not response.has_next
+        assert response.total_pages is None
+
+
+class TestKeysetPagination:
+    """Test services walk listings by key without OFFSET."""
+
+    def test_transactions_pages_match_offset_listing(self, db):
+        """Test cursor pages split same-day rows without gaps or repeats."""
+        service = TransactionService()
+        uid = user_id(db)
+        filters = TransactionFilters(user_id=uid, min_amount=None, max_amount=None)
+        expected = [t.id for t in service.get_user_transactions(db, uid, filters)]
+
+        pages = walk(
+            lambda cursor, limit: service.get_user_transactions(
+                db, uid, filters, limit=limit, cursor=cursor
+            ),
+            lambda transaction: (transaction.transaction_date, transaction.id),
+            page_size=2,
+        )
+
+        assert [len(page) for page in pages] == [2, 2, 2, 1]
+        assert [t.id for page in pages for t in page] == expected
+
+    def test_deep_page_is_one_keyset_query(self, db, test_db):
+        """Test a later page is a single keyset query."""
+        _override_get_db, engine = test_db
+        service = TransactionService()
+        uid = user_id(db)
+        cursor = encode_cursor(START + timedelta(days=2), 10**6)
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            page = service.get_user_transactions(db, uid, limit=3, cursor=cursor)
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        assert len(statements) == 1
+        assert "(transactions.transaction_date, transactions.id) < (?, ?)" in (
+            statements[0]
+        )
+        assert [t.transaction_date for t in page] == [
+            START + timedelta(days=2),
+            START + timedelta(days=2),
+            START + timedelta(days=1),
+        ]
+
+    def test_positions_pages(self, db):
+        """Test positions are walked in id order."""
+        service = PositionService()
+        uid = user_id(db)
+        filters = PositionFilters(user_id=uid, min_value=None, max_value=None)
+
+        pages = walk(
+            lambda cursor, limit: service.get_user_positions(
+                db, uid, filters, limit=limit, cursor=cursor
+            ),
+            lambda position: (position.id,),
+            page_size=2,
+        )
+
+        ids = [position.id for page in pages for position in page]
+        assert ids == sorted(ids)
+        assert len(ids) == 5
+        assert all(p.weight_in_portfolio == Decimal("20.00") for p in pages[-1])
+
+    def test_base_service_pages(self, db):
+        """Test get_multi and search continue after an id cursor."""
+        service = BaseService(Asset)
+        first, cursor = split_page(
+            service.get_multi(db, limit=3, order_by="id"), 2, lambda a: (a.id,)
+        )
+
+        rest = service.get_multi(db, cursor=cursor)
+        found = service.search(
+            db, search_term="Ticker", search_fields=["name"], cursor=cursor
+        )
+
+        assert [a.ticker for a in first + rest] == [f"T{i}" for i in range(5)]
+        assert [a.ticker for a in found] == ["T2", "T3", "T4"]
+
+    def test_search_page_with_total_is_one_query(self, db, test_db):
+        """Test search, filters and an exact total share one statement."""
+        _override_get_db, engine = test_db
+        service = BaseService(Asset)
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            rows, total = service.get_page(
+                db,
+                limit=2,
+                filters={"asset_type": "stock", "sector": None},
+                search_term="ticker",
+                search_fields=["ticker", "name"],
+            )
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        assert len(statements) == 1
+        assert total == 5
+        assert [row.ticker for row in rows] == ["T0", "T1"]
+
+    def test_page_totals_without_window(self, db):
+        """Test cursor pages and pages past the end still count every match."""
+        service = BaseService(Asset)
+        cursor = encode_cursor(service.get_page(db, limit=1)[0][0].id)
+
+        rows, total = service.get_page(db, limit=10, cursor=cursor)
+        empty, total_past_end = service.get_page(db, skip=10)
+
+        assert (len(rows), total) == (4, 5)
+        assert (empty, total_past_end) == ([], 5)
+        assert service.get_page(db, search_term="T4", count="none")[1] is None
+
+    def test_counts(self, db):
+        """Test count modes; SQLite has no estimate and counts exactly."""
+        query = db.query(Transaction).filter(Transaction.user_id == user_id(db))
+
+        assert count_rows(db, query) == 7
+        assert count_rows(db, query, "estimated") == 7
+        assert count_rows(db, query, "none") is None
+        assert BaseService(Asset).count(db, estimate=True) == 5
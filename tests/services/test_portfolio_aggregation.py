@@ -0,0 +1,335 @@
+"""Tests for SQL portfolio aggregation against ORM-computed values."""
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.orm import joinedload
+
+from backend.models import (
+    Asset,
+    AssetCategory,
+    AssetType,
+    CashAccount,
+    PortfolioSnapshot,
+    Position,
+    User,
+)
+from backend.services.portfolio import PortfolioService
+from backend.services.portfolio_aggregation import PortfolioAggregator
+
+
+@pytest.fixture
+def db(db_session):
+    """SQLite session with a mixed portfolio.
+
+    Includes an unpriced asset, an asset without a sector, two positions in
+    the same asset and an inactive position.
+    """
+
+    user = User(email="user@example.com", username="user", hashed_password="hashed")
+    assets = [
+        Asset(
+            ticker="AAPL",
+            name="Apple Inc.",
+            asset_type=AssetType.STOCK,
+            category=AssetCategory.EQUITY,
+            sector="Technology",
+            current_price=Decimal("180"),
+        ),
+        Asset(
+            ticker="MSFT",
+            name="Microsoft Corp.",
+            asset_type=AssetType.STOCK,
+            category=AssetCategory.EQUITY,
+            sector="Technology",
+            current_price=Decimal("400"),
+        ),
+        Asset(
+            ticker="AGG",
+            name="iShares Core US Aggregate Bond ETF",
+            asset_type=AssetType.ETF,
+            category=AssetCategory.FIXED_INCOME,
+            sector=None,
+            current_price=Decimal("95"),
+        ),
+        Asset(
+            ticker="NEW",
+            name="Unpriced Listing",
+            asset_type=AssetType.STOCK,
+            category=AssetCategory.EQUITY,
+            sector="Industrials",
+            current_price=None,
+        ),
+    ]
+    db_session.add_all([user, *assets])
+    db_session.commit()
+
+    holdings = [
+        (assets[0], "10", "1500", True),
+        (assets[0], "5", "800", True),
+        (assets[1], "8", "2800", True),
+        (assets[2], "50", "5000", True),
+        (assets[3], "100", "1000", True),
+        (assets[1], "99", "9900", False),
+    ]
+    db_session.add_all(
+        [
+            Position(
+                user_id=user.id,
+                asset_id=asset.id,
+                quantity=Decimal(quantity),
+                average_cost_per_share=Decimal(cost) / Decimal(quantity),
+                total_cost_basis=Decimal(cost),
+                is_active=is_active,
+            )
+            for asset, quantity, cost, is_active in holdings
+        ]
+    )
+    db_session.add(
+        CashAccount(
+            user_id=user.id,
+            currency="USD",
+            account_name="Main USD Account",
+            balance=Decimal("2000"),
+            is_primary=True,
+        )
+    )
+    db_session.commit()
+
+    return db_session
+
+
+@pytest.fixture
+def positions(db):
+    """Active positions loaded through the ORM, as the service used to."""
+    return (
+        db.query(Position)
+        .options(joinedload(Position.asset))
+        .filter(Position.user_id == 1, Position.is_active.is_(True))
+        .all()
+    )
+
+
+def close(a, b):
+    """Compare Decimals computed through SQLite floats and Python Decimals."""
+    return abs(Decimal(a) - Decimal(b)) < Decimal("1e-9")
+
+
+class TestPortfolioAggregator:
+    """Test grouped SQL aggregation."""
+
+    def test_totals_match_orm_positions(self, db, positions):
+        """Test grouped totals equal sums over hydrated positions."""
+        aggregate = PortfolioAggregator().aggregate(db, 1, top_n=3)
+        values = [p.current_value or Decimal("0") for p in positions]
+
+        assert close(aggregate.market_value, sum(values))
+        assert close(aggregate.cost_basis, sum(p.total_cost_basis for p in positions))
+        assert aggregate.position_count == 5
+        assert aggregate.asset_count == 4
+        assert close(aggregate.max_value, max(values))
+        assert close(
+            aggregate.herfindahl_index,
+            sum((v / sum(values)) ** 2 for v in values),
+        )
+        assert [p.ticker for p in aggregate.top_positions] == ["AGG", "MSFT", "AAPL"]
+
+    def test_value_by_keeps_unpriced_groups_on_request(self, db):
+        """Test groups without market value are dropped unless asked for."""
+        aggregate = PortfolioAggregator().aggregate(db, 1)
+
+        assert set(aggregate.value_by("sector")) == {"Technology", None}
+        assert set(aggregate.value_by("sector", include_empty=True)) == {
+            "Technology",
+            "Industrials",
+            None,
+        }
+        assert close(aggregate.value_by("category")[AssetCategory.EQUITY], "5900")
+
+
+class TestPortfolioServiceAggregation:
+    """Test portfolio views built on the aggregator."""
+
+    @pytest.fixture
+    def service(self):
+        """Portfolio service without caching."""
+        service = PortfolioService()
+        service.cache = None
+        return service
+
+    def test_summary(self, service, db, positions, count_queries):
+        """Test the summary matches hydrated positions in few statements."""
+        statements = count_queries(db)
+        summary = service.get_portfolio_summary(db, 1)
+
+        invested = sum(p.current_value or Decimal("0") for p in positions)
+        assert close(summary.invested_amount, invested)
+        assert close(summary.total_value, invested + Decimal("2000"))
+        assert summary.total_positions == 5
+        assert summary.total_assets == 4
+        assert [p.asset.ticker for p in summary.top_positions] == [
+            "AGG",
+            "MSFT",
+            "AAPL",
+            "AAPL",
+            "NEW",
+        ]
+        assert summary.top_positions[-1].current_value == Decimal("0")
+        assert summary.top_positions[-1].unrealized_gain_loss is None
+        # User, grouped totals, top positions, cash balance, yesterday's snapshot
+        assert len(statements) == 5
+
+    def test_allocation(self, service, db):
+        """Test allocation percentages from grouped totals."""
+        allocation = service.get_allocation_breakdown(db, 1)
+
+        # 5900 equity + 4750 fixed income + 2000 cash
+        assert close(allocation.equity_percent, Decimal("5900") / 12650 * 100)
+        assert close(allocation.cash_percent, Decimal("2000") / 12650 * 100)
+        assert set(allocation.allocation_by_sector) == {"Technology"}
+        assert set(allocation.allocation_by_asset_type) == {
+            AssetType.STOCK,
+            AssetType.ETF,
+        }
+
+    def test_diversification(self, service, db, positions, count_queries):
+        """Test diversification metrics in two statements."""
+        statements = count_queries(db)
+        metrics = service.get_diversification_metrics(db, 1)
+
+        assert close(metrics.concentration_risk, Decimal("4750") / 10650 * 100)
+        assert set(metrics.sector_concentration) == {
+            "Technology",
+            "Industrials",
+            "Unknown",
+        }
+        assert metrics.sector_diversification_score > 0
+        assert metrics.asset_type_diversification_score == 50
+        assert len(statements) == 2
+
+    def test_position_weights(self, service, db, positions):
+        """Test weights cover every active position and sum to 100."""
+        weights = service.calculate_position_weights(db, 1)
+
+        assert set(weights) == {p.id for p in positions}
+        assert close(sum(weights.values()), 100)
+
+
+class TestSnapshotCreation:
+    """Test set-based daily snapshots against the per-user factory."""
+
+    @pytest.fixture
+    def snapshot_date(self):
+        """Date of the snapshots under test."""
+        return date(2024, 6, 3)
+
+    def test_matches_factory(self, db, positions, snapshot_date, count_queries):
+        """Test the inserted row equals PortfolioSnapshot.create_from_positions."""
+        statements = count_queries(db)
+        created = PortfolioAggregator().create_snapshots(db, snapshot_date)
+        assert len(statements) == 1
+        db.commit()
+
+        expected = PortfolioSnapshot.create_from_positions(
+            user_id=1,
+            snapshot_date=snapshot_date,
+            positions=positions,
+            cash_balance=Decimal("2000"),
+        )
+        snapshot = db.query(PortfolioSnapshot).one()
+        assert created == 1
+        for column in (
+            "total_value",
+            "total_cost_basis",
+            "cash_balance",
+            "invested_amount",
+            "total_gain_loss",
+            "total_gain_loss_percent",
+            "equity_value",
+            "fixed_income_value",
+            "commodity_value",
+        ):
+            # Snapshot columns keep four decimal places
+            difference = getattr(snapshot, column) - getattr(expected, column)
+            assert abs(difference) < Decimal("0.0001"), column
+        assert snapshot.number_of_positions == 5
+        assert snapshot.number_of_assets == 4
+        assert snapshot.daily_change is None
+
+    def test_skips_existing_and_inactive_users(self, db, snapshot_date):
+        """Test re-runs and inactive or position-less users insert nothing."""
+        db.add_all(
+            [
+                User(email="idle@example.com", username="idle", hashed_password="x"),
+                User(
+                    email="gone@example.com",
+                    username="gone",
+                    hashed_password="x",
+                    is_active=False,
+                ),
+            ]
+        )
+        db.commit()
+        db.add(
+            Position(
+                user_id=3,
+                asset_id=1,
+                quantity=Decimal("1"),
+                average_cost_per_share=Decimal("1"),
+                total_cost_basis=Decimal("1"),
+            )
+        )
+        db.commit()
+        aggregator = PortfolioAggregator()
+
+        assert aggregator.create_snapshots(db, snapshot_date) == 1
+        db.commit()
+        assert aggregator.create_snapshots(db, snapshot_date) == 0
+        # A specific user is snapshotted even when inactive
+        assert aggregator.create_snapshots(db, snapshot_date, user_id=3) == 1
+        db.commit()
+
+        assert {s.user_id for s in db.query(PortfolioSnapshot)} == {1, 3}
+
+    def test_skips_users_without_priced_positions(self, db, snapshot_date):
+        """Test users whose positions all lack a price get no snapshot."""
+        db.add(User(email="new@example.com", username="new", hashed_password="x"))
+        db.commit()
+        db.add(
+            Position(
+                user_id=2,
+                asset_id=4,
+                quantity=Decimal("10"),
+                average_cost_per_share=Decimal("10"),
+                total_cost_basis=Decimal("100"),
+            )
+        )
+        db.commit()
+
+        assert PortfolioAggregator().create_snapshots(db, snapshot_date) == 1
+        db.commit()
+
+        assert {s.user_id for s in db.query(PortfolioSnapshot)} == {1}
+
+    def test_daily_change_from_previous_snapshot(self, db, snapshot_date):
+        """Test the change is measured against the latest earlier snapshot."""
+        aggregator = PortfolioAggregator()
+        aggregator.create_snapshots(db, snapshot_date - timedelta(days=3))
+        db.commit()
+        db.query(PortfolioSnapshot).update(
+            {PortfolioSnapshot.total_value: Decimal("10000")}
+        )
+        db.commit()
+
+        aggregator.create_snapshots(db, snapshot_date)
+        db.commit()
+
+        snapshot = (
+            db.query(PortfolioSnapshot)
+            .filter(PortfolioSnapshot.snapshot_date == snapshot_date)
+            .one()
+        )
+        # 10650 invested + 2000 cash
+        assert close(snapshot.daily_change, "2650")
+        assert close(snapshot.daily_change_percent, "26.5")
@@ -0,0 +1,266 @@
+"""Tests for the per-user portfolio view cache and its invalidation."""
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import update
+
+from backend.models import (
+    Asset,
+    AssetCategory,
+    AssetType,
+    CashAccount,
+    Position,
+    Transaction,
+    User,
+)
+from backend.services.portfolio import PortfolioService
+from backend.services.portfolio_cache import PortfolioCache
+
+
+@pytest.fixture
+def db(db_session):
+    """SQLite session with two users holding positions in two assets."""
+
+    users = [
+        User(
+            email=f"user{i}@example.com",
+            username=f"user{i}",
+            hashed_password="hashed",
+        )
+        for i in (1, 2)
+    ]
+    assets = [
+        Asset(
+            ticker="AAPL",
+            name="Apple Inc.",
+            asset_type=AssetType.STOCK,
+            category=AssetCategory.EQUITY,
+            sector="Technology",
+            current_price=Decimal("180"),
+        ),
+        Asset(
+            ticker="AGG",
+            name="iShares Core US Aggregate Bond ETF",
+            asset_type=AssetType.ETF,
+            category=AssetCategory.FIXED_INCOME,
+            sector="Bonds",
+            current_price=Decimal("95"),
+        ),
+    ]
+    db_session.add_all(users + assets)
+    db_session.commit()
+
+    for user in users:
+        db_session.add_all(
+            [
+                Position(
+                    user_id=user.id,
+                    asset_id=asset.id,
+                    quantity=Decimal("10"),
+                    average_cost_per_share=Decimal("100"),
+                    total_cost_basis=Decimal("1000"),
+                    is_active=True,
+                )
+                for asset in assets
+            ]
+        )
+        db_session.add(
+            CashAccount(
+                user_id=user.id,
+                currency="USD",
+                account_name="Main USD Account",
+                balance=Decimal("1000"),
+                is_primary=True,
+            )
+        )
+    db_session.commit()
+
+    return db_session
+
+
+@pytest.fixture
+def service():
+    """Portfolio service with its own cache instance."""
+    return PortfolioService(cache=PortfolioCache(ttl=600, max_size=100))
+
+
+def shared_cache(client):
+    """Cache of one worker whose Redis tier is ``client``."""
+    cache = PortfolioCache(ttl=600, max_size=100)
+    for tier in (*cache.caches.values(), cache.versions):
+        tier.redis_enabled = True
+        tier._redis = client
+    return cache
+
+
+class TestPortfolioCache:
+    """Test cached portfolio views and event-driven invalidation."""
+
+    def test_views_are_served_from_cache(self, service, db, count_queries):
+        """Test repeated dashboard loads run no queries."""
+        summary = service.get_portfolio_summary(db, 1)
+        allocation = service.get_allocation_breakdown(db, 1)
+        diversification = service.get_diversification_metrics(db, 1)
+
+        statements = count_queries(db)
+        assert service.get_portfolio_summary(db, 1) == summary
+        assert service.get_allocation_breakdown(db, 1) == allocation
+        assert service.get_diversification_metrics(db, 1) == diversification
+        assert statements == []
+        assert summary.total_value == Decimal("3750")
+
+    def test_position_edit_invalidates_only_its_owner(self, service, db, count_queries):
+        """Test committing a position change recomputes that user's views."""
+        service.get_portfolio_summary(db, 1)
+        service.get_portfolio_summary(db, 2)
+
+        position = db.query(Position).filter(Position.user_id == 1).first()
+        position.quantity = Decimal("20")
+        db.commit()
+
+        assert service.get_portfolio_summary(db, 1).total_value == Decimal("5550")
+        statements = count_queries(db)
+        assert service.get_portfolio_summary(db, 2).total_value == Decimal("3750")
+        assert statements == []
+
+    def test_transactions_and_cash_changes_invalidate(self, service, db):
+        """Test buy transactions and cash balance changes drop cached views."""
+        service.get_portfolio_summary(db, 1)
+        invalidations = service.cache.get_stats()["invalidations"]
+
+        db.add(
+            Transaction.create_buy(
+                user_id=1,
+                asset_id=1,
+                quantity=Decimal("1"),
+                price_per_share=Decimal("180"),
+                transaction_date=date.today(),
+            )
+        )
+        db.commit()
+        assert service.cache.get_stats()["invalidations"] == invalidations + 1
+        assert service.cache.caches["summary"].get(service.cache._key(1)) is None
+
+        cash = db.query(CashAccount).filter(CashAccount.user_id == 1).one()
+        cash.balance = Decimal("500")
+        db.commit()
+        assert service.get_portfolio_summary(db, 1).cash_balance == Decimal("500")
+
+    def test_price_refresh_invalidates_every_user(self, service, db):
+        """Test asset price writes, including bulk updates, clear all users."""
+        service.get_portfolio_summary(db, 1)
+        service.get_portfolio_summary(db, 2)
+
+        db.execute(update(Asset), [{"id": 1, "current_price": Decimal("200")}])
+        db.commit()
+
+        assert service.get_portfolio_summary(db, 1).total_value == Decimal("3950")
+        assert service.get_portfolio_summary(db, 2).total_value == Decimal("3950")
+
+    def test_read_only_commits_keep_cached_views(self, service, db):
+        """Test commits that write nothing leave the cache untouched."""
+        service.get_portfolio_summary(db, 1)
+        invalidations = service.cache.get_stats()["invalidations"]
+
+        db.query(Position).all()
+        db.commit()
+
+        assert service.cache.get_stats()["invalidations"] == invalidations
+        assert service.cache.caches["summary"].get(service.cache._key(1)) is not None
+
+    def test_result_computed_during_invalidation_is_not_stored(self, service, db):
+        """Test a view that raced with a write is returned but not cached."""
+        cache = service.cache
+        key = cache._key(1)
+
+        def compute():
+            summary = service._build_portfolio_summary(db, 1)
+            cache.invalidate_user(1)
+            return summary
+
+        cache.get_or_compute("summary", 1, compute)
+        assert cache.caches["summary"].get(key) is None
+
+    def test_result_raced_by_another_worker_is_not_served(self, db, fake_redis):
+        """Test a view computed before another worker's invalidation stays unread."""
+        api_worker = shared_cache(fake_redis)
+        celery_worker = shared_cache(fake_redis)
+        service = PortfolioService(cache=api_worker)
+
+        def compute():
+            summary = service._build_portfolio_summary(db, 1)
+            # A Celery task commits a change to the user in the meantime
+            celery_worker.invalidate_user(1)
+            return summary
+
+        stale = api_worker.get_or_compute("summary", 1, compute)
+        recomputed = []
+
+        celery_worker.get_or_compute(
+            "summary", 1, lambda: recomputed.append(1) or stale
+        )
+
+        assert recomputed == [1]
+
+    def test_views_round_trip_through_redis_codec(self, service, db):
+        """Test cached views survive the JSON encoding used for Redis."""
+        for view, value in (
+            ("summary", service.get_portfolio_summary(db, 1)),
+            ("allocation", service.get_allocation_breakdown(db, 1)),
+            ("diversification", service.get_diversification_metrics(db, 1)),
+        ):
+            cache = service.cache.caches[view]
+            assert cache.decode(cache.encode(value)) == value
+
+    def test_callers_cannot_modify_cached_views(self, service, db):
+        """Test changing a returned view leaves the cached copy intact."""
+        service.get_portfolio_summary(db, 1).total_value = Decimal("0")
+        cached = service.get_portfolio_summary(db, 1)
+        cached.top_positions.clear()
+
+        summary = service.get_portfolio_summary(db, 1)
+        assert summary.total_value == Decimal("3750")
+        assert summary.top_positions
+
+    def test_rolled_back_writes_do_not_invalidate(self, service, db):
+        """Test a rollback forgets the writes it undid before the next commit."""
+        service.get_portfolio_summary(db, 1)
+        invalidations = service.cache.get_stats()["invalidations"]
+
+        position = db.query(Position).filter(Position.user_id == 1).first()
+        position.quantity = Decimal("20")
+        db.flush()
+        db.rollback()
+        db.commit()
+
+        assert service.cache.get_stats()["invalidations"] == invalidations
+
+    def test_savepoint_rollback_keeps_outer_writes(self, service, db):
+        """Test rolling back a savepoint still invalidates the outer write."""
+        service.get_portfolio_summary(db, 1)
+
+        position = db.query(Position).filter(Position.user_id == 1).first()
+        position.quantity = Decimal("20")
+        db.flush()
+        savepoint = db.begin_nested()
+        savepoint.rollback()
+        db.commit()
+
+        assert service.get_portfolio_summary(db, 1).total_value == Decimal("5550")
+
+    async def test_async_views_use_the_cache(self, service, db):
+        """Test the async path stores views and serves copies of them."""
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            return service._build_portfolio_summary(db, 1)
+
+        first = await service.cache.get_or_compute_async("summary", 1, compute)
+        first.total_value = Decimal("0")
+        second = await service.cache.get_or_compute_async("summary", 1, compute)
+
+        assert calls == [1]
+        assert second.total_value == Decimal("3750")
@@ -23,6 +23,11 @@ from backend.schemas.portfolio import (
     PortfolioSummary,
 )
 from backend.services.portfolio import PortfolioService
+from backend.services.portfolio_aggregation import (
+    AllocationGroup,
+    PortfolioAggregate,
+    PositionValue,
+)
 
 
 class TestPortfolioService:
@@ -77,6 +82,41 @@ class TestPortfolioService:
         """Create mock database session."""
         return Mock(spec=Session)
 
+    @pytest.fixture
+    def mock_aggregate(self, mock_position):
+        """Create aggregate equivalent to the mock position."""
+        asset = mock_position.asset
+        return PortfolioAggregate(
+            groups=[
+                AllocationGroup(
+                    category=asset.category,
+                    sector=asset.sector,
+                    asset_type=asset.asset_type,
+                    market_value=mock_position.current_value,
+                    cost_basis=mock_position.total_cost_basis,
+                    position_count=1,
+                    asset_count=1,
+                    sum_of_squares=mock_position.current_value**2,
+                    max_value=mock_position.current_value,
+                )
+            ],
+            top_positions=[
+                PositionValue(
+                    id=mock_position.id,
+                    asset_id=asset.id,
+                    quantity=mock_position.quantity,
+                    total_cost_basis=mock_position.total_cost_basis,
+                    ticker=asset.ticker,
+                    name=asset.name,
+                    asset_type=asset.asset_type,
+                    category=asset.category,
+                    current_price=asset.current_price,
+                    currency=asset.currency,
+                    asset_is_active=asset.is_active,
+                )
+            ],
+        )
+
     def test_get_portfolio_summary_user_not_found(self, portfolio_service, mock_db):
         """Test portfolio summary when user doesn't exist."""
         mock_db.query.return_value.filter.return_value.first.return_value = None
@@ -96,18 +136,12 @@ class TestPortfolioService:
             Mock(
                 filter=Mock(return_value=Mock(first=Mock(return_value=mock_user)))
             ),  # User query
-            Mock(
-                options=Mock(
-                    return_value=Mock(
-                        filter=Mock(return_value=Mock(all=Mock(return_value=[])))
-                    )
-                )
-            ),  # Positions query
             Mock(
                 filter=Mock(return_value=Mock(first=Mock(return_value=None)))
             ),  # Yesterday snapshot query
         ]
 
+        portfolio_service.aggregator.aggregate = Mock(return_value=PortfolioAggregate())
         # Mock the cash service instance method
         portfolio_service.cash_service.get_cash_balance = Mock(
             return_value=Decimal("1000.00")
@@ -125,14 +159,12 @@ class TestPortfolioService:
         assert len(result.top_positions) == 0
 
     def test_get_portfolio_summary_with_positions(
-        self, portfolio_service, mock_db, mock_user, mock_position
+        self, portfolio_service, mock_db, mock_user, mock_aggregate
     ):
         """Test portfolio summary with positions."""
         # Setup mocks
         mock_db.query.return_value.filter.return_value.first.return_value = mock_user
-        mock_db.query.return_value.options.return_value.filter.return_value.all.return_value = [
-            mock_position
-        ]
+        portfolio_service.aggregator.aggregate = Mock(return_value=mock_aggregate)
         portfolio_service.cash_service.get_cash_balance = Mock(
             return_value=Decimal("500.00")
         )
@@ -172,9 +204,7 @@ class TestPortfolioService:
     ):
         """Test allocation breakdown with empty portfolio."""
         mock_db.query.return_value.filter.return_value.first.return_value = mock_user
-        mock_db.query.return_value.options.return_value.filter.return_value.all.return_value = (
-            []
-        )
+        portfolio_service.aggregator.aggregate = Mock(return_value=PortfolioAggregate())
         portfolio_service.cash_service.get_cash_balance = Mock(
             return_value=Decimal("0.00")
         )
@@ -186,13 +216,11 @@ class TestPortfolioService:
         assert result.cash_percent == Decimal("100")
 
     def test_get_allocation_breakdown_with_positions(
-        self, portfolio_service, mock_db, mock_user, mock_position
+        self, portfolio_service, mock_db, mock_user, mock_aggregate
     ):
         """Test allocation breakdown with positions."""
         mock_db.query.return_value.filter.return_value.first.return_value = mock_user
-        mock_db.query.return_value.options.return_value.filter.return_value.all.return_value = [
-            mock_position
-        ]
+        portfolio_service.aggregator.aggregate = Mock(return_value=mock_aggregate)
         portfolio_service.cash_service.get_cash_balance = Mock(
             return_value=Decimal("500.00")
         )
@@ -251,8 +279,9 @@ class TestPortfolioService:
             snapshot2,
         ]
 
-        # Mock dividend transactions
+        # Mock dividend transactions and benchmark prices
         mock_db.query.return_value.filter.return_value.all.return_value = []
+        mock_db.query.return_value.filter.return_value.scalar.return_value = None
 
         result = portfolio_service.calculate_performance_metrics(mock_db, 1)
 
@@ -327,9 +356,7 @@ class TestPortfolioService:
     ):
         """Test diversification metrics with empty portfolio."""
         mock_db.query.return_value.filter.return_value.first.return_value = mock_user
-        mock_db.query.return_value.options.return_value.filter.return_value.all.return_value = (
-            []
-        )
+        portfolio_service.aggregator.aggregate = Mock(return_value=PortfolioAggregate())
 
         result = portfolio_service.get_diversification_metrics(mock_db, 1)
 
@@ -340,13 +367,11 @@ class TestPortfolioService:
         assert result.overall_diversification_score == 0
 
     def test_get_diversification_metrics_with_positions(
-        self, portfolio_service, mock_db, mock_user, mock_position
+        self, portfolio_service, mock_db, mock_user, mock_aggregate
     ):
         """Test diversification metrics with positions."""
         mock_db.query.return_value.filter.return_value.first.return_value = mock_user
-        mock_db.query.return_value.options.return_value.filter.return_value.all.return_value = [
-            mock_position
-        ]
+        portfolio_service.aggregator.aggregate = Mock(return_value=mock_aggregate)
 
         result = portfolio_service.get_diversification_metrics(mock_db, 1)
 
@@ -372,7 +397,7 @@ class TestPortfolioService:
     ):
         """Test position weights with empty portfolio."""
         mock_db.query.return_value.filter.return_value.first.return_value = mock_user
-        mock_db.query.return_value.filter.return_value.all.return_value = []
+        portfolio_service.aggregator.position_values = Mock(return_value={})
 
         result = portfolio_service.calculate_position_weights(mock_db, 1)
 
@@ -383,9 +408,9 @@ class TestPortfolioService:
     ):
         """Test position weights with positions."""
         mock_db.query.return_value.filter.return_value.first.return_value = mock_user
-        mock_db.query.return_value.filter.return_value.all.return_value = [
-            mock_position
-        ]
+        portfolio_service.aggregator.position_values = Mock(
+            return_value={mock_position.id: mock_position.current_value}
+        )
 
         result = portfolio_service.calculate_position_weights(mock_db, 1)
 
@@ -432,7 +457,7 @@ class TestPortfolioService:
     ):
         """Test benchmark return with market data fallback."""
         # Mock no benchmark asset in database
-        mock_db.query.return_value.filter.return_value.first.return_value = None
+        mock_db.query.return_value.filter.return_value.scalar.return_value = None
 
         # Mock market data service
         mock_result = Mock()
@@ -453,7 +478,7 @@ class TestPortfolioService:
     ):
         """Test benchmark return with historical average fallback."""
         # Mock database queries to return None
-        mock_db.query.return_value.filter.return_value.first.return_value = None
+        mock_db.query.return_value.filter.return_value.scalar.return_value = None
 
         # Mock market data service to fail
         mock_result = Mock()
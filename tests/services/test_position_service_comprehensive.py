@@ -104,10 +104,10 @@ class TestPositionService:
 
         # Mock position query
         query_mock = Mock()
-        mock_db.query.return_value.options.return_value.filter.return_value = query_mock
-        query_mock.offset.return_value.limit.return_value.all.return_value = [
-            mock_position
-        ]
+        joined = mock_db.query.return_value.options.return_value.join.return_value
+        joined.filter.return_value = query_mock
+        page = query_mock.order_by.return_value.offset.return_value.limit.return_value
+        page.all.return_value = [(mock_position, Decimal("2500.00"))]
 
         result = position_service.get_user_positions(mock_db, 1)
 
@@ -116,6 +116,7 @@ class TestPositionService:
         assert result[0].id == mock_position.id
         assert result[0].user_id == mock_position.user_id
         assert result[0].quantity == mock_position.quantity
+        assert result[0].weight_in_portfolio == Decimal("60.00")
 
     def test_get_user_positions_with_filters(
         self, position_service, mock_db, mock_user, mock_position
@@ -135,12 +136,12 @@ class TestPositionService:
 
         # Mock complex query chain with joins and filters
         query_mock = Mock()
-        mock_db.query.return_value.options.return_value.filter.return_value = query_mock
+        joined = mock_db.query.return_value.options.return_value.join.return_value
+        joined.filter.return_value = query_mock
         query_mock.join.return_value = query_mock
         query_mock.filter.return_value = query_mock
-        query_mock.offset.return_value.limit.return_value.all.return_value = [
-            mock_position
-        ]
+        page = query_mock.order_by.return_value.offset.return_value.limit.return_value
+        page.all.return_value = [(mock_position, Decimal("2500.00"))]
 
         result = position_service.get_user_positions(mock_db, 1, filters)
 
@@ -159,8 +160,10 @@ class TestPositionService:
 
         # Mock empty position query
         query_mock = Mock()
-        mock_db.query.return_value.options.return_value.filter.return_value = query_mock
-        query_mock.offset.return_value.limit.return_value.all.return_value = []
+        joined = mock_db.query.return_value.options.return_value.join.return_value
+        joined.filter.return_value = query_mock
+        page = query_mock.order_by.return_value.offset.return_value.limit.return_value
+        page.all.return_value = []
 
         result = position_service.get_user_positions(mock_db, 1)
 
@@ -168,17 +171,19 @@ class TestPositionService:
 
     def test_calculate_position_weight(self, position_service, mock_position):
         """Test calculating position weight in portfolio."""
-        # Create additional mock positions
-        other_position = Mock(spec=Position)
-        other_position.current_value = Decimal("1000.00")
-
-        all_positions = [mock_position, other_position]
-
         weight = position_service._calculate_position_weight(
-            mock_position, all_positions
+            mock_position, Decimal("2500.00")
         )
 
-        assert weight == Decimal("60.00")  # 1500 / (1500 + 1000) * 100
+        assert weight == Decimal("60.00")  # 1500 / 2500 * 100
+
+    def test_calculate_position_weight_float_total(
+        self, position_service, mock_position
+    ):
+        """Test weights from a portfolio total returned as a float."""
+        weight = position_service._calculate_position_weight(mock_position, 3000.0)
+
+        assert weight == Decimal("50.00")
 
     def test_calculate_position_weight_no_current_value(
         self, position_service, mock_position
@@ -186,7 +191,7 @@ class TestPositionService:
         """Test calculating position weight when position has no current value."""
         mock_position.current_value = None
 
-        weight = position_service._calculate_position_weight(mock_position, [])
+        weight = position_service._calculate_position_weight(mock_position, None)
 
         assert weight is None
 
@@ -195,10 +200,9 @@ class TestPositionService:
     ):
         """Test calculating position weight when position has zero current value."""
         mock_position.current_value = Decimal("0")
-        all_positions = [mock_position]
 
         weight = position_service._calculate_position_weight(
-            mock_position, all_positions
+            mock_position, Decimal("0")
         )
 
         # When current_value is 0, the method returns None (not 0)
@@ -213,7 +217,7 @@ class TestPositionService:
 
         with patch("backend.services.position.logger") as mock_logger:
             weight = position_service._calculate_position_weight(
-                mock_position, [mock_position]
+                mock_position, Decimal("1500.00")
             )
 
             assert weight is None
@@ -633,3 +637,80 @@ class TestPositionService:
         assert mock_position.quantity == Decimal("20")  # 10 * 2
         assert mock_position.average_cost_per_share == Decimal("70.00")  # 140 / 2
         assert result == mock_position
+
+
+class TestPositionWeights:
+    """Test portfolio-wide weights on a real database."""
+
+    @pytest.fixture
+    def db(self, test_db):
+        """SQLite session with three priced, one unpriced and one closed position."""
+        override_get_db, _engine = test_db
+        session = next(override_get_db())
+
+        session.add(
+            User(email="user@example.com", username="user", hashed_password="hashed")
+        )
+        prices = {"AAPL": "100", "MSFT": "200", "AGG": "50", "NEW": None}
+        assets = [
+            Asset(
+                ticker=ticker,
+                name=ticker,
+                asset_type=AssetType.STOCK,
+                category=AssetCategory.EQUITY,
+                current_price=Decimal(price) if price else None,
+            )
+            for ticker, price in prices.items()
+        ]
+        session.add_all(assets)
+        session.commit()
+
+        # Active values: 1000 + 2000 + 1000 + unpriced = 4000
+        holdings = [(0, "10", True), (1, "10", True), (2, "20", True), (3, "5", True)]
+        holdings.append((1, "50", False))
+        session.add_all(
+            [
+                Position(
+                    user_id=1,
+                    asset_id=assets[index].id,
+                    quantity=Decimal(quantity),
+                    average_cost_per_share=Decimal("1"),
+                    total_cost_basis=Decimal(quantity),
+                    is_active=is_active,
+                )
+                for index, quantity, is_active in holdings
+            ]
+        )
+        session.commit()
+
+        yield session
+        session.close()
+
+    def test_weights_are_portfolio_wide_on_every_page(self, db):
+        """Test each page is weighted against the whole active portfolio."""
+        service = PositionService()
+        filters = PositionFilters(user_id=1, min_value=None, max_value=None)
+
+        pages = [
+            service.get_user_positions(db, 1, filters, skip=skip, limit=2)
+            for skip in (0, 2)
+        ]
+
+        weights = {
+            p.asset.ticker: p.weight_in_portfolio for page in pages for p in page
+        }
+        assert weights == {
+            "AAPL": Decimal("25.00"),
+            "MSFT": Decimal("50.00"),
+            "AGG": Decimal("25.00"),
+            "NEW": None,
+        }
+
+    def test_weights_ignore_filters(self, db):
+        """Test filtering positions does not change the denominator."""
+        filters = PositionFilters(user_id=1, min_value=Decimal("1500"), max_value=None)
+
+        positions = PositionService().get_user_positions(db, 1, filters)
+
+        assert [p.asset.ticker for p in positions] == ["MSFT"]
+        assert positions[0].weight_in_portfolio == Decimal("50.00")
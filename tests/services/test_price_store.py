@@ -0,0 +1,144 @@
+"""Tests for the columnar price history store."""
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+import numpy as np
+import pytest
+from sqlalchemy import update
+
+from backend.models import Asset, AssetCategory, AssetType
+from backend.models.price_history import PriceHistory
+from backend.services.price_store import PriceStore
+
+START = date(2024, 1, 1)
+
+
+@pytest.fixture
+def db(db_session):
+    """SQLite session with ten days of SPY prices."""
+    asset = Asset(
+        ticker="SPY",
+        name="SPDR S&P 500 ETF",
+        asset_type=AssetType.ETF,
+        category=AssetCategory.EQUITY,
+    )
+    db_session.add(asset)
+    db_session.commit()
+    db_session.add_all(
+        [
+            PriceHistory(
+                asset_id=asset.id,
+                price_date=START + timedelta(days=day),
+                open_price=Decimal(100 + day),
+                close_price=Decimal(101 + day),
+                volume=1000 * day if day else None,
+            )
+            for day in range(10)
+        ]
+    )
+    db_session.commit()
+    return db_session
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Empty store in a temporary directory."""
+    return PriceStore(tmp_path / "prices")
+
+
+def asset_id(db):
+    """Id of the seeded asset."""
+    return db.query(Asset.id).scalar()
+
+
+class TestPriceStore:
+    """Test syncing from price_history and reading memory-mapped series."""
+
+    def test_sync_and_read_range(self, db, store):
+        """Test a date range comes back as memory-mapped columns."""
+        assert store.sync(db) == 10
+
+        series = store.read(asset_id(db), START + timedelta(days=2), date(2024, 1, 5))
+
+        assert isinstance(series.close.base, np.memmap)
+        np.testing.assert_array_equal(
+            series.dates, np.arange("2024-01-03", "2024-01-06", dtype="datetime64[D]")
+        )
+        np.testing.assert_allclose(series.close, [103, 104, 105])
+        np.testing.assert_allclose(series.open, [102, 103, 104])
+        assert np.isnan(store.read(asset_id(db)).volume[0])
+        assert np.all(np.isnan(series.high))
+
+    def test_incremental_sync_merges_changes(self, db, store):
+        """Test later syncs apply new and corrected rows only."""
+        store.sync(db)
+        spy = asset_id(db)
+        db.execute(
+            update(PriceHistory)
+            .where(PriceHistory.price_date == START)
+            .values(close_price=Decimal("99"))
+        )
+        db.add(
+            PriceHistory(
+                asset_id=spy, price_date=date(2024, 1, 11), close_price=Decimal("120")
+            )
+        )
+        db.commit()
+
+        store.sync(db)
+
+        closes = store.read(spy).close
+        assert len(closes) == 11
+        assert closes[0] == 99
+        assert closes[-1] == 120
+
+    def test_readers_keep_their_generation(self, db, store):
+        """Test a series read before a sync is not changed by it."""
+        store.sync(db)
+        before = store.read(asset_id(db)).close
+        db.execute(update(PriceHistory).values(close_price=Decimal("1")))
+        db.commit()
+
+        store.sync(db)
+
+        assert before[0] == 101
+        assert store.read(asset_id(db)).close[0] == 1
+
+    def test_full_sync_drops_deleted_rows(self, db, store):
+        """Test a full rebuild removes rows deleted from the table."""
+        store.sync(db)
+        db.query(PriceHistory).filter(PriceHistory.price_date > START).delete()
+        db.commit()
+
+        store.sync(db, full=True)
+
+        assert len(store.read(asset_id(db))) == 1
+
+    def test_load_falls_back_to_sql_before_first_sync(self, db, store):
+        """Test loading works before the store is populated."""
+        series = store.load(db, asset_id(db), START, START + timedelta(days=1))
+
+        assert not store.is_synced()
+        np.testing.assert_allclose(series.close, [101, 102])
+
+    def test_load_many_before_first_sync(self, db, store):
+        """Test several assets load with a single query."""
+        series = store.load_many(db, [asset_id(db), 999], end=START)
+
+        np.testing.assert_allclose(series[asset_id(db)].close, [101])
+        assert len(series[999]) == 0
+
+    def test_unknown_asset_is_empty(self, db, store):
+        """Test assets without prices read as an empty series."""
+        store.sync(db)
+
+        assert len(store.load(db, 999)) == 0
+
+    def test_disabled_store_reads_sql(self, db, tmp_path):
+        """Test a disabled store never writes files."""
+        store = PriceStore(tmp_path / "prices", enabled=False)
+
+        assert store.sync(db) == 0
+        assert len(store.load(db, asset_id(db))) == 10
+        assert not (tmp_path / "prices").exists()
@@ -0,0 +1,235 @@
+"""Tests for covariance-based portfolio risk."""
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+from fastapi import HTTPException
+import numpy as np
+import pytest
+from sqlalchemy import event
+
+from backend.models import Asset, AssetCategory, AssetType, Position, User
+from backend.models.price_history import PriceHistory
+from backend.services.analytics import (
+    correlation_matrix,
+    covariance_matrix,
+    return_matrix,
+    risk_contributions,
+)
+from backend.services.cache import TTLCache, TwoTierCache
+from backend.services.monte_carlo import SimulationConfig
+from backend.services.risk import RiskService
+
+AS_OF = date(2024, 3, 31)
+
+
+class TestRiskKernels:
+    """Test the matrix kernels against hand-computed values."""
+
+    def test_return_matrix_uses_shared_valid_dates(self, days):
+        """Test only dates priced in every series form periods."""
+        common, returns = return_matrix(
+            [
+                days("2024-01-01", "2024-01-02", "2024-01-03"),
+                days("2024-01-01", "2024-01-02", "2024-01-03"),
+            ],
+            [np.array([100.0, 110.0, 121.0]), np.array([50.0, np.nan, 60.0])],
+        )
+
+        np.testing.assert_array_equal(common, days("2024-01-01", "2024-01-03"))
+        np.testing.assert_allclose(returns, [[0.21, 0.2]])
+
+    def test_covariance_and_correlation(self):
+        """Test annualized covariance and its correlation matrix."""
+        first = np.array([0.01, -0.02, 0.015, 0.005])
+        returns = np.column_stack([first, -2 * first, np.zeros(4)])
+
+        covariance = covariance_matrix(returns)
+        correlation = correlation_matrix(covariance)
+
+        assert covariance[0, 0] == pytest.approx(np.var(first, ddof=1) * 252)
+        assert covariance[0, 1] == pytest.approx(-2 * covariance[0, 0])
+        np.testing.assert_allclose(
+            correlation, [[1.0, -1.0, 0.0], [-1.0, 1.0, 0.0], [0.0, 0.0, 1.0]]
+        )
+
+    def test_risk_contributions_sum_to_volatility(self):
+        """Test weighted marginal contributions add up to the volatility."""
+        covariance = np.array([[0.04, 0.006], [0.006, 0.09]])
+        weights = np.array([0.6, 0.4])
+
+        portfolio_volatility, marginal = risk_contributions(weights, covariance)
+
+        assert portfolio_volatility == pytest.approx(
+            np.sqrt(weights @ covariance @ weights)
+        )
+        assert (weights * marginal).sum() == pytest.approx(portfolio_volatility)
+        assert risk_contributions(weights, np.zeros((2, 2)))[0] == 0.0
+
+
+@pytest.fixture
+def db(db_session):
+    """SQLite session with a user holding two correlated assets and a new one."""
+    user = User(email="risk@example.com", username="risk", hashed_password="x")
+    assets = [
+        Asset(
+            ticker=ticker,
+            name=ticker,
+            asset_type=AssetType.STOCK,
+            category=AssetCategory.EQUITY,
+            current_price=Decimal("100"),
+        )
+        for ticker in ("AAA", "BBB", "NEW")
+    ]
+    db_session.add(user)
+    db_session.add_all(assets)
+    db_session.commit()
+
+    rng = np.random.default_rng(11)
+    market = np.cumsum(rng.normal(0, 0.01, 60))
+    paths = {
+        "AAA": 100 * np.exp(market),
+        "BBB": 50 * np.exp(0.5 * market + np.cumsum(rng.normal(0, 0.005, 60))),
+        "NEW": 20 * np.exp(market[-5:]),
+    }
+    for asset in assets:
+        prices = paths[asset.ticker]
+        db_session.add_all(
+            PriceHistory(
+                asset_id=asset.id,
+                price_date=AS_OF - timedelta(days=len(prices) - 1 - day),
+                close_price=Decimal(str(round(price, 4))),
+            )
+            for day, price in enumerate(prices)
+        )
+        db_session.add(
+            Position(
+                user_id=user.id,
+                asset_id=asset.id,
+                quantity=Decimal("10"),
+                average_cost_per_share=Decimal("90"),
+                total_cost_basis=Decimal("900"),
+            )
+        )
+    db_session.commit()
+    return db_session
+
+
+@pytest.fixture
+def service():
+    """Risk service with its own empty caches."""
+    return RiskService(
+        cache=TTLCache(max_size=10, ttl=60),
+        simulation_cache=TwoTierCache(namespace="test_risk", ttl=60, max_size=10),
+    )
+
+
+def user_id(db):
+    """Id of the seeded user."""
+    return db.query(User.id).scalar()
+
+
+class TestRiskService:
+    """Test risk analysis of a stored portfolio."""
+
+    def test_risk_analysis(self, db, service):
+        """Test volatility, contributions and correlations of the holdings."""
+        result = service.get_risk_analysis(db, user_id(db), AS_OF)
+
+        assert result.excluded_tickers == ["NEW"]
+        assert result.observations == 59
+        assert set(result.correlation_matrix) == {"AAA", "BBB"}
+        assert result.correlation_matrix["AAA"]["AAA"] == Decimal("1.0")
+        assert result.correlation_matrix["AAA"]["BBB"] > Decimal("0.5")
+        assert sum(result.risk_contribution.values()) == pytest.approx(
+            Decimal("100"), abs=Decimal("0.001")
+        )
+        assert result.portfolio_volatility > 0
+        assert result.value_at_risk["99"] > result.value_at_risk["95"]
+        assert result.expected_shortfall["95"] > result.value_at_risk["95"]
+
+    def test_matrix_is_cached(self, db, service, test_db):
+        """Test a repeated request runs no price query."""
+        _override_get_db, engine = test_db
+        service.get_risk_analysis(db, user_id(db), AS_OF)
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            service.get_risk_analysis(db, user_id(db), AS_OF)
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        assert not any("price_history" in statement for statement in statements)
+
+    def test_short_history_has_no_matrix(self, db, service):
+        """Test a window too short for an estimate reports no figures."""
+        result = service.get_risk_analysis(db, user_id(db), AS_OF, lookback_days=10)
+
+        assert result.portfolio_volatility is None
+        assert result.correlation_matrix == {}
+        assert sorted(result.excluded_tickers) == ["AAA", "BBB", "NEW"]
+
+    def test_unknown_user(self, db, service):
+        """Test a missing user is a 404."""
+        with pytest.raises(HTTPException) as exc_info:
+            service.get_risk_analysis(db, 999, AS_OF)
+
+        assert exc_info.value.status_code == 404
+
+
+class TestSimulatedRisk:
+    """Test Monte Carlo value at risk of a stored portfolio."""
+
+    CONFIG = SimulationConfig(horizons=(1, 10), paths=2000, seed=1)
+
+    def test_simulated_risk(self, db, service):
+        """Test VaR and CVaR per horizon, level and amount."""
+        result = service.get_simulated_risk(db, user_id(db), AS_OF, config=self.CONFIG)
+
+        assert result.excluded_tickers == ["NEW"]
+        assert result.portfolio_value == Decimal("2000.0")
+        one_day, ten_day = result.horizons
+        assert ten_day.horizon_days == 10
+        assert one_day.value_at_risk["99"] > one_day.value_at_risk["95"] > 0
+        assert one_day.conditional_value_at_risk["95"] >= one_day.value_at_risk["95"]
+        assert ten_day.value_at_risk["95"] > one_day.value_at_risk["95"]
+        assert one_day.value_at_risk_amount["95"] == pytest.approx(
+            one_day.value_at_risk["95"] * 20, abs=Decimal("0.01")
+        )
+
+    def test_simulate_all_fills_cache(self, db, service):
+        """Test the batch run caches what the per-user lookup returns."""
+        results = service.simulate_all(db, AS_OF, config=self.CONFIG, workers=1)
+        service.simulation_cache.stats.hits = 0
+
+        cached = service.get_simulated_risk(db, user_id(db), AS_OF, config=self.CONFIG)
+
+        assert service.simulation_cache.stats.hits == 1
+        assert cached == results[user_id(db)]
+
+    def test_latest_run_served_without_date(self, db, service):
+        """Test a request without a date gets the newest nightly run."""
+        results = service.simulate_all(db, AS_OF, config=self.CONFIG, workers=1)
+        service.simulation_cache.stats.hits = 0
+
+        latest = service.get_simulated_risk(db, user_id(db), config=self.CONFIG)
+
+        assert service.simulation_cache.stats.hits == 1
+        assert latest == results[user_id(db)]
+        assert latest.as_of == AS_OF
+
+    def test_seed_changes_paths(self, db, service):
+        """Test a different seed is simulated rather than served from cache."""
+        first = service.get_simulated_risk(db, user_id(db), AS_OF, config=self.CONFIG)
+        second = service.get_simulated_risk(
+            db,
+            user_id(db),
+            AS_OF,
+            config=SimulationConfig(horizons=(1, 10), paths=2000, seed=2),
+        )
+
+        assert first.horizons != second.horizons
@@ -0,0 +1,127 @@
+"""Tests for in-flight request coalescing."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import threading
+from unittest.mock import Mock, patch
+
+import pytest
+
+from backend.services.enhanced_market_data import (
+    EnhancedMarketDataService,
+    MarketQuote,
+)
+from backend.services.single_flight import SingleFlight
+
+
+class TestSingleFlightSync:
+    """Test suite for the thread-based path."""
+
+    def test_concurrent_calls_share_one_execution(self):
+        """Test callers waiting on the same key get the leader's result."""
+        flight = SingleFlight("test")
+        started = threading.Event()
+        release = threading.Event()
+        fetch = Mock(side_effect=lambda: (started.set(), release.wait(), 42)[2])
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            leader = executor.submit(flight.do, "AAPL", fetch)
+            started.wait()
+            followers = [executor.submit(flight.do, "AAPL", fetch) for _ in range(3)]
+            while flight.stats.collapsed < 3:
+                release.wait(0.001)
+            release.set()
+            results = [leader.result(), *(f.result() for f in followers)]
+
+        assert results == [42, 42, 42, 42]
+        assert fetch.call_count == 1
+        assert flight.get_stats() == {
+            "name": "test",
+            "in_flight": 0,
+            "calls": 4,
+            "executions": 1,
+            "collapsed": 3,
+        }
+
+    def test_errors_propagate_and_are_not_remembered(self):
+        """Test a failed fetch raises for every waiter and is retried later."""
+        flight = SingleFlight("test")
+
+        with pytest.raises(ValueError):
+            flight.do("AAPL", Mock(side_effect=ValueError("boom")))
+
+        assert flight.do("AAPL", lambda: 1) == 1
+        assert flight.stats.executions == 2
+
+    def test_different_keys_do_not_collapse(self):
+        """Test distinct keys run independently."""
+        flight = SingleFlight("test")
+
+        assert flight.do("AAPL", lambda: 1) == 1
+        assert flight.do("MSFT", lambda: 2) == 2
+        assert flight.stats.collapsed == 0
+
+
+class TestSingleFlightAsync:
+    """Test suite for the asyncio path."""
+
+    async def test_concurrent_awaits_share_one_task(self):
+        """Test coroutines for the same key await one shared fetch."""
+        flight = SingleFlight("test")
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "quote"
+
+        results = await asyncio.gather(
+            *(flight.do_async("AAPL", fetch) for _ in range(5))
+        )
+
+        assert results == ["quote"] * 5
+        assert calls == 1
+        assert flight.stats.collapsed == 4
+        assert flight.get_stats()["in_flight"] == 0
+
+    async def test_cancelled_waiter_does_not_cancel_fetch(self):
+        """Test cancelling one caller leaves the shared fetch running."""
+        flight = SingleFlight("test")
+
+        async def fetch():
+            await asyncio.sleep(0.01)
+            return "quote"
+
+        first = asyncio.ensure_future(flight.do_async("AAPL", fetch))
+        second = asyncio.ensure_future(flight.do_async("AAPL", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        assert await second == "quote"
+
+    async def test_enhanced_service_coalesces_isin_lookups(self):
+        """Test concurrent get_quote_by_isin calls trigger one upstream fetch."""
+        service = EnhancedMarketDataService()
+        quote = MarketQuote(symbol="SAP.DE", isin="DE0007164600", price=120.0)
+
+        async def fetch_from_source(ticker, source, isin):
+            await asyncio.sleep(0.01)
+            return quote
+
+        with (
+            patch.object(
+                service, "_resolve_isin_to_ticker", return_value="SAP.DE"
+            ) as resolve,
+            patch.object(
+                service, "_fetch_quote_from_source", side_effect=fetch_from_source
+            ) as fetch,
+        ):
+            results = await asyncio.gather(
+                *(service.get_quote_by_isin("DE0007164600") for _ in range(3))
+            )
+
+        assert all(result is quote for result in results)
+        assert resolve.call_count == 1
+        assert fetch.call_count == 1
+        assert service.get_cache_stats()["single_flight"]["collapsed"] == 2
@@ -0,0 +1,248 @@
+"""Tests for tax-lot matching and the per-user ledger cache."""
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import event
+
+from backend.models import Asset, AssetCategory, AssetType, Position, User
+from backend.models.transaction import Transaction, TransactionType
+from backend.services.cache import TTLCache
+from backend.services.tax_lots import LotQueue, TaxLotLedger, TaxLotService
+
+
+def lots(method, *buys):
+    """Queue holding ``(quantity, total cost)`` lots in order."""
+    queue = LotQueue(method)
+    for quantity, cost in buys:
+        queue.add(Decimal(quantity), Decimal(cost))
+    return queue
+
+
+class TestLotQueue:
+    """Test lot matching for each tax-lot method."""
+
+    @pytest.mark.parametrize(
+        ("method", "expected_cost"),
+        [("FIFO", "1400"), ("LIFO", "2200"), ("AverageCost", "1800")],
+    )
+    def test_sell_matches_by_method(self, method, expected_cost):
+        """Test which lots a partial sale closes."""
+        queue = lots(method, ("10", "1000"), ("10", "2000"))
+
+        matched, cost = queue.remove(Decimal("12"))
+
+        assert matched == Decimal("12")
+        assert cost == Decimal(expected_cost)
+        assert queue.quantity == Decimal("8")
+        assert queue.cost_basis == Decimal("3000") - Decimal(expected_cost)
+
+    def test_selling_more_than_held(self):
+        """Test only held shares are matched."""
+        matched, cost = lots("FIFO", ("5", "500")).remove(Decimal("8"))
+
+        assert (matched, cost) == (Decimal("5"), Decimal("500"))
+
+    def test_consumed_lots_are_compacted(self):
+        """Test closed lots do not accumulate at the front."""
+        queue = lots("FIFO", *[("1", "10")] * 10)
+
+        queue.remove(Decimal("6"))
+
+        assert len(queue) == 4
+        assert len(queue.quantities) == 4
+
+    def test_split(self):
+        """Test a split keeps the cost basis and scales the shares."""
+        queue = lots("FIFO", ("10", "1000"))
+
+        queue.split(Decimal("2"))
+
+        assert queue.quantity == Decimal("20")
+        assert queue.remove(Decimal("5"))[1] == Decimal("250")
+
+
+def row(transaction_id, transaction_type, day, quantity, amount, fee="0"):
+    """Transaction row as streamed from the database."""
+    return (
+        transaction_id,
+        1,
+        transaction_type,
+        date(2024, 1, day),
+        Decimal(quantity),
+        Decimal(amount),
+        Decimal(fee),
+        Decimal("0"),
+        Decimal("0"),
+        None,
+        None,
+    )
+
+
+class TestTaxLotLedger:
+    """Test realized gains and cash flows from a transaction stream."""
+
+    def test_realized_gain_uses_lot_cost_not_later_buys(self):
+        """Test a sale is costed at the lots it closes, net of fees."""
+        ledger = TaxLotLedger(methods={1: "FIFO"})
+        for transaction in [
+            row(1, TransactionType.BUY, 1, "10", "1000", fee="10"),
+            row(2, TransactionType.SELL, 2, "-10", "1500", fee="10"),
+            row(3, TransactionType.BUY, 3, "10", "3000"),
+            row(4, TransactionType.DIVIDEND, 4, "0", "40"),
+        ]:
+            ledger.apply(transaction)
+
+        totals = ledger.totals()
+        assert totals.realized_gains == Decimal("480")
+        assert totals.fees_paid == Decimal("20")
+        assert totals.net_cash_flow == Decimal("1490") + Decimal("40") - Decimal("4010")
+        assert ledger.cost_basis(1) == Decimal("3000")
+        assert ledger.totals(99).transactions == 0
+
+
+@pytest.fixture
+def db(db_session):
+    """SQLite session with a user holding one LIFO position."""
+    user = User(email="lots@example.com", username="lots", hashed_password="x")
+    asset = Asset(
+        ticker="LOT",
+        name="Lot Corp",
+        asset_type=AssetType.STOCK,
+        category=AssetCategory.EQUITY,
+    )
+    db_session.add_all([user, asset])
+    db_session.commit()
+    db_session.add(
+        Position(
+            user_id=user.id,
+            asset_id=asset.id,
+            quantity=Decimal("10"),
+            average_cost_per_share=Decimal("100"),
+            total_cost_basis=Decimal("1000"),
+            tax_lot_method="LIFO",
+        )
+    )
+    db_session.commit()
+    return db_session
+
+
+def add(db, transaction_type, day, quantity, price):
+    """Store a transaction of the seeded user and asset."""
+    transaction = Transaction(
+        user_id=db.query(User.id).scalar(),
+        asset_id=db.query(Asset.id).scalar(),
+        transaction_type=transaction_type,
+        transaction_date=date(2024, 1, day),
+        quantity=Decimal(quantity),
+        price_per_share=Decimal(price),
+        total_amount=abs(Decimal(quantity)) * Decimal(price),
+    )
+    db.add(transaction)
+    db.commit()
+    return transaction
+
+
+class TestTaxLotService:
+    """Test building and incrementally extending stored ledgers."""
+
+    @pytest.fixture
+    def service(self):
+        """Service with its own empty ledger cache."""
+        return TaxLotService(cache=TTLCache(max_size=10, ttl=60))
+
+    def test_honors_position_method_and_extends(self, db, service, test_db):
+        """Test LIFO matching and that new rows are applied incrementally."""
+        _override_get_db, engine = test_db
+        user_id = db.query(User.id).scalar()
+        add(db, TransactionType.BUY, 1, "10", "100")
+        add(db, TransactionType.BUY, 2, "10", "200")
+        service.get_summary(db, user_id)
+        ledger = service.cache.get(str(user_id))
+        add(db, TransactionType.SELL, 3, "-10", "250")
+
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            summary = service.get_summary(db, user_id)
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        assert service.cache.get(str(user_id)) is ledger
+        assert summary.realized_gains == Decimal("500")
+        assert ledger.count == 3
+        history_reads = [s for s in statements if "ORDER BY transactions" in s]
+        assert len(history_reads) == 1
+        assert "transactions.id >" in history_reads[0]
+
+    def test_back_dated_transaction_rebuilds(self, db, service):
+        """Test a transaction dated before applied ones replays the history."""
+        user_id = db.query(User.id).scalar()
+        add(db, TransactionType.BUY, 2, "10", "200")
+        add(db, TransactionType.SELL, 3, "-10", "250")
+        service.get_summary(db, user_id)
+        first = service.cache.get(str(user_id))
+        add(db, TransactionType.BUY, 1, "10", "100")
+
+        rebuilt = service.get_summary(db, user_id)
+
+        assert service.cache.get(str(user_id)) is not first
+        # LIFO still closes the day-2 lot, which was bought last before the sale
+        assert rebuilt.realized_gains == Decimal("500")
+        assert rebuilt.open_cost_basis == Decimal("1000")
+
+    def test_deleted_transaction_rebuilds(self, db, service):
+        """Test removing an applied transaction is picked up."""
+        user_id = db.query(User.id).scalar()
+        buy = add(db, TransactionType.BUY, 1, "10", "100")
+        add(db, TransactionType.BUY, 2, "5", "100")
+        service.get_summary(db, user_id)
+        db.delete(buy)
+        db.commit()
+
+        assert service.get_summary(db, user_id).open_cost_basis == Decimal("500")
+
+    def test_edit_within_the_same_second_rebuilds(self, db, service):
+        """Test an edit that leaves the row stamp unchanged is picked up."""
+        user_id = db.query(User.id).scalar()
+        add(db, TransactionType.BUY, 1, "10", "50")
+        sell = add(db, TransactionType.SELL, 2, "-10", "75")
+        assert service.get_summary(db, user_id).realized_gains == Decimal("250")
+
+        sell.total_amount = Decimal("1000")
+        db.commit()
+
+        totals = service.get_summary(db, user_id)
+        assert totals.proceeds == Decimal("1000")
+        assert totals.realized_gains == Decimal("500")
+
+    def test_rolled_back_edit_keeps_ledger(self, db, service):
+        """Test an edit that was rolled back does not drop the ledger on commit."""
+        user_id = db.query(User.id).scalar()
+        buy = add(db, TransactionType.BUY, 1, "10", "100")
+        service.get_summary(db, user_id)
+        ledger = service.cache.get(str(user_id))
+
+        buy.total_amount = Decimal("2000")
+        db.flush()
+        db.rollback()
+        db.commit()
+
+        assert service.cache.get(str(user_id)) is ledger
+
+    def test_summary_is_a_snapshot(self, db, service):
+        """Test a returned summary is unaffected by later extensions."""
+        user_id = db.query(User.id).scalar()
+        add(db, TransactionType.BUY, 1, "10", "100")
+        summary = service.get_summary(db, user_id)
+        add(db, TransactionType.BUY, 2, "10", "200")
+
+        assert service.get_summary(db, user_id).open_cost_basis == Decimal("3000")
+        assert summary.open_cost_basis == Decimal("1000")
+        assert service._lock_for(user_id) is service._lock_for(user_id)
+        assert service._lock_for(user_id) is not service._lock_for(user_id + 1)
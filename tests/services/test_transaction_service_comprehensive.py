@@ -15,9 +15,13 @@ from backend.schemas.transaction import (
     DividendTransactionRequest,
     SellTransactionRequest,
     TransactionFilters,
+    TransactionHistorySummary,
     TransactionPerformanceMetrics,
+    TransactionPeriodSummary,
     TransactionResponse,
+    TransactionTypeTotals,
 )
+from backend.services.tax_lots import TaxLotLedger
 from backend.services.transaction import TransactionService
 
 
@@ -407,46 +411,23 @@ class TestTransactionService:
         self, transaction_service, mock_db
     ):
         """Test getting transaction performance metrics without asset filter."""
-        # Mock transactions
-        buy_transaction = Mock()
-        buy_transaction.transaction_type = TransactionType.BUY
-        buy_transaction.total_amount = Decimal("1500.00")
-        buy_transaction.commission = Decimal("5.00")
-        buy_transaction.regulatory_fees = Decimal("1.00")
-        buy_transaction.other_fees = Decimal("0.50")
-        buy_transaction.position_id = None
-
-        sell_transaction = Mock()
-        sell_transaction.transaction_type = TransactionType.SELL
-        sell_transaction.total_amount = Decimal("1600.00")
-        sell_transaction.commission = Decimal("5.00")
-        sell_transaction.regulatory_fees = Decimal("1.00")
-        sell_transaction.other_fees = Decimal("0.50")
-        sell_transaction.position_id = 1
-        sell_transaction.quantity = Decimal("10")
-
-        dividend_transaction = Mock()
-        dividend_transaction.transaction_type = TransactionType.DIVIDEND
-        dividend_transaction.total_amount = Decimal("25.00")
-        dividend_transaction.commission = Decimal("0")
-        dividend_transaction.regulatory_fees = Decimal("0")
-        dividend_transaction.other_fees = Decimal("0")
-        dividend_transaction.position_id = None
-
-        mock_db.query.return_value.filter.return_value.all.return_value = [
-            buy_transaction,
-            sell_transaction,
-            dividend_transaction,
+        fees = (Decimal("5.00"), Decimal("1.00"), Decimal("0.50"))
+        no_fees = (Decimal("0"), Decimal("0"), Decimal("0"))
+        rows = [
+            (1, 1, TransactionType.BUY, date(2024, 1, 2), Decimal("10"))
+            + (Decimal("1500.00"), *fees, None, None),
+            (2, 1, TransactionType.SELL, date(2024, 2, 1), Decimal("-10"))
+            + (Decimal("1600.00"), *fees, None, None),
+            (3, 1, TransactionType.DIVIDEND, date(2024, 3, 1), Decimal("0"))
+            + (Decimal("25.00"), *no_fees, None, None),
         ]
+        ledger = TaxLotLedger()
+        for row in rows:
+            ledger.apply(row)
 
-        # Mock position query for sell transaction
-        mock_position = Mock()
-        mock_position.average_cost_per_share = Decimal("150.00")
-        mock_db.query.return_value.filter.return_value.first.return_value = (
-            mock_position
-        )
-
-        result = transaction_service.get_transaction_performance(mock_db, 1)
+        with patch("backend.services.transaction.tax_lot_service") as lots:
+            lots.get_summary.return_value = ledger.summary()
+            result = transaction_service.get_transaction_performance(mock_db, 1)
 
         assert isinstance(result, TransactionPerformanceMetrics)
         assert result.total_transactions == 3
@@ -456,16 +437,18 @@ class TestTransactionService:
         assert result.total_invested == Decimal("1506.50")  # 1500 + 6.50 fees
         assert result.total_proceeds == Decimal("1593.50")  # 1600 - 6.50 fees
         assert result.total_dividends_received == Decimal("25.00")
+        assert result.realized_gains == Decimal("87.00")  # 1593.50 - 1506.50
+        assert result.open_cost_basis == Decimal("0")
 
     def test_get_transaction_performance_with_asset_filter(
         self, transaction_service, mock_db
     ):
         """Test getting transaction performance metrics with asset filter."""
-        mock_db.query.return_value.filter.return_value.filter.return_value.all.return_value = (
-            []
-        )
-
-        result = transaction_service.get_transaction_performance(mock_db, 1, asset_id=1)
+        with patch("backend.services.transaction.tax_lot_service") as lots:
+            lots.get_summary.return_value = TaxLotLedger().summary(1)
+            result = transaction_service.get_transaction_performance(
+                mock_db, 1, asset_id=1
+            )
 
         assert isinstance(result, TransactionPerformanceMetrics)
         assert result.total_transactions == 0
@@ -521,27 +504,40 @@ class TestTransactionService:
 
     def test_get_monthly_transaction_summary(self, transaction_service, mock_db):
         """Test getting monthly transaction summary."""
-        # Mock response from get_transactions_by_date_range
-        transaction_response = Mock()
-        transaction_response.transaction_type = "buy"
-        transaction_response.total_amount = Decimal("1500.00")
-        transaction_response.commission = Decimal("5.00")
-        transaction_response.regulatory_fees = Decimal("1.00")
-        transaction_response.other_fees = Decimal("0.50")
+        period = TransactionPeriodSummary(
+            period_start=date(2025, 6, 1),
+            period_end=date(2025, 6, 30),
+            total_transactions=1,
+            total_fees=Decimal("6.50"),
+            by_type={
+                "buy": TransactionTypeTotals(
+                    count=1, total_amount=Decimal("1500.00"), fees=Decimal("6.50")
+                )
+            },
+        )
 
         with patch.object(
-            transaction_service, "get_transactions_by_date_range"
-        ) as mock_get_transactions:
-            mock_get_transactions.return_value = [transaction_response]
+            transaction_service, "get_transaction_summary"
+        ) as mock_get_summary:
+            mock_get_summary.return_value = TransactionHistorySummary(
+                start_date=date(2025, 6, 1),
+                end_date=date(2025, 6, 30),
+                period="month",
+                periods=[period],
+            )
 
             result = transaction_service.get_monthly_transaction_summary(
                 mock_db, 1, 2025, 6
             )
 
+            mock_get_summary.assert_called_once_with(
+                mock_db, 1, date(2025, 6, 1), date(2025, 6, 30), period="month"
+            )
             assert result["month"] == "2025-06"
             assert result["total_transactions"] == 1
             assert result["buys"]["count"] == 1
             assert result["buys"]["total_amount"] == Decimal("1500.00")
+            assert result["sells"]["count"] == 0
             assert result["fees"]["total"] == Decimal("6.50")
 
     def test_delete_transaction_not_found(self, transaction_service, mock_db):
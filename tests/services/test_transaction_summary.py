@@ -0,0 +1,127 @@
+"""Tests for grouped transaction summaries over date ranges."""
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import event
+
+from backend.models import Asset, AssetCategory, AssetType, User
+from backend.models.transaction import Transaction, TransactionType
+from backend.services.transaction import TransactionService
+
+
+@pytest.fixture
+def db(db_session):
+    """SQLite session with transactions spread over three months."""
+    user = User(email="summary@example.com", username="summary", hashed_password="x")
+    asset = Asset(
+        ticker="SUM",
+        name="Summary Inc",
+        asset_type=AssetType.STOCK,
+        category=AssetCategory.EQUITY,
+    )
+    db_session.add_all([user, asset])
+    db_session.commit()
+    for transaction_type, day, amount, fee in [
+        (TransactionType.BUY, date(2024, 1, 3), "1000", "5"),  # Wednesday
+        (TransactionType.BUY, date(2024, 1, 8), "500", "5"),  # Monday
+        (TransactionType.SELL, date(2024, 1, 14), "800", "4"),  # Sunday
+        (TransactionType.DIVIDEND, date(2024, 3, 1), "20", "0"),
+    ]:
+        db_session.add(
+            Transaction(
+                user_id=user.id,
+                asset_id=asset.id,
+                transaction_type=transaction_type,
+                transaction_date=day,
+                quantity=Decimal("1"),
+                price_per_share=Decimal(amount),
+                total_amount=Decimal(amount),
+                commission=Decimal(fee),
+            )
+        )
+    db_session.commit()
+    return db_session
+
+
+@pytest.fixture
+def service():
+    """Transaction service."""
+    return TransactionService()
+
+
+def user_id(db):
+    """Id of the seeded user."""
+    return db.query(User.id).scalar()
+
+
+class TestTransactionSummary:
+    """Test per-period totals from one grouped query."""
+
+    def test_monthly_periods_include_empty_months(self, db, service, test_db):
+        """Test every month is listed and totals come from a single query."""
+        _override_get_db, engine = test_db
+        seeded_user = user_id(db)
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            summary = service.get_transaction_summary(
+                db, seeded_user, date(2024, 1, 1), date(2024, 3, 31)
+            )
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        assert len(statements) == 1
+        assert "GROUP BY" in statements[0]
+        january, february, march = summary.periods
+        assert (january.period_start, january.period_end) == (
+            date(2024, 1, 1),
+            date(2024, 1, 31),
+        )
+        assert january.total_transactions == 3
+        assert january.by_type["buy"].count == 2
+        assert january.by_type["buy"].total_amount == Decimal("1500")
+        assert january.total_fees == Decimal("14")
+        assert january.net_cash_flow == Decimal("796") - Decimal("1510")
+        assert february.total_transactions == 0
+        assert march.by_type["dividend"].total_amount == Decimal("20")
+        assert summary.totals.total_transactions == 4
+
+    def test_weeks_start_on_monday(self, db, service):
+        """Test weekly periods split at Mondays."""
+        summary = service.get_transaction_summary(
+            db, user_id(db), date(2024, 1, 1), date(2024, 1, 14), period="week"
+        )
+
+        first, second = summary.periods
+        assert (first.period_start, second.period_start) == (
+            date(2024, 1, 1),
+            date(2024, 1, 8),
+        )
+        assert first.total_transactions == 1
+        assert second.total_transactions == 2
+        assert second.period_end == date(2024, 1, 14)
+
+    def test_monthly_summary(self, db, service):
+        """Test the single-month summary keeps its shape."""
+        result = service.get_monthly_transaction_summary(db, user_id(db), 2024, 1)
+
+        assert result["month"] == "2024-01"
+        assert result["sells"] == {"count": 1, "total_amount": Decimal("800")}
+        assert result["dividends"]["count"] == 0
+
+    def test_invalid_range(self, db, service):
+        """Test reversed ranges and unknown periods are rejected."""
+        with pytest.raises(ValueError):
+            service.get_transaction_summary(
+                db, user_id(db), date(2024, 2, 1), date(2024, 1, 1)
+            )
+        with pytest.raises(ValueError):
+            service.get_transaction_summary(
+                db, user_id(db), date(2024, 1, 1), date(2024, 2, 1), period="day"
+            )
@@ -0,0 +1,165 @@
+"""Tests for the async database session path used by read endpoints."""
+
+from decimal import Decimal
+
+import pytest
+
+from backend.database import get_async_database_url
+from backend.models import Asset, AssetCategory, AssetType, Position, User
+from backend.models.isin import ISINTickerMapping
+
+
+class TestAsyncDatabaseUrl:
+    """Test mapping sync database URLs onto async drivers."""
+
+    @pytest.mark.parametrize(
+        ("database_url", "expected"),
+        [
+            (
+                "postgresql://user:pw@db:5432/app",
+                "postgresql+asyncpg://user:pw@db:5432/app",
+            ),
+            (
+                "postgresql+psycopg2://user:pw@db/app",
+                "postgresql+asyncpg://user:pw@db/app",
+            ),
+            ("sqlite:///test.db", "sqlite+aiosqlite:///test.db"),
+        ],
+    )
+    def test_driver_is_rewritten(self, database_url, expected):
+        """Test each backend gets its async driver and keeps credentials."""
+        url = get_async_database_url(database_url)
+
+        assert url.render_as_string(hide_password=False) == expected
+
+    def test_in_memory_sqlite(self):
+        """Test in-memory SQLite stays in memory."""
+        url = get_async_database_url("sqlite:///:memory:")
+
+        assert url.drivername == "sqlite+aiosqlite"
+        assert url.database == ":memory:"
+
+    def test_unsupported_backend(self):
+        """Test backends without an async driver are rejected."""
+        with pytest.raises(ValueError, match="No async driver"):
+            get_async_database_url("mysql://user:pw@db/app")
+
+
+class TestAsyncReadEndpoints:
+    """Test read endpoints served through AsyncSession."""
+
+    @pytest.fixture
+    def seeded_client(self, client, test_db):
+        """Client whose database holds one user with two priced positions."""
+        override_get_db, _engine = test_db
+        session = next(override_get_db())
+        session.add(
+            User(email="user@example.com", username="user", hashed_password="hashed")
+        )
+        assets = [
+            Asset(
+                ticker="AAPL",
+                name="Apple Inc.",
+                asset_type=AssetType.STOCK,
+                category=AssetCategory.EQUITY,
+                current_price=Decimal("150"),
+            ),
+            Asset(
+                ticker="AGG",
+                name="iShares Core US Aggregate Bond ETF",
+                asset_type=AssetType.ETF,
+                category=AssetCategory.FIXED_INCOME,
+                current_price=Decimal("50"),
+            ),
+        ]
+        session.add_all(assets)
+        session.commit()
+        session.add_all(
+            [
+                Position(
+                    user_id=1,
+                    asset_id=asset.id,
+                    quantity=Decimal("10"),
+                    average_cost_per_share=Decimal("1"),
+                    total_cost_basis=Decimal("10"),
+                )
+                for asset in assets
+            ]
+        )
+        session.commit()
+        session.close()
+        return client
+
+    def test_assets_listing(self, seeded_client):
+        """Test the asset listing reads committed rows asynchronously."""
+        response = seeded_client.get("/api/v1/assets/")
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["total"] == 2
+        assert {a["ticker"] for a in body["data"]} == {"AAPL", "AGG"}
+
+    def test_asset_search_with_filters(self, seeded_client):
+        """Test search terms and filters select one page with its total."""
+        response = seeded_client.get(
+            "/api/v1/assets/",
+            params={"query": "a", "asset_type": "etf", "page_size": 1},
+        )
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["total"] == 1
+        assert not body["has_next"]
+        assert [a["ticker"] for a in body["data"]] == ["AGG"]
+
+    def test_asset_cursor_pages(self, seeded_client):
+        """Test following next_cursor walks every asset once."""
+        first = seeded_client.get("/api/v1/assets/", params={"page_size": 1}).json()
+        second = seeded_client.get(
+            "/api/v1/assets/",
+            params={"page_size": 1, "cursor": first["next_cursor"], "count": "none"},
+        ).json()
+
+        assert first["has_next"] and not second["has_next"]
+        assert second["total"] is None
+        assert [first["data"][0]["ticker"], second["data"][0]["ticker"]] == [
+            "AAPL",
+            "AGG",
+        ]
+        bad = seeded_client.get("/api/v1/assets/", params={"cursor": "nope"})
+        assert bad.status_code == 400
+
+    def test_asset_by_ticker(self, seeded_client):
+        """Test looking up a single asset by ticker."""
+        response = seeded_client.get("/api/v1/assets/ticker/aapl")
+
+        assert response.status_code == 200
+        assert response.json()["data"]["name"] == "Apple Inc."
+
+    def test_allocation_breakdown(self, seeded_client):
+        """Test portfolio services run on the async session's connection."""
+        response = seeded_client.get("/api/v1/portfolio/allocation/1")
+
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert Decimal(data["equity_percent"]) == Decimal("75")
+        assert Decimal(data["fixed_income_percent"]) == Decimal("25")
+
+    def test_isin_mappings_and_statistics(self, seeded_client, db_session):
+        """Test ISIN reads run on the async session's connection."""
+        db_session.add(
+            ISINTickerMapping(
+                isin="US0378331005", ticker="AAPL", exchange_code="XNAS", source="test"
+            )
+        )
+        db_session.commit()
+
+        mappings = seeded_client.get(
+            "/api/v1/isin/mappings", params={"isin": "us0378331005"}
+        )
+        statistics = seeded_client.get("/api/v1/isin/statistics")
+
+        assert mappings.status_code == 200
+        assert [m["ticker"] for m in mappings.json()] == ["AAPL"]
+        assert statistics.status_code == 200
+        assert statistics.json()["active_mappings"] == 1
@@ -1,5 +1,6 @@
 import pytest
 
+from backend.tasks import celery_app
 from backend.tasks.market_data import fetch_market_data
 
 
@@ -14,3 +15,10 @@ def test_fetch_market_data_task():
     output = result.get(timeout=20)
     assert output["status"] in ("success", "completed")  # nosec
     assert "results" in output  # nosec
+
+
+def test_portfolio_var_runs_on_the_simulation_queue():
+    # Prefork children cannot start the simulation process pool
+    router = celery_app.amqp.router
+    assert router.route({}, "calculate_portfolio_var")["queue"].name == "simulation"
+    assert router.route({}, "update_portfolio_prices")["queue"].name == "celery"
@@ -0,0 +1,198 @@
+"""Tests for connection pool profiles and pool metrics."""
+
+import pytest
+from sqlalchemy import create_engine, exc, text
+
+from backend import db_pool
+from backend.config import get_settings
+from backend.db_pool import (
+    POOL_PROFILES,
+    PoolProfile,
+    TimedAsyncAdaptedQueuePool,
+    TimedQueuePool,
+    get_pool_options,
+    get_pool_profile,
+    get_pool_stats,
+    instrument_engine,
+)
+
+POSTGRES_URL = "postgresql://user:pw@db:5432/app"
+
+
+@pytest.fixture
+def settings():
+    """Copy of the settings that tests can modify freely."""
+    return get_settings().model_copy()
+
+
+class TestPoolProfiles:
+    """Test resolving pool settings for a process role."""
+
+    @pytest.mark.parametrize("role", ["api", "worker", "beat"])
+    def test_role_profile(self, settings, role):
+        """Test each role gets its own profile when nothing is overridden."""
+        settings.process_role = role
+
+        assert get_pool_profile(settings) == POOL_PROFILES[role]
+
+    def test_settings_override_profile(self, settings):
+        """Test DATABASE_POOL_* settings replace individual profile fields."""
+        settings.process_role = "worker"
+        settings.database_pool_size = 2
+        settings.database_pool_timeout = 1.5
+
+        profile = get_pool_profile(settings)
+
+        assert profile == PoolProfile(
+            pool_size=2,
+            max_overflow=POOL_PROFILES["worker"].max_overflow,
+            pool_timeout=1.5,
+            pool_recycle=POOL_PROFILES["worker"].pool_recycle,
+        )
+
+    def test_unknown_role(self, settings):
+        """Test a misspelled role fails loudly."""
+        settings.process_role = "scheduler"
+
+        with pytest.raises(ValueError, match="Unknown process role"):
+            get_pool_profile(settings)
+
+    def test_engine_options(self, settings):
+        """Test server databases get a timed pool sized from the profile."""
+        settings.process_role = "beat"
+
+        options = get_pool_options(settings, POSTGRES_URL)
+
+        assert options == {
+            "poolclass": TimedQueuePool,
+            "pool_size": 1,
+            "max_overflow": 1,
+            "pool_timeout": 30,
+            "pool_recycle": 1800,
+        }
+        assert (
+            get_pool_options(settings, POSTGRES_URL, is_async=True)["poolclass"]
+            is TimedAsyncAdaptedQueuePool
+        )
+
+    def test_api_budget_split_between_engines(self, settings):
+        """Test the sync and async engines share one API process budget."""
+        settings.process_role = "api"
+        budget = POOL_PROFILES["api"]
+
+        sync = get_pool_options(settings, POSTGRES_URL)
+        async_ = get_pool_options(settings, POSTGRES_URL, is_async=True)
+
+        assert sync["pool_size"] + async_["pool_size"] == budget.pool_size
+        assert sync["max_overflow"] + async_["max_overflow"] == budget.max_overflow
+        assert async_["pool_size"] == sync["pool_size"] == 5
+
+    @pytest.mark.parametrize("role", ["worker", "beat"])
+    def test_unused_async_engine_keeps_minimal_pool(self, settings, role):
+        """Test roles without async endpoints give the sync engine everything."""
+        settings.process_role = role
+        budget = POOL_PROFILES[role]
+
+        sync = get_pool_options(settings, POSTGRES_URL)
+        async_ = get_pool_options(settings, POSTGRES_URL, is_async=True)
+
+        assert (sync["pool_size"], sync["max_overflow"]) == (
+            budget.pool_size,
+            budget.max_overflow,
+        )
+        assert (async_["pool_size"], async_["max_overflow"]) == (1, 0)
+
+    def test_sqlite_keeps_default_pool(self, settings):
+        """Test SQLite engines are left on SQLAlchemy's default pool."""
+        assert get_pool_options(settings, "sqlite:///:memory:") == {}
+
+
+class TestPoolMetrics:
+    """Test checkout counters and wait times of an instrumented pool."""
+
+    @pytest.fixture
+    def engine(self, tmp_path):
+        """File-backed SQLite engine with a single-connection timed pool."""
+        engine = create_engine(
+            f"sqlite:///{tmp_path / 'pool.db'}",
+            poolclass=TimedQueuePool,
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=0.05,
+        )
+        yield engine
+        engine.dispose()
+        db_pool._instrumented.pop("test", None)
+
+    def test_checkouts_and_waits(self, engine):
+        """Test each checkout is counted and timed."""
+        metrics = instrument_engine("test", engine)
+
+        for _ in range(3):
+            with engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+
+        stats = get_pool_stats()["test"]
+        assert metrics.checkouts == 3
+        assert stats["checkouts"] == 3
+        assert stats["checkins"] == 3
+        assert stats["wait_ms"]["count"] == 3
+        assert stats["checked_out"] == 0
+        assert stats["size"] == 1
+
+    def test_exhausted_pool_counts_timeouts(self, engine):
+        """Test waiting past pool_timeout is reported."""
+        instrument_engine("test", engine)
+
+        with engine.connect():
+            assert get_pool_stats()["test"]["checked_out"] == 1
+            with pytest.raises(exc.TimeoutError):
+                engine.connect()
+
+        assert get_pool_stats()["test"]["timeouts"] == 1
+
+    def test_metrics_survive_dispose(self, engine):
+        """Test the replacement pool keeps reporting to the same metrics."""
+        metrics = instrument_engine("test", engine)
+
+        engine.dispose()
+        with engine.connect():
+            pass
+
+        assert engine.pool.metrics is metrics
+        assert metrics.wait_count == 1
+
+
+def test_health_reports_pools(client):
+    """Test the health endpoint exposes pool state for each engine."""
+    response = client.get("/health")
+
+    pool = response.json()["database_pool"]
+    assert pool["process_role"] == "api"
+    assert set(pool["engines"]) >= {"sync", "async"}
+    assert "checkouts" in pool["engines"]["sync"]
+
+
+def test_shared_engine_rolls_back():
+    """Test router sessions on the shared engine keep their transactions."""
+    from backend.models import Asset, AssetCategory, AssetType, get_db, init_db
+
+    init_db()
+    db_gen = get_db()
+    session = next(db_gen)
+    try:
+        before = session.query(Asset).count()
+        session.add(
+            Asset(
+                ticker="ROLLBACK",
+                name="Rollback Test",
+                asset_type=AssetType.STOCK,
+                category=AssetCategory.EQUITY,
+            )
+        )
+        session.flush()
+        session.rollback()
+
+        assert session.query(Asset).count() == before
+    finally:
+        db_gen.close()
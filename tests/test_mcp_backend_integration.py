@@ -1,7 +1,6 @@
 """Integration tests for MCP server connecting to backend API."""
 
-import asyncio
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
 from fastapi.testclient import TestClient
 import httpx
@@ -84,9 +83,8 @@ class TestMCPBackendIntegration:
         """Test MCP get_positions tool with backend integration."""
         # Mock the portfolio tools to use our test backend
         mock_instance = mock_portfolio_tools.return_value
-        mock_instance.execute_tool.return_value = asyncio.Future()
-        mock_instance.execute_tool.return_value.set_result(
-            [
+        mock_instance.execute_tool = AsyncMock(
+            return_value=[
                 {
                     "type": "text",
                     "text": "**Current Portfolio Positions:**\n\n**No positions found in your portfolio.**\n\nTo get started, use the `add_position` tool to add your first investment!",
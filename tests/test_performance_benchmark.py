@@ -4,6 +4,11 @@ from datetime import date, timedelta
 from decimal import Decimal
 from unittest.mock import Mock, patch
 
+import pytest
+from sqlalchemy import event
+
+from backend.models import Asset, AssetCategory, AssetType
+from backend.models.price_history import PriceHistory
 from backend.services.performance_benchmark import (
     BenchmarkMetrics,
     PerformanceBenchmarkService,
@@ -269,6 +274,125 @@ class TestPerformanceBenchmarkService:
         assert sharpe_analysis["relative_performance"] == 0.5  # 1.5 - 1.0
 
 
+class TestBatchedBenchmarkAnalysis:
+    """Test loading benchmarks in one batch and caching their metrics."""
+
+    START = date(2024, 1, 1)
+    END = date(2024, 1, 10)
+
+    @pytest.fixture
+    def db(self, db_session):
+        """SQLite session with ten days of SPY and BND prices."""
+        for ticker, step in (("SPY", 2), ("BND", -1)):
+            asset = Asset(
+                ticker=ticker,
+                name=ticker,
+                asset_type=AssetType.ETF,
+                category=AssetCategory.EQUITY,
+            )
+            db_session.add(asset)
+            db_session.flush()
+            db_session.add_all(
+                [
+                    PriceHistory(
+                        asset_id=asset.id,
+                        price_date=self.START + timedelta(days=day),
+                        close_price=Decimal(100 + step * day),
+                    )
+                    for day in range(10)
+                ]
+            )
+        db_session.commit()
+        return db_session
+
+    @pytest.fixture
+    def service(self):
+        """Service with a fixed portfolio and an empty metrics cache."""
+        service = PerformanceBenchmarkService()
+        portfolio = Mock()
+        portfolio.total_return_percent = Decimal("10.0")
+        portfolio.annualized_return = None
+        portfolio.sharpe_ratio = Decimal("1.0")
+        portfolio.volatility = Decimal("15.0")
+        portfolio.max_drawdown = Decimal("5.0")
+        service.portfolio_service = Mock()
+        service.portfolio_service.calculate_performance_metrics.return_value = portfolio
+        return service
+
+    def count_statements(self, db):
+        """List that collects every SQL statement run on ``db``."""
+        statements = []
+        event.listen(
+            db.get_bind(),
+            "before_cursor_execute",
+            lambda *args: statements.append(args[2]),
+        )
+        return statements
+
+    def test_benchmarks_load_in_one_batch(self, db, service):
+        """Test assets and prices for all benchmarks take one query each."""
+        statements = self.count_statements(db)
+
+        analysis = service.get_comprehensive_benchmark_analysis(
+            db, 1, ["SPY", "BND"], self.START, self.END
+        )
+
+        assert len(statements) == 2
+        comparisons = analysis["benchmark_comparisons"]
+        assert float(comparisons["SPY"]["benchmark"].total_return) == 18.0
+        assert comparisons["SPY"]["comparison"]["excess_return"] == -8.0
+        assert comparisons["BND"]["comparison"]["outperformed"] is True
+
+    def test_metrics_are_cached(self, db, service):
+        """Test a repeated analysis does not query benchmark prices again."""
+        service.get_comprehensive_benchmark_analysis(
+            db, 1, ["SPY", "BND"], self.START, self.END
+        )
+        statements = self.count_statements(db)
+
+        analysis = service.get_comprehensive_benchmark_analysis(
+            db, 2, ["BND", "SPY"], self.START, self.END
+        )
+
+        assert statements == []
+        assert list(analysis["benchmark_comparisons"]) == ["BND", "SPY"]
+
+    def test_cache_round_trip(self):
+        """Test metrics survive the shared cache encoding."""
+        metrics = BenchmarkMetrics(
+            "S&P 500", "SPY", Decimal("10.5"), volatility=Decimal("12.25")
+        )
+
+        restored = BenchmarkMetrics.from_json(metrics.to_json())
+
+        assert vars(restored) == vars(metrics)
+
+    def test_vectorized_comparison_matches_single(self, service):
+        """Test comparing many benchmarks at once equals one at a time."""
+        portfolio = service.portfolio_service.calculate_performance_metrics()
+        benchmarks = [
+            BenchmarkMetrics("A", "A", Decimal("12.0"), volatility=Decimal("15.0")),
+            BenchmarkMetrics("B", "B", Decimal("0"), sharpe_ratio=Decimal("0.4")),
+            BenchmarkMetrics(
+                "C",
+                "C",
+                Decimal("-3.5"),
+                volatility=Decimal("9.0"),
+                max_drawdown=Decimal("20.0"),
+            ),
+        ]
+
+        batch = service._compare_portfolio_to_benchmarks(portfolio, benchmarks)
+
+        assert batch == [
+            service._compare_portfolio_to_benchmark(portfolio, b) for b in benchmarks
+        ]
+        assert batch[0]["risk_adjusted_excess"] is None
+        assert batch[1]["relative_return"] == 0
+        assert batch[1]["sharpe_ratio_diff"] == 0.6
+        assert batch[2]["risk_adjusted_excess"] == pytest.approx(13.5 / 6.0)
+
+
 class TestPerformanceBenchmarkAPI:
     """Test performance benchmarking API integration."""
 
@@ -5,13 +5,16 @@ parsing, caching, and mapping operations.
 """
 
 from datetime import datetime, timedelta
+import threading
 from unittest.mock import Mock, patch
 
 import pytest
+from sqlalchemy import event
 
 from backend.models.isin import ISINValidationCache
 from backend.services.isin_utils import (
     ISINMapping,
+    ISINMappingIndex,
     ISINMappingService,
     ISINService,
     ISINUtils,
@@ -100,6 +103,53 @@ class TestISINValidation:
         is_valid, error = ISINUtils.validate_isin("uS0378331005")
         assert is_valid, "Mixed case ISIN should be accepted and normalized"
 
+    def test_validation_cached_in_memory(self):
+        """Test repeated validations are served without touching the database."""
+        before = ISINUtils.validation_cache_info()
+
+        with patch("backend.database.get_db_session") as mock_get_db:
+            for _ in range(3):
+                assert ISINUtils.validate_isin("GB0002162385") == (True, None)
+            assert ISINUtils.validate_isin("gb0002162385 ") == (True, None)
+
+        mock_get_db.assert_not_called()
+        after = ISINUtils.validation_cache_info()
+        assert after["hits"] - before["hits"] >= 3
+
+    def test_validate_isins_matches_validate_isin(self):
+        """Test batch validation agrees with per-ISIN validation."""
+        isins = [
+            "US0378331005",
+            "DE0007164600",
+            "us0378331005",
+            " GB0002162385 ",
+            "US0378331006",
+            "US037833100",
+            "US03783310@5",
+            "1S0378331005",
+            "ＵＳ０３７８３３１００５",
+            "",
+            None,
+            123,
+        ]
+
+        batch = ISINUtils.validate_isins(isins)
+
+        assert len(batch) == len(isins)
+        assert batch.valid_count == 4
+        assert batch.results() == [
+            ISINUtils.validate_isin(isin, use_cache=False) for isin in isins
+        ]
+        assert batch.expected_check_digit[4] == 5
+        assert batch.expected_check_digit[5] == -1
+
+    def test_validation_without_cache(self):
+        """Test use_cache=False validates directly."""
+        before = ISINUtils.validation_cache_info()
+
+        assert ISINUtils.validate_isin("US0378331006", use_cache=False)[0] is False
+        assert ISINUtils.validation_cache_info() == before
+
 
 class TestISINParsing:
     """Test ISIN parsing functionality."""
@@ -285,6 +335,184 @@ class TestISINMappingService:
         assert mappings[0].isin == "US0378331005"
         assert mappings[0].ticker == "AAPL"
 
+    @pytest.fixture
+    def mapping_db(self, db_session):
+        """Real SQLite session with mappings on several exchanges."""
+        from backend.models.isin import ISINTickerMapping
+
+        rows = [
+            ("DE0007164600", "SAP", "XX", 0.99),
+            ("DE0007164600", "SAP.GF", "GF", 0.80),
+            ("DE0007164600", "SAP.GD", "GD", 0.95),
+            ("US0378331005", "AAPL", "ZZ", 0.70),
+            ("US0378331005", "AAPL.X", "YY", 0.90),
+        ]
+        db_session.add_all(
+            [
+                ISINTickerMapping(
+                    isin=isin,
+                    ticker=ticker,
+                    exchange_code=exchange,
+                    source="test",
+                    confidence=confidence,
+                )
+                for isin, ticker, exchange, confidence in rows
+            ]
+        )
+        db_session.commit()
+        return db_session
+
+    def count_queries(self, session):
+        """Attach a SELECT counter to the session's engine."""
+        from sqlalchemy import event
+
+        statements = []
+        event.listen(
+            session.get_bind(),
+            "before_cursor_execute",
+            lambda _conn, _cursor, statement, *_args: statements.append(statement),
+        )
+        return statements
+
+    def test_resolve_isin_to_ticker_single_query(self, mapping_service, mapping_db):
+        """Test resolution ranks by exchange preference with one query."""
+        statements = self.count_queries(mapping_db)
+
+        # GF is preferred over GD for German ISINs, even at lower confidence
+        assert mapping_service.resolve_isin_to_ticker(mapping_db, "DE0007164600") == (
+            "SAP.GF"
+        )
+        # No preferred exchange listed: highest confidence wins
+        assert mapping_service.resolve_isin_to_ticker(mapping_db, "US0378331005") == (
+            "AAPL.X"
+        )
+        assert len(statements) == 2
+
+    def test_resolve_isins_to_tickers_batch(self, mapping_service, mapping_db):
+        """Test batch resolution uses one IN query for the whole portfolio."""
+        statements = self.count_queries(mapping_db)
+
+        resolved = mapping_service.resolve_isins_to_tickers(
+            mapping_db, ["DE0007164600", "US0378331005", "GB0002162385", "US0378331006"]
+        )
+
+        assert resolved == {
+            "DE0007164600": "SAP.GF",
+            "US0378331005": "AAPL.X",
+            "GB0002162385": None,
+            "US0378331006": None,
+        }
+        assert len(statements) == 1
+
+    def test_mapping_index_resolves_without_queries(self, mapping_db):
+        """Test a loaded index answers ISIN and ticker lookups from memory."""
+        index = ISINMappingIndex(refresh_interval=3600, reload_interval=86400)
+        service = ISINMappingService(index)
+        assert index.load(mapping_db) == 5
+        statements = self.count_queries(mapping_db)
+
+        assert service.resolve_isin_to_ticker(mapping_db, "DE0007164600") == "SAP.GF"
+        assert service.resolve_isins_to_tickers(
+            mapping_db, ["US0378331005", "GB0002162385"]
+        ) == {"US0378331005": "AAPL.X", "GB0002162385": None}
+        assert [m.isin for m in service.get_mappings_for_ticker(mapping_db, "aapl.x")]
+        assert [
+            m.ticker for m in service.get_mappings_from_db(mapping_db, "DE0007164600")
+        ] == ["SAP", "SAP.GD", "SAP.GF"]
+        assert statements == []
+
+    def test_mapping_index_invalidation(self, mapping_db):
+        """Test invalidated ISINs are re-read before the next lookup."""
+        from backend.models.isin import ISINTickerMapping
+
+        index = ISINMappingIndex(refresh_interval=3600, reload_interval=86400)
+        service = ISINMappingService(index)
+        index.load(mapping_db)
+
+        mapping_db.query(ISINTickerMapping).filter(
+            ISINTickerMapping.ticker == "AAPL.X"
+        ).update({"is_active": False})
+        mapping_db.add(
+            ISINTickerMapping(
+                isin="GB0002162385", ticker="AV.L", exchange_code="L", source="test"
+            )
+        )
+        mapping_db.commit()
+
+        # Within the refresh interval the index still serves its snapshot
+        assert service.resolve_isin_to_ticker(mapping_db, "US0378331005") == "AAPL.X"
+
+        index.invalidate(["US0378331005", "gb0002162385"])
+        assert service.resolve_isins_to_tickers(
+            mapping_db, ["US0378331005", "GB0002162385"]
+        ) == {"US0378331005": "AAPL", "GB0002162385": "AV.L"}
+        assert service.get_mappings_for_ticker(mapping_db, "AAPL.X") == []
+
+        stats = index.get_stats()
+        assert stats["full_loads"] == 1
+        assert stats["incremental_refreshes"] == 1
+        assert stats["pending_invalidations"] == 0
+
+    def test_mapping_index_incremental_refresh(self, mapping_db):
+        """Test rows written after the watermark are merged without a reload."""
+        from backend.models.isin import ISINTickerMapping
+
+        index = ISINMappingIndex(refresh_interval=0, reload_interval=86400)
+        service = ISINMappingService(index)
+        index.load(mapping_db)
+
+        mapping_db.add(
+            ISINTickerMapping(
+                isin="GB0002162385", ticker="AV.L", exchange_code="L", source="test"
+            )
+        )
+        mapping_db.commit()
+
+        assert service.resolve_isin_to_ticker(mapping_db, "GB0002162385") == "AV.L"
+        assert index.get_stats()["full_loads"] == 1
+        assert index.get_stats()["mappings"] == 6
+
+    def test_mapping_index_queries_outside_lock(self, mapping_db):
+        """Test lookups from other threads proceed while a refresh queries."""
+        index = ISINMappingIndex(refresh_interval=3600, reload_interval=86400)
+        index.load(mapping_db)
+        blocked = []
+
+        def lookup_from_other_thread(*_args):
+            thread = threading.Thread(target=index.lookup, args=("DE0007164600",))
+            thread.start()
+            thread.join(timeout=1)
+            blocked.append(thread.is_alive())
+
+        event.listen(
+            mapping_db.get_bind(), "before_cursor_execute", lookup_from_other_thread
+        )
+        try:
+            index.invalidate(["US0378331005"])
+            assert index.ensure_fresh(mapping_db)
+            index.invalidate()
+            assert index.ensure_fresh(mapping_db)
+        finally:
+            event.remove(
+                mapping_db.get_bind(), "before_cursor_execute", lookup_from_other_thread
+            )
+
+        assert blocked == [False, False]
+
+    def test_mapping_index_skips_refresh_in_progress(self, mapping_db):
+        """Test callers serve the current maps while another caller refreshes."""
+        index = ISINMappingIndex(refresh_interval=3600, reload_interval=86400)
+        index.load(mapping_db)
+        index.invalidate(["US0378331005"])
+        statements = self.count_queries(mapping_db)
+
+        with index._refresh_lock:
+            assert index.ensure_fresh(mapping_db)
+            assert [m.ticker for m in index.lookup("US0378331005")]
+
+        assert statements == []
+        assert index.get_stats()["pending_invalidations"] == 1
+
 
 class TestISINService:
     """Test main ISIN service functionality."""